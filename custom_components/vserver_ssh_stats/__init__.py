@@ -8,7 +8,6 @@ import re
 import socket
 from datetime import UTC, datetime
 
-import paramiko
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
@@ -16,22 +15,47 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 
-from .ssh_security import configure_pinned_host_keys, parse_host_key_fingerprints
+from .health import parse_health_thresholds
+from .ssh_collector import (
+    configure_collector_profiling,
+    configure_output_compression,
+    configure_remote_cache,
+    forget_collector_profiles,
+)
+from .ssh_executor import LANE_ACTION, ssh_executor
+from .ssh_pool import ssh_pool
+from .ssh_security import parse_host_key_fingerprints
+from .ssh_transport import (
+    asyncssh_transport,
+    configure_host_transport,
+    forget_hosts,
+    transport_for_host,
+)
 from .util import (
+    COLLECTION_MODES,
     DEFAULT_ACTION_COMMAND_TIMEOUT,
+    DEFAULT_COLLECTION_MODE,
     DEFAULT_COMMAND_ALLOWLIST,
     DEFAULT_COMMAND_TIMEOUT,
     DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DOCKER_DISK_INTERVAL,
     DEFAULT_DOCKER_INTERVAL,
     DEFAULT_HISTORY_RETENTION_DAYS,
     DEFAULT_INTERVAL,
+    DEFAULT_MAX_SSH_SESSIONS,
+    DEFAULT_MEDIUM_INTERVAL,
     DEFAULT_PACKAGE_INTERVAL,
     DEFAULT_SLOW_COMMAND_TIMEOUT,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_SSH_TRANSPORT,
     DEFAULT_STORAGE_INTERVAL,
     MAX_HISTORY_RETENTION_DAYS,
+    MAX_SSH_SESSIONS,
+    SSH_TRANSPORTS,
     is_command_allowed,
     parse_command_allowlist,
     parse_monitored_ports,
+    parse_remote_cache_ttls,
     resolve_private_key_path,
 )
 
@@ -425,57 +449,75 @@ def _build_tail_logs_commands(target_os: str, service: str | None, lines: int) -
     return _build_os_command_sequence(target_os, linux_cmd, windows_cmd)
 
 
-def _exec_ssh_with_fallback(
-    client: paramiko.SSHClient,
+def _exec_remote_commands(
+    hass: HomeAssistant,
+    data: dict,
     commands: list[str],
-    command_timeout: int,
 ) -> tuple[str, bool]:
-    """Run commands in order and return the first successful output."""
+    """Run command fallbacks over the shared SSH pool and return output/success."""
 
+    connect_timeout = _positive_timeout(data.get("connect_timeout"), DEFAULT_CONNECT_TIMEOUT)
+    command_timeout = _positive_timeout(
+        data.get("command_timeout"), DEFAULT_ACTION_COMMAND_TIMEOUT
+    )
+    host_key_fingerprints = _host_key_fingerprints_for_connection(hass, data)
+    key = resolve_private_key_path(hass, data.get("key"))
     last_output = ""
     for command in commands:
-        _, stdout, stderr = client.exec_command(command, timeout=command_timeout)
-        output = stdout.read().decode() + stderr.read().decode()
-        status = stdout.channel.recv_exit_status()
+        with ssh_pool.exec_command(
+            data["host"],
+            data["username"],
+            data.get("password") or None,
+            key or None,
+            data.get("port") or 22,
+            command,
+            connect_timeout,
+            command_timeout,
+            host_key_fingerprints,
+        ) as (_, stdout, stderr, _connect_time_ms):
+            output = stdout.read().decode() + stderr.read().decode()
+            status = stdout.channel.recv_exit_status()
         if status == 0:
             return output, True
         last_output = output
     return last_output, False
 
 
-def _exec_remote_commands(
+async def _async_exec_remote_commands(
     hass: HomeAssistant,
     data: dict,
     commands: list[str],
 ) -> tuple[str, bool]:
-    """Connect via SSH, run command fallbacks, and return output/success."""
+    """Run command fallbacks on the host's configured SSH transport."""
+
+    transport = transport_for_host(data["host"])
+    if transport is None:
+        return await ssh_executor.run(LANE_ACTION, _exec_remote_commands, hass, data, commands)
 
-    client = paramiko.SSHClient()
-    configure_pinned_host_keys(
-        client,
-        _host_key_fingerprints_for_connection(hass, data),
-    )
     connect_timeout = _positive_timeout(data.get("connect_timeout"), DEFAULT_CONNECT_TIMEOUT)
     command_timeout = _positive_timeout(
         data.get("command_timeout"), DEFAULT_ACTION_COMMAND_TIMEOUT
     )
-    connect_args = {
-        "hostname": data["host"],
-        "username": data["username"],
-        "port": data.get("port", 22),
-        "password": data.get("password"),
-        "timeout": connect_timeout,
-        "banner_timeout": connect_timeout,
-        "auth_timeout": connect_timeout,
-    }
+    host_key_fingerprints = _host_key_fingerprints_for_connection(hass, data)
     key = resolve_private_key_path(hass, data.get("key"))
-    if key:
-        connect_args["key_filename"] = key
-    client.connect(**{k: v for k, v in connect_args.items() if v})
-    try:
-        return _exec_ssh_with_fallback(client, commands, command_timeout)
-    finally:
-        client.close()
+    last_output = ""
+    for command in commands:
+        stdout, stderr, status, _connect_time_ms, _ = await transport.async_exec(
+            data["host"],
+            data["username"],
+            data.get("password") or None,
+            key or None,
+            data.get("port") or 22,
+            command,
+            connect_timeout,
+            command_timeout,
+            host_key_fingerprints,
+        )
+        output = stdout + stderr
+        if status == 0:
+            return output, True
+        last_output = output
+    return last_output, False
 
 
 def _command_allowlist_for_host(hass: HomeAssistant, host: str) -> list[str]:
@@ -643,39 +685,8 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
             )
             return {"output": output, "success": False, "blocked": True}
 
-        def _exec_cmd() -> tuple[str, bool]:
-            client = paramiko.SSHClient()
-            configure_pinned_host_keys(
-                client,
-                _host_key_fingerprints_for_connection(hass, data),
-            )
-            connect_timeout = _positive_timeout(data.get("connect_timeout"), DEFAULT_CONNECT_TIMEOUT)
-            command_timeout = _positive_timeout(
-                data.get("command_timeout"), DEFAULT_ACTION_COMMAND_TIMEOUT
-            )
-            connect_args = {
-                "hostname": data["host"],
-                "username": data["username"],
-                "port": data.get("port", 22),
-                "password": data.get("password"),
-                "timeout": connect_timeout,
-                "banner_timeout": connect_timeout,
-                "auth_timeout": connect_timeout,
-            }
-            key = resolve_private_key_path(hass, data.get("key"))
-            if key:
-                connect_args["key_filename"] = key
-            client.connect(**{k: v for k, v in connect_args.items() if v})
-            try:
-                _, stdout, stderr = client.exec_command(command, timeout=command_timeout)
-                output = stdout.read().decode() + stderr.read().decode()
-                status = stdout.channel.recv_exit_status()
-                return output, status == 0
-            finally:
-                client.close()
-
         try:
-            output, success = await asyncio.to_thread(_exec_cmd)
+            output, success = await _async_exec_remote_commands(hass, data, [command])
         except Exception as err:  # pragma: no cover - best effort
             _LOGGER.error("Command execution failed: %s", err)
             output = str(err) or err.__class__.__name__
@@ -694,12 +705,7 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
 
         data = dict(call.data)
         try:
-            output, success = await asyncio.to_thread(
-                _exec_remote_commands,
-                hass,
-                data,
-                commands,
-            )
+            output, success = await _async_exec_remote_commands(hass, data, commands)
         except Exception as err:  # pragma: no cover - best effort
             _LOGGER.error("%s failed for %s: %s", action, data.get("host"), err)
             output = str(err)
@@ -1179,12 +1185,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             server["monitored_ports"] = parse_monitored_ports(server.get("monitored_ports"))
         except ValueError:
             server["monitored_ports"] = []
+        try:
+            server["health_thresholds"] = parse_health_thresholds(
+                server.get("health_thresholds")
+            )
+        except ValueError:
+            server["health_thresholds"] = {}
+    try:
+        remote_result_cache_ttls = parse_remote_cache_ttls(data.get("remote_result_cache_ttls"))
+    except ValueError:
+        remote_result_cache_ttls = {}
     hass.data[DOMAIN][entry.entry_id] = {
         "interval": data.get("interval") or DEFAULT_INTERVAL,
+        "medium_interval": data.get("medium_interval") or DEFAULT_MEDIUM_INTERVAL,
+        "slow_interval": data.get("slow_interval") or DEFAULT_SLOW_INTERVAL,
+        "adaptive_interval": bool(data.get("adaptive_interval", False)),
+        "docker_events": bool(data.get("docker_events", False)),
         "connect_timeout": data.get("connect_timeout") or DEFAULT_CONNECT_TIMEOUT,
         "command_timeout": data.get("command_timeout") or DEFAULT_COMMAND_TIMEOUT,
         "package_interval": data.get("package_interval") or DEFAULT_PACKAGE_INTERVAL,
         "docker_interval": data.get("docker_interval") or DEFAULT_DOCKER_INTERVAL,
+        "docker_disk_interval": (
+            data.get("docker_disk_interval")
+            if data.get("docker_disk_interval") is not None
+            else DEFAULT_DOCKER_DISK_INTERVAL
+        ),
         "storage_interval": (
             data.get("storage_interval")
             if data.get("storage_interval") is not None
@@ -1193,18 +1218,79 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "slow_command_timeout": data.get("slow_command_timeout")
         or DEFAULT_SLOW_COMMAND_TIMEOUT,
         "command_allowlist": data.get("command_allowlist", DEFAULT_COMMAND_ALLOWLIST),
+        "collection_mode": (
+            data.get("collection_mode")
+            if data.get("collection_mode") in COLLECTION_MODES
+            else DEFAULT_COLLECTION_MODE
+        ),
+        "max_ssh_sessions": min(
+            data.get("max_ssh_sessions") or DEFAULT_MAX_SSH_SESSIONS, MAX_SSH_SESSIONS
+        ),
+        "ssh_transport": (
+            data.get("ssh_transport")
+            if data.get("ssh_transport") in SSH_TRANSPORTS
+            else DEFAULT_SSH_TRANSPORT
+        ),
+        "ssh_compression": bool(data.get("ssh_compression", False)),
+        "compress_collector_output": bool(data.get("compress_collector_output", False)),
+        "collector_profiling": bool(data.get("collector_profiling", False)),
+        "remote_result_cache": bool(data.get("remote_result_cache", False)),
+        "remote_result_cache_ttls": remote_result_cache_ttls,
         "servers": servers,
         "custom_sensors": custom_sensors if isinstance(custom_sensors, list) else [],
     }
+    hosts = [server["host"] for server in servers if server.get("host")]
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    configure_host_transport(hosts, entry_data["ssh_transport"])
+    ssh_pool.set_compression(hosts, entry_data["ssh_compression"])
+    configure_output_compression(hosts, entry_data["compress_collector_output"])
+    configure_collector_profiling(hosts, entry_data["collector_profiling"])
+    configure_remote_cache(
+        hosts, entry_data["remote_result_cache"], entry_data["remote_result_cache_ttls"]
+    )
+    _configure_ssh_executor(hass)
     _cleanup_empty_device_entries(hass, entry)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+def _configure_ssh_executor(hass: HomeAssistant) -> None:
+    """Size the SSH thread pools for all loaded servers, or stop them."""
+
+    server_count = sum(
+        len(entry_data.get("servers", []))
+        for entry_data in hass.data.get(DOMAIN, {}).values()
+        if isinstance(entry_data, dict)
+    )
+    if server_count:
+        ssh_executor.configure(server_count)
+    else:
+        ssh_executor.shutdown()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a VServer SSH Stats config entry."""
     _LOGGER.debug("Unloading VServer SSH Stats entry")
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        entry_data = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        if isinstance(entry_data, dict):
+            # Streams close their channels on the SSH executor, so they must
+            # end before the pools are closed and the executor shuts down.
+            for coordinator in entry_data.get("coordinators", []) or []:
+                await coordinator.async_stop_stream()
+            hosts = {
+                server["host"]
+                for server in entry_data.get("servers", [])
+                if isinstance(server, dict) and server.get("host")
+            }
+            forget_hosts(hosts)
+            ssh_pool.set_compression(hosts, False)
+            configure_output_compression(hosts, False)
+            configure_collector_profiling(hosts, False)
+            forget_collector_profiles(hosts)
+            configure_remote_cache(hosts, False)
+            await ssh_executor.run(LANE_ACTION, ssh_pool.close_hosts, hosts)
+            await asyncssh_transport.async_close_hosts(hosts)
+        _configure_ssh_executor(hass)
     return unload_ok
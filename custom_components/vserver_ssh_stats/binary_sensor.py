@@ -16,7 +16,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import DOMAIN
 from .coordinator import VServerCoordinator, async_get_or_create_coordinators
-from .docker_entities import find_container, sanitize_container_name
+from .docker_entities import CONTAINER_DATA_KEYS, find_container, sanitize_container_name
 from .util import build_container_device_info, build_device_info
 
 BINARY_SENSORS: tuple[tuple[str, str, str], ...] = (
@@ -112,7 +112,7 @@ class VServerDiagnosticBinarySensor(
     ) -> None:
         """Initialize the binary diagnostic sensor."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=frozenset({key}))
         host = coordinator.server["host"]
         self._key = key
         self._icon = icon
@@ -145,7 +145,16 @@ class VServerPortBinarySensor(CoordinatorEntity[VServerCoordinator], BinarySenso
     def __init__(self, coordinator: VServerCoordinator, server_name: str, port: int) -> None:
         """Initialize the TCP port sensor."""
 
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            context=frozenset(
+                {
+                    f"port_open_{port}",
+                    f"port_response_time_ms_{port}",
+                    f"port_error_{port}",
+                }
+            ),
+        )
         host = coordinator.server["host"]
         self._port = port
         self._attr_unique_id = f"{host}_port_{port}_open"
@@ -203,7 +212,7 @@ class VServerContainerMemoryLimitBinarySensor(
     ) -> None:
         """Initialize the container memory-limit warning."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=CONTAINER_DATA_KEYS)
         host = coordinator.server["host"]
         self._container_key = container_key
         self._attr_unique_id = f"{host}_container_{container_key}_memory_limit_reached"
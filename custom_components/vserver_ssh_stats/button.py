@@ -17,6 +17,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from . import DOMAIN
 from .coordinator import VServerCoordinator, async_get_or_create_coordinators
 from .docker_entities import (
+    CONTAINER_DATA_KEYS,
     build_container_action_data,
     container_names_from_registry,
     container_names_from_stats,
@@ -248,7 +249,7 @@ class VServerContainerRestartButton(
     ) -> None:
         """Initialize the restart button."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=CONTAINER_DATA_KEYS)
         self._container_name = container_name
         self._sanitized_name = sanitized_name
         self._connect_timeout = connect_timeout
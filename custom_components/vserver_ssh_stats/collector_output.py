@@ -0,0 +1,283 @@
+"""Size-bounded reading and JSON decoding of remote collector output."""
+from __future__ import annotations
+
+import importlib
+import json
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+# Largest JSON document accepted from one collector run. Hosts with hundreds
+# of containers or disks stay well below this; anything larger is treated as
+# runaway output instead of being buffered.
+MAX_COLLECTOR_OUTPUT = 8 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+# Candidate object starts tried when banner text before the document
+# contains braces of its own.
+MAX_JSON_START_ATTEMPTS = 8
+
+# Header line the remote collector prints before compressed output, followed
+# by the encoding name and a newline.
+COMPRESSED_OUTPUT_MARKER = b"\x1fVSSHZ "
+MAX_MARKER_LINE = 64
+OUTPUT_ENCODING_GZIP = "gzip"
+OUTPUT_ENCODING_ZSTD = "zstd"
+
+_decoder = json.JSONDecoder()
+
+
+class CollectorOutputTooLarge(ValueError):
+    """Raised when collector output exceeds the configured maximum size."""
+
+
+# Decoders take compressed bytes and the number of output bytes still allowed,
+# and return at most one byte more than that so overruns are detected without
+# inflating a whole decompression bomb.
+OutputDecoder = Callable[[bytes, int], bytes]
+
+
+def _gzip_decoder() -> OutputDecoder:
+    """Return a streaming gzip decoder."""
+
+    decompressor = zlib.decompressobj(wbits=31)
+
+    def decode(data: bytes, limit: int) -> bytes:
+        output = decompressor.decompress(data, limit + 1)
+        if decompressor.unconsumed_tail:
+            output += b"\0"
+        return output
+
+    return decode
+
+
+def _zstd_decoder() -> Optional[OutputDecoder]:
+    """Return a streaming zstd decoder, or ``None`` without zstd support."""
+
+    try:
+        zstd = importlib.import_module("compression.zstd")
+    except ImportError:
+        pass
+    else:
+        decompressor = zstd.ZstdDecompressor()
+
+        def decode(data: bytes, limit: int) -> bytes:
+            output = decompressor.decompress(data, limit + 1)
+            if not decompressor.needs_input and not decompressor.eof:
+                output += b"\0"
+            return output
+
+        return decode
+    return _zstandard_decoder()
+
+
+class _OutputLimitReached(Exception):
+    """Stop a zstandard stream writer once the output limit is exceeded."""
+
+
+class _BoundedSink:
+    """Collect decompressed output up to an allowance of bytes."""
+
+    def __init__(self) -> None:
+        """Initialize an empty sink."""
+
+        self.output = bytearray()
+        self.allowance = 0
+
+    def write(self, data: bytes) -> int:
+        """Keep *data* and stop the writer once the allowance is exceeded."""
+
+        self.output += data
+        if len(self.output) > self.allowance:
+            raise _OutputLimitReached
+        return len(data)
+
+
+def _zstandard_decoder() -> Optional[OutputDecoder]:
+    """Return a streaming decoder based on the ``zstandard`` package.
+
+    Its stream writer hands output to the sink in chunks of at most the
+    writer's write size, so an overrun stops after one chunk instead of
+    inflating the whole input.
+    """
+
+    try:
+        zstandard = importlib.import_module("zstandard")
+    except ImportError:
+        return None
+    sink = _BoundedSink()
+    writer = zstandard.ZstdDecompressor().stream_writer(sink, write_return_read=True)
+
+    def decode(data: bytes, limit: int) -> bytes:
+        sink.output = bytearray()
+        sink.allowance = limit
+        try:
+            writer.write(data)
+        except _OutputLimitReached:
+            pass
+        return bytes(sink.output[: limit + 1])
+
+    return decode
+
+
+_OUTPUT_DECODERS: dict[str, Callable[[], Optional[OutputDecoder]]] = {
+    OUTPUT_ENCODING_ZSTD: _zstd_decoder,
+    OUTPUT_ENCODING_GZIP: _gzip_decoder,
+}
+
+
+def supported_output_encodings() -> tuple[str, ...]:
+    """Return the compressed output encodings this host can decode, best first."""
+
+    return tuple(
+        encoding for encoding, factory in _OUTPUT_DECODERS.items() if factory() is not None
+    )
+
+
+def decode_json_document(text: str) -> Dict[str, Any]:
+    """Decode the first JSON object in *text*, ignoring surrounding noise.
+
+    Banner or MOTD lines before the object and trailing text after it are
+    skipped by index, so the document is parsed once without slicing copies.
+    """
+
+    start = text.find("{")
+    if start == -1:
+        if text.strip():
+            raise json.JSONDecodeError("SSH output missing JSON object", text, 0)
+        return {}
+    first_error: json.JSONDecodeError | None = None
+    for _ in range(MAX_JSON_START_ATTEMPTS):
+        try:
+            document, _end = _decoder.raw_decode(text, start)
+        except json.JSONDecodeError as err:
+            first_error = first_error or err
+            start = text.find("{", start + 1)
+            if start == -1:
+                break
+            continue
+        if isinstance(document, dict):
+            return document
+        first_error = first_error or json.JSONDecodeError(
+            "Collector output is not a JSON object", text, start
+        )
+        break
+    assert first_error is not None
+    raise first_error
+
+
+class CollectorOutputReader:
+    """Collect one JSON document from channel chunks with a size limit.
+
+    Bytes before the first ``{`` are counted and dropped as they arrive, so
+    banner noise is never buffered. Output behind a compressed-output marker
+    is decompressed on the fly. The JSON payload is kept in a single buffer
+    and decoded once by :meth:`finish`.
+    """
+
+    def __init__(self, max_bytes: int = MAX_COLLECTOR_OUTPUT) -> None:
+        """Initialize an empty reader accepting at most *max_bytes* of payload."""
+
+        self._max_bytes = max_bytes
+        self._buffer = bytearray()
+        self._pending = bytearray()
+        self._started = False
+        self._skipped_text = False
+        self._decoder: Optional[OutputDecoder] = None
+        self.encoding: Optional[str] = None
+        self.received_bytes = 0
+        self.skipped_bytes = 0
+        self.parse_time_ms = 0.0
+
+    @property
+    def payload_bytes(self) -> int:
+        """Return the number of buffered (decompressed) payload bytes."""
+
+        return len(self._buffer)
+
+    def feed(self, chunk: bytes) -> None:
+        """Add one chunk of collector stdout."""
+
+        self.received_bytes += len(chunk)
+        if self._started:
+            self._feed_payload(chunk)
+            return
+        self._pending.extend(chunk)
+        brace = self._pending.find(b"{")
+        marker = self._pending.find(COMPRESSED_OUTPUT_MARKER)
+        if marker != -1 and (brace == -1 or marker < brace):
+            self._start_compressed(marker)
+        elif brace != -1:
+            self._skip(brace)
+            self._started = True
+            payload, self._pending = self._pending, bytearray()
+            self._feed_payload(payload)
+        else:
+            # Keep a tail that may hold the beginning of a split marker.
+            self._skip(max(0, len(self._pending) - len(COMPRESSED_OUTPUT_MARKER) + 1))
+
+    def read_from(self, stream: Any) -> None:
+        """Feed all data from a blocking file-like *stream* until EOF."""
+
+        while True:
+            chunk = stream.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            self.feed(chunk)
+
+    def finish(self) -> Dict[str, Any]:
+        """Decode the buffered document and record the parse time."""
+
+        if not self._started and (self._skipped_text or self._pending.strip()):
+            raise json.JSONDecodeError("SSH output missing JSON object", "", 0)
+        started = time.monotonic()
+        try:
+            return decode_json_document(self._buffer.decode("utf-8", "ignore"))
+        finally:
+            self.parse_time_ms = (time.monotonic() - started) * 1000
+
+    def _skip(self, count: int) -> None:
+        """Drop *count* leading bytes of banner noise."""
+
+        if count <= 0:
+            return
+        self._skipped_text |= bool(self._pending[:count].strip())
+        self.skipped_bytes += count
+        del self._pending[:count]
+
+    def _start_compressed(self, marker: int) -> None:
+        """Switch to decompression once the marker line is complete."""
+
+        end = self._pending.find(b"\n", marker)
+        if end == -1:
+            if len(self._pending) - marker > MAX_MARKER_LINE:
+                raise ValueError("Malformed compressed collector output header")
+            return
+        encoding = (
+            self._pending[marker + len(COMPRESSED_OUTPUT_MARKER) : end]
+            .decode("ascii", "replace")
+            .strip()
+        )
+        factory = _OUTPUT_DECODERS.get(encoding)
+        decoder = factory() if factory is not None else None
+        if decoder is None:
+            raise ValueError(f"Unsupported collector output encoding: {encoding}")
+        self._skip(marker)
+        self._decoder = decoder
+        self.encoding = encoding
+        self._started = True
+        compressed = bytes(self._pending[end - marker + 1 :])
+        self._pending = bytearray()
+        self._feed_payload(compressed)
+
+    def _feed_payload(self, data: bytes | memoryview) -> None:
+        """Append payload bytes, decompressing them first when needed."""
+
+        remaining = self._max_bytes - len(self._buffer)
+        if self._decoder is not None:
+            data = self._decoder(bytes(data), max(remaining, 0))
+        if len(data) > remaining:
+            raise CollectorOutputTooLarge(
+                f"Collector output exceeded {self._max_bytes} bytes"
+            )
+        self._buffer.extend(data)
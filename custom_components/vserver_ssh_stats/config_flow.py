@@ -17,24 +17,42 @@ from homeassistant.core import callback
 from homeassistant.helpers import selector
 
 from . import DOMAIN
+from .health import format_health_thresholds, parse_health_thresholds
 from .ssh_collector import async_run_custom_command
 from .ssh_discovery import discover_ssh_hosts, guess_local_network
+from .ssh_executor import ssh_executor
 from .ssh_security import SSHHostKeyError, parse_host_key_fingerprints
 from .util import (
+    COLLECTION_MODE_POLL,
+    COLLECTION_MODE_STREAM,
+    COLLECTION_MODES,
+    DEFAULT_COLLECTION_MODE,
     DEFAULT_COMMAND_ALLOWLIST,
     DEFAULT_COMMAND_TIMEOUT,
     DEFAULT_CONNECT_TIMEOUT,
     DEFAULT_CUSTOM_SENSOR_INTERVAL,
     DEFAULT_CUSTOM_SENSOR_TIMEOUT,
+    DEFAULT_DOCKER_DISK_INTERVAL,
     DEFAULT_DOCKER_INTERVAL,
     DEFAULT_HISTORY_RETENTION_DAYS,
     DEFAULT_INTERVAL,
+    DEFAULT_MAX_SSH_SESSIONS,
+    DEFAULT_MEDIUM_INTERVAL,
     DEFAULT_PACKAGE_INTERVAL,
     DEFAULT_SLOW_COMMAND_TIMEOUT,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_SSH_TRANSPORT,
     DEFAULT_STORAGE_INTERVAL,
     MAX_HISTORY_RETENTION_DAYS,
+    MAX_SSH_SESSIONS,
     MIN_CUSTOM_SENSOR_INTERVAL,
+    SSH_TRANSPORT_ASYNCSSH,
+    SSH_TRANSPORT_PARAMIKO,
+    SSH_TRANSPORTS,
+    format_remote_cache_ttls,
     parse_monitored_ports,
+    parse_remote_cache_ttls,
+    remote_cache_ttls,
     resolve_private_key_path,
 )
 
@@ -42,6 +60,9 @@ from .util import (
 async def _async_test_ssh_connection(server: dict[str, Any]) -> str | None:
     """Attempt a lightweight SSH command and return an error code, or None on success."""
 
+    # The executor is shut down after the last entry unloaded; a new entry
+    # is tested before its setup configures the executor again.
+    ssh_executor.start()
     try:
         await async_run_custom_command(
             server["host"],
@@ -85,6 +106,24 @@ def _coerce_nonnegative_int(value: Any, default: int) -> int:
     return number if number >= 0 else default
 
 
+def _coerce_collection_mode(value: Any) -> str:
+    """Return a supported base collection mode."""
+
+    return value if value in COLLECTION_MODES else DEFAULT_COLLECTION_MODE
+
+
+def _coerce_max_ssh_sessions(value: Any) -> int:
+    """Return a supported per-entry SSH session limit."""
+
+    return min(_coerce_positive_int(value, DEFAULT_MAX_SSH_SESSIONS), MAX_SSH_SESSIONS)
+
+
+def _coerce_ssh_transport(value: Any) -> str:
+    """Return a supported SSH transport backend."""
+
+    return value if value in SSH_TRANSPORTS else DEFAULT_SSH_TRANSPORT
+
+
 def _number_box(min_value: int = 1, max_value: int | None = None) -> selector.NumberSelector:
     """Create a consistent numeric box selector."""
 
@@ -135,6 +174,16 @@ def _format_monitored_ports(value: object) -> str:
     return ", ".join(str(port) for port in ports)
 
 
+def _format_health_thresholds(value: object) -> str:
+    """Return health threshold overrides formatted for text input."""
+
+    try:
+        thresholds = parse_health_thresholds(value)
+    except ValueError:
+        return str(value or "")
+    return format_health_thresholds(thresholds)
+
+
 def _format_host_key_fingerprints(value: object) -> str:
     """Return configured host-key fingerprints formatted for text input."""
 
@@ -212,6 +261,12 @@ def _build_server_schema(
             default=_format_monitored_ports(defaults.get("monitored_ports", "")),
         )
     ] = _textarea_selector()
+    schema[
+        vol.Optional(
+            "health_thresholds",
+            default=_format_health_thresholds(defaults.get("health_thresholds", "")),
+        )
+    ] = _textarea_selector()
     schema[
         vol.Optional(
             "history_retention_days",
@@ -242,20 +297,80 @@ def _build_options_schema(
     storage_interval: int,
     slow_command_timeout: int,
     command_allowlist: str,
+    collection_mode: str = DEFAULT_COLLECTION_MODE,
+    max_ssh_sessions: int = DEFAULT_MAX_SSH_SESSIONS,
+    ssh_transport: str = DEFAULT_SSH_TRANSPORT,
+    ssh_compression: bool = False,
+    compress_collector_output: bool = False,
+    collector_profiling: bool = False,
+    remote_result_cache: bool = False,
+    medium_interval: int = DEFAULT_MEDIUM_INTERVAL,
+    slow_interval: int = DEFAULT_SLOW_INTERVAL,
+    adaptive_interval: bool = False,
+    docker_events: bool = False,
+    docker_disk_interval: int = DEFAULT_DOCKER_DISK_INTERVAL,
+    remote_result_cache_ttls: str = "",
 ) -> vol.Schema:
     """Create the top-level options schema."""
 
     return vol.Schema(
         {
             vol.Required("interval", default=interval): _number_box(),
+            vol.Required("medium_interval", default=medium_interval): _number_box(),
+            vol.Required("slow_interval", default=slow_interval): _number_box(),
+            vol.Optional("adaptive_interval", default=adaptive_interval): bool,
             vol.Required("connect_timeout", default=connect_timeout): _number_box(max_value=300),
             vol.Required("command_timeout", default=command_timeout): _number_box(max_value=300),
             vol.Required("package_interval", default=package_interval): _number_box(),
             vol.Required("docker_interval", default=docker_interval): _number_box(),
+            vol.Optional("docker_events", default=docker_events): bool,
+            vol.Required("docker_disk_interval", default=docker_disk_interval): _number_box(
+                min_value=0
+            ),
             vol.Required("storage_interval", default=storage_interval): _number_box(min_value=0),
             vol.Required("slow_command_timeout", default=slow_command_timeout): _number_box(
                 max_value=3600
             ),
+            vol.Required("collection_mode", default=collection_mode): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[
+                        selector.SelectOptionDict(
+                            value=COLLECTION_MODE_POLL,
+                            label="Poll (new SSH command per interval)",
+                        ),
+                        selector.SelectOptionDict(
+                            value=COLLECTION_MODE_STREAM,
+                            label="Stream (resident collector, one JSON line per interval)",
+                        ),
+                    ],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Required("max_ssh_sessions", default=max_ssh_sessions): _number_box(
+                max_value=MAX_SSH_SESSIONS
+            ),
+            vol.Required("ssh_transport", default=ssh_transport): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[
+                        selector.SelectOptionDict(
+                            value=SSH_TRANSPORT_PARAMIKO,
+                            label="Paramiko (worker thread per command)",
+                        ),
+                        selector.SelectOptionDict(
+                            value=SSH_TRANSPORT_ASYNCSSH,
+                            label="asyncssh (asyncio-native)",
+                        ),
+                    ],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Optional("ssh_compression", default=ssh_compression): bool,
+            vol.Optional("compress_collector_output", default=compress_collector_output): bool,
+            vol.Optional("collector_profiling", default=collector_profiling): bool,
+            vol.Optional("remote_result_cache", default=remote_result_cache): bool,
+            vol.Optional(
+                "remote_result_cache_ttls", default=remote_result_cache_ttls
+            ): _textarea_selector(),
             vol.Optional("command_allowlist", default=command_allowlist): _textarea_selector(),
             vol.Optional("edit_server", default=False): bool,
             vol.Optional("add_server", default=False): bool,
@@ -326,6 +441,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         )
                     except ValueError:
                         errors["monitored_ports"] = "invalid_ports"
+                    try:
+                        server["health_thresholds"] = parse_health_thresholds(
+                            user_input.get("health_thresholds")
+                        )
+                    except ValueError:
+                        errors["health_thresholds"] = "invalid_health_thresholds"
                     if user_input.get("password"):
                         server["password"] = user_input["password"]
                     key_input = user_input.get("key")
@@ -362,13 +483,25 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         self._abort_if_unique_id_configured()
                         data = {
                             "interval": self._interval,
+                            "medium_interval": DEFAULT_MEDIUM_INTERVAL,
+                            "slow_interval": DEFAULT_SLOW_INTERVAL,
+                            "adaptive_interval": False,
                             "connect_timeout": DEFAULT_CONNECT_TIMEOUT,
                             "command_timeout": DEFAULT_COMMAND_TIMEOUT,
                             "package_interval": DEFAULT_PACKAGE_INTERVAL,
                             "docker_interval": DEFAULT_DOCKER_INTERVAL,
+                            "docker_events": False,
+                            "docker_disk_interval": DEFAULT_DOCKER_DISK_INTERVAL,
                             "storage_interval": DEFAULT_STORAGE_INTERVAL,
                             "slow_command_timeout": DEFAULT_SLOW_COMMAND_TIMEOUT,
                             "command_allowlist": DEFAULT_COMMAND_ALLOWLIST,
+                            "collection_mode": DEFAULT_COLLECTION_MODE,
+                            "max_ssh_sessions": DEFAULT_MAX_SSH_SESSIONS,
+                            "ssh_transport": DEFAULT_SSH_TRANSPORT,
+                            "ssh_compression": False,
+                            "compress_collector_output": False,
+                            "collector_profiling": False,
+                            "remote_result_cache": False,
                             "servers_json": json.dumps(self._servers),
                         }
                         title = (
@@ -474,6 +607,14 @@ class OptionsFlowHandler(OptionsFlow):
 
         self._config_entry = config_entry
         self._interval = _coerce_positive_int(config_entry.data.get("interval"), DEFAULT_INTERVAL)
+        self._medium_interval = _coerce_positive_int(
+            config_entry.data.get("medium_interval"), DEFAULT_MEDIUM_INTERVAL
+        )
+        self._slow_interval = _coerce_positive_int(
+            config_entry.data.get("slow_interval"), DEFAULT_SLOW_INTERVAL
+        )
+        self._adaptive_interval = bool(config_entry.data.get("adaptive_interval", False))
+        self._docker_events = bool(config_entry.data.get("docker_events", False))
         self._connect_timeout = _coerce_positive_int(
             config_entry.data.get("connect_timeout"), DEFAULT_CONNECT_TIMEOUT
         )
@@ -486,6 +627,9 @@ class OptionsFlowHandler(OptionsFlow):
         self._docker_interval = _coerce_positive_int(
             config_entry.data.get("docker_interval"), DEFAULT_DOCKER_INTERVAL
         )
+        self._docker_disk_interval = _coerce_nonnegative_int(
+            config_entry.data.get("docker_disk_interval"), DEFAULT_DOCKER_DISK_INTERVAL
+        )
         self._storage_interval = _coerce_nonnegative_int(
             config_entry.data.get("storage_interval"), DEFAULT_STORAGE_INTERVAL
         )
@@ -495,6 +639,25 @@ class OptionsFlowHandler(OptionsFlow):
         self._command_allowlist = str(
             config_entry.data.get("command_allowlist", DEFAULT_COMMAND_ALLOWLIST)
         )
+        self._collection_mode = _coerce_collection_mode(
+            config_entry.data.get("collection_mode")
+        )
+        self._max_ssh_sessions = _coerce_max_ssh_sessions(
+            config_entry.data.get("max_ssh_sessions")
+        )
+        self._ssh_transport = _coerce_ssh_transport(config_entry.data.get("ssh_transport"))
+        self._ssh_compression = bool(config_entry.data.get("ssh_compression", False))
+        self._compress_collector_output = bool(
+            config_entry.data.get("compress_collector_output", False)
+        )
+        self._collector_profiling = bool(config_entry.data.get("collector_profiling", False))
+        self._remote_result_cache = bool(config_entry.data.get("remote_result_cache", False))
+        try:
+            self._remote_result_cache_ttls = parse_remote_cache_ttls(
+                config_entry.data.get("remote_result_cache_ttls")
+            )
+        except ValueError:
+            self._remote_result_cache_ttls = {}
         try:
             self._existing_servers: list[dict[str, Any]] = json.loads(
                 config_entry.data.get("servers_json", "[]")
@@ -520,6 +683,13 @@ class OptionsFlowHandler(OptionsFlow):
         errors: dict[str, str] = {}
         if user_input is not None:
             self._apply_common_options(user_input)
+            try:
+                self._remote_result_cache_ttls = parse_remote_cache_ttls(
+                    user_input.get("remote_result_cache_ttls")
+                )
+            except ValueError:
+                errors["remote_result_cache_ttls"] = "invalid_remote_cache_ttls"
+                return self._show_init_form(errors)
             actions = [
                 action
                 for action in (
@@ -604,6 +774,19 @@ class OptionsFlowHandler(OptionsFlow):
                 self._storage_interval,
                 self._slow_command_timeout,
                 self._command_allowlist,
+                self._collection_mode,
+                self._max_ssh_sessions,
+                self._ssh_transport,
+                self._ssh_compression,
+                self._compress_collector_output,
+                self._collector_profiling,
+                self._remote_result_cache,
+                self._medium_interval,
+                self._slow_interval,
+                self._adaptive_interval,
+                self._docker_events,
+                self._docker_disk_interval,
+                format_remote_cache_ttls(remote_cache_ttls(self._remote_result_cache_ttls)),
             ),
             errors=errors or {},
         )
@@ -612,6 +795,14 @@ class OptionsFlowHandler(OptionsFlow):
         """Store common options selected on the first options step."""
 
         self._interval = _coerce_positive_int(user_input.get("interval"), DEFAULT_INTERVAL)
+        self._medium_interval = _coerce_positive_int(
+            user_input.get("medium_interval"), DEFAULT_MEDIUM_INTERVAL
+        )
+        self._slow_interval = _coerce_positive_int(
+            user_input.get("slow_interval"), DEFAULT_SLOW_INTERVAL
+        )
+        self._adaptive_interval = bool(user_input.get("adaptive_interval", False))
+        self._docker_events = bool(user_input.get("docker_events", False))
         self._connect_timeout = _coerce_positive_int(
             user_input.get("connect_timeout"), DEFAULT_CONNECT_TIMEOUT
         )
@@ -624,6 +815,9 @@ class OptionsFlowHandler(OptionsFlow):
         self._docker_interval = _coerce_positive_int(
             user_input.get("docker_interval"), DEFAULT_DOCKER_INTERVAL
         )
+        self._docker_disk_interval = _coerce_nonnegative_int(
+            user_input.get("docker_disk_interval"), DEFAULT_DOCKER_DISK_INTERVAL
+        )
         self._storage_interval = _coerce_nonnegative_int(
             user_input.get("storage_interval"), DEFAULT_STORAGE_INTERVAL
         )
@@ -633,6 +827,15 @@ class OptionsFlowHandler(OptionsFlow):
         self._command_allowlist = str(
             user_input.get("command_allowlist", DEFAULT_COMMAND_ALLOWLIST)
         )
+        self._collection_mode = _coerce_collection_mode(user_input.get("collection_mode"))
+        self._max_ssh_sessions = _coerce_max_ssh_sessions(user_input.get("max_ssh_sessions"))
+        self._ssh_transport = _coerce_ssh_transport(user_input.get("ssh_transport"))
+        self._ssh_compression = bool(user_input.get("ssh_compression", False))
+        self._compress_collector_output = bool(
+            user_input.get("compress_collector_output", False)
+        )
+        self._collector_profiling = bool(user_input.get("collector_profiling", False))
+        self._remote_result_cache = bool(user_input.get("remote_result_cache", False))
 
     def _server_select_options(self) -> list[selector.SelectOptionDict]:
         """Return selector options for all configured servers."""
@@ -1094,6 +1297,12 @@ class OptionsFlowHandler(OptionsFlow):
             )
         except ValueError:
             errors["monitored_ports"] = "invalid_ports"
+        try:
+            server["health_thresholds"] = parse_health_thresholds(
+                user_input.get("health_thresholds")
+            )
+        except ValueError:
+            errors["health_thresholds"] = "invalid_health_thresholds"
 
         password = user_input.get("password")
         if user_input.get("clear_password"):
@@ -1183,13 +1392,26 @@ class OptionsFlowHandler(OptionsFlow):
         ]
         data = {
             "interval": self._interval,
+            "medium_interval": self._medium_interval,
+            "slow_interval": self._slow_interval,
+            "adaptive_interval": self._adaptive_interval,
             "connect_timeout": self._connect_timeout,
             "command_timeout": self._command_timeout,
             "package_interval": self._package_interval,
             "docker_interval": self._docker_interval,
+            "docker_events": self._docker_events,
+            "docker_disk_interval": self._docker_disk_interval,
             "storage_interval": self._storage_interval,
             "slow_command_timeout": self._slow_command_timeout,
             "command_allowlist": self._command_allowlist,
+            "collection_mode": self._collection_mode,
+            "max_ssh_sessions": self._max_ssh_sessions,
+            "ssh_transport": self._ssh_transport,
+            "ssh_compression": self._ssh_compression,
+            "compress_collector_output": self._compress_collector_output,
+            "collector_profiling": self._collector_profiling,
+            "remote_result_cache": self._remote_result_cache,
+            "remote_result_cache_ttls": self._remote_result_cache_ttls,
             "servers_json": json.dumps(servers),
             "custom_sensors_json": json.dumps(self._custom_sensors),
         }
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
 import re
 import socket
@@ -10,28 +11,54 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from . import DOMAIN
+from .health import HealthResult, evaluate_health
+from .scheduler import (
+    INTERVAL_REASON_BACKOFF,
+    INTERVAL_REASON_CONFIGURED,
+    PRIORITY_BASE,
+    PRIORITY_SLOW,
+    AdaptivePollInterval,
+    SSHSessionLimiter,
+    fleet_session_limiter,
+    phase_offset,
+)
 from .ssh_collector import (
+    CollectorStream,
+    DockerEventStream,
     async_run_custom_command,
     async_sample,
     async_sample_docker,
+    async_sample_docker_disk,
     async_sample_packages,
+    async_sample_slow,
     async_sample_storage,
+    merge_docker_containers,
+    merge_standby_storage_devices,
 )
 from .util import (
+    COLLECTION_MODE_STREAM,
     DEFAULT_BACKOFF_FAILURE_THRESHOLD,
     DEFAULT_BACKOFF_MAX_INTERVAL,
+    DEFAULT_COLLECTION_MODE,
     DEFAULT_COMMAND_TIMEOUT,
     DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DOCKER_DISK_INTERVAL,
     DEFAULT_DOCKER_INTERVAL,
     DEFAULT_INTERVAL,
+    DEFAULT_MAX_SSH_SESSIONS,
+    DEFAULT_MEDIUM_INTERVAL,
     DEFAULT_PACKAGE_INTERVAL,
     DEFAULT_SLOW_COMMAND_TIMEOUT,
+    DEFAULT_SLOW_INTERVAL,
     DEFAULT_STORAGE_INTERVAL,
+    METRIC_TIER_MEDIUM,
+    METRIC_TIER_SECTIONS,
+    METRIC_TIER_SLOW,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,6 +66,21 @@ COORDINATORS_KEY = "coordinators"
 COORDINATOR_LOCK_KEY = "coordinators_lock"
 CUSTOM_COORDINATORS_KEY = "custom_sensor_coordinators"
 CUSTOM_COORDINATOR_LOCK_KEY = "custom_sensor_coordinators_lock"
+SESSION_LIMITER_KEY = "session_limiter"
+# Seconds to collect Docker events before a targeted container refresh, so the
+# die, stop and start events of one restart share a single round trip.
+DOCKER_EVENT_REFRESH_DELAY = 1.0
+_MISSING = object()
+
+
+def changed_keys(old: dict[str, Any], new: dict[str, Any]) -> set[str]:
+    """Return the keys whose values differ between *old* and *new*."""
+
+    return {
+        key
+        for key in old.keys() | new.keys()
+        if old.get(key, _MISSING) != new.get(key, _MISSING)
+    }
 
 
 class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
@@ -55,6 +97,13 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         docker_interval: int,
         storage_interval: int,
         slow_command_timeout: int,
+        collection_mode: str = DEFAULT_COLLECTION_MODE,
+        session_limiter: SSHSessionLimiter | None = None,
+        medium_interval: int = DEFAULT_MEDIUM_INTERVAL,
+        slow_interval: int = DEFAULT_SLOW_INTERVAL,
+        adaptive_interval: bool = False,
+        docker_events: bool = False,
+        docker_disk_interval: int = DEFAULT_DOCKER_DISK_INTERVAL,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
@@ -70,35 +119,75 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.package_interval = package_interval
         self.docker_interval = docker_interval
         self.storage_interval = storage_interval
+        self.docker_disk_interval = docker_disk_interval
         self.slow_command_timeout = slow_command_timeout
+        self.collection_mode = collection_mode
         self.consecutive_failures = 0
         self.current_interval = interval
+        self.interval_reason = INTERVAL_REASON_CONFIGURED
+        self._adaptive_interval = AdaptivePollInterval(interval) if adaptive_interval else None
+        self.health_thresholds = server.get("health_thresholds") or {}
+        self._health: HealthResult | None = None
+        self._notified_data: dict[str, Any] | None = None
+        self._notified_success = True
+        self.notifications_sent = 0
+        self.notifications_skipped = 0
         self._last_package_attempt = 0.0
         self._last_docker_attempt = 0.0
+        self._last_docker_disk_attempt = 0.0
         self._last_storage_attempt = 0.0
+        self.tier_intervals = {
+            METRIC_TIER_MEDIUM: medium_interval,
+            METRIC_TIER_SLOW: slow_interval,
+        }
+        self._last_tier_poll = dict.fromkeys(self.tier_intervals, 0.0)
         self._slow_refresh_task: asyncio.Task[None] | None = None
         self._docker_state_revision = 0
+        self._stream: CollectorStream | None = None
+        self._stream_task: asyncio.Task[None] | None = None
+        self.docker_events = docker_events
+        self._docker_events_task: asyncio.Task[None] | None = None
+        self._docker_events_since: int | None = None
+        self._pending_container_refresh: set[str] = set()
+        self._container_refresh_task: asyncio.Task[None] | None = None
+        self.session_limiter = session_limiter or SSHSessionLimiter(
+            DEFAULT_MAX_SSH_SESSIONS, parent=fleet_session_limiter
+        )
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from the server."""
+        if self._stream is not None:
+            # The resident collector publishes the sample; just ask for it now.
+            try:
+                await self._stream.async_request_sample()
+            except Exception as err:
+                _LOGGER.debug(
+                    "Sample request on the %s stream failed: %s",
+                    self.server["host"],
+                    err,
+                )
+            else:
+                return self.data if isinstance(self.data, dict) else {}
+        started = time.monotonic()
+        due_tiers = self._due_metric_tiers(started)
         try:
-            base_data = await async_sample(
-                self.server["host"],
-                self.server["username"],
-                self.server.get("password"),
-                self.server.get("key"),
-                self.server.get("port", 22),
-                self.server.get("target_os", "auto"),
-                self.connect_timeout,
-                self.command_timeout,
-                self.server.get("monitored_ports"),
-                self.server.get("host_key_fingerprints"),
-            )
+            async with self.session_limiter.slot(PRIORITY_BASE) as wait_seconds:
+                base_data = await async_sample(
+                    self.server["host"],
+                    self.server["username"],
+                    self.server.get("password"),
+                    self.server.get("key"),
+                    self.server.get("port", 22),
+                    self.server.get("target_os", "auto"),
+                    self.connect_timeout,
+                    self.command_timeout,
+                    self.server.get("monitored_ports"),
+                    self.server.get("host_key_fingerprints"),
+                    skip_sections=self._skipped_sections(due_tiers),
+                )
+                base_data["ssh_queue_wait_ms"] = round(wait_seconds * 1000, 2)
+                base_data["ssh_queue_depth"] = self.session_limiter.queue_depth
             data = self._merge_base_data(base_data)
-            if not data.get("collection_error"):
-                self._schedule_slow_data(data)
-            if not data:
-                data = {"collection_error": f"No data returned from host: {self.server['host']}"}
         except socket.gaierror as err:
             self._record_failure()
             raise UpdateFailed(f"Unable to resolve host: {self.server['host']}") from err
@@ -109,6 +198,187 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             self._record_failure()
             message = str(err) or err.__class__.__name__
             raise UpdateFailed(f"Unable to update host {self.server['host']}: {message}") from err
+        data = self._apply_base_sample(data)
+        if data.get("last_collection_failed"):
+            return data
+        for tier in due_tiers:
+            self._last_tier_poll[tier] = started
+        self._start_stream(data)
+        self._start_docker_events(data)
+        return data
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only entities whose coordinator keys changed.
+
+        Entities pass the keys they read as their listener context; entities
+        without such a context are always notified, and so is every entity
+        when availability changes. This covers base polls, streamed samples
+        and slow collector merges alike.
+        """
+
+        data = self.data if isinstance(self.data, dict) else {}
+        self._health = None
+        # This relies on the private DataUpdateCoordinator._listeners dict, whose
+        # values are (update_callback, context) tuples. If Home Assistant changes
+        # that layout, notify every listener the way the base class does.
+        listeners = getattr(self, "_listeners", None)
+        if not isinstance(listeners, dict) or not all(
+            isinstance(listener, tuple) and len(listener) == 2
+            for listener in listeners.values()
+        ):
+            super().async_update_listeners()
+            return
+        previous = self._notified_data
+        self._notified_data = data
+        notify_all = previous is None or self._notified_success != self.last_update_success
+        self._notified_success = self.last_update_success
+        changed = set() if notify_all else changed_keys(previous, data)
+        for update_callback, context in list(self._listeners.values()):
+            if not notify_all and isinstance(context, frozenset) and changed.isdisjoint(context):
+                self.notifications_skipped += 1
+                continue
+            self.notifications_sent += 1
+            update_callback()
+
+    @property
+    def health(self) -> HealthResult:
+        """Return the aggregated health of the current data revision.
+
+        The result is evaluated on first access after each listener update and
+        shared by the health sensors until the next one.
+        """
+
+        if self._health is None:
+            self._health = evaluate_health(
+                self.data if isinstance(self.data, dict) else {},
+                self.last_update_success,
+                self.health_thresholds,
+            )
+        return self._health
+
+    def _start_stream(self, data: dict[str, Any]) -> None:
+        """Switch to the streaming collector after a successful poll."""
+
+        if self.collection_mode != COLLECTION_MODE_STREAM or data.get("os") == "Windows":
+            return
+        if self._stream_task is not None and not self._stream_task.done():
+            return
+        self.update_interval = None
+        self._stream_task = self.hass.async_create_background_task(
+            self._async_run_stream(),
+            f"{self.name} collector stream",
+        )
+
+    async def _async_run_stream(self) -> None:
+        """Consume streamed base samples and restart the channel with backoff."""
+
+        while True:
+            stream = CollectorStream(
+                self.server["host"],
+                self.server["username"],
+                self.server.get("password"),
+                self.server.get("key"),
+                self.server.get("port", 22),
+                self.connect_timeout,
+                self.command_timeout,
+                self.base_interval,
+                self.server.get("monitored_ports"),
+                self.server.get("host_key_fingerprints"),
+            )
+            try:
+                async for base_data in stream.async_samples():
+                    self._stream = stream
+                    data = self._apply_base_sample(self._merge_base_data(base_data))
+                    self.async_set_updated_data(data)
+                    if not data.get("last_collection_failed"):
+                        self._start_docker_events(data)
+            except Exception as err:
+                _LOGGER.debug(
+                    "Collector stream for %s ended: %s",
+                    self.server["host"],
+                    err,
+                )
+            finally:
+                self._stream = None
+            self._record_failure()
+            await asyncio.sleep(self.current_interval)
+            # Poll once so availability and errors follow the regular path.
+            await self.async_refresh()
+
+    async def async_stop_stream(self) -> None:
+        """Stop the streaming collector and Docker event channels, e.g. on unload."""
+
+        tasks = [self._stream_task, self._docker_events_task, self._container_refresh_task]
+        self._stream_task = None
+        self._docker_events_task = None
+        self._container_refresh_task = None
+        for task in tasks:
+            if task is None or task.done():
+                continue
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def _start_docker_events(self, data: dict[str, Any]) -> None:
+        """Open the Docker event channel once Docker was found on the host."""
+
+        if not self.docker_events or data.get("docker") != 1 or data.get("os") == "Windows":
+            return
+        if self._docker_events_task is not None and not self._docker_events_task.done():
+            return
+        self._docker_events_task = self.hass.async_create_background_task(
+            self._async_run_docker_events(),
+            f"{self.name} docker events",
+        )
+
+    async def _async_run_docker_events(self) -> None:
+        """Apply streamed Docker events and restart the channel with backoff.
+
+        A restarted channel resumes at the host time of the last event or
+        heartbeat, so Docker replays the events it missed in between.
+        """
+
+        failures = 0
+        while True:
+            since = self._docker_events_since
+            stream = DockerEventStream(
+                self.server["host"],
+                self.server["username"],
+                self.server.get("password"),
+                self.server.get("key"),
+                self.server.get("port", 22),
+                self.connect_timeout,
+                self.command_timeout,
+                since,
+                self.server.get("host_key_fingerprints"),
+            )
+            try:
+                async for event in stream.async_events():
+                    self.apply_docker_event(event)
+            except Exception as err:
+                _LOGGER.debug(
+                    "Docker event stream for %s ended: %s",
+                    self.server["host"],
+                    err,
+                )
+            finally:
+                self._docker_events_since = stream.since
+            failures = 1 if stream.since != since else failures + 1
+            await asyncio.sleep(
+                min(self.base_interval * 2 ** (failures - 1), DEFAULT_BACKOFF_MAX_INTERVAL)
+            )
+
+    def _apply_base_sample(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Record the outcome of a merged base sample and return the data to publish.
+
+        Polls and streamed samples both pass through here: a failed collection
+        keeps the previous snapshot and counts towards backoff, a successful one
+        resets it, feeds the adaptive interval and schedules the slow collectors.
+        """
+
+        if not data:
+            data = {"collection_error": f"No data returned from host: {self.server['host']}"}
         if data.get("collection_error"):
             self._record_failure()
             if isinstance(self.data, dict) and self.data:
@@ -120,16 +390,26 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                         preserved[key] = value
                 preserved["collection_error"] = data["collection_error"]
                 preserved["last_collection_failed"] = True
+                self._publish_poll_interval(preserved)
                 return preserved
             data["last_collection_failed"] = True
+            self._publish_poll_interval(data)
             return data
+        self._schedule_slow_data(data)
         if data.get("mac_addresses"):
             self.server["mac_addresses"] = data["mac_addresses"]
+        if self._adaptive_interval is not None:
+            self._adaptive_interval.update(data)
         self._record_success()
+        self._publish_poll_interval(data)
         return data
 
     def _merge_base_data(self, base_data: dict[str, Any]) -> dict[str, Any]:
-        """Merge fast collector data over the previous full snapshot."""
+        """Merge fast collector data over the previous full snapshot.
+
+        Fields of sections skipped because their tier was not due keep their
+        previous values.
+        """
 
         if not isinstance(self.data, dict) or not self.data:
             return dict(base_data or {})
@@ -142,6 +422,32 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         return interval > 0 and (last_attempt <= 0 or now - last_attempt >= interval)
 
+    def _due_metric_tiers(self, now: float) -> list[str]:
+        """Return the medium and slow metric tiers that are due on this poll.
+
+        A tier that becomes due less than half a poll interval from now runs
+        early, so jitter cannot push it back by a whole poll interval.
+        """
+
+        slack = self.current_interval / 2
+        return [
+            tier
+            for tier, interval in self.tier_intervals.items()
+            if self._last_tier_poll[tier] <= 0
+            or now - self._last_tier_poll[tier] >= interval - slack
+        ]
+
+    @staticmethod
+    def _skipped_sections(due_tiers: list[str]) -> list[str]:
+        """Return the base collector sections of tiers that are not due."""
+
+        return [
+            section
+            for tier, sections in METRIC_TIER_SECTIONS.items()
+            if tier not in due_tiers
+            for section in sections
+        ]
+
     def _clear_docker_data(self, data: dict[str, Any]) -> None:
         """Remove stale Docker-owned fields before applying a fresh Docker sample."""
 
@@ -155,10 +461,6 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "docker_restart_count_total",
             "docker_collection_error",
             "docker_collection_time_ms",
-            "docker_images_size_bytes",
-            "docker_containers_size_bytes",
-            "docker_volumes_size_bytes",
-            "docker_build_cache_size_bytes",
         }
         for key in list(data):
             if key in docker_keys or key.startswith("container_"):
@@ -176,6 +478,7 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             "storage_stats_partial",
             "storage_devices_seen",
             "storage_devices_collected",
+            "storage_devices_standby",
             "storage_device_errors",
             "raid_detail_arrays",
             "storage_collection_error",
@@ -184,10 +487,12 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             data.pop(key, None)
 
     def force_slow_refresh(self) -> None:
-        """Make the next refresh run all slow collectors."""
+        """Make the next refresh run all slow collectors and metric tiers."""
 
+        self._last_tier_poll = dict.fromkeys(self._last_tier_poll, 0.0)
         self._last_package_attempt = 0.0
         self._last_docker_attempt = 0.0
+        self._last_docker_disk_attempt = 0.0
         self._last_storage_attempt = 0.0
 
     async def async_wait_for_slow_refresh(self) -> None:
@@ -231,6 +536,131 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         }
         self.async_set_updated_data(updated_data)
 
+    def apply_docker_event(self, event: dict[str, Any]) -> None:
+        """Publish a container state change reported by the Docker event stream.
+
+        Start, die, pause, health and destroy events patch the container right
+        away. Every event also queues a targeted refresh of the container,
+        which replaces the patched fields with collected values.
+        """
+
+        container_id = str(event.get("id") or "")
+        if not container_id:
+            return
+        self._queue_container_refresh(container_id)
+        if not isinstance(self.data, dict):
+            return
+        container_stats = self.data.get("container_stats")
+        container = next(
+            (
+                item
+                for item in (container_stats if isinstance(container_stats, list) else [])
+                if isinstance(item, dict)
+                and item.get("id")
+                and container_id.startswith(str(item["id"]))
+            ),
+            None,
+        )
+        if container is None:
+            return
+
+        action = event.get("action")
+        patched: dict[str, Any] | None = dict(container)
+        status = str(container.get("status") or "")
+        health_state = str(container.get("health_state") or "")
+        has_healthcheck = health_state in ("starting", "healthy", "unhealthy")
+        if action in ("start", "restart"):
+            patched["running"] = True
+            patched["status"] = "Up Less than a second"
+            patched["health_state"] = "starting" if has_healthcheck else "running"
+        elif action == "die":
+            exit_code = event.get("exit_code")
+            patched["running"] = False
+            patched["status"] = (
+                f"Exited ({exit_code}) Less than a second ago"
+                if exit_code is not None
+                else "Exited"
+            )
+            if not has_healthcheck:
+                patched["health_state"] = "exited"
+        elif action == "pause" and not status.endswith("(Paused)"):
+            patched["status"] = f"{status} (Paused)"
+        elif action == "unpause":
+            patched["status"] = status.removesuffix(" (Paused)")
+        elif action == "health_status" and event.get("health_state"):
+            patched["health_state"] = event["health_state"]
+        elif action == "destroy":
+            patched = None
+        else:
+            return
+        if patched == container:
+            return
+        self.async_set_updated_data(
+            merge_docker_containers(
+                self.data, [patched] if patched else [], [str(container["id"])]
+            )
+        )
+
+    def _queue_container_refresh(self, container_id: str) -> None:
+        """Schedule a targeted Docker refresh that includes *container_id*."""
+
+        self._pending_container_refresh.add(container_id)
+        task = self._container_refresh_task
+        if task is None or task.done():
+            self._container_refresh_task = self.hass.async_create_background_task(
+                self._async_refresh_containers(),
+                f"{self.name} container refresh",
+            )
+
+    async def _async_refresh_containers(self) -> None:
+        """Collect the containers of queued Docker events and merge them."""
+
+        await asyncio.sleep(DOCKER_EVENT_REFRESH_DELAY)
+        while self._pending_container_refresh:
+            # A full Docker sample started earlier must not overwrite this one.
+            await self.async_wait_for_slow_refresh()
+            container_ids = sorted(self._pending_container_refresh)
+            self._pending_container_refresh.clear()
+            try:
+                async with self.session_limiter.slot(PRIORITY_SLOW):
+                    docker_revision = self._docker_state_revision
+                    result = await async_sample_docker(
+                        self.server["host"],
+                        self.server["username"],
+                        self.server.get("password"),
+                        self.server.get("key"),
+                        self.server.get("port", 22),
+                        self.server.get("target_os", "auto"),
+                        self.connect_timeout,
+                        self.slow_command_timeout,
+                        self.server.get("host_key_fingerprints"),
+                        containers=container_ids,
+                    )
+            except Exception as err:
+                _LOGGER.debug(
+                    "Container refresh failed for %s: %s",
+                    self.server["host"],
+                    err,
+                )
+                continue
+            if docker_revision != self._docker_state_revision:
+                _LOGGER.debug(
+                    "Discarding stale container refresh for %s after a container action",
+                    self.server["host"],
+                )
+                continue
+            containers = result.get("container_stats")
+            if result.get("docker_collection_error") or not isinstance(containers, list):
+                _LOGGER.debug(
+                    "Discarding container refresh for %s: %s",
+                    self.server["host"],
+                    result.get("docker_collection_error"),
+                )
+                continue
+            self.async_set_updated_data(
+                merge_docker_containers(self.data or {}, containers, container_ids)
+            )
+
     @staticmethod
     def _sanitize_container_name(name: str) -> str:
         """Return the lookup key used for a container name."""
@@ -250,7 +680,7 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         await self._slow_refresh_task
 
     def _schedule_slow_data(self, data: dict[str, Any]) -> None:
-        """Schedule due package and Docker collectors without blocking base polling."""
+        """Schedule due slow collectors without blocking base polling."""
 
         if data.get("os") == "Windows":
             return
@@ -262,6 +692,13 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         if self._slow_data_due(self._last_docker_attempt, self.docker_interval, now):
             self._last_docker_attempt = now
             due_collectors.append("docker")
+        # Disk usage accounting is much slower than container state, so it has
+        # its own interval and is skipped on hosts known to run no Docker.
+        if data.get("docker") != 0 and self._slow_data_due(
+            self._last_docker_disk_attempt, self.docker_disk_interval, now
+        ):
+            self._last_docker_disk_attempt = now
+            due_collectors.append("docker_disk")
         if self._slow_data_due(self._last_package_attempt, self.package_interval, now):
             self._last_package_attempt = now
             due_collectors.append("package")
@@ -279,49 +716,106 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Collect and publish slow metrics independently from the base poll."""
 
         try:
-            for collector in due_collectors:
-                docker_revision = (
-                    self._docker_state_revision if collector == "docker" else None
-                )
+            # Several due collectors share one SSH round trip; their sections
+            # are merged below exactly like individual results.
+            combined: dict[str, dict[str, Any]] | None = None
+            combined_docker_revision = self._docker_state_revision
+            if len(due_collectors) > 1:
                 try:
-                    if collector == "package":
-                        result = await async_sample_packages(
-                            self.server["host"],
-                            self.server["username"],
-                            self.server.get("password"),
-                            self.server.get("key"),
-                            self.server.get("port", 22),
-                            self.server.get("target_os", "auto"),
-                            self.connect_timeout,
-                            self.slow_command_timeout,
-                            self.server.get("host_key_fingerprints"),
-                        )
-                    elif collector == "docker":
-                        result = await async_sample_docker(
-                            self.server["host"],
-                            self.server["username"],
-                            self.server.get("password"),
-                            self.server.get("key"),
-                            self.server.get("port", 22),
-                            self.server.get("target_os", "auto"),
-                            self.connect_timeout,
-                            self.slow_command_timeout,
-                            self.server.get("host_key_fingerprints"),
-                        )
-                    elif collector == "storage":
-                        result = await async_sample_storage(
+                    async with self.session_limiter.slot(PRIORITY_SLOW):
+                        combined_docker_revision = self._docker_state_revision
+                        combined = await async_sample_slow(
                             self.server["host"],
                             self.server["username"],
                             self.server.get("password"),
                             self.server.get("key"),
                             self.server.get("port", 22),
+                            due_collectors,
                             self.server.get("target_os", "auto"),
                             self.connect_timeout,
                             self.slow_command_timeout,
                             self.server.get("host_key_fingerprints"),
                         )
+                except Exception as err:
+                    _LOGGER.debug(
+                        "Combined slow collectors failed for %s: %s",
+                        self.server["host"],
+                        err,
+                    )
+                    combined = {
+                        collector: {
+                            f"{collector}_collection_error": (
+                                str(err) or err.__class__.__name__
+                            )
+                        }
+                        for collector in due_collectors
+                    }
+            for collector in due_collectors:
+                docker_revision = (
+                    self._docker_state_revision if collector == "docker" else None
+                )
+                try:
+                    if combined is not None:
+                        result = combined[collector]
+                        if collector == "docker":
+                            docker_revision = combined_docker_revision
                     else:
-                        continue
+                        async with self.session_limiter.slot(PRIORITY_SLOW):
+                            docker_revision = (
+                                self._docker_state_revision
+                                if collector == "docker"
+                                else None
+                            )
+                            if collector == "package":
+                                result = await async_sample_packages(
+                                    self.server["host"],
+                                    self.server["username"],
+                                    self.server.get("password"),
+                                    self.server.get("key"),
+                                    self.server.get("port", 22),
+                                    self.server.get("target_os", "auto"),
+                                    self.connect_timeout,
+                                    self.slow_command_timeout,
+                                    self.server.get("host_key_fingerprints"),
+                                )
+                            elif collector == "docker":
+                                result = await async_sample_docker(
+                                    self.server["host"],
+                                    self.server["username"],
+                                    self.server.get("password"),
+                                    self.server.get("key"),
+                                    self.server.get("port", 22),
+                                    self.server.get("target_os", "auto"),
+                                    self.connect_timeout,
+                                    self.slow_command_timeout,
+                                    self.server.get("host_key_fingerprints"),
+                                )
+                            elif collector == "docker_disk":
+                                result = await async_sample_docker_disk(
+                                    self.server["host"],
+                                    self.server["username"],
+                                    self.server.get("password"),
+                                    self.server.get("key"),
+                                    self.server.get("port", 22),
+                                    self.server.get("target_os", "auto"),
+                                    self.connect_timeout,
+                                    self.slow_command_timeout,
+                                    self.server.get("host_key_fingerprints"),
+                                )
+                            elif collector == "storage":
+                                result = await async_sample_storage(
+                                    self.server["host"],
+                                    self.server["username"],
+                                    self.server.get("password"),
+                                    self.server.get("key"),
+                                    self.server.get("port", 22),
+                                    self.server.get("target_os", "auto"),
+                                    self.connect_timeout,
+                                    self.slow_command_timeout,
+                                    self.server.get("host_key_fingerprints"),
+                                )
+                            else:
+                                continue
                 except Exception as err:
                     _LOGGER.debug(
                         "%s collector failed for %s: %s",
@@ -349,6 +843,9 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 if collector == "docker" and "docker" in result:
                     self._clear_docker_data(merged)
                 if collector == "storage" and "storage_devices" in result:
+                    result = merge_standby_storage_devices(
+                        result, merged.get("storage_device_lookup")
+                    )
                     self._clear_storage_data(merged)
                 merged.update(result)
                 self.async_set_updated_data(merged)
@@ -359,6 +856,11 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Reset backoff after a successful update."""
 
         self.consecutive_failures = 0
+        if self._adaptive_interval is not None:
+            self.interval_reason = self._adaptive_interval.reason
+            self._set_poll_interval(self._adaptive_interval.interval)
+            return
+        self.interval_reason = INTERVAL_REASON_CONFIGURED
         self._set_poll_interval(self.base_interval)
 
     def _record_failure(self) -> None:
@@ -372,15 +874,23 @@ class VServerCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             self.base_interval * (2 ** exponent),
             DEFAULT_BACKOFF_MAX_INTERVAL,
         )
+        self.interval_reason = INTERVAL_REASON_BACKOFF
         self._set_poll_interval(interval)
 
+    def _publish_poll_interval(self, data: dict[str, Any]) -> None:
+        """Expose the effective poll interval and its reason in *data*."""
+
+        data["poll_interval"] = self.current_interval
+        data["poll_interval_reason"] = self.interval_reason
+
     def _set_poll_interval(self, interval: int) -> None:
         """Apply a runtime-only polling interval."""
 
         if self.current_interval == interval:
             return
         self.current_interval = interval
-        self.update_interval = timedelta(seconds=interval)
+        if self._stream_task is None:
+            self.update_interval = timedelta(seconds=interval)
 
 
 class CustomCommandCoordinator(DataUpdateCoordinator[dict[str, Any]]):
@@ -392,6 +902,7 @@ class CustomCommandCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         server: dict[str, Any],
         definition: dict[str, Any],
         connect_timeout: int,
+        session_limiter: SSHSessionLimiter | None = None,
     ) -> None:
         """Initialize a custom command coordinator."""
 
@@ -406,22 +917,26 @@ class CustomCommandCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self.definition = definition
         self.connect_timeout = connect_timeout
         self.command_timeout = max(1, min(3600, int(definition["timeout"])))
+        self.session_limiter = session_limiter or SSHSessionLimiter(
+            DEFAULT_MAX_SSH_SESSIONS, parent=fleet_session_limiter
+        )
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Execute the configured command and publish its output."""
 
         try:
-            output, timing = await async_run_custom_command(
-                self.server["host"],
-                self.server["username"],
-                self.server.get("password"),
-                self.server.get("key"),
-                self.server.get("port", 22),
-                self.definition["command"],
-                self.connect_timeout,
-                self.command_timeout,
-                self.server.get("host_key_fingerprints"),
-            )
+            async with self.session_limiter.slot(PRIORITY_SLOW):
+                output, timing = await async_run_custom_command(
+                    self.server["host"],
+                    self.server["username"],
+                    self.server.get("password"),
+                    self.server.get("key"),
+                    self.server.get("port", 22),
+                    self.definition["command"],
+                    self.connect_timeout,
+                    self.command_timeout,
+                    self.server.get("host_key_fingerprints"),
+                )
         except Exception as err:
             message = str(err) or err.__class__.__name__
             raise UpdateFailed(
@@ -435,21 +950,57 @@ class CustomCommandCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         }
 
 
+def _initial_refresh_delay(coordinator: DataUpdateCoordinator) -> float:
+    """Return the deterministic startup delay of *coordinator*.
+
+    The offset is capped at the default interval so hourly custom sensors
+    still report shortly after startup.
+    """
+
+    interval = coordinator.update_interval
+    seconds = interval.total_seconds() if interval else 0
+    return phase_offset(coordinator.name, min(seconds, DEFAULT_INTERVAL))
+
+
 def _schedule_initial_refresh(
     hass: HomeAssistant,
     entry: ConfigEntry,
     coordinators: list[DataUpdateCoordinator],
 ) -> None:
-    """Start remote polling only after Home Assistant finished startup."""
+    """Start remote polling only after Home Assistant finished startup.
+
+    Each coordinator waits for its phase offset first, so hosts keep polling
+    at spread out points of the interval instead of all at once.
+    """
+
+    async def _async_refresh_after(
+        coordinator: DataUpdateCoordinator, delay: float
+    ) -> None:
+        await asyncio.sleep(delay)
+        await coordinator.async_request_refresh()
 
     async def _async_refresh(_hass: HomeAssistant) -> None:
         await asyncio.gather(
-            *(coordinator.async_request_refresh() for coordinator in coordinators)
+            *(
+                _async_refresh_after(coordinator, _initial_refresh_delay(coordinator))
+                for coordinator in coordinators
+            )
         )
 
     entry.async_on_unload(async_at_started(hass, _async_refresh))
 
 
+def _entry_session_limiter(entry_data: dict[str, Any]) -> SSHSessionLimiter:
+    """Return the SSH session limiter shared by all coordinators of an entry."""
+
+    limit = entry_data.get("max_ssh_sessions") or DEFAULT_MAX_SSH_SESSIONS
+    limiter = entry_data.get(SESSION_LIMITER_KEY)
+    if limiter is None:
+        limiter = SSHSessionLimiter(limit, parent=fleet_session_limiter)
+        entry_data[SESSION_LIMITER_KEY] = limiter
+    return limiter
+
+
 async def async_get_or_create_coordinators(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -467,6 +1018,10 @@ async def async_get_or_create_coordinators(
             return coordinators
 
         interval = entry_data.get("interval") or DEFAULT_INTERVAL
+        medium_interval = entry_data.get("medium_interval") or DEFAULT_MEDIUM_INTERVAL
+        slow_interval = entry_data.get("slow_interval") or DEFAULT_SLOW_INTERVAL
+        adaptive_interval = bool(entry_data.get("adaptive_interval", False))
+        docker_events = bool(entry_data.get("docker_events", False))
         connect_timeout = entry_data.get("connect_timeout") or DEFAULT_CONNECT_TIMEOUT
         configured_command_timeout = entry_data.get("command_timeout") or DEFAULT_COMMAND_TIMEOUT
         command_timeout = max(configured_command_timeout, DEFAULT_COMMAND_TIMEOUT)
@@ -475,9 +1030,14 @@ async def async_get_or_create_coordinators(
         storage_interval = entry_data.get("storage_interval")
         if storage_interval is None:
             storage_interval = DEFAULT_STORAGE_INTERVAL
+        docker_disk_interval = entry_data.get("docker_disk_interval")
+        if docker_disk_interval is None:
+            docker_disk_interval = DEFAULT_DOCKER_DISK_INTERVAL
         slow_command_timeout = (
             entry_data.get("slow_command_timeout") or DEFAULT_SLOW_COMMAND_TIMEOUT
         )
+        collection_mode = entry_data.get("collection_mode") or DEFAULT_COLLECTION_MODE
+        session_limiter = _entry_session_limiter(entry_data)
         coordinators = []
         for server in entry_data.get("servers", []):
             if not server.get("name"):
@@ -493,8 +1053,16 @@ async def async_get_or_create_coordinators(
                     docker_interval,
                     storage_interval,
                     slow_command_timeout,
+                    collection_mode,
+                    session_limiter,
+                    medium_interval,
+                    slow_interval,
+                    adaptive_interval,
+                    docker_events,
+                    docker_disk_interval,
                 )
             )
+            entry.async_on_unload(coordinators[-1].async_stop_stream)
 
         entry_data[COORDINATORS_KEY] = coordinators
         _schedule_initial_refresh(hass, entry, coordinators)
@@ -524,6 +1092,7 @@ async def async_get_or_create_custom_sensor_coordinators(
             if server.get("host") and server.get("name")
         }
         connect_timeout = entry_data.get("connect_timeout") or DEFAULT_CONNECT_TIMEOUT
+        session_limiter = _entry_session_limiter(entry_data)
         coordinators = []
         for definition in entry_data.get("custom_sensors", []):
             if not isinstance(definition, dict):
@@ -536,7 +1105,9 @@ async def async_get_or_create_custom_sensor_coordinators(
                 continue
             try:
                 coordinators.append(
-                    CustomCommandCoordinator(hass, server, definition, connect_timeout)
+                    CustomCommandCoordinator(
+                        hass, server, definition, connect_timeout, session_limiter
+                    )
                 )
             except (KeyError, TypeError, ValueError):
                 _LOGGER.warning(
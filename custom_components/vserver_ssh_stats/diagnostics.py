@@ -9,6 +9,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from . import DOMAIN
+from .coordinator import COORDINATORS_KEY
+from .ssh_executor import ssh_executor
 
 TO_REDACT = {"host", "username", "password", "key"}
 
@@ -28,6 +30,7 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for a config entry."""
 
     servers = _load_servers(config_entry)
+    entry_data = hass.data.get(DOMAIN, {}).get(config_entry.entry_id, {})
     redacted_servers = [async_redact_data(server, TO_REDACT) for server in servers]
     try:
         custom_sensors = json.loads(config_entry.data.get("custom_sensors_json", "[]"))
@@ -39,16 +42,37 @@ async def async_get_config_entry_diagnostics(
             "entry_id": config_entry.entry_id,
             "unique_id": config_entry.unique_id,
             "interval": config_entry.data.get("interval"),
+            "medium_interval": config_entry.data.get("medium_interval"),
+            "slow_interval": config_entry.data.get("slow_interval"),
+            "adaptive_interval": config_entry.data.get("adaptive_interval"),
+            "docker_events": config_entry.data.get("docker_events"),
             "connect_timeout": config_entry.data.get("connect_timeout"),
             "command_timeout": config_entry.data.get("command_timeout"),
             "package_interval": config_entry.data.get("package_interval"),
             "docker_interval": config_entry.data.get("docker_interval"),
+            "docker_disk_interval": config_entry.data.get("docker_disk_interval"),
             "storage_interval": config_entry.data.get("storage_interval"),
             "slow_command_timeout": config_entry.data.get("slow_command_timeout"),
+            "collection_mode": config_entry.data.get("collection_mode"),
+            "max_ssh_sessions": config_entry.data.get("max_ssh_sessions"),
+            "ssh_transport": config_entry.data.get("ssh_transport"),
+            "ssh_compression": config_entry.data.get("ssh_compression"),
+            "compress_collector_output": config_entry.data.get("compress_collector_output"),
+            "collector_profiling": config_entry.data.get("collector_profiling"),
+            "remote_result_cache": config_entry.data.get("remote_result_cache"),
+            "remote_result_cache_ttls": config_entry.data.get("remote_result_cache_ttls"),
             "command_allowlist_configured": bool(config_entry.data.get("command_allowlist")),
             "custom_sensor_count": len(custom_sensors) if isinstance(custom_sensors, list) else 0,
         },
         "servers": redacted_servers,
+        "ssh_executor": ssh_executor.stats(),
+        "entity_notifications": {
+            coordinator.name: {
+                "sent": coordinator.notifications_sent,
+                "skipped": coordinator.notifications_skipped,
+            }
+            for coordinator in entry_data.get(COORDINATORS_KEY) or []
+        },
         "options": config_entry.options,
         "domain": DOMAIN,
     }
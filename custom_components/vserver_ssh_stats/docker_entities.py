@@ -4,6 +4,10 @@ from __future__ import annotations
 import re
 from typing import Any, Iterable
 
+# Coordinator keys read by container entities. They are passed as listener
+# context so these entities only update when Docker data changes.
+CONTAINER_DATA_KEYS = frozenset({"container_lookup", "container_stats"})
+
 
 def sanitize_container_name(name: str) -> str:
     """Return a stable entity-safe representation of a container name."""
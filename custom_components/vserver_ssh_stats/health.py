@@ -0,0 +1,295 @@
+"""Aggregated server health evaluated once per coordinator data revision."""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+HEALTH_LEVEL_OK = "ok"
+HEALTH_LEVEL_WARNING = "warning"
+HEALTH_LEVEL_CRITICAL = "critical"
+HEALTH_LEVEL_OFFLINE = "offline"
+
+# Default (high, critical) levels of the configurable health checks. Usage
+# values are percent, ``load`` is the 5-minute load per core and ``mount``
+# applies to every mounted filesystem except the root filesystem.
+HEALTH_THRESHOLDS: dict[str, tuple[float, float]] = {
+    "cpu": (85.0, 95.0),
+    "mem": (85.0, 95.0),
+    "swap": (40.0, 80.0),
+    "disk": (85.0, 95.0),
+    "mount": (85.0, 95.0),
+    "load": (1.0, 2.0),
+    "conntrack": (80.0, 95.0),
+}
+
+THRESHOLD_SPLIT_PATTERN = re.compile(r"[,;\s]+")
+
+
+def parse_health_thresholds(value: object) -> dict[str, tuple[float, float]]:
+    """Return per-server threshold overrides from user input.
+
+    Text input holds ``metric=high:critical`` entries separated by commas or
+    line breaks, for example ``cpu=90:98``. Stored mappings of metric to a
+    two-item sequence are accepted as well. Unknown metrics, non-numeric
+    values and critical levels below the high level raise ``ValueError``.
+    """
+
+    if value in (None, ""):
+        return {}
+    if isinstance(value, str):
+        entries: list[tuple[str, object]] = []
+        for part in THRESHOLD_SPLIT_PATTERN.split(value):
+            if not part:
+                continue
+            metric, separator, levels = part.partition("=")
+            if not separator:
+                raise ValueError("Invalid health threshold")
+            entries.append((metric, levels.split(":")))
+    elif isinstance(value, Mapping):
+        entries = list(value.items())
+    else:
+        raise ValueError("Invalid health threshold")
+
+    thresholds: dict[str, tuple[float, float]] = {}
+    for metric, levels in entries:
+        metric = str(metric).strip().lower()
+        if metric not in HEALTH_THRESHOLDS or not isinstance(levels, (list, tuple)):
+            raise ValueError("Invalid health threshold")
+        if len(levels) != 2 or any(isinstance(level, bool) for level in levels):
+            raise ValueError("Invalid health threshold")
+        try:
+            high, critical = (float(str(level).strip()) for level in levels)
+        except ValueError as err:
+            raise ValueError("Invalid health threshold") from err
+        if high < 0 or critical < high:
+            raise ValueError("Invalid health threshold")
+        thresholds[metric] = (high, critical)
+    return thresholds
+
+
+def format_health_thresholds(thresholds: Mapping[str, tuple[float, float]]) -> str:
+    """Return threshold overrides formatted for text input."""
+
+    return "\n".join(
+        f"{metric}={high:g}:{critical:g}" for metric, (high, critical) in thresholds.items()
+    )
+
+
+def health_level(score: int) -> str:
+    """Return a health state for a numeric score."""
+
+    if score <= 70:
+        return HEALTH_LEVEL_CRITICAL
+    if score <= 90:
+        return HEALTH_LEVEL_WARNING
+    return HEALTH_LEVEL_OK
+
+
+def _as_float(value: Any) -> float | None:
+    """Return *value* as float or None."""
+
+    try:
+        if value is None:
+            return None
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class HealthResult:
+    """Score, level and the reasons and metric values that lowered the score."""
+
+    score: int
+    level: str
+    reasons: tuple[str, ...] = ()
+    metrics: dict[str, Any] = field(default_factory=dict)
+
+
+def evaluate_health(
+    data: Mapping[str, Any],
+    online: bool,
+    thresholds: Mapping[str, tuple[float, float]] | None = None,
+) -> HealthResult:
+    """Build an aggregated health state from collected server metrics.
+
+    *thresholds* override entries of :data:`HEALTH_THRESHOLDS`.
+    """
+
+    if not online:
+        return HealthResult(0, HEALTH_LEVEL_OFFLINE, ("Host is currently unreachable",))
+
+    levels = {**HEALTH_THRESHOLDS, **(thresholds or {})}
+    score = 100
+    reasons: list[str] = []
+    metrics: dict[str, Any] = {}
+
+    def add_reason(message: str, penalty: int, metric: str, value: Any) -> None:
+        nonlocal score
+        reasons.append(message)
+        metrics[metric] = value
+        score = max(0, score - penalty)
+
+    def check_usage(
+        key: str, threshold: str, label: str, penalties: tuple[int, int], high_word: str = "high"
+    ) -> None:
+        value = _as_float(data.get(key))
+        if value is None:
+            return
+        high, critical = levels[threshold]
+        if value >= critical:
+            add_reason(f"{label} is critical at {value:.0f}%", penalties[1], key, value)
+        elif value >= high:
+            add_reason(f"{label} is {high_word} at {value:.0f}%", penalties[0], key, value)
+
+    check_usage("cpu", "cpu", "CPU usage", (15, 30))
+    check_usage("mem", "mem", "Memory usage", (15, 30))
+    check_usage("swap_usage", "swap", "Swap usage", (10, 25), "elevated")
+    check_usage("disk", "disk", "Root disk usage", (15, 30))
+
+    mount_high, mount_critical = levels["mount"]
+    for disk_stat in data.get("disk_stats", []):
+        if not isinstance(disk_stat, dict):
+            continue
+        if disk_stat.get("mount") == "/":
+            continue
+        total = _as_float(disk_stat.get("total"))
+        free = _as_float(disk_stat.get("free"))
+        if not total or free is None:
+            continue
+        used_percent = 100 - (free / total * 100)
+        label = disk_stat.get("label") or disk_stat.get("mount") or disk_stat.get("name")
+        metric = f"disk_stats:{label}"
+        if used_percent >= mount_critical:
+            add_reason(f"Disk {label} is critical at {used_percent:.0f}%", 25, metric, used_percent)
+        elif used_percent >= mount_high:
+            add_reason(f"Disk {label} is high at {used_percent:.0f}%", 10, metric, used_percent)
+
+    cores = _as_float(data.get("cores"))
+    load_5 = _as_float(data.get("load_5"))
+    if cores and load_5 is not None:
+        load_ratio = load_5 / cores
+        load_high, load_critical = levels["load"]
+        message = f"5-minute load is %s at {load_5:.2f} on {cores:.0f} cores"
+        if load_ratio >= load_critical:
+            add_reason(message % "critical", 25, "load_5", load_5)
+        elif load_ratio >= load_high:
+            add_reason(message % "high", 10, "load_5", load_5)
+
+    pkg_count = _as_float(data.get("pkg_count"))
+    if pkg_count is not None:
+        if pkg_count >= 50:
+            add_reason(f"{pkg_count:.0f} package updates are pending", 10, "pkg_count", pkg_count)
+        elif pkg_count >= 10:
+            add_reason(f"{pkg_count:.0f} package updates are pending", 5, "pkg_count", pkg_count)
+
+    ssh_connect_time = _as_float(data.get("ssh_connect_time_ms"))
+    if ssh_connect_time is not None and ssh_connect_time >= 3000:
+        add_reason(
+            f"SSH connect time is high at {ssh_connect_time:.0f} ms",
+            10,
+            "ssh_connect_time_ms",
+            ssh_connect_time,
+        )
+
+    collection_time = _as_float(data.get("collection_time_ms"))
+    if collection_time is not None and collection_time >= 10000:
+        add_reason(
+            f"Collection time is high at {collection_time:.0f} ms",
+            10,
+            "collection_time_ms",
+            collection_time,
+        )
+
+    if data.get("reboot_required"):
+        add_reason("Reboot is required", 10, "reboot_required", True)
+
+    if data.get("root_fs_readonly"):
+        add_reason("Root filesystem is mounted read-only", 40, "root_fs_readonly", True)
+
+    security_updates = _as_float(data.get("security_updates"))
+    if security_updates is not None:
+        message = f"{security_updates:.0f} security updates are pending"
+        if security_updates >= 10:
+            add_reason(message, 15, "security_updates", security_updates)
+        elif security_updates >= 1:
+            add_reason(message, 8, "security_updates", security_updates)
+
+    failed_units = _as_float(data.get("failed_systemd_units"))
+    if failed_units is not None and failed_units > 0:
+        penalty = min(30, 10 + int(failed_units) * 5)
+        add_reason(
+            f"{failed_units:.0f} systemd units failed",
+            penalty,
+            "failed_systemd_units",
+            failed_units,
+        )
+
+    journal_errors = _as_float(data.get("journal_errors"))
+    if journal_errors is not None:
+        message = f"{journal_errors:.0f} journal errors in the last 15 minutes"
+        if journal_errors >= 20:
+            add_reason(message, 15, "journal_errors", journal_errors)
+        elif journal_errors >= 1:
+            add_reason(message, 5, "journal_errors", journal_errors)
+
+    failed_ssh_logins = _as_float(data.get("failed_ssh_logins_15m"))
+    if failed_ssh_logins is not None:
+        message = f"{failed_ssh_logins:.0f} failed SSH login attempts in the last 15 minutes"
+        if failed_ssh_logins >= 100:
+            add_reason(message, 15, "failed_ssh_logins_15m", failed_ssh_logins)
+        elif failed_ssh_logins >= 20:
+            add_reason(message, 5, "failed_ssh_logins_15m", failed_ssh_logins)
+
+    unhealthy_containers: list[str] = []
+    for container in data.get("container_stats", []):
+        if not isinstance(container, dict):
+            continue
+        health = str(container.get("health_state") or "").lower()
+        status = str(container.get("status") or "").lower()
+        name = str(container.get("name") or "").strip() or "unknown"
+        memory_limit_usage = _as_float(container.get("memory_limit_usage"))
+        exited_with_error = status.startswith("exited") and not status.startswith(
+            "exited (0)"
+        )
+        if health in {"unhealthy", "dead"} or exited_with_error:
+            unhealthy_containers.append(name)
+        metric = f"container_stats:{name}:memory_limit_usage"
+        if memory_limit_usage is not None and memory_limit_usage >= 100:
+            add_reason(
+                f"Container {name} reached its memory limit", 20, metric, memory_limit_usage
+            )
+        elif memory_limit_usage is not None and memory_limit_usage >= 90:
+            add_reason(
+                f"Container {name} is near its memory limit", 10, metric, memory_limit_usage
+            )
+    for name in unhealthy_containers[:5]:
+        add_reason(f"Container {name} is not healthy", 15, f"container_stats:{name}", False)
+
+    zombies = _as_float(data.get("process_zombies"))
+    if zombies is not None and zombies > 0:
+        add_reason(
+            f"{zombies:.0f} zombie processes detected",
+            min(15, 5 + int(zombies)),
+            "process_zombies",
+            zombies,
+        )
+
+    if data.get("software_raid_degraded"):
+        add_reason("Software RAID is degraded", 35, "software_raid_degraded", True)
+    if data.get("smart_failure_detected"):
+        add_reason(
+            "A storage device reports SMART failure", 40, "smart_failure_detected", True
+        )
+    elif data.get("storage_collection_error"):
+        add_reason(
+            "Storage health data is incomplete",
+            10,
+            "storage_collection_error",
+            data["storage_collection_error"],
+        )
+
+    check_usage("conntrack_usage", "conntrack", "Conntrack usage", (10, 25))
+
+    return HealthResult(score, health_level(score), tuple(reasons), metrics)
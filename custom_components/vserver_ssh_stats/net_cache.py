@@ -1,8 +1,9 @@
 """Cache network statistics for rate computation."""
 from __future__ import annotations
 
+import math
 from collections import deque
-from typing import Deque, Dict, Optional, Tuple
+from typing import Deque, Dict, Iterable, Optional, Sequence, Tuple
 
 
 class NetStatsCache:
@@ -71,6 +72,139 @@ class EnergyStatsCache:
         return total
 
 
+class CpuStatsCache:
+    """Cache /proc/stat jiffies to derive CPU utilisation between samples."""
+
+    def __init__(self) -> None:
+        self._last_jiffies: Dict[str, Tuple[int, ...]] = {}
+        self._last_uptime: Dict[str, int] = {}
+
+    def last_uptime(self, key: str) -> Optional[int]:
+        """Return the uptime of the cached sample for *key*, if any."""
+
+        return self._last_uptime.get(key)
+
+    def compute(
+        self,
+        key: str,
+        jiffies: Optional[Sequence[int]],
+        uptime: Optional[int],
+    ) -> Optional[int]:
+        """Return the CPU usage in percent since the previous sample for *key*.
+
+        Counters are ordered like /proc/stat (user, nice, system, idle, iowait,
+        irq, softirq, steal). ``None`` is returned for the first sample and
+        after a reboot, when the counters start from zero again.
+        """
+
+        if not jiffies or uptime is None:
+            self._last_jiffies.pop(key, None)
+            self._last_uptime.pop(key, None)
+            return None
+
+        current = tuple(jiffies)
+        previous = self._last_jiffies.get(key)
+        previous_uptime = self._last_uptime.get(key)
+        self._last_jiffies[key] = current
+        self._last_uptime[key] = uptime
+
+        if (
+            previous is None
+            or previous_uptime is None
+            or uptime < previous_uptime
+            or len(previous) != len(current)
+        ):
+            return None
+        d_total = sum(current) - sum(previous)
+        d_idle = (current[3] + current[4]) - (previous[3] + previous[4])
+        if d_total <= 0 or d_idle < 0:
+            return 0
+        return min(100, max(0, (100 * (d_total - d_idle) + d_total // 2) // d_total))
+
+
+class PowerStatsCache:
+    """Cache RAPL energy counters to derive the average power between samples."""
+
+    def __init__(self) -> None:
+        self._last_sample: Dict[str, Tuple[int, float]] = {}
+
+    def compute(
+        self,
+        key: str,
+        energy_uj: Optional[int],
+        energy_range_uj: Optional[int],
+        sample_uptime: Optional[float],
+    ) -> Optional[float]:
+        """Return the average power in watts since the previous sample for *key*."""
+
+        if energy_uj is None or sample_uptime is None:
+            self._last_sample.pop(key, None)
+            return None
+
+        previous = self._last_sample.get(key)
+        self._last_sample[key] = (energy_uj, sample_uptime)
+        if previous is None:
+            return None
+
+        previous_energy, previous_uptime = previous
+        elapsed = sample_uptime - previous_uptime
+        if elapsed <= 0:
+            return None
+        delta = energy_uj - previous_energy
+        if delta < 0:
+            if not energy_range_uj:
+                return None
+            delta += energy_range_uj
+        return delta / elapsed / 1_000_000
+
+
+class ContainerCpuCache:
+    """Cache container cgroup CPU time to derive CPU usage between samples."""
+
+    def __init__(self) -> None:
+        self._last_sample: Dict[str, Dict[str, Tuple[int, float]]] = {}
+
+    def compute(
+        self,
+        key: str,
+        usage_usec: Dict[str, int],
+        sample_uptime: Optional[float],
+        partial: bool = False,
+    ) -> Dict[str, float]:
+        """Return the CPU usage in percent per container since the previous sample.
+
+        Like ``docker stats``, 100 percent is one fully used core. Containers
+        without a previous sample, restarted containers whose counter went
+        backwards and all containers after a host reboot are left out. A
+        *partial* sample of only some containers updates their baseline and
+        keeps the others; a full sample replaces the baseline.
+        """
+
+        if not usage_usec or sample_uptime is None:
+            if not partial:
+                self._last_sample.pop(key, None)
+            return {}
+
+        previous = self._last_sample.get(key, {})
+        if any(uptime > sample_uptime for _, uptime in previous.values()):
+            previous = {}
+        current = {
+            container_id: (usage, sample_uptime) for container_id, usage in usage_usec.items()
+        }
+        self._last_sample[key] = {**previous, **current} if partial else current
+
+        result: Dict[str, float] = {}
+        for container_id, usage in usage_usec.items():
+            if container_id not in previous:
+                continue
+            last, last_uptime = previous[container_id]
+            elapsed_usec = (sample_uptime - last_uptime) * 1_000_000
+            if elapsed_usec <= 0 or usage < last:
+                continue
+            result[container_id] = round((usage - last) / elapsed_usec * 100, 2)
+        return result
+
+
 class ProcessPeakCache:
     """Track the highest observed process count until the host reboots."""
 
@@ -109,3 +243,42 @@ class RollingAverageCache:
         while samples and samples[0][0] < cutoff:
             samples.popleft()
         return sum(sample_value for _, sample_value in samples) / len(samples)
+
+
+class SectionTimingCache:
+    """Keep the most recent durations per key and section for percentiles."""
+
+    def __init__(self, max_samples: int = 100) -> None:
+        self._max_samples = max_samples
+        self._samples: Dict[str, Dict[str, Deque[float]]] = {}
+
+    def compute(
+        self, key: str, durations: Dict[str, float]
+    ) -> Dict[str, Dict[str, float]]:
+        """Record *durations* for *key* and return p50/p95 per known section."""
+
+        sections = self._samples.setdefault(key, {})
+        for section, duration in durations.items():
+            sections.setdefault(section, deque(maxlen=self._max_samples)).append(duration)
+        stats: Dict[str, Dict[str, float]] = {}
+        for section, samples in sections.items():
+            ordered = sorted(samples)
+            stats[section] = {
+                "p50_ms": _nearest_rank(ordered, 0.5),
+                "p95_ms": _nearest_rank(ordered, 0.95),
+                "samples": len(ordered),
+            }
+        return stats
+
+    def forget(self, keys: Iterable[str]) -> None:
+        """Drop the samples of *keys*, e.g. of hosts whose entry unloaded."""
+
+        for key in keys:
+            self._samples.pop(key, None)
+
+
+def _nearest_rank(ordered: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of an ascending, non-empty sequence."""
+
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return round(ordered[index], 2)
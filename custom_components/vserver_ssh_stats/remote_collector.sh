@@ -20,6 +20,15 @@ number_or_null() {
   fi
 }
 
+# Like number_or_null, but assigns variable $1 instead of forking a subshell.
+set_number_or_null() {
+  if [ -n "$2" ]; then
+    printf -v "$1" '%s' "$2"
+  else
+    printf -v "$1" 'null'
+  fi
+}
+
 run_limited() {
   seconds="$1"
   shift
@@ -49,6 +58,37 @@ collector_mode="${VSERVER_SSH_STATS_MODE:-full}"
 pkg_timeout=$(positive_timeout "${VSERVER_SSH_STATS_PKG_TIMEOUT:-}" 6)
 docker_timeout=$(positive_timeout "${VSERVER_SSH_STATS_DOCKER_TIMEOUT:-}" 5)
 storage_timeout=$(positive_timeout "${VSERVER_SSH_STATS_STORAGE_TIMEOUT:-}" 15)
+storage_jobs=$(positive_timeout "${VSERVER_SSH_STATS_STORAGE_JOBS:-}" 4)
+prev_uptime="${VSERVER_SSH_STATS_PREV_UPTIME:-}"
+collector_profile_enabled="${VSERVER_SSH_STATS_PROFILE:-0}"
+section_timeout=$(positive_timeout "${VSERVER_SSH_STATS_SECTION_TIMEOUT:-}" 10)
+
+# Per-section result cache TTLs in seconds, e.g. "os=3600,firewall=300".
+declare -A cache_ttls=()
+IFS=, read -r -a cache_ttl_entries <<< "${VSERVER_SSH_STATS_CACHE_TTL:-}"
+for cache_ttl_entry in "${cache_ttl_entries[@]}"; do
+  case "${cache_ttl_entry#*=}" in
+    ''|*[!0-9]*) continue ;;
+  esac
+  cache_ttls[${cache_ttl_entry%%=*}]=${cache_ttl_entry#*=}
+done
+# Base sections whose tier is not due on this poll, e.g. "processes,fail2ban".
+declare -A skipped_sections=()
+IFS=, read -r -a skipped_section_entries <<< "${VSERVER_SSH_STATS_SKIP:-}"
+for skipped_section in "${skipped_section_entries[@]}"; do
+  [ -n "$skipped_section" ] && skipped_sections[$skipped_section]=1
+done
+# Container IDs of a targeted Docker refresh, e.g. "abc123,def456".
+docker_container_filters=()
+docker_api_filter=""
+IFS=, read -r -a docker_filter_ids <<< "${VSERVER_SSH_STATS_DOCKER_CONTAINERS:-}"
+for docker_filter_id in "${docker_filter_ids[@]}"; do
+  docker_filter_id=${docker_filter_id//[^0-9a-fA-F]/}
+  [ -n "$docker_filter_id" ] || continue
+  docker_container_filters+=(--filter "id=$docker_filter_id")
+  docker_api_filter+="${docker_api_filter:+,}\"$docker_filter_id\""
+done
+result_cache_dir=""
 docker_quick_timeout=$docker_timeout
 if [ "$docker_quick_timeout" -gt 30 ]; then
   docker_quick_timeout=30
@@ -95,8 +135,34 @@ read_power_metrics() {
   fi
 }
 
+read_uptime() {
+  sample_uptime=""
+  uptime=""
+  if [ -r /proc/uptime ]; then
+    read -r sample_uptime _idle_seconds < /proc/uptime || sample_uptime=""
+  fi
+  case "$sample_uptime" in
+    ''|*[!0-9.]*) sample_uptime="" ;;
+    *) uptime=${sample_uptime%%.*} ;;
+  esac
+}
+
+# Home Assistant keeps the previous jiffies and passes the uptime of that
+# sample. Without a reboot since then, skip the 1 s sleep and let it compute
+# the utilisation from the counter delta.
+cpu_delta_mode() {
+  case "$prev_uptime" in
+    ''|*[!0-9]*) return 1 ;;
+  esac
+  case "$uptime" in
+    ''|*[!0-9]*) return 1 ;;
+  esac
+  [ "$uptime" -ge "$prev_uptime" ]
+}
+
 read_cpu_stats() {
   cpu=0
+  cpu_jiffies_json=null
   if [ ! -r /proc/stat ]; then
     return 0
   fi
@@ -109,12 +175,19 @@ read_cpu_stats() {
   irq=${irq:-0}
   softirq=${softirq:-0}
   steal=${steal:-0}
+  if cpu_delta_mode; then
+    cpu=""
+    cpu_jiffies_json="[$user,$nice,$system,$idle,$iowait,$irq,$softirq,$steal]"
+    return 0
+  fi
   prev_total=$((user+nice+system+idle+iowait+irq+softirq+steal))
   prev_idle=$((idle+iowait))
   sleep 1
   if [ -n "$power_energy_file" ]; then
     power_energy_after=$(cat "$power_energy_file" 2>/dev/null || echo "")
   fi
+  # Timestamp the counters that are reported, i.e. the ones after the sleep.
+  read_uptime
   read _cpu user nice system idle iowait irq softirq steal _guest _guest_nice < /proc/stat || return 0
   user=${user:-0}
   nice=${nice:-0}
@@ -124,6 +197,7 @@ read_cpu_stats() {
   irq=${irq:-0}
   softirq=${softirq:-0}
   steal=${steal:-0}
+  cpu_jiffies_json="[$user,$nice,$system,$idle,$iowait,$irq,$softirq,$steal]"
   total=$((user+nice+system+idle+iowait+irq+softirq+steal))
   idle_all=$((idle+iowait))
   d_total=$((total-prev_total))
@@ -247,10 +321,8 @@ read_load_and_freq() {
   if [ -r /proc/loadavg ]; then
     read load_1 load_5 load_15 _ < /proc/loadavg || true
   fi
-  cpu_freq=""
-  if [ -f /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq ]; then
-    cpu_freq=$(awk '{printf "%.0f", $1/1000}' /sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq 2>/dev/null)
-  elif command -v lscpu >/dev/null 2>&1; then
+  # cpu_freq comes from read_proc_snapshot when cpufreq is exposed.
+  if [ -z "$cpu_freq" ] && command -v lscpu >/dev/null 2>&1; then
     cpu_freq=$(lscpu 2>/dev/null | awk -F: '/CPU max MHz/ {gsub(/ /,"",$2); print int($2+0)}')
   fi
   if [ -n "$cpu_freq" ]; then cpu_freq_json=$cpu_freq; else cpu_freq_json=null; fi
@@ -321,22 +393,241 @@ collect_pkg_updates() {
   pkg_list_json=$(json_escape "$pkg_list")
 }
 
-read_cpu_throttle() {
-  throttle_periods=""
-  throttle_usec=""
-  container_pid="$1"
-  [ -n "$container_pid" ] && [ "$container_pid" -gt 0 ] 2>/dev/null || return 0
-  cgroup_path=$(awk -F: '$1 == "0" {print $3; exit} $2 ~ /(^|,)cpu(,|$)/ {print $3; exit}' "/proc/$container_pid/cgroup" 2>/dev/null)
-  [ -n "$cgroup_path" ] || return 0
-  for cpu_stat in "/sys/fs/cgroup$cgroup_path/cpu.stat" "/sys/fs/cgroup/cpu$cgroup_path/cpu.stat" "/sys/fs/cgroup/cpu,cpuacct$cgroup_path/cpu.stat"; do
-    [ -r "$cpu_stat" ] || continue
-    throttle_periods=$(awk '$1 == "nr_throttled" {print $2; exit}' "$cpu_stat" 2>/dev/null)
-    throttle_usec=$(awk '
-      $1 == "throttled_usec" {print $2; exit}
-      $1 == "throttled_time" {printf "%.0f", $2/1000; exit}
-    ' "$cpu_stat" 2>/dev/null)
-    break
+read_container_cgroups() {
+  # Read CPU, memory and PID counters of every running container from its
+  # cgroup in one awk pass. Output lines are
+  # id|usage_usec|mem_percent|mem_used|pids|throttled_periods|throttled_usec.
+  cgroup_root=${1:-}
+  container_cgroup_lines=""
+  docker_sample_uptime=""
+  cgroup_files=()
+  if [ -r "$cgroup_root"/sys/fs/cgroup/cgroup.controllers ]; then
+    cgroup_unified=1
+  else
+    cgroup_unified=0
+  fi
+  while IFS='|' read -r cgroup_id _ cgroup_running _ _ _ _ _ cgroup_pid _; do
+    [ "$cgroup_running" = "true" ] || continue
+    cgroup_pid=${cgroup_pid//[^0-9]/}
+    [ -n "$cgroup_pid" ] && [ "$cgroup_pid" -gt 0 ] || continue
+    [ -r "$cgroup_root/proc/$cgroup_pid/cgroup" ] || continue
+    cgroup_v2_path=""
+    cgroup_cpu_path=""
+    cgroup_memory_path=""
+    cgroup_pids_path=""
+    while IFS=: read -r _ cgroup_controllers cgroup_path; do
+      case ",$cgroup_controllers," in
+        ,,) cgroup_v2_path=$cgroup_path ;;
+        *,cpuacct,*|*,cpu,*) cgroup_cpu_path=$cgroup_path ;;
+      esac
+      case ",$cgroup_controllers," in
+        *,memory,*) cgroup_memory_path=$cgroup_path ;;
+        *,pids,*) cgroup_pids_path=$cgroup_path ;;
+      esac
+    done < "$cgroup_root/proc/$cgroup_pid/cgroup"
+    if [ "$cgroup_unified" -eq 1 ]; then
+      [ -n "$cgroup_v2_path" ] || continue
+      cgroup_candidates=(
+        "$cgroup_root/sys/fs/cgroup$cgroup_v2_path/cpu.stat"
+        "$cgroup_root/sys/fs/cgroup$cgroup_v2_path/memory.current"
+        "$cgroup_root/sys/fs/cgroup$cgroup_v2_path/memory.max"
+        "$cgroup_root/sys/fs/cgroup$cgroup_v2_path/memory.stat"
+        "$cgroup_root/sys/fs/cgroup$cgroup_v2_path/pids.current"
+      )
+    else
+      # cpu and cpuacct are usually one hierarchy with symlinked aliases,
+      # so read each file once from the combined mount when it exists.
+      cgroup_cpu_dir=cpu
+      cgroup_cpuacct_dir=cpuacct
+      if [ -d "$cgroup_root/sys/fs/cgroup/cpu,cpuacct" ]; then
+        cgroup_cpu_dir=cpu,cpuacct
+        cgroup_cpuacct_dir=cpu,cpuacct
+      fi
+      cgroup_candidates=(
+        "$cgroup_root/sys/fs/cgroup/$cgroup_cpu_dir$cgroup_cpu_path/cpu.stat"
+        "$cgroup_root/sys/fs/cgroup/$cgroup_cpuacct_dir$cgroup_cpu_path/cpuacct.usage"
+        "$cgroup_root/sys/fs/cgroup/memory$cgroup_memory_path/memory.usage_in_bytes"
+        "$cgroup_root/sys/fs/cgroup/memory$cgroup_memory_path/memory.limit_in_bytes"
+        "$cgroup_root/sys/fs/cgroup/memory$cgroup_memory_path/memory.stat"
+        "$cgroup_root/sys/fs/cgroup/pids$cgroup_pids_path/pids.current"
+      )
+    fi
+    cgroup_files+=("c=$cgroup_id")
+    for cgroup_file in "${cgroup_candidates[@]}"; do
+      [ -r "$cgroup_file" ] && cgroup_files+=("$cgroup_file")
+    done
+  done < <(printf '%s\n' "$inspect_lines")
+  [ "${#cgroup_files[@]}" -gt 0 ] || return 0
+  if [ -r "$cgroup_root"/proc/uptime ]; then
+    read -r docker_sample_uptime _ < "$cgroup_root"/proc/uptime || docker_sample_uptime=""
+  fi
+  case "$docker_sample_uptime" in
+    ''|*[!0-9.]*) docker_sample_uptime="" ;;
+  esac
+  [ -r "$cgroup_root"/proc/meminfo ] && cgroup_files=("$cgroup_root"/proc/meminfo "${cgroup_files[@]}")
+  container_cgroup_lines=$(awk '
+    FNR == 1 {
+      n = split(FILENAME, parts, "/")
+      file = parts[n]
+      if (c != "" && !(c in seen)) {
+        seen[c] = 1
+        order[++count] = c
+      }
+    }
+    file == "meminfo" && $1 == "MemTotal:" { mem_total = $2 * 1024 }
+    file == "meminfo" { next }
+    file == "cpu.stat" && $1 == "usage_usec" { usage[c] = $2 }
+    file == "cpu.stat" && $1 == "nr_throttled" { periods[c] = $2 }
+    file == "cpu.stat" && $1 == "throttled_usec" { throttled[c] = $2 }
+    file == "cpu.stat" && $1 == "throttled_time" { throttled[c] = sprintf("%.0f", $2 / 1000) }
+    file == "cpuacct.usage" { usage[c] = sprintf("%.0f", $1 / 1000) }
+    file == "memory.current" || file == "memory.usage_in_bytes" { current[c] = $1 }
+    file == "memory.max" || file == "memory.limit_in_bytes" { limit[c] = $1 }
+    # Like docker stats, do not count reclaimable page cache as used memory.
+    file == "memory.stat" && ($1 == "inactive_file" || $1 == "total_inactive_file") {
+      inactive[c] = $2
+    }
+    file == "pids.current" { pids[c] = $1 }
+    END {
+      for (i = 1; i <= count; i++) {
+        c = order[i]
+        percent = ""
+        used = ""
+        if (c in current) {
+          used = current[c]
+          if ((c in inactive) && inactive[c] < used) {
+            used -= inactive[c]
+          }
+          maximum = limit[c]
+          if (maximum !~ /^[0-9]+$/ || (mem_total > 0 && maximum + 0 > mem_total)) {
+            maximum = mem_total
+          }
+          if (maximum > 0) {
+            percent = sprintf("%.2f", used / maximum * 100)
+          }
+          used = sprintf("%.0f", used)
+        }
+        print c "|" usage[c] "|" percent "|" used "|" pids[c] "|" periods[c] "|" throttled[c]
+      }
+    }' "${cgroup_files[@]}" 2>/dev/null)
+}
+
+# Set docker_api_socket and return 0 when curl can reach the Docker daemon
+# socket of this user.
+docker_api_socket_usable() {
+  case "${DOCKER_HOST:-}" in
+    "") docker_api_socket=/var/run/docker.sock ;;
+    unix://*) docker_api_socket=${DOCKER_HOST#unix://} ;;
+    *) return 1 ;;
+  esac
+  [ -S "$docker_api_socket" ] && [ -r "$docker_api_socket" ] && [ -w "$docker_api_socket" ] || return 1
+  command -v curl >/dev/null 2>&1
+}
+
+# Set docker_command to the docker CLI, through passwordless sudo when the
+# user cannot reach the daemon, and return the status of docker info.
+select_docker_command() {
+  docker_command=(docker)
+  run_limited "$docker_quick_timeout" "${docker_command[@]}" info >/dev/null 2>&1
+  docker_info_status=$?
+  if [ "$docker_info_status" -ne 0 ] && command -v sudo >/dev/null 2>&1; then
+    docker_command=(sudo -n docker)
+    run_limited "$docker_quick_timeout" "${docker_command[@]}" info >/dev/null 2>&1
+    docker_info_status=$?
+  fi
+  return "$docker_info_status"
+}
+
+# Print the Docker Engine API documents at the given URLs, one per line, from
+# one curl process that reuses its connection to the socket.
+docker_api_get() {
+  run_limited "$docker_quick_timeout" curl -sf --unix-socket "$docker_api_socket" -w '\n' "$@" 2>/dev/null
+}
+
+# Join the complete JSON documents of docker_api_get output with commas.
+docker_api_join() {
+  docker_api_joined=""
+  while IFS= read -r docker_api_line; do
+    case "$docker_api_line" in
+      '{'*'}') docker_api_joined+="${docker_api_joined:+,}$docker_api_line" ;;
+    esac
+  done <<< "$1"
+}
+
+read_docker_api() {
+  # Collect Docker data from the Engine API on the daemon socket instead of
+  # starting the docker CLI once per call. One request lists the containers
+  # and one curl process then inspects all of them. Containers are normalized
+  # in Home Assistant. Returns 1 when the socket or curl cannot be used.
+  docker_api_json=null
+  docker_api_socket_usable || return 1
+  docker_api_query=(-G --data-urlencode all=1)
+  [ -n "$docker_api_filter" ] && docker_api_query+=(--data-urlencode "filters={\"id\":[$docker_api_filter]}")
+  docker_api_list=$(run_limited "$docker_quick_timeout" curl -sf --unix-socket "$docker_api_socket" \
+    "${docker_api_query[@]}" http://localhost/containers/json 2>/dev/null) || return 1
+  case "$docker_api_list" in
+    '['*']') ;;
+    *) return 1 ;;
+  esac
+  docker_api_urls=()
+  docker_api_rest=$docker_api_list
+  while [[ $docker_api_rest =~ \"Id\":\"([0-9a-f]+)\" ]]; do
+    docker_api_urls+=("http://localhost/containers/${BASH_REMATCH[1]}/json")
+    docker_api_rest=${docker_api_rest#*"${BASH_REMATCH[0]}"}
   done
+  docker_api_inspect=""
+  if [ "${#docker_api_urls[@]}" -gt 0 ]; then
+    docker_api_inspect=$(docker_api_get "${docker_api_urls[@]}")
+    docker_api_status=$?
+    # 22 means a container was removed after it was listed.
+    case "$docker_api_status" in
+      0|22) ;;
+      *)
+        docker_api_inspect=""
+        docker_stats_partial=1
+        ;;
+    esac
+  fi
+
+  inspect_lines=""
+  while IFS= read -r docker_api_line; do
+    [[ $docker_api_line =~ \"State\":\{ ]] || continue
+    [[ $docker_api_line =~ \"Id\":\"([0-9a-f]+)\" ]] || continue
+    docker_api_id=${BASH_REMATCH[1]}
+    docker_api_running=false
+    [[ $docker_api_line =~ \"Running\":true ]] && docker_api_running=true
+    docker_api_pid=""
+    [[ $docker_api_line =~ \"Pid\":([0-9]+) ]] && docker_api_pid=${BASH_REMATCH[1]}
+    inspect_lines+="$docker_api_id||$docker_api_running||||||$docker_api_pid|"$'\n'
+  done <<< "$docker_api_inspect"
+  read_container_cgroups
+  docker_api_cgroups=""
+  while IFS='|' read -r docker_api_id docker_api_usage docker_api_mem docker_api_used docker_api_pids docker_api_periods docker_api_throttled; do
+    [ -n "$docker_api_id" ] || continue
+    set_number_or_null docker_api_usage "$docker_api_usage"
+    set_number_or_null docker_api_mem "$docker_api_mem"
+    set_number_or_null docker_api_used "$docker_api_used"
+    set_number_or_null docker_api_pids "$docker_api_pids"
+    set_number_or_null docker_api_periods "$docker_api_periods"
+    set_number_or_null docker_api_throttled "$docker_api_throttled"
+    docker_api_cgroups+="${docker_api_cgroups:+,}{\"id\":\"$docker_api_id\",\"cpu_usage_usec\":$docker_api_usage,\"mem\":$docker_api_mem,\"memory_usage_bytes\":$docker_api_used,\"pids\":$docker_api_pids,\"cpu_throttled_periods\":$docker_api_periods,\"cpu_throttled_usec\":$docker_api_throttled}"
+  done <<< "$container_cgroup_lines"
+  # Running containers whose cgroup could not be read use one-shot stats.
+  docker_api_urls=()
+  while IFS='|' read -r docker_api_id _ docker_api_running _; do
+    [ "$docker_api_running" = "true" ] || continue
+    [[ $docker_api_cgroups == *"\"$docker_api_id\""* ]] && continue
+    docker_api_urls+=("http://localhost/containers/$docker_api_id/stats?stream=false&one-shot=true")
+  done <<< "$inspect_lines"
+  docker_api_stats=""
+  if [ "${#docker_api_urls[@]}" -gt 0 ]; then
+    docker_api_stats=$(docker_api_get "${docker_api_urls[@]}") || docker_stats_partial=1
+    if [ -z "$docker_sample_uptime" ] && [ -r /proc/uptime ]; then
+      read -r docker_sample_uptime _ < /proc/uptime || docker_sample_uptime=""
+    fi
+  fi
+  docker_api_join "$docker_api_inspect"$'\n'"$docker_api_stats"
+  docker_api_json="{\"containers\":$docker_api_list,\"documents\":[$docker_api_joined],\"cgroups\":[$docker_api_cgroups]}"
 }
 
 read_docker_stats() {
@@ -345,28 +636,27 @@ read_docker_stats() {
   container_stats="[]"
   docker_stats_complete=0
   docker_stats_partial=0
-  docker_images_size_bytes=""
-  docker_containers_size_bytes=""
-  docker_volumes_size_bytes=""
-  docker_build_cache_size_bytes=""
-  docker_command=(docker)
-  if ! command -v docker >/dev/null 2>&1; then
+  docker_sample_uptime=""
+  container_cgroup_lines=""
+  set +e
+  read_docker_api
+  docker_api_status=$?
+  set -e
+  if [ "$docker_api_status" -eq 0 ]; then
+    docker=1
+    docker_stats_complete=1
+  elif ! command -v docker >/dev/null 2>&1; then
     docker=0
     docker_stats_complete=1
   else
     set +e
-    run_limited "$docker_quick_timeout" "${docker_command[@]}" info >/dev/null 2>&1
+    select_docker_command
     docker_info_status=$?
-    if [ "$docker_info_status" -ne 0 ] && command -v sudo >/dev/null 2>&1; then
-      docker_command=(sudo -n docker)
-      run_limited "$docker_quick_timeout" "${docker_command[@]}" info >/dev/null 2>&1
-      docker_info_status=$?
-    fi
     set -e
     if [ "$docker_info_status" -eq 0 ]; then
       set +e
       docker=1
-      ps_lines=$(run_limited "$docker_quick_timeout" "${docker_command[@]}" ps -a --format '{{.ID}}|{{.Names}}|{{.Image}}|{{.Status}}|{{.Ports}}' 2>/dev/null)
+      ps_lines=$(run_limited "$docker_quick_timeout" "${docker_command[@]}" ps -a "${docker_container_filters[@]}" --format '{{.ID}}|{{.Names}}|{{.Image}}|{{.Status}}|{{.Ports}}' 2>/dev/null)
       ps_status=$?
       if [ "$ps_status" -eq 0 ]; then
         docker_stats_complete=1
@@ -378,8 +668,24 @@ read_docker_stats() {
       inspect_lines=""
       if [ -n "$ps_lines" ]; then
         container_ids=$(printf '%s\n' "$ps_lines" | awk -F'|' '{print $1}' | tr '\n' ' ')
-        running_container_ids=$(printf '%s\n' "$ps_lines" |
-          awk -F'|' '$4 ~ /^(Up|Restarting)/ {printf "%s ", $1}')
+        read -r -a container_id_args <<< "$container_ids"
+        inspect_lines=$(run_limited "$docker_quick_timeout" "${docker_command[@]}" inspect --format '{{.Id}}|{{.RestartCount}}|{{.State.Running}}|{{if .State.Health}}{{.State.Health.Status}}{{else}}{{.State.Status}}{{end}}|{{.HostConfig.RestartPolicy.Name}}|{{index .Config.Labels "com.docker.compose.project"}}|{{index .Config.Labels "com.docker.compose.service"}}|{{index .Config.Labels "com.docker.swarm.service.name"}}|{{.State.Pid}}|{{.HostConfig.Memory}}' "${container_id_args[@]}" 2>/dev/null)
+        inspect_status=$?
+        read_container_cgroups
+        # docker stats samples for about two seconds, so it only covers
+        # running containers whose cgroup counters could not be read.
+        running_container_ids=$(printf '%s\n' "$container_cgroup_lines" "--" "$ps_lines" |
+          awk -F'|' '
+            $0 == "--" { listed = 1; next }
+            !listed && ($2 != "" || $4 != "") { read_ids[$1] = 1; next }
+            listed && $4 ~ /^(Up|Restarting)/ {
+              for (read_id in read_ids) {
+                if (index(read_id, $1) == 1) {
+                  next
+                }
+              }
+              printf "%s ", $1
+            }')
         stats_status=0
         if [ -n "$running_container_ids" ]; then
           read -r -a running_container_id_args <<< "$running_container_ids"
@@ -406,9 +712,6 @@ read_docker_stats() {
           fi
           stats_lines=$stats_raw
         fi
-        read -r -a container_id_args <<< "$container_ids"
-        inspect_lines=$(run_limited "$docker_quick_timeout" "${docker_command[@]}" inspect --format '{{.Id}}|{{.RestartCount}}|{{.State.Running}}|{{if .State.Health}}{{.State.Health.Status}}{{else}}{{.State.Status}}{{end}}|{{.HostConfig.RestartPolicy.Name}}|{{index .Config.Labels "com.docker.compose.project"}}|{{index .Config.Labels "com.docker.compose.service"}}|{{index .Config.Labels "com.docker.swarm.service.name"}}|{{.State.Pid}}|{{.HostConfig.Memory}}' "${container_id_args[@]}" 2>/dev/null)
-        inspect_status=$?
         if [ "$stats_status" -ne 0 ] || [ "$inspect_status" -ne 0 ]; then
           docker_stats_partial=1
         fi
@@ -436,13 +739,21 @@ read_docker_stats() {
           container_mem=null
           container_mem_usage=""
           container_pids=""
-          if [ -n "$stats_match" ]; then
+          container_cpu_usage=""
+          throttle_periods=""
+          throttle_usec=""
+          cgroup_match=$(printf '%s\n' "$container_cgroup_lines" |
+            awk -F'|' -v id="$container_id" 'index($1, id) == 1 {print; exit}')
+          if [ -n "$cgroup_match" ]; then
+            IFS='|' read -r _ container_cpu_usage container_mem container_mem_usage container_pids throttle_periods throttle_usec <<< "$cgroup_match"
+            set_number_or_null container_mem "$container_mem"
+          elif [ -n "$stats_match" ]; then
             IFS='|' read -r container_cpu container_mem container_mem_usage_raw container_pids <<< "$stats_match"
             container_mem_usage=${container_mem_usage_raw%%/*}
             container_mem_usage=$(human_bytes "$container_mem_usage")
           fi
           inspect_match=$(printf '%s\n' "$inspect_lines" |
-            awk -F'|' -v id="$container_id" 'index($1, id) == 1 {print $2 "|" $3 "|" $4 "|" $5 "|" $6 "|" $7 "|" $8 "|" $9 "|" $10; exit}')
+            awk -F'|' -v id="$container_id" 'index($1, id) == 1 {print $2 "|" $3 "|" $4 "|" $5 "|" $6 "|" $7 "|" $8 "|" $10; exit}')
           restart_count=""
           running_state=""
           health_state=""
@@ -450,7 +761,6 @@ read_docker_stats() {
           compose_project=""
           compose_service=""
           swarm_service=""
-          container_pid=""
           container_memory_limit=""
           if [ -n "$inspect_match" ]; then
             restart_count=${inspect_match%%|*}
@@ -466,16 +776,12 @@ read_docker_stats() {
             compose_service=${inspect_remainder%%|*}
             inspect_remainder=${inspect_remainder#*|}
             swarm_service=${inspect_remainder%%|*}
-            inspect_remainder=${inspect_remainder#*|}
-            container_pid=${inspect_remainder%%|*}
             container_memory_limit=${inspect_remainder#*|}
           fi
           restart_count=${restart_count//[^0-9]/}
           restart_count_json=$(number_or_null "$restart_count")
-          container_pid=${container_pid//[^0-9]/}
           container_memory_limit=${container_memory_limit//[^0-9]/}
           container_pids=${container_pids//[^0-9]/}
-          read_cpu_throttle "$container_pid"
           case "$running_state" in
             true|false) running_json=$running_state ;;
             *) running_json=null ;;
@@ -490,7 +796,7 @@ read_docker_stats() {
           compose_project_json=$(json_escape "$compose_project")
           compose_service_json=$(json_escape "$compose_service")
           swarm_service_json=$(json_escape "$swarm_service")
-          container_entries="$container_entries{\"id\":\"$container_id_json\",\"name\":\"$name_json\",\"cpu\":$container_cpu,\"mem\":$container_mem,\"memory_usage_bytes\":$(number_or_null "$container_mem_usage"),\"memory_limit_bytes\":$(number_or_null "$container_memory_limit"),\"pids\":$(number_or_null "$container_pids"),\"cpu_throttled_periods\":$(number_or_null "$throttle_periods"),\"cpu_throttled_usec\":$(number_or_null "$throttle_usec"),\"image\":\"$image_json\",\"status\":\"$status_json\",\"restart_count\":$restart_count_json,\"ports\":\"$ports_json\",\"health_state\":\"$health_json\",\"running\":$running_json,\"restart_policy\":\"$restart_policy_json\",\"compose_project\":\"$compose_project_json\",\"compose_service\":\"$compose_service_json\",\"swarm_service\":\"$swarm_service_json\"},"
+          container_entries="$container_entries{\"id\":\"$container_id_json\",\"name\":\"$name_json\",\"cpu\":$container_cpu,\"cpu_usage_usec\":$(number_or_null "$container_cpu_usage"),\"mem\":$container_mem,\"memory_usage_bytes\":$(number_or_null "$container_mem_usage"),\"memory_limit_bytes\":$(number_or_null "$container_memory_limit"),\"pids\":$(number_or_null "$container_pids"),\"cpu_throttled_periods\":$(number_or_null "$throttle_periods"),\"cpu_throttled_usec\":$(number_or_null "$throttle_usec"),\"image\":\"$image_json\",\"status\":\"$status_json\",\"restart_count\":$restart_count_json,\"ports\":\"$ports_json\",\"health_state\":\"$health_json\",\"running\":$running_json,\"restart_policy\":\"$restart_policy_json\",\"compose_project\":\"$compose_project_json\",\"compose_service\":\"$compose_service_json\",\"swarm_service\":\"$swarm_service_json\"},"
         done < <(printf '%s\n' "$ps_lines")
         if [ -n "$container_entries" ]; then
           container_stats="[${container_entries%,}]"
@@ -500,16 +806,6 @@ read_docker_stats() {
       else
         container_stats="[]"
       fi
-      docker_disk_lines=$(run_limited "$docker_quick_timeout" "${docker_command[@]}" system df --format '{{.Type}}|{{.Size}}|{{.Reclaimable}}' 2>/dev/null)
-      while IFS='|' read -r docker_disk_type docker_disk_size _docker_reclaimable; do
-        docker_disk_bytes=$(human_bytes "$docker_disk_size")
-        case "$docker_disk_type" in
-          Images) docker_images_size_bytes=$docker_disk_bytes ;;
-          Containers) docker_containers_size_bytes=$docker_disk_bytes ;;
-          "Local Volumes") docker_volumes_size_bytes=$docker_disk_bytes ;;
-          "Build Cache") docker_build_cache_size_bytes=$docker_disk_bytes ;;
-        esac
-      done < <(printf '%s\n' "$docker_disk_lines")
       set -e
     else
       docker=1
@@ -520,6 +816,57 @@ read_docker_stats() {
   container_stats_json=$container_stats
 }
 
+read_docker_disk_usage() {
+  # Docker computes image, container, volume and build cache sizes in one
+  # call that can take minutes on hosts with many volumes, so disk usage is
+  # its own slow section. The Engine API document also lists every image
+  # and volume; the CLI only reports the totals.
+  docker=""
+  docker_disk_complete=0
+  docker_df_json=null
+  docker_images_size_bytes=""
+  docker_containers_size_bytes=""
+  docker_volumes_size_bytes=""
+  docker_build_cache_size_bytes=""
+  set +e
+  if docker_api_socket_usable; then
+    docker_df_document=$(run_limited "$docker_timeout" curl -sf --unix-socket "$docker_api_socket" http://localhost/system/df 2>/dev/null)
+    docker_df_status=$?
+    set -e
+    docker=1
+    case "$docker_df_document" in
+      '{'*'}')
+        [ "$docker_df_status" -eq 0 ] && docker_disk_complete=1
+        docker_df_json=$docker_df_document
+        ;;
+    esac
+    return 0
+  fi
+  if ! command -v docker >/dev/null 2>&1; then
+    set -e
+    docker=0
+    docker_disk_complete=1
+    return 0
+  fi
+  select_docker_command
+  docker_info_status=$?
+  if [ "$docker_info_status" -eq 0 ]; then
+    docker=1
+    docker_disk_lines=$(run_limited "$docker_timeout" "${docker_command[@]}" system df --format '{{.Type}}|{{.Size}}|{{.Reclaimable}}' 2>/dev/null)
+    [ $? -eq 0 ] && docker_disk_complete=1
+    while IFS='|' read -r docker_disk_type docker_disk_size _docker_reclaimable; do
+      docker_disk_bytes=$(human_bytes "$docker_disk_size")
+      case "$docker_disk_type" in
+        Images) docker_images_size_bytes=$docker_disk_bytes ;;
+        Containers) docker_containers_size_bytes=$docker_disk_bytes ;;
+        "Local Volumes") docker_volumes_size_bytes=$docker_disk_bytes ;;
+        "Build Cache") docker_build_cache_size_bytes=$docker_disk_bytes ;;
+      esac
+    done < <(printf '%s\n' "$docker_disk_lines")
+  fi
+  set -e
+}
+
 read_mac_addresses() {
   mac_address=""
   mac_entries=""
@@ -591,67 +938,183 @@ read_top_processes() {
   fi
 }
 
-parse_process_state() {
-  local stat_line="$1"
-  local stat_remainder
-  parsed_process_state=""
-  case "$stat_line" in
-    *") "*)
-      stat_remainder=${stat_line##*) }
-      parsed_process_state=${stat_remainder%% *}
-      ;;
-  esac
-}
-
 read_process_state() {
+  # Walk /proc once in a single awk instead of forking cat for every process.
+  proc_root="${1:-/proc}"
   process_total=0
   process_running=0
   process_zombies=0
-  for stat_path in /proc/[0-9]*/stat; do
-    [ -r "$stat_path" ] || continue
-    stat_line=$(cat "$stat_path" 2>/dev/null || echo "")
-    [ -n "$stat_line" ] || continue
-    parse_process_state "$stat_line"
-    process_state=$parsed_process_state
-    case "$process_state" in
-      R|S|D|Z|T|t|X|x|K|W|P|I) ;;
-      *) continue ;;
-    esac
-    process_total=$((process_total + 1))
-    [ "$process_state" = "R" ] && process_running=$((process_running + 1))
-    [ "$process_state" = "Z" ] && process_zombies=$((process_zombies + 1))
-  done
+  process_states_json="{}"
+  process_users_json="{}"
+  process_cgroups_json="{}"
+  process_scan=$(printf '%s\n' "$proc_root"/[0-9]* | awk -v top=10 '
+    function clean(value) {
+      gsub(/["\\]/, "_", value)
+      return value
+    }
+    function top_counts(counts, limit,    out, key, pick, best, taken, used) {
+      out = ""
+      taken = 0
+      while (limit == 0 || taken < limit) {
+        pick = ""
+        best = 0
+        for (key in counts) {
+          if (!(key in used) && counts[key] > best) {
+            best = counts[key]
+            pick = key
+          }
+        }
+        if (pick == "") break
+        used[pick] = 1
+        taken++
+        out = out (out == "" ? "" : ",") "\"" clean(pick) "\":" best
+      }
+      return "{" out "}"
+    }
+    BEGIN {
+      while ((getline line < "/etc/passwd") > 0) {
+        split(line, fields, ":")
+        user_names[fields[3]] = fields[1]
+      }
+      close("/etc/passwd")
+    }
+    {
+      dir = $0
+      stat_file = dir "/stat"
+      if ((getline line < stat_file) <= 0) {
+        close(stat_file)
+        next
+      }
+      close(stat_file)
+      # The command name may contain spaces and parentheses; the state
+      # follows the last ") ".
+      if (index(line, ") ") == 0) next
+      sub(/.*\) /, "", line)
+      state = substr(line, 1, 1)
+      if (state !~ /^[RSDZTtXxKWPI]$/) next
+      total++
+      states[state]++
+
+      status_file = dir "/status"
+      while ((getline line < status_file) > 0) {
+        if (line ~ /^Uid:/) {
+          split(line, uid_fields, /[ \t]+/)
+          uid = uid_fields[2]
+          users[(uid in user_names) ? user_names[uid] : uid]++
+          break
+        }
+      }
+      close(status_file)
+
+      cgroup = ""
+      cgroup_file = dir "/cgroup"
+      while ((getline line < cgroup_file) > 0) {
+        if (line ~ /^0::/) {
+          cgroup = substr(line, 4)
+          break
+        }
+        if (cgroup == "" || line ~ /:name=systemd:/) {
+          cgroup = line
+          sub(/^[^:]*:[^:]*:/, "", cgroup)
+        }
+      }
+      close(cgroup_file)
+      if (cgroup != "") cgroups[cgroup]++
+    }
+    END {
+      running = ("R" in states) ? states["R"] : 0
+      zombies = ("Z" in states) ? states["Z"] : 0
+      printf "%d\t%d\t%d\t%s\t%s\t%s\n", total, running, zombies, top_counts(states, 0), top_counts(users, top), top_counts(cgroups, top)
+    }
+  ' 2>/dev/null || true)
+  [ -n "$process_scan" ] || return 0
+  IFS=$'\t' read -r process_total process_running process_zombies \
+    process_states_json process_users_json process_cgroups_json <<< "$process_scan"
   return 0
 }
 
-read_connection_metrics() {
-  tcp_established=0
-  tcp_time_wait=0
-  for tcp_file in /proc/net/tcp /proc/net/tcp6; do
-    [ -r "$tcp_file" ] || continue
-    established=$(awk 'NR > 1 && $4 == "01" {count++} END {print count+0}' "$tcp_file" 2>/dev/null || echo 0)
-    time_wait=$(awk 'NR > 1 && $4 == "06" {count++} END {print count+0}' "$tcp_file" 2>/dev/null || echo 0)
-    tcp_established=$((tcp_established + established))
-    tcp_time_wait=$((tcp_time_wait + time_wait))
+# Read the counters of /proc/net, conntrack, /sys/block, the first thermal
+# zone and cpufreq in one awk pass instead of one or two forks per file.
+# The optional argument is the root of the tree to read (used by the tests).
+read_proc_snapshot() {
+  snapshot_root=${1:-}
+  snapshot_files=()
+  for snapshot_file in \
+    "$snapshot_root"/proc/net/dev \
+    "$snapshot_root"/proc/net/tcp \
+    "$snapshot_root"/proc/net/tcp6 \
+    "$snapshot_root"/proc/net/sockstat \
+    "$snapshot_root"/proc/net/sockstat6 \
+    "$snapshot_root"/proc/sys/net/netfilter/nf_conntrack_count \
+    "$snapshot_root"/proc/sys/net/netfilter/nf_conntrack_max \
+    "$snapshot_root"/sys/class/thermal/thermal_zone0/temp \
+    "$snapshot_root"/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq \
+    "$snapshot_root"/sys/block/*/stat; do
+    [ -r "$snapshot_file" ] || continue
+    snapshot_files+=("$snapshot_file")
   done
 
-  sockets_used=""
-  tcp_sockets_in_use=""
-  if [ -r /proc/net/sockstat ]; then
-    sockets_used=$(awk '$1 == "sockets:" {for(i=2;i<=NF;i++) if($i=="used") print $(i+1)}' /proc/net/sockstat 2>/dev/null)
-    tcp_sockets_in_use=$(awk '$1 == "TCP:" {for(i=2;i<=NF;i++) if($i=="inuse") print $(i+1)}' /proc/net/sockstat 2>/dev/null)
-  fi
-  if [ -r /proc/net/sockstat6 ]; then
-    tcp6_sockets_in_use=$(awk '$1 == "TCP6:" {for(i=2;i<=NF;i++) if($i=="inuse") print $(i+1)}' /proc/net/sockstat6 2>/dev/null)
-    if [ -n "$tcp6_sockets_in_use" ]; then
-      tcp_sockets_in_use=$((${tcp_sockets_in_use:-0} + tcp6_sockets_in_use))
-    fi
+  snapshot=""
+  if [ "${#snapshot_files[@]}" -gt 0 ]; then
+    set +e
+    snapshot=$(awk -v root_length="${#snapshot_root}" '
+      FNR == 1 { name = substr(FILENAME, root_length + 1) }
+      name == "/proc/net/dev" {
+        split_at = index($0, ":")
+        if (split_at == 0) next
+        interface = substr($0, 1, split_at - 1)
+        gsub(/[ \t]/, "", interface)
+        if (interface == "lo") next
+        split(substr($0, split_at + 1), counters, " ")
+        rx += counters[1]; tx += counters[9]
+        next
+      }
+      name == "/proc/net/tcp" || name == "/proc/net/tcp6" {
+        if (FNR > 1 && $4 == "01") established++
+        else if (FNR > 1 && $4 == "06") time_wait++
+        next
+      }
+      name == "/proc/net/sockstat" || name == "/proc/net/sockstat6" {
+        for (i = 2; i < NF; i++) {
+          if ($1 == "sockets:" && $i == "used") sockets_used = $(i + 1)
+          else if ($1 == "TCP:" && $i == "inuse") tcp_in_use = $(i + 1)
+          else if ($1 == "TCP6:" && $i == "inuse") tcp6_in_use = $(i + 1)
+        }
+        next
+      }
+      name ~ /nf_conntrack_count$/ { conntrack_count = $1; next }
+      name ~ /nf_conntrack_max$/ { conntrack_max = $1; next }
+      name ~ /^\/sys\/class\/thermal\// { temp_raw = $1; next }
+      name ~ /scaling_cur_freq$/ { freq_khz = $1; next }
+      name ~ /^\/sys\/block\// {
+        device = name
+        sub(/^\/sys\/block\//, "", device)
+        sub(/\/stat$/, "", device)
+        if (device ~ /^(loop|ram|zram)/) next
+        sectors_read += $3; sectors_written += $7
+        next
+      }
+      END {
+        if (tcp6_in_use != "") tcp_in_use = tcp_in_use + tcp6_in_use
+        temp = ""
+        if (temp_raw ~ /^-?[0-9]+$/) temp = sprintf("%.1f", (temp_raw >= 1000 ? temp_raw / 1000 : temp_raw))
+        freq = ""
+        if (freq_khz ~ /^[0-9]+$/) freq = sprintf("%.0f", freq_khz / 1000)
+        printf "%.0f|%.0f|%d|%d|%s|%s|%s|%s|%.0f|%.0f|%s|%s\n", rx, tx, established, time_wait, \
+          sockets_used, tcp_in_use, conntrack_count, conntrack_max, \
+          sectors_read * 512, sectors_written * 512, temp, freq
+      }' "${snapshot_files[@]}" 2>/dev/null)
+    set -e
   fi
-
-  conntrack_count=""
-  conntrack_max=""
-  [ -r /proc/sys/net/netfilter/nf_conntrack_count ] && conntrack_count=$(cat /proc/sys/net/netfilter/nf_conntrack_count 2>/dev/null || echo "")
-  [ -r /proc/sys/net/netfilter/nf_conntrack_max ] && conntrack_max=$(cat /proc/sys/net/netfilter/nf_conntrack_max 2>/dev/null || echo "")
+  IFS='|' read -r rx tx tcp_established tcp_time_wait sockets_used tcp_sockets_in_use \
+    conntrack_count conntrack_max disk_read_bytes disk_write_bytes temp cpu_freq <<< "$snapshot" || true
+  rx=${rx:-0}
+  tx=${tx:-0}
+  tcp_established=${tcp_established:-0}
+  tcp_time_wait=${tcp_time_wait:-0}
+  disk_read_bytes=${disk_read_bytes:-0}
+  disk_write_bytes=${disk_write_bytes:-0}
+  set_number_or_null temp_json "$temp"
   return 0
 }
 
@@ -708,7 +1171,217 @@ read_software_raid() {
   return 0
 }
 
+# Output of a SMART/NVMe read that carries health data or a standby notice.
+storage_output_pattern='SMART support is|SMART overall-health|SMART Health Status|SMART Attributes Data Structure|NVMe|Critical Warning|critical_warning|Temperature:|temperature[[:space:]]*:|percentage_used|media_errors|Device Model:|Model Number:|Device is in (STANDBY|SLEEP) mode'
+
+# Read health data of device "$1" with tool "$2" ("smartctl" or "nvme"),
+# through sudo -n when "$3" is 1. With "$4" set to 1 the identity section is
+# skipped because model and serial are already known. Sets smart_output and
+# smart_command_status; returns 1 when the output holds no health data.
+read_storage_device_output() {
+  storage_read_prefix=()
+  if [ "$3" = 1 ]; then
+    command -v sudo >/dev/null 2>&1 || return 1
+    storage_read_prefix=(sudo -n)
+  fi
+  set +e
+  if [ "$2" = nvme ]; then
+    smart_output=$(run_limited "$storage_timeout" "${storage_read_prefix[@]}" nvme smart-log "$1" 2>&1)
+  elif [ "$4" = 1 ]; then
+    smart_output=$(run_limited "$storage_timeout" "${storage_read_prefix[@]}" smartctl -n standby -H -A "$1" 2>&1)
+  else
+    smart_output=$(run_limited "$storage_timeout" "${storage_read_prefix[@]}" smartctl -n standby -a "$1" 2>&1)
+  fi
+  smart_command_status=$?
+  # Sudoers rules from before the standby check only allow "smartctl -a",
+  # which wakes disks in standby but still reads their health.
+  if [ "$3" = 1 ] && [ "$2" != nvme ] && [ "$smart_command_status" != 0 ] \
+    && printf '%s\n' "$smart_output" | grep -Eq '^sudo:|not allowed to execute'; then
+    smart_output=$(run_limited "$storage_timeout" sudo -n smartctl -a "$1" 2>&1)
+    smart_command_status=$?
+  fi
+  set -e
+  printf '%s\n' "$smart_output" | grep -Eq "$storage_output_pattern"
+}
+
+# Probe block device "$1" below sysfs path "$2" and set storage_probe_state
+# (collected, standby, error or missing), storage_probe_entry and the
+# storage_probe_cache_line to remember for the next run. The tool and sudo
+# choice remembered for the device is tried first, and a remembered serial
+# and model skip the identity section. Devices in standby are not spun up.
+probe_storage_device() {
+  device_name=$1
+  block_path=$2
+  device_path="/dev/$device_name"
+  storage_probe_state=missing
+  storage_probe_entry=""
+  storage_probe_cache_line=""
+  model=$(cat "$block_path/device/model" 2>/dev/null | sed 's/^[[:space:]]*//;s/[[:space:]]*$//' || echo "")
+  serial=$(cat "$block_path/device/serial" 2>/dev/null | sed 's/^[[:space:]]*//;s/[[:space:]]*$//' || echo "")
+  capacity=""
+  capacity_sectors=""
+  { read -r capacity_sectors < "$block_path/size"; } 2>/dev/null || true
+  case "$capacity_sectors" in
+    ''|*[!0-9]*) ;;
+    *) capacity=$((capacity_sectors * 512)) ;;
+  esac
+  # The WWID tells a replaced disk from the remembered one at the same name.
+  device_fingerprint=""
+  { read -r device_fingerprint < "$block_path/device/wwid"; } 2>/dev/null \
+    || { read -r device_fingerprint < "$block_path/wwid"; } 2>/dev/null \
+    || device_fingerprint="$model $capacity"
+  device_fingerprint=${device_fingerprint//|/}
+
+  cached_fingerprint=""
+  cached_tool=""
+  cached_sudo=0
+  cached_serial=""
+  cached_model=""
+  if [ -n "${storage_probe_cache[$device_name]:-}" ]; then
+    IFS='|' read -r cached_fingerprint cached_tool cached_sudo cached_serial cached_model \
+      <<< "${storage_probe_cache[$device_name]}"
+    [ "$cached_fingerprint" = "$device_fingerprint" ] || cached_tool=""
+  fi
+
+  storage_attempts=()
+  case "$cached_tool" in
+    smartctl|nvme)
+      identity_known=0
+      [ -n "$cached_serial" ] && identity_known=1
+      storage_attempts+=("$cached_tool:$cached_sudo:$identity_known")
+      ;;
+  esac
+  discovery_tool=""
+  if command -v smartctl >/dev/null 2>&1; then
+    discovery_tool=smartctl
+  elif [[ "$device_name" == nvme* ]] && command -v nvme >/dev/null 2>&1; then
+    discovery_tool=nvme
+  fi
+  if [ -n "$discovery_tool" ]; then
+    for discovery_sudo in 0 1; do
+      [ "${storage_attempts[0]:-}" = "$discovery_tool:$discovery_sudo:0" ] && continue
+      storage_attempts+=("$discovery_tool:$discovery_sudo:0")
+    done
+  fi
+
+  smart_output=""
+  smart_command_status=127
+  storage_tool=""
+  for storage_attempt in "${storage_attempts[@]}"; do
+    IFS=: read -r attempt_tool attempt_sudo attempt_identity <<< "$storage_attempt"
+    if read_storage_device_output "$device_path" "$attempt_tool" "$attempt_sudo" "$attempt_identity"; then
+      storage_tool=$attempt_tool
+      break
+    fi
+  done
+  if [ -z "$storage_tool" ]; then
+    [ "$smart_command_status" -ne 127 ] && storage_probe_state=error
+    return 0
+  fi
+  if [ "$attempt_identity" = 1 ]; then
+    [ -z "$model" ] && model=$cached_model
+    [ -z "$serial" ] && serial=$cached_serial
+  fi
+  protocol="smart"
+  [ "$storage_tool" = nvme ] && protocol="nvme"
+
+  smart_status="unknown"
+  standby=false
+  temperature=""
+  wear_percent=""
+  media_errors=""
+  reallocated_sectors=""
+  pending_sectors=""
+  uncorrectable_sectors=""
+  power_on_hours=""
+  if [[ "$smart_output" =~ Device\ is\ in\ (STANDBY|SLEEP)\ mode ]]; then
+    standby=true
+  else
+    smart_health=$(printf '%s\n' "$smart_output" | awk -F: '/SMART overall-health self-assessment test result|SMART Health Status/ {sub(/^[[:space:]]*/, "", $2); print $2; exit}')
+    critical_warning=$(printf '%s\n' "$smart_output" | awk -F: '/^critical_warning|^Critical Warning/ {gsub(/[[:space:]]/, "", $2); print $2; exit}')
+    case "$smart_health" in
+      *PASSED*|*Passed*|*OK*) smart_status="passed" ;;
+      *FAILED*|*Failed*|*BAD*) smart_status="failed" ;;
+    esac
+    case "$critical_warning" in
+      0|0x0|0x00) [ "$smart_status" = "unknown" ] && smart_status="passed" ;;
+      "") ;;
+      *) smart_status="failed" ;;
+    esac
+    temperature=$(printf '%s\n' "$smart_output" | awk '
+      /Temperature_Celsius|Airflow_Temperature_Cel/ {print $NF; exit}
+      /^Temperature:|^temperature[[:space:]]*:/ {for(i=2;i<=NF;i++) if($i ~ /^[0-9]+([.][0-9]+)?$/) {print $i; exit}}
+      /^Current Drive Temperature:/ {for(i=4;i<=NF;i++) if($i ~ /^[0-9]+$/) {print $i; exit}}
+    ' | head -n 1)
+    wear_percent=$(printf '%s\n' "$smart_output" | awk -F: '/^Percentage Used|^percentage_used/ {gsub(/[^0-9.]/, "", $2); print $2; exit}')
+    if [ -z "$wear_percent" ]; then
+      wear_percent=$(printf '%s\n' "$smart_output" | awk '
+        $2 ~ /^(Media_Wearout_Indicator|Percent_Lifetime_Remain|SSD_Life_Left)$/ && $4 ~ /^[0-9]+$/ {
+          used=100-$4
+          if (used < 0) used=0
+          if (used > 100) used=100
+          print used
+          exit
+        }
+      ')
+    fi
+    media_errors=$(printf '%s\n' "$smart_output" | awk -F: '/^Media and Data Integrity Errors|^media_errors/ {gsub(/[^0-9]/, "", $2); print $2; exit}')
+    reallocated_sectors=$(printf '%s\n' "$smart_output" | awk '/Reallocated_Sector_Ct/ {print $NF; exit}')
+    pending_sectors=$(printf '%s\n' "$smart_output" | awk '/Current_Pending_Sector/ {print $NF; exit}')
+    uncorrectable_sectors=$(printf '%s\n' "$smart_output" | awk '/Offline_Uncorrectable/ {print $NF; exit}')
+    power_on_hours=$(printf '%s\n' "$smart_output" | awk '
+      /Power_On_Hours/ {print $NF; exit}
+      /^Power On Hours:|^power_on_hours[[:space:]]*:/ {for(i=NF;i>=2;i--) if($i ~ /^[0-9]+$/) {print $i; exit}}
+    ' | head -n 1)
+    [ -z "$model" ] && model=$(printf '%s\n' "$smart_output" | awk -F: '/^(Device Model|Model Number):/ {sub(/^[[:space:]]*/, "", $2); print $2; exit}')
+    [ -z "$serial" ] && serial=$(printf '%s\n' "$smart_output" | awk -F: '/^Serial Number:/ {sub(/^[[:space:]]*/, "", $2); print $2; exit}')
+  fi
+  # A standby read returns no identity; keep what an earlier run learned.
+  if [ "$standby" = true ] && [ -n "$cached_tool" ]; then
+    [ -z "$model" ] && model=$cached_model
+    [ -z "$serial" ] && serial=$cached_serial
+  fi
+
+  temperature=${temperature//[^0-9.]/}
+  wear_percent=${wear_percent//[^0-9.]/}
+  media_errors=${media_errors//[^0-9]/}
+  reallocated_sectors=${reallocated_sectors//[^0-9]/}
+  pending_sectors=${pending_sectors//[^0-9]/}
+  uncorrectable_sectors=${uncorrectable_sectors//[^0-9]/}
+  power_on_hours=${power_on_hours//[^0-9]/}
+  device_name_json=$(json_escape "$device_name")
+  device_path_json=$(json_escape "$device_path")
+  model_json=$(json_escape "$model")
+  serial_json=$(json_escape "$serial")
+  protocol_json=$(json_escape "$protocol")
+  smart_status_json=$(json_escape "$smart_status")
+  storage_probe_state=collected
+  [ "$standby" = true ] && storage_probe_state=standby
+  storage_probe_entry="{\"name\":\"$device_name_json\",\"path\":\"$device_path_json\",\"model\":\"$model_json\",\"serial\":\"$serial_json\",\"protocol\":\"$protocol_json\",\"smart_status\":\"$smart_status_json\",\"standby\":$standby,\"capacity_bytes\":$(number_or_null "$capacity"),\"temperature\":$(number_or_null "$temperature"),\"wear_percent\":$(number_or_null "$wear_percent"),\"media_errors\":$(number_or_null "$media_errors"),\"reallocated_sectors\":$(number_or_null "$reallocated_sectors"),\"pending_sectors\":$(number_or_null "$pending_sectors"),\"uncorrectable_sectors\":$(number_or_null "$uncorrectable_sectors"),\"power_on_hours\":$(number_or_null "$power_on_hours")},"
+  storage_probe_cache_line="$device_name|$device_fingerprint|$storage_tool|$attempt_sudo|${serial//|/}|${model//|/}"
+}
+
+# Take over the storage_probe_* result of one device.
+add_storage_probe() {
+  case "$storage_probe_state" in
+    collected|standby)
+      storage_devices_collected=$((storage_devices_collected + 1))
+      [ "$storage_probe_state" = standby ] && storage_devices_standby=$((storage_devices_standby + 1))
+      storage_entries="$storage_entries$storage_probe_entry"
+      ;;
+    error)
+      storage_device_errors=$((storage_device_errors + 1))
+      storage_stats_partial=1
+      ;;
+  esac
+  [ -n "$storage_probe_cache_line" ] && storage_cache_lines+="$storage_probe_cache_line"$'\n'
+  return 0
+}
+
+# Read SMART/NVMe health of the block devices below sysfs root "$1" with up
+# to storage_jobs probes in parallel, then mdadm details of software RAID.
 read_storage_health() {
+  storage_root=${1:-}
   storage_devices_json="[]"
   raid_details_json="[]"
   storage_tools_available=0
@@ -716,125 +1389,79 @@ read_storage_health() {
   storage_stats_partial=0
   storage_devices_seen=0
   storage_devices_collected=0
+  storage_devices_standby=0
   storage_device_errors=0
   storage_entries=""
+  storage_cache_lines=""
+
+  declare -A storage_probe_cache=()
+  storage_cache_file=""
+  prepare_private_cache_dir && storage_cache_file="$private_cache_dir/storage_devices.cache"
+  if [ -n "$storage_cache_file" ] && [ -O "$storage_cache_file" ]; then
+    while IFS= read -r storage_cache_line; do
+      [ -n "$storage_cache_line" ] && storage_probe_cache[${storage_cache_line%%|*}]=${storage_cache_line#*|}
+    done < "$storage_cache_file"
+  fi
 
-  for block_path in /sys/block/*; do
+  storage_probe_dir=$(mktemp -d 2>/dev/null || echo "")
+  storage_device_names=()
+  storage_job_pids=()
+  storage_running_jobs=0
+  for block_path in "$storage_root"/sys/block/*; do
     [ -e "$block_path" ] || continue
     device_name=$(basename "$block_path")
     case "$device_name" in
       loop*|ram*|zram*|md*|dm-*) continue ;;
     esac
     storage_devices_seen=$((storage_devices_seen + 1))
-    device_path="/dev/$device_name"
-    model=$(cat "$block_path/device/model" 2>/dev/null | sed 's/^[[:space:]]*//;s/[[:space:]]*$//' || echo "")
-    serial=$(cat "$block_path/device/serial" 2>/dev/null | sed 's/^[[:space:]]*//;s/[[:space:]]*$//' || echo "")
-    protocol="smart"
-    smart_output=""
-    smart_command_status=127
-
     if command -v smartctl >/dev/null 2>&1; then
       storage_tools_available=1
-      set +e
-      smart_output=$(run_limited "$storage_timeout" smartctl -a "$device_path" 2>&1)
-      smart_command_status=$?
-      if ! printf '%s\n' "$smart_output" | grep -Eq 'SMART support is|SMART overall-health|SMART Health Status|SMART Attributes Data Structure|NVMe|Critical Warning|Temperature:|Device Model:|Model Number:'; then
-        if command -v sudo >/dev/null 2>&1; then
-          smart_output=$(run_limited "$storage_timeout" sudo -n smartctl -a "$device_path" 2>&1)
-          smart_command_status=$?
-        fi
-      fi
-      set -e
     elif [[ "$device_name" == nvme* ]] && command -v nvme >/dev/null 2>&1; then
       storage_tools_available=1
-      protocol="nvme"
-      set +e
-      smart_output=$(run_limited "$storage_timeout" nvme smart-log "$device_path" 2>&1)
-      smart_command_status=$?
-      if [ "$smart_command_status" -ne 0 ] && command -v sudo >/dev/null 2>&1; then
-        smart_output=$(run_limited "$storage_timeout" sudo -n nvme smart-log "$device_path" 2>&1)
-        smart_command_status=$?
-      fi
-      set -e
     fi
-
-    if ! printf '%s\n' "$smart_output" | grep -Eq 'SMART support is|SMART overall-health|SMART Health Status|SMART Attributes Data Structure|NVMe|Critical Warning|critical_warning|Temperature:|temperature[[:space:]]*:|percentage_used|media_errors|Device Model:|Model Number:'; then
-      if [ "$smart_command_status" -ne 127 ]; then
-        storage_device_errors=$((storage_device_errors + 1))
-        storage_stats_partial=1
-      fi
+    if [ -z "$storage_probe_dir" ]; then
+      probe_storage_device "$device_name" "$block_path"
+      add_storage_probe
       continue
     fi
-    storage_devices_collected=$((storage_devices_collected + 1))
-    smart_status="unknown"
-    temperature=""
-    wear_percent=""
-    media_errors=""
-    reallocated_sectors=""
-    pending_sectors=""
-    uncorrectable_sectors=""
-    power_on_hours=""
-    if [ -n "$smart_output" ]; then
-      smart_health=$(printf '%s\n' "$smart_output" | awk -F: '/SMART overall-health self-assessment test result|SMART Health Status/ {sub(/^[[:space:]]*/, "", $2); print $2; exit}')
-      critical_warning=$(printf '%s\n' "$smart_output" | awk -F: '/^critical_warning|^Critical Warning/ {gsub(/[[:space:]]/, "", $2); print $2; exit}')
-      case "$smart_health" in
-        *PASSED*|*Passed*|*OK*) smart_status="passed" ;;
-        *FAILED*|*Failed*|*BAD*) smart_status="failed" ;;
-      esac
-      case "$critical_warning" in
-        0|0x0|0x00) [ "$smart_status" = "unknown" ] && smart_status="passed" ;;
-        "") ;;
-        *) smart_status="failed" ;;
-      esac
-      temperature=$(printf '%s\n' "$smart_output" | awk '
-        /Temperature_Celsius|Airflow_Temperature_Cel/ {print $NF; exit}
-        /^Temperature:|^temperature[[:space:]]*:/ {for(i=2;i<=NF;i++) if($i ~ /^[0-9]+([.][0-9]+)?$/) {print $i; exit}}
-        /^Current Drive Temperature:/ {for(i=4;i<=NF;i++) if($i ~ /^[0-9]+$/) {print $i; exit}}
-      ' | head -n 1)
-      wear_percent=$(printf '%s\n' "$smart_output" | awk -F: '/^Percentage Used|^percentage_used/ {gsub(/[^0-9.]/, "", $2); print $2; exit}')
-      if [ -z "$wear_percent" ]; then
-        wear_percent=$(printf '%s\n' "$smart_output" | awk '
-          $2 ~ /^(Media_Wearout_Indicator|Percent_Lifetime_Remain|SSD_Life_Left)$/ && $4 ~ /^[0-9]+$/ {
-            used=100-$4
-            if (used < 0) used=0
-            if (used > 100) used=100
-            print used
-            exit
-          }
-        ')
-      fi
-      media_errors=$(printf '%s\n' "$smart_output" | awk -F: '/^Media and Data Integrity Errors|^media_errors/ {gsub(/[^0-9]/, "", $2); print $2; exit}')
-      reallocated_sectors=$(printf '%s\n' "$smart_output" | awk '/Reallocated_Sector_Ct/ {print $NF; exit}')
-      pending_sectors=$(printf '%s\n' "$smart_output" | awk '/Current_Pending_Sector/ {print $NF; exit}')
-      uncorrectable_sectors=$(printf '%s\n' "$smart_output" | awk '/Offline_Uncorrectable/ {print $NF; exit}')
-      power_on_hours=$(printf '%s\n' "$smart_output" | awk '
-        /Power_On_Hours/ {print $NF; exit}
-        /^Power On Hours:|^power_on_hours[[:space:]]*:/ {for(i=NF;i>=2;i--) if($i ~ /^[0-9]+$/) {print $i; exit}}
-      ' | head -n 1)
-      [ -z "$model" ] && model=$(printf '%s\n' "$smart_output" | awk -F: '/^(Device Model|Model Number):/ {sub(/^[[:space:]]*/, "", $2); print $2; exit}')
-      [ -z "$serial" ] && serial=$(printf '%s\n' "$smart_output" | awk -F: '/^Serial Number:/ {sub(/^[[:space:]]*/, "", $2); print $2; exit}')
+    storage_device_names+=("$device_name")
+    if [ "$storage_running_jobs" -ge "$storage_jobs" ]; then
+      wait -n 2>/dev/null || wait "${storage_job_pids[@]}"
+      storage_running_jobs=$((storage_running_jobs - 1))
     fi
-
-    temperature=${temperature//[^0-9.]/}
-    wear_percent=${wear_percent//[^0-9.]/}
-    media_errors=${media_errors//[^0-9]/}
-    reallocated_sectors=${reallocated_sectors//[^0-9]/}
-    pending_sectors=${pending_sectors//[^0-9]/}
-    uncorrectable_sectors=${uncorrectable_sectors//[^0-9]/}
-    power_on_hours=${power_on_hours//[^0-9]/}
-    device_name_json=$(json_escape "$device_name")
-    device_path_json=$(json_escape "$device_path")
-    model_json=$(json_escape "$model")
-    serial_json=$(json_escape "$serial")
-    protocol_json=$(json_escape "$protocol")
-    smart_status_json=$(json_escape "$smart_status")
-    storage_entries="$storage_entries{\"name\":\"$device_name_json\",\"path\":\"$device_path_json\",\"model\":\"$model_json\",\"serial\":\"$serial_json\",\"protocol\":\"$protocol_json\",\"smart_status\":\"$smart_status_json\",\"temperature\":$(number_or_null "$temperature"),\"wear_percent\":$(number_or_null "$wear_percent"),\"media_errors\":$(number_or_null "$media_errors"),\"reallocated_sectors\":$(number_or_null "$reallocated_sectors"),\"pending_sectors\":$(number_or_null "$pending_sectors"),\"uncorrectable_sectors\":$(number_or_null "$uncorrectable_sectors"),\"power_on_hours\":$(number_or_null "$power_on_hours")},"
+    (
+      set +e
+      probe_storage_device "$device_name" "$block_path"
+      dump_variables storage_probe_state storage_probe_entry storage_probe_cache_line
+    ) > "$storage_probe_dir/$device_name.vars" 2>/dev/null &
+    storage_job_pids+=("$!")
+    storage_running_jobs=$((storage_running_jobs + 1))
   done
+  if [ -n "$storage_probe_dir" ]; then
+    [ "${#storage_job_pids[@]}" -gt 0 ] && wait "${storage_job_pids[@]}"
+    for device_name in "${storage_device_names[@]}"; do
+      storage_probe_state=error
+      storage_probe_entry=""
+      storage_probe_cache_line=""
+      # The probe job wrote its results there as printf %q assignments.
+      # shellcheck source=/dev/null
+      . "$storage_probe_dir/$device_name.vars" || storage_probe_state=error
+      add_storage_probe
+    done
+    rm -rf "$storage_probe_dir"
+  fi
   [ -n "$storage_entries" ] && storage_devices_json="[${storage_entries%,}]"
 
+  if [ -n "$storage_cache_file" ]; then
+    storage_cache_tmp="$storage_cache_file.$$"
+    if printf '%s' "$storage_cache_lines" > "$storage_cache_tmp" 2>/dev/null; then
+      mv -f "$storage_cache_tmp" "$storage_cache_file" 2>/dev/null || rm -f "$storage_cache_tmp"
+    fi
+  fi
+
   if command -v mdadm >/dev/null 2>&1; then
     raid_detail_entries=""
-    for md_sys_path in /sys/block/md*; do
+    for md_sys_path in "$storage_root"/sys/block/md*; do
       [ -e "$md_sys_path" ] || continue
       md_name=$(basename "$md_sys_path")
       md_path="/dev/$md_name"
@@ -887,24 +1514,6 @@ read_service_status() {
   fi
 }
 
-read_temperature() {
-  temp=""
-  if [ -f /sys/class/thermal/thermal_zone0/temp ]; then
-    t=$(cat /sys/class/thermal/thermal_zone0/temp 2>/dev/null || echo "")
-    if [ -n "$t" ]; then temp=$(awk -v v="$t" 'BEGIN{printf "%.1f", (v>=1000?v/1000:v)}'); fi
-  fi
-  if [ -n "$temp" ]; then temp_json=$temp; else temp_json=null; fi
-}
-
-read_network_bytes() {
-  rx=0
-  tx=0
-  if [ -r /proc/net/dev ]; then
-    rx=$(awk -F'[: ]+' '/:/{if($1!="lo"){rx+=$3; tx+=$11}} END{print rx+0}' /proc/net/dev 2>/dev/null || echo 0)
-    tx=$(awk -F'[: ]+' '/:/{if($1!="lo"){rx+=$3; tx+=$11}} END{print tx+0}' /proc/net/dev 2>/dev/null || echo 0)
-  fi
-}
-
 read_boot_and_kernel_status() {
   reboot_required=0
   last_boot=""
@@ -914,13 +1523,13 @@ read_boot_and_kernel_status() {
     reboot_required=1
   fi
 
-  if [ -r /proc/uptime ] && command -v date >/dev/null 2>&1; then
+  # read_uptime already parsed /proc/uptime for this sample.
+  if [ -n "$uptime" ] && command -v date >/dev/null 2>&1; then
     set +e
-    uptime_seconds=$(awk '{print int($1)}' /proc/uptime 2>/dev/null)
     now_seconds=$(date +%s 2>/dev/null)
     set -e
-    if [ -n "$uptime_seconds" ] && [ -n "$now_seconds" ]; then
-      boot_epoch=$((now_seconds - uptime_seconds))
+    if [ -n "$now_seconds" ]; then
+      boot_epoch=$((now_seconds - uptime))
       last_boot=$(date -u -d "@$boot_epoch" +%Y-%m-%dT%H:%M:%SZ 2>/dev/null || echo "")
     fi
   fi
@@ -1154,23 +1763,6 @@ read_fail2ban_status() {
   [ -n "$jail_entries" ] && fail2ban_jails_json="[${jail_entries%,}]"
 }
 
-read_disk_io_bytes() {
-  disk_read_bytes=0
-  disk_write_bytes=0
-  for stat_file in /sys/block/*/stat; do
-    [ -r "$stat_file" ] || continue
-    device=$(basename "$(dirname "$stat_file")")
-    case "$device" in
-      loop*|ram*|zram*) continue ;;
-    esac
-    read _reads _reads_merged sectors_read _read_ms _writes _writes_merged sectors_written _write_ms _ios _io_ms _weighted_ms < "$stat_file" || continue
-    sectors_read=${sectors_read:-0}
-    sectors_written=${sectors_written:-0}
-    disk_read_bytes=$((disk_read_bytes + sectors_read * 512))
-    disk_write_bytes=$((disk_write_bytes + sectors_written * 512))
-  done
-}
-
 compute_power() {
   power_w_json=null
   energy_counter_json=null
@@ -1190,77 +1782,96 @@ compute_power() {
     if [ -n "$power_energy_range" ]; then
       energy_range_json=$power_energy_range
     fi
+  elif [ -n "$power_energy_before" ]; then
+    # Delta mode: Home Assistant derives watts from consecutive counters.
+    energy_counter_json=$power_energy_before
+    if [ -n "$power_energy_range" ]; then
+      energy_range_json=$power_energy_range
+    fi
   fi
 }
 
 # Prepare JSON-safe fallbacks for numeric values
 prepare_numeric_json_values() {
-  cpu_json=$(number_or_null "$cpu")
-  mem_json=$(number_or_null "$mem")
-  disk_json=$(number_or_null "$disk")
-  disk_total_bytes_json=$(number_or_null "$disk_total_bytes")
-  uptime_json=$(number_or_null "$uptime")
-  rx_json=$(number_or_null "$rx")
-  tx_json=$(number_or_null "$tx")
-  ram_json=$(number_or_null "$ram")
-  cores_json=$(number_or_null "$cores")
-  load_1_json=$(number_or_null "$load_1")
-  load_5_json=$(number_or_null "$load_5")
-  load_15_json=$(number_or_null "$load_15")
-  pkg_count_json=$(number_or_null "$pkg_count")
-  docker_json=$(number_or_null "$docker")
-  swap_usage_json=$(number_or_null "$swap_usage_json")
-  swap_total_json=$(number_or_null "$swap_total_json")
-  reboot_required_json=$(number_or_null "$reboot_required")
-  security_updates_json=$(number_or_null "$security_updates")
-  failed_systemd_units_json_count=$(number_or_null "$failed_systemd_units")
-  journal_errors_json=$(number_or_null "$journal_errors")
-  root_fs_readonly_json=$(number_or_null "$root_fs_readonly")
-  failed_ssh_logins_15m_json=$(number_or_null "$failed_ssh_logins_15m")
-  firewall_active_json=$(number_or_null "$firewall_active")
+  set_number_or_null cpu_json "$cpu"
+  set_number_or_null mem_json "$mem"
+  set_number_or_null disk_json "$disk"
+  set_number_or_null disk_total_bytes_json "$disk_total_bytes"
+  set_number_or_null uptime_json "$uptime"
+  set_number_or_null sample_uptime_json "$sample_uptime"
+  set_number_or_null rx_json "$rx"
+  set_number_or_null tx_json "$tx"
+  set_number_or_null ram_json "$ram"
+  set_number_or_null cores_json "$cores"
+  set_number_or_null load_1_json "$load_1"
+  set_number_or_null load_5_json "$load_5"
+  set_number_or_null load_15_json "$load_15"
+  set_number_or_null pkg_count_json "$pkg_count"
+  set_number_or_null docker_json "$docker"
+  set_number_or_null swap_usage_json "$swap_usage_json"
+  set_number_or_null swap_total_json "$swap_total_json"
+  set_number_or_null reboot_required_json "$reboot_required"
+  set_number_or_null security_updates_json "$security_updates"
+  set_number_or_null failed_systemd_units_json_count "$failed_systemd_units"
+  set_number_or_null journal_errors_json "$journal_errors"
+  set_number_or_null root_fs_readonly_json "$root_fs_readonly"
+  set_number_or_null failed_ssh_logins_15m_json "$failed_ssh_logins_15m"
+  set_number_or_null firewall_active_json "$firewall_active"
   firewall_backend_json=$(json_escape "$firewall_backend")
-  firewall_rules_count_json=$(number_or_null "$firewall_rules_count")
-  fail2ban_active_json=$(number_or_null "$fail2ban_active")
-  fail2ban_banned_count_json=$(number_or_null "$fail2ban_banned_count")
-  disk_read_bytes_json=$(number_or_null "$disk_read_bytes")
-  disk_write_bytes_json=$(number_or_null "$disk_write_bytes")
-  process_total_json=$(number_or_null "$process_total")
-  process_running_json=$(number_or_null "$process_running")
-  process_zombies_json=$(number_or_null "$process_zombies")
-  tcp_established_json=$(number_or_null "$tcp_established")
-  tcp_time_wait_json=$(number_or_null "$tcp_time_wait")
-  sockets_used_json=$(number_or_null "$sockets_used")
-  tcp_sockets_in_use_json=$(number_or_null "$tcp_sockets_in_use")
-  conntrack_count_json=$(number_or_null "$conntrack_count")
-  conntrack_max_json=$(number_or_null "$conntrack_max")
-  software_raid_arrays_json=$(number_or_null "$software_raid_arrays")
-  software_raid_degraded_json=$(number_or_null "$software_raid_degraded")
-  software_raid_rebuild_active_json=$(number_or_null "$software_raid_rebuild_active")
-  software_raid_rebuild_progress_json=$(number_or_null "$software_raid_rebuild_progress")
-  software_raid_rebuild_remaining_minutes_json=$(number_or_null "$software_raid_rebuild_remaining_minutes")
+  set_number_or_null firewall_rules_count_json "$firewall_rules_count"
+  set_number_or_null fail2ban_active_json "$fail2ban_active"
+  set_number_or_null fail2ban_banned_count_json "$fail2ban_banned_count"
+  set_number_or_null disk_read_bytes_json "$disk_read_bytes"
+  set_number_or_null disk_write_bytes_json "$disk_write_bytes"
+  set_number_or_null process_total_json "$process_total"
+  set_number_or_null process_running_json "$process_running"
+  set_number_or_null process_zombies_json "$process_zombies"
+  set_number_or_null tcp_established_json "$tcp_established"
+  set_number_or_null tcp_time_wait_json "$tcp_time_wait"
+  set_number_or_null sockets_used_json "$sockets_used"
+  set_number_or_null tcp_sockets_in_use_json "$tcp_sockets_in_use"
+  set_number_or_null conntrack_count_json "$conntrack_count"
+  set_number_or_null conntrack_max_json "$conntrack_max"
+  set_number_or_null software_raid_arrays_json "$software_raid_arrays"
+  set_number_or_null software_raid_degraded_json "$software_raid_degraded"
+  set_number_or_null software_raid_rebuild_active_json "$software_raid_rebuild_active"
+  set_number_or_null software_raid_rebuild_progress_json "$software_raid_rebuild_progress"
+  set_number_or_null software_raid_rebuild_remaining_minutes_json "$software_raid_rebuild_remaining_minutes"
 }
 
 print_package_json() {
   pkg_count_json=$(number_or_null "$pkg_count")
   security_updates_json=$(number_or_null "$security_updates")
   pkg_updates_complete_json=$(number_or_null "$pkg_updates_complete")
-  printf '{"pkg_count":%s,"pkg_list":"%s","security_updates":%s,"pkg_updates_complete":%s}\n' \
-    "$pkg_count_json" "$pkg_list_json" "$security_updates_json" "$pkg_updates_complete_json"
+  set_collector_profile_field
+  printf '{"pkg_count":%s,"pkg_list":"%s","security_updates":%s,"pkg_updates_complete":%s%s}\n' \
+    "$pkg_count_json" "$pkg_list_json" "$security_updates_json" "$pkg_updates_complete_json" \
+    "$collector_profile_field"
 }
 
 print_docker_json() {
+  set_collector_profile_field
   docker_json=$(number_or_null "$docker")
   docker_stats_complete_json=$(number_or_null "$docker_stats_complete")
   docker_stats_partial_json=$(number_or_null "$docker_stats_partial")
-  printf '{"docker":%s,"containers":"%s","container_stats":%s,"docker_stats_complete":%s,"docker_stats_partial":%s,"docker_images_size_bytes":%s,"docker_containers_size_bytes":%s,"docker_volumes_size_bytes":%s,"docker_build_cache_size_bytes":%s}\n' \
+  printf '{"docker":%s,"containers":"%s","container_stats":%s,"docker_stats_complete":%s,"docker_stats_partial":%s,"docker_sample_uptime":%s,"docker_api":%s%s}\n' \
     "$docker_json" "$containers_json" "$container_stats_json" "$docker_stats_complete_json" "$docker_stats_partial_json" \
-    "$(number_or_null "$docker_images_size_bytes")" "$(number_or_null "$docker_containers_size_bytes")" "$(number_or_null "$docker_volumes_size_bytes")" "$(number_or_null "$docker_build_cache_size_bytes")"
+    "$(number_or_null "$docker_sample_uptime")" "$docker_api_json" "$collector_profile_field"
+}
+
+print_docker_disk_json() {
+  set_collector_profile_field
+  printf '{"docker":%s,"docker_disk_complete":%s,"docker_images_size_bytes":%s,"docker_containers_size_bytes":%s,"docker_volumes_size_bytes":%s,"docker_build_cache_size_bytes":%s,"docker_df":%s%s}\n' \
+    "$(number_or_null "$docker")" "$docker_disk_complete" \
+    "$(number_or_null "$docker_images_size_bytes")" "$(number_or_null "$docker_containers_size_bytes")" "$(number_or_null "$docker_volumes_size_bytes")" "$(number_or_null "$docker_build_cache_size_bytes")" \
+    "$docker_df_json" "$collector_profile_field"
 }
 
 print_storage_json() {
-  printf '{"storage_devices":%s,"raid_details":%s,"storage_tools_available":%s,"storage_stats_complete":%s,"storage_stats_partial":%s,"storage_devices_seen":%s,"storage_devices_collected":%s,"storage_device_errors":%s}\n' \
+  set_collector_profile_field
+  printf '{"storage_devices":%s,"raid_details":%s,"storage_tools_available":%s,"storage_stats_complete":%s,"storage_stats_partial":%s,"storage_devices_seen":%s,"storage_devices_collected":%s,"storage_devices_standby":%s,"storage_device_errors":%s%s}\n' \
     "$storage_devices_json" "$raid_details_json" "$storage_tools_available" "$storage_stats_complete" "$storage_stats_partial" \
-    "$storage_devices_seen" "$storage_devices_collected" "$storage_device_errors"
+    "$storage_devices_seen" "$storage_devices_collected" "$storage_devices_standby" "$storage_device_errors" "$collector_profile_field"
 }
 
 init_package_defaults() {
@@ -1278,80 +1889,590 @@ init_docker_defaults() {
   container_stats="[]"
   docker_stats_complete=""
   docker_stats_partial=""
-  docker_images_size_bytes=""
-  docker_containers_size_bytes=""
-  docker_volumes_size_bytes=""
-  docker_build_cache_size_bytes=""
+  docker_sample_uptime=""
+  docker_api_json=null
   containers_json=""
   container_stats_json="[]"
 }
 
+read_core_count() {
+  cores=$(nproc 2>/dev/null || getconf _NPROCESSORS_ONLN 2>/dev/null || echo "")
+}
+
+# Set fork_counter to the number of processes forked on the host since boot.
+read_fork_counter() {
+  fork_counter=""
+  [ -r /proc/stat ] || return 0
+  while read -r stat_key stat_value _; do
+    if [ "$stat_key" = "processes" ]; then
+      fork_counter=$stat_value
+      return 0
+    fi
+  done < /proc/stat
+  return 0
+}
+
+# Set clock_us and clock_ms to the wall clock without forking. Bash has no
+# monotonic clock builtin; EPOCHREALTIME is the finest one available.
+read_clock_ms() {
+  clock_us=${EPOCHREALTIME:-}
+  clock_us=${clock_us//[.,]/}
+  case "$clock_us" in
+    ''|*[!0-9]*) clock_us=$((SECONDS * 1000000)) ;;
+  esac
+  clock_ms=$((clock_us / 1000))
+}
+
+# Start a new collector_profile object for one base sample or slow section.
+reset_collector_profile() {
+  collector_profile_json=""
+  read_clock_ms
+  collector_profile_origin_us=$clock_us
+}
+
+# Run function "$1". With VSERVER_SSH_STATS_PROFILE=1, record its start and
+# end in milliseconds since the sample started.
+run_profiled() {
+  if [ "$collector_profile_enabled" != 1 ]; then
+    "$1"
+    return 0
+  fi
+  read_clock_ms
+  profile_start_us=$((clock_us - collector_profile_origin_us))
+  "$1"
+  read_clock_ms
+  profile_end_us=$((clock_us - collector_profile_origin_us))
+  [ "$profile_end_us" -ge "$profile_start_us" ] || profile_end_us=$profile_start_us
+  printf -v profile_entry '"%s":{"start_ms":%d.%03d,"end_ms":%d.%03d}' "$1" \
+    $((profile_start_us / 1000)) $((profile_start_us % 1000)) \
+    $((profile_end_us / 1000)) $((profile_end_us % 1000))
+  collector_profile_json="$collector_profile_json$profile_entry,"
+}
+
+# Set collector_profile_field to the JSON member appended to the document,
+# or to nothing when profiling is off.
+set_collector_profile_field() {
+  collector_profile_field=""
+  if [ "$collector_profile_enabled" = 1 ]; then
+    collector_profile_field=",\"collector_profile\":{${collector_profile_json%,}}"
+  fi
+}
+
+# Run the functions "$2"... as base section "$1" and record its wall time and
+# the forks the host made meanwhile. Forks are read from /proc/stat, so they
+# include unrelated processes started on busy hosts.
+run_base_section() {
+  base_section=$1
+  shift
+  if [ -n "${skipped_sections[$base_section]:-}" ]; then
+    base_skipped_sections_json="$base_skipped_sections_json\"$base_section\","
+    return 0
+  fi
+  read_fork_counter
+  section_forks_before=$fork_counter
+  read_clock_ms
+  section_started_ms=$clock_ms
+  for section_step in "$@"; do
+    run_base_step "$section_step"
+  done
+  read_clock_ms
+  read_fork_counter
+  section_forks=""
+  if [ -n "$section_forks_before" ] && [ -n "$fork_counter" ]; then
+    section_forks=$((fork_counter - section_forks_before))
+  fi
+  base_section_time_json="$base_section_time_json\"$base_section\":$((clock_ms - section_started_ms)),"
+  set_number_or_null section_forks_json "$section_forks"
+  # Assigned by set_number_or_null through printf -v.
+  # shellcheck disable=SC2154
+  base_section_forks_json="$base_section_forks_json\"$base_section\":$section_forks_json,"
+}
+
+# Sections that only shell out to service tools run as background jobs, so a
+# slow or hung tool delays neither the /proc readers nor the other sections.
+# Entries are "name:function:variables set by the function".
+base_background_sections=(
+  "services:read_service_status:ssh_enabled,web,vnc"
+  "systemd:read_systemd_failures:failed_systemd_units,failed_systemd_units_json"
+  "journal:read_journal_errors:journal_errors"
+  "ssh_logins:read_failed_ssh_logins:failed_ssh_logins_15m"
+  "firewall:read_firewall_status:firewall_active,firewall_backend,firewall_rules_count"
+  "fail2ban:read_fail2ban_status:fail2ban_active,fail2ban_banned_count,fail2ban_jails_json"
+)
+
+# Slow-changing foreground sections that may be served from the result
+# cache, in the format of base_background_sections. The background sections
+# are cacheable as well.
+base_cached_sections=(
+  "os:read_os_info:os,os_json"
+  "mac:read_mac_addresses:mac_address,mac_address_json,mac_addresses_json"
+  "boot:read_boot_and_kernel_status:reboot_required,last_boot_json,kernel_version_json"
+)
+
+# Set private_cache_dir to a directory below the user's runtime dir for
+# state kept between runs. The directory and files must belong to this user
+# because they are sourced. Returns 1 when no such directory is available.
+prepare_private_cache_dir() {
+  private_cache_dir=""
+  cache_dir="${XDG_RUNTIME_DIR:-${TMPDIR:-/tmp}}/vserver_ssh_stats-${UID:-0}"
+  if [ ! -d "$cache_dir" ]; then
+    mkdir -m 700 "$cache_dir" 2>/dev/null || return 1
+  fi
+  [ -O "$cache_dir" ] || return 1
+  private_cache_dir=$cache_dir
+}
+
+# Use the private directory for cached section results.
+prepare_result_cache() {
+  result_cache_dir=""
+  [ "${#cache_ttls[@]}" -gt 0 ] || return 0
+  prepare_private_cache_dir || return 0
+  result_cache_dir=$private_cache_dir
+}
+
+# Load section "$1" from the result cache when it is younger than its TTL and
+# the host did not reboot since it was stored. Records the age on success.
+load_cached_section() {
+  [ -n "$result_cache_dir" ] || return 1
+  cache_ttl=${cache_ttls[$1]:-0}
+  [ "$cache_ttl" -gt 0 ] || return 1
+  case "$uptime" in
+    ''|*[!0-9]*) return 1 ;;
+  esac
+  cache_file="$result_cache_dir/$1.vars"
+  [ -O "$cache_file" ] || return 1
+  cache_header=""
+  read -r cache_header < "$cache_file" || return 1
+  cached_uptime=${cache_header#cached_uptime=}
+  case "$cached_uptime" in
+    ''|*[!0-9]*) return 1 ;;
+  esac
+  [ "$uptime" -ge "$cached_uptime" ] || return 1
+  [ $((uptime - cached_uptime)) -lt "$cache_ttl" ] || return 1
+  # The cache file holds the printf %q assignments of store_cached_section.
+  # shellcheck source=/dev/null
+  . "$cache_file"
+  base_cache_age_json="$base_cache_age_json\"$1\":$((uptime - cached_uptime)),"
+}
+
+# Store the variables listed comma separated in "$2" for section "$1".
+store_cached_section() {
+  [ -n "$result_cache_dir" ] || return 0
+  [ "${cache_ttls[$1]:-0}" -gt 0 ] || return 0
+  case "$uptime" in
+    ''|*[!0-9]*) return 0 ;;
+  esac
+  cache_tmp="$result_cache_dir/.$1.$$"
+  IFS=, read -r -a cache_variable_names <<< "$2"
+  if { printf 'cached_uptime=%s\n' "$uptime"; dump_variables "${cache_variable_names[@]}"; } \
+    > "$cache_tmp" 2>/dev/null; then
+    mv -f "$cache_tmp" "$result_cache_dir/$1.vars" 2>/dev/null || rm -f "$cache_tmp"
+  fi
+  base_cache_age_json="$base_cache_age_json\"$1\":0,"
+  return 0
+}
+
+# Run step "$1" of a base section, serving cacheable sections from the cache.
+run_base_step() {
+  for cached_section in "${base_cached_sections[@]}"; do
+    IFS=: read -r cached_name cached_function cached_variables <<< "$cached_section"
+    [ "$cached_function" = "$1" ] || continue
+    load_cached_section "$cached_name" && return 0
+    run_profiled "$1"
+    store_cached_section "$cached_name" "$cached_variables"
+    return 0
+  done
+  run_profiled "$1"
+}
+
+# Print assignments for the variables "$@" that the caller can source.
+dump_variables() {
+  for dump_name in "$@"; do
+    printf '%s=%q\n' "$dump_name" "${!dump_name}"
+  done
+}
+
+# Print a script for a fresh bash that gets this script's functions and
+# settings, runs section function "$1" and prints assignments for its
+# comma separated variables "$2".
+print_background_section_script() {
+  declare -f
+  declare -p collector_mode pkg_timeout docker_timeout storage_timeout prev_uptime \
+    docker_quick_timeout collector_profile_enabled collector_profile_origin_us
+  printf 'set -e\ncollector_profile_json=""\nrun_profiled %s\n' "$1"
+  printf 'dump_variables %s collector_profile_json\n' "${2//,/ }"
+}
+
+# Start each background section in a fresh bash bounded by run_limited. Its
+# variables are written to a temp file and read back by
+# join_background_sections. Without mktemp the sections run the same way in
+# the foreground when they are joined. Skipped sections and sections served
+# from the result cache are not started.
+start_background_sections() {
+  background_pids=()
+  settled_background_sections=","
+  for background_section in "${base_background_sections[@]}"; do
+    IFS=: read -r job_name job_function job_variables <<< "$background_section"
+    if [ -n "${skipped_sections[$job_name]:-}" ]; then
+      base_skipped_sections_json="$base_skipped_sections_json\"$job_name\","
+      settled_background_sections="$settled_background_sections$job_name,"
+    elif load_cached_section "$job_name"; then
+      settled_background_sections="$settled_background_sections$job_name,"
+    fi
+  done
+  background_dir=$(mktemp -d 2>/dev/null || echo "")
+  [ -n "$background_dir" ] || return 0
+  for background_section in "${base_background_sections[@]}"; do
+    IFS=: read -r job_name job_function job_variables <<< "$background_section"
+    case "$settled_background_sections" in
+      *",$job_name,"*) continue ;;
+    esac
+    (
+      set +e
+      read_clock_ms
+      job_started_ms=$clock_ms
+      print_background_section_script "$job_function" "$job_variables" \
+        | run_limited "$section_timeout" "${BASH:-bash}" -s > "$background_dir/$job_name.vars" 2>/dev/null
+      job_status=$?
+      read_clock_ms
+      printf '%s %s\n' "$job_status" $((clock_ms - job_started_ms)) > "$background_dir/$job_name.status"
+    ) &
+    background_pids+=("$!")
+  done
+}
+
+# Wait for the background sections and take over their variables. A section
+# that failed or hit its timeout reports null values and is listed in
+# partial_sections; the other sections are unaffected.
+join_background_sections() {
+  if [ "${#background_pids[@]}" -gt 0 ]; then
+    wait "${background_pids[@]}" || true
+  fi
+  for background_section in "${base_background_sections[@]}"; do
+    IFS=: read -r job_name job_function job_variables <<< "$background_section"
+    case "$settled_background_sections" in
+      *",$job_name,"*) continue ;;
+    esac
+    job_status=1
+    job_time=""
+    if [ -n "$background_dir" ]; then
+      read -r job_status job_time < "$background_dir/$job_name.status" || true
+      if [ "$job_status" = 0 ]; then
+        parent_profile_json=$collector_profile_json
+        # The job wrote its variables there as printf %q assignments.
+        # shellcheck source=/dev/null
+        . "$background_dir/$job_name.vars" || job_status=1
+        collector_profile_json="$parent_profile_json$collector_profile_json"
+      fi
+    else
+      read_clock_ms
+      job_started_ms=$clock_ms
+      set +e
+      job_output=$(print_background_section_script "$job_function" "$job_variables" \
+        | run_limited "$section_timeout" "${BASH:-bash}" -s 2>/dev/null)
+      job_status=$?
+      set -e
+      if [ "$job_status" = 0 ]; then
+        parent_profile_json=$collector_profile_json
+        # The output holds printf %q assignments, as in the .vars files.
+        eval "$job_output" || job_status=1
+        collector_profile_json="$parent_profile_json$collector_profile_json"
+      fi
+      read_clock_ms
+      job_time=$((clock_ms - job_started_ms))
+    fi
+    if [ "$job_status" != 0 ]; then
+      IFS=, read -r -a job_variable_names <<< "$job_variables"
+      for job_variable in "${job_variable_names[@]}"; do
+        case "$job_variable" in
+          *_json) printf -v "$job_variable" 'null' ;;
+          *) printf -v "$job_variable" '' ;;
+        esac
+      done
+      base_partial_sections_json="$base_partial_sections_json\"$job_name\","
+    else
+      store_cached_section "$job_name" "$job_variables"
+    fi
+    set_number_or_null job_time_json "$job_time"
+    # Assigned by set_number_or_null through printf -v.
+    # shellcheck disable=SC2154
+    base_section_time_json="$base_section_time_json\"$job_name\":$job_time_json,"
+    base_section_forks_json="$base_section_forks_json\"$job_name\":null,"
+  done
+  if [ -n "$background_dir" ]; then
+    rm -rf "$background_dir"
+  fi
+  return 0
+}
+
+collect_base_sample() {
+  base_section_time_json=""
+  base_section_forks_json=""
+  base_partial_sections_json=""
+  base_skipped_sections_json=""
+  base_cache_age_json=""
+  reset_collector_profile
+  prepare_result_cache
+  # The result cache is keyed on uptime, so read it before loading sections.
+  read_uptime
+  start_background_sections
+  # Run collectors (order matters for power deltas; the snapshot provides
+  # cpu_freq for read_load_and_freq)
+  run_base_section cpu read_uptime read_power_metrics read_cpu_stats
+  run_base_section snapshot read_proc_snapshot
+  run_base_section system read_mem_stats read_core_count read_load_and_freq read_os_info
+  if [ "$collector_mode" = "full" ]; then
+    run_base_section packages collect_pkg_updates
+    run_base_section docker read_docker_stats
+  else
+    init_package_defaults
+    init_docker_defaults
+  fi
+  run_base_section processes read_top_processes read_process_state
+  run_base_section network read_mac_addresses read_primary_ip
+  run_base_section host read_software_raid read_boot_and_kernel_status
+  if [ "$collector_mode" = "full" ]; then
+    run_base_section security_updates collect_security_updates
+  fi
+  run_base_section disk read_disk_stats read_root_filesystem_status
+  run_base_section background_wait join_background_sections
+  run_base_section finalize compute_power prepare_numeric_json_values fill_missing_json_values
+  set_collector_profile_field
+}
+
+# Sections skipped on this poll leave their JSON values unset; report them as
+# null so the document stays valid.
+fill_missing_json_values() {
+  for json_variable in disk_stats_json mac_addresses_json top_processes_json \
+    process_states_json process_users_json process_cgroups_json raid_arrays_json \
+    failed_systemd_units_json fail2ban_jails_json; do
+    [ -n "${!json_variable:-}" ] || printf -v "$json_variable" 'null'
+  done
+}
+
+# The *_json values are assigned by set_number_or_null through printf -v.
+# shellcheck disable=SC2154
+print_base_json() {
+  printf '{"cpu":%s,"mem":%s,"disk":%s,"disk_capacity_total":%s,"disk_stats":%s,"uptime":%s,"temp":%s,"rx":%s,"tx":%s,"ram":%s,"cores":%s,"load_1":%s,"load_5":%s,"load_15":%s,"cpu_freq":%s,"os":"%s","pkg_count":%s,"pkg_list":"%s","docker":%s,"containers":"%s","container_stats":%s,"docker_api":%s,"mac_address":"%s","mac_addresses":%s,"top_processes":%s,"process_total":%s,"process_running":%s,"process_zombies":%s,"process_states":%s,"process_users":%s,"process_cgroups":%s,"tcp_established":%s,"tcp_time_wait":%s,"sockets_used":%s,"tcp_sockets_in_use":%s,"conntrack_count":%s,"conntrack_max":%s,"software_raid_arrays":%s,"software_raid_degraded":%s,"software_raid_rebuild_active":%s,"software_raid_rebuild_progress":%s,"software_raid_rebuild_remaining_minutes":%s,"raid_arrays":%s,"vnc":"%s","web":"%s","ssh":"%s","power_w":%s,"energy_uj":%s,"energy_range_uj":%s,"swap_usage":%s,"swap_total":%s,"reboot_required":%s,"security_updates":%s,"last_boot":"%s","kernel_version":"%s","primary_ip":"%s","failed_systemd_units":%s,"failed_systemd_units_list":%s,"journal_errors":%s,"root_fs_readonly":%s,"failed_ssh_logins_15m":%s,"firewall_active":%s,"firewall_backend":"%s","firewall_rules_count":%s,"fail2ban_active":%s,"fail2ban_banned_count":%s,"fail2ban_jails":%s,"disk_read_bytes":%s,"disk_write_bytes":%s,"cpu_jiffies":%s,"sample_uptime":%s,"section_time_ms":{%s},"section_forks":{%s},"partial_sections":[%s],"skipped_sections":[%s],"cache_age_seconds":{%s}%s}\n' \
+    "$cpu_json" "$mem_json" "$disk_json" "$disk_total_bytes_json" "$disk_stats_json" "$uptime_json" "$temp_json" "$rx_json" "$tx_json" "$ram_json" "$cores_json" "$load_1_json" \
+    "$load_5_json" "$load_15_json" "$cpu_freq_json" "$os_json" "$pkg_count_json" "$pkg_list_json" "$docker_json" "$containers_json" "$container_stats_json" "$docker_api_json" \
+    "$mac_address_json" "$mac_addresses_json" "$top_processes_json" "$process_total_json" "$process_running_json" "$process_zombies_json" \
+    "$process_states_json" "$process_users_json" "$process_cgroups_json" \
+    "$tcp_established_json" "$tcp_time_wait_json" "$sockets_used_json" "$tcp_sockets_in_use_json" "$conntrack_count_json" "$conntrack_max_json" \
+    "$software_raid_arrays_json" "$software_raid_degraded_json" "$software_raid_rebuild_active_json" "$software_raid_rebuild_progress_json" "$software_raid_rebuild_remaining_minutes_json" "$raid_arrays_json" \
+    "$vnc" "$web" "$ssh_enabled" "$power_w_json" "$energy_counter_json" "$energy_range_json" "$swap_usage_json" "$swap_total_json" \
+    "$reboot_required_json" "$security_updates_json" "$last_boot_json" "$kernel_version_json" "$primary_ip_json" "$failed_systemd_units_json_count" "$failed_systemd_units_json" \
+    "$journal_errors_json" "$root_fs_readonly_json" "$failed_ssh_logins_15m_json" "$firewall_active_json" "$firewall_backend_json" "$firewall_rules_count_json" \
+    "$fail2ban_active_json" "$fail2ban_banned_count_json" "$fail2ban_jails_json" \
+    "$disk_read_bytes_json" "$disk_write_bytes_json" "$cpu_jiffies_json" "$sample_uptime_json" \
+    "${base_section_time_json%,}" "${base_section_forks_json%,}" "${base_partial_sections_json%,}" \
+    "${base_skipped_sections_json%,}" \
+    "${base_cache_age_json%,}" "$collector_profile_field"
+}
+
+# Relay container lifecycle and health events as JSON lines until Docker or
+# the channel goes away. A heartbeat with the host clock is written whenever
+# the engine stays quiet for the stream interval, so the reader can tell a
+# quiet host from a dead channel and resume with --since after a reconnect.
+run_docker_events() {
+  events_heartbeat=$(positive_timeout "${VSERVER_SSH_STATS_STREAM_INTERVAL:-}" 30)
+  events_since=${VSERVER_SSH_STATS_DOCKER_EVENTS_SINCE//[^0-9]/}
+  command -v docker >/dev/null 2>&1 || return 0
+  docker_command=(docker)
+  set +e
+  if ! run_limited "$docker_quick_timeout" docker info >/dev/null 2>&1 &&
+    command -v sudo >/dev/null 2>&1; then
+    docker_command=(sudo -n docker)
+  fi
+  events_args=(events --format '{{json .}}' --filter type=container)
+  for events_action in create start restart die stop kill pause unpause oom destroy rename health_status; do
+    events_args+=(--filter "event=$events_action")
+  done
+  [ -n "$events_since" ] && events_args+=(--since "$events_since")
+  printf '{"heartbeat":%(%s)T}\n' -1
+  while :; do
+    if IFS= read -r -t "$events_heartbeat" event_line; then
+      printf '%s\n' "$event_line"
+    elif [ $? -gt 128 ]; then
+      printf '{"heartbeat":%(%s)T}\n' -1
+    else
+      break
+    fi
+  done < <("${docker_command[@]}" "${events_args[@]}" 2>/dev/null)
+  set -e
+}
+
+# Keep sampling on one channel: emit one JSON line per interval and take an
+# extra sample whenever a "sample" line arrives on stdin. EOF or "stop" ends it.
+run_base_stream() {
+  stream_interval=$(positive_timeout "${VSERVER_SSH_STATS_STREAM_INTERVAL:-}" 30)
+  while :; do
+    sample_started=$SECONDS
+    collect_base_sample
+    print_base_json
+    prev_uptime=$uptime
+    wait_seconds=$((stream_interval - (SECONDS - sample_started)))
+    if [ "$wait_seconds" -lt 1 ]; then
+      wait_seconds=1
+    fi
+    request=""
+    set +e
+    IFS= read -r -t "$wait_seconds" request
+    read_status=$?
+    set -e
+    if [ "$read_status" -gt 128 ]; then
+      continue
+    fi
+    if [ "$read_status" -ne 0 ]; then
+      return 0
+    fi
+    case "$request" in
+      stop) return 0 ;;
+    esac
+  done
+}
+
+run_collector_section() {
+  reset_collector_profile
+  case "$1" in
+    packages)
+      run_profiled collect_pkg_updates
+      run_profiled collect_security_updates
+      print_package_json
+      ;;
+    docker)
+      run_profiled read_docker_stats
+      print_docker_json
+      ;;
+    docker_disk)
+      run_profiled read_docker_disk_usage
+      print_docker_disk_json
+      ;;
+    storage)
+      run_profiled read_storage_health
+      print_storage_json
+      ;;
+    *)
+      return 1
+      ;;
+  esac
+}
+
+now_ms() {
+  read_clock_ms
+  printf '%s' "$clock_ms"
+}
+
+# Run comma separated slow sections (e.g. docker,storage) in parallel and print
+# one document with the JSON, a completion flag and the duration per section.
+# Without mktemp the sections run one after another.
+run_combined_modes() {
+  IFS=, read -r -a section_modes <<< "$collector_mode"
+  section_dir=$(mktemp -d 2>/dev/null || echo "")
+  if [ -n "$section_dir" ]; then
+    for section in "${section_modes[@]}"; do
+      case "$section" in
+        packages|docker|docker_disk|storage) ;;
+        *) continue ;;
+      esac
+      (
+        section_started=$(now_ms)
+        set +e
+        ( set -e; run_collector_section "$section" ) > "$section_dir/$section.json" 2>/dev/null
+        section_status=$?
+        printf '%s %s\n' "$section_status" $(( $(now_ms) - section_started )) > "$section_dir/$section.status"
+      ) &
+    done
+    wait
+  fi
+
+  sections_json=""
+  section_complete_json=""
+  section_time_json=""
+  for section in "${section_modes[@]}"; do
+    case "$section" in
+      packages|docker|docker_disk|storage) ;;
+      *) continue ;;
+    esac
+    section_output=""
+    section_status=1
+    section_time=""
+    if [ -n "$section_dir" ]; then
+      section_output=$(cat "$section_dir/$section.json" 2>/dev/null || true)
+      read -r section_status section_time 2>/dev/null < "$section_dir/$section.status" || true
+    else
+      section_started=$(now_ms)
+      set +e
+      section_output=$( set -e; run_collector_section "$section" 2>/dev/null )
+      section_status=$?
+      set -e
+      section_time=$(( $(now_ms) - section_started ))
+    fi
+    if [ "$section_status" = 0 ] && [ -n "$section_output" ]; then
+      section_complete=1
+    else
+      section_complete=0
+      section_output=null
+    fi
+    sections_json="$sections_json\"$section\":$section_output,"
+    section_complete_json="$section_complete_json\"$section\":$section_complete,"
+    section_time_json="$section_time_json\"$section\":$(number_or_null "$section_time"),"
+  done
+  if [ -n "$section_dir" ]; then
+    rm -rf "$section_dir"
+  fi
+  printf '{"sections":{%s},"section_complete":{%s},"section_time_ms":{%s}}\n' \
+    "${sections_json%,}" "${section_complete_json%,}" "${section_time_json%,}"
+}
+
+output_encoding() {
+  # Print the first requested encoding that has a compressor on this host.
+  for encoding in $(printf '%s' "${VSERVER_SSH_STATS_COMPRESS:-}" | tr ',' ' '); do
+    case "$encoding" in
+      zstd|gzip)
+        if command -v "$encoding" >/dev/null 2>&1; then
+          printf '%s' "$encoding"
+          return 0
+        fi
+        ;;
+    esac
+  done
+  return 1
+}
+
+emit_output() {
+  # Run "$@" and compress its output when Home Assistant asked for it.
+  if ! encoding=$(output_encoding); then
+    "$@"
+    return
+  fi
+  printf '\037VSSHZ %s\n' "$encoding"
+  case "$encoding" in
+    zstd) "$@" | zstd -q -c ;;
+    gzip) "$@" | gzip -c ;;
+  esac
+}
+
 case "$collector_mode" in
-  packages)
-    collect_pkg_updates
-    collect_security_updates
-    print_package_json
+  packages|docker|docker_disk|storage)
+    emit_output run_collector_section "$collector_mode"
+    exit 0
+    ;;
+  *,*)
+    emit_output run_combined_modes
     exit 0
     ;;
-  docker)
-    read_docker_stats
-    print_docker_json
+  stream)
+    run_base_stream
     exit 0
     ;;
-  storage)
-    read_storage_health
-    print_storage_json
+  docker_events)
+    run_docker_events
     exit 0
     ;;
 esac
 
-# Run collectors (order matters for power deltas)
-read_power_metrics
-read_cpu_stats
-read_mem_stats
-read_disk_stats
-uptime=$(awk '{print int($1)}' /proc/uptime 2>/dev/null || echo "")
-cores=$(nproc 2>/dev/null || getconf _NPROCESSORS_ONLN 2>/dev/null || echo "")
-read_load_and_freq
-read_os_info
-if [ "$collector_mode" = "full" ]; then
-  collect_pkg_updates
-  read_docker_stats
-else
-  init_package_defaults
-  init_docker_defaults
-fi
-read_mac_addresses
-read_top_processes
-read_process_state
-read_connection_metrics
-read_software_raid
-read_service_status
-read_temperature
-read_network_bytes
-read_boot_and_kernel_status
-read_primary_ip
-if [ "$collector_mode" = "full" ]; then
-  collect_security_updates
-fi
-read_systemd_failures
-read_journal_errors
-read_root_filesystem_status
-read_failed_ssh_logins
-read_firewall_status
-read_fail2ban_status
-read_disk_io_bytes
-compute_power
-prepare_numeric_json_values
-
-printf '{"cpu":%s,"mem":%s,"disk":%s,"disk_capacity_total":%s,"disk_stats":%s,"uptime":%s,"temp":%s,"rx":%s,"tx":%s,"ram":%s,"cores":%s,"load_1":%s,"load_5":%s,"load_15":%s,"cpu_freq":%s,"os":"%s","pkg_count":%s,"pkg_list":"%s","docker":%s,"containers":"%s","container_stats":%s,"mac_address":"%s","mac_addresses":%s,"top_processes":%s,"process_total":%s,"process_running":%s,"process_zombies":%s,"tcp_established":%s,"tcp_time_wait":%s,"sockets_used":%s,"tcp_sockets_in_use":%s,"conntrack_count":%s,"conntrack_max":%s,"software_raid_arrays":%s,"software_raid_degraded":%s,"software_raid_rebuild_active":%s,"software_raid_rebuild_progress":%s,"software_raid_rebuild_remaining_minutes":%s,"raid_arrays":%s,"vnc":"%s","web":"%s","ssh":"%s","power_w":%s,"energy_uj":%s,"energy_range_uj":%s,"swap_usage":%s,"swap_total":%s,"reboot_required":%s,"security_updates":%s,"last_boot":"%s","kernel_version":"%s","primary_ip":"%s","failed_systemd_units":%s,"failed_systemd_units_list":%s,"journal_errors":%s,"root_fs_readonly":%s,"failed_ssh_logins_15m":%s,"firewall_active":%s,"firewall_backend":"%s","firewall_rules_count":%s,"fail2ban_active":%s,"fail2ban_banned_count":%s,"fail2ban_jails":%s,"disk_read_bytes":%s,"disk_write_bytes":%s}\n' \
-  "$cpu_json" "$mem_json" "$disk_json" "$disk_total_bytes_json" "$disk_stats_json" "$uptime_json" "$temp_json" "$rx_json" "$tx_json" "$ram_json" "$cores_json" "$load_1_json" \
-  "$load_5_json" "$load_15_json" "$cpu_freq_json" "$os_json" "$pkg_count_json" "$pkg_list_json" "$docker_json" "$containers_json" "$container_stats_json" \
-  "$mac_address_json" "$mac_addresses_json" "$top_processes_json" "$process_total_json" "$process_running_json" "$process_zombies_json" \
-  "$tcp_established_json" "$tcp_time_wait_json" "$sockets_used_json" "$tcp_sockets_in_use_json" "$conntrack_count_json" "$conntrack_max_json" \
-  "$software_raid_arrays_json" "$software_raid_degraded_json" "$software_raid_rebuild_active_json" "$software_raid_rebuild_progress_json" "$software_raid_rebuild_remaining_minutes_json" "$raid_arrays_json" \
-  "$vnc" "$web" "$ssh_enabled" "$power_w_json" "$energy_counter_json" "$energy_range_json" "$swap_usage_json" "$swap_total_json" \
-  "$reboot_required_json" "$security_updates_json" "$last_boot_json" "$kernel_version_json" "$primary_ip_json" "$failed_systemd_units_json_count" "$failed_systemd_units_json" \
-  "$journal_errors_json" "$root_fs_readonly_json" "$failed_ssh_logins_15m_json" "$firewall_active_json" "$firewall_backend_json" "$firewall_rules_count_json" \
-  "$fail2ban_active_json" "$fail2ban_banned_count_json" "$fail2ban_jails_json" \
-  "$disk_read_bytes_json" "$disk_write_bytes_json"
+collect_base_sample
+print_base_json
+
+
@@ -1,3 +1,61 @@
+import hashlib
 from pathlib import Path
 
 REMOTE_SCRIPT = (Path(__file__).parent / "remote_collector.sh").read_text(encoding="utf-8")
+REMOTE_SCRIPT_SHA256 = hashlib.sha256(REMOTE_SCRIPT.encode("utf-8")).hexdigest()
+
+# Exit status of the cached command when the collector is not installed yet.
+REMOTE_SCRIPT_MISSING_STATUS = 86
+REMOTE_SCRIPT_INSTALL_FAILED_STATUS = 87
+REMOTE_SCRIPT_CACHE_DIR = '"${XDG_CACHE_HOME:-${HOME:-/tmp}/.cache}/vserver_ssh_stats"'
+
+
+def cached_script_command(env: str) -> str:
+    """Return a command that runs the installed collector or exits as missing."""
+
+    return (
+        f"{env} sh -c 'f={REMOTE_SCRIPT_CACHE_DIR}/collector-{REMOTE_SCRIPT_SHA256}.sh; "
+        f'[ -s "$f" ] || exit {REMOTE_SCRIPT_MISSING_STATUS}; exec bash "$f"\''
+    )
+
+
+def install_script_command(env: str) -> str:
+    """Return a command that stores the collector from stdin and then runs it.
+
+    The file is written next to its final name and renamed into place so an
+    interrupted upload never leaves a truncated collector behind. Older
+    collector versions in the cache directory are removed after a successful
+    install.
+    """
+
+    failed = REMOTE_SCRIPT_INSTALL_FAILED_STATUS
+    return (
+        f"{env} sh -c 'd={REMOTE_SCRIPT_CACHE_DIR}; "
+        f'f="$d/collector-{REMOTE_SCRIPT_SHA256}.sh"; t="$d/.collector-$$.tmp"; '
+        f'umask 077; mkdir -p "$d" 2>/dev/null || exit {failed}; '
+        'if cat > "$t" 2>/dev/null && mv -f "$t" "$f" 2>/dev/null; then '
+        'for o in "$d"/collector-*.sh; do [ "$o" = "$f" ] || rm -f "$o"; done; '
+        'exec bash "$f"; '
+        f'fi; rm -f "$t"; exit {failed}\''
+    )
+
+
+STREAM_NEEDS_SCRIPT = "vserver-ssh-stats:need-script"
+STREAM_SCRIPT_END = "vserver-ssh-stats:end-of-script"
+
+
+def stream_script_command(env: str) -> str:
+    """Return a command that keeps the collector resident on one channel.
+
+    The installed copy is used when present. Otherwise the remote side asks
+    for the script with one handshake line and reads it from stdin up to an
+    end marker, leaving the rest of stdin free for sample requests.
+    """
+
+    return (
+        f"{env} bash -c 'f={REMOTE_SCRIPT_CACHE_DIR}/collector-{REMOTE_SCRIPT_SHA256}.sh; "
+        '[ -s "$f" ] && exec bash "$f"; '
+        f'printf "%s\\n" {STREAM_NEEDS_SCRIPT}; s=; '
+        f'while IFS= read -r l && [ "$l" != {STREAM_SCRIPT_END} ]; do s="$s$l\n"; done; '
+        'eval "$s"\''
+    )
@@ -0,0 +1,249 @@
+"""Fleet-wide SSH session limits, poll phase offsets and adaptive intervals."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Mapping, Optional
+
+from .util import DEFAULT_MAX_FLEET_SSH_SESSIONS
+
+PRIORITY_BASE = 0
+PRIORITY_SLOW = 1
+
+# Adaptive polling never goes below ADAPTIVE_MIN_INTERVAL seconds and relaxes
+# to at most ADAPTIVE_CEILING_FACTOR times the configured interval, capped at
+# ADAPTIVE_MAX_INTERVAL seconds.
+ADAPTIVE_MIN_INTERVAL = 10
+ADAPTIVE_MAX_INTERVAL = 300
+ADAPTIVE_CEILING_FACTOR = 4
+ADAPTIVE_STABLE_SAMPLES = 5
+# Changes between two polls that count as volatile, and levels that count as
+# an incident. CPU and memory are percent, load is per core and network
+# throughput is received plus sent bytes per second.
+ADAPTIVE_CHANGE_THRESHOLDS = {"cpu": 20.0, "mem": 10.0, "load": 0.5, "net": 1024.0 * 1024}
+ADAPTIVE_ALERT_LEVELS = {"cpu": 90.0, "mem": 90.0, "load": 1.5}
+
+INTERVAL_REASON_CONFIGURED = "configured"
+INTERVAL_REASON_SETTLING = "settling"
+INTERVAL_REASON_STABLE = "stable"
+INTERVAL_REASON_BACKOFF = "backoff"
+
+
+def phase_offset(key: str, interval: float) -> float:
+    """Return a stable offset in ``[0, interval)`` seconds for *key*.
+
+    Hosts keep the same offset across restarts so their polls stay spread over
+    the interval instead of all starting together.
+    """
+
+    if interval <= 0:
+        return 0.0
+    digest = hashlib.sha256(key.encode("utf-8")).digest()
+    fraction = int.from_bytes(digest[:8], "big") / 2**64
+    return fraction * interval
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Return *value* as a float, or ``None`` when it is not numeric."""
+
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _volatility_metrics(data: Mapping[str, Any]) -> dict[str, float]:
+    """Extract the metrics adaptive polling watches from coordinator data."""
+
+    metrics = {
+        "cpu": _as_float(data.get("cpu")),
+        "mem": _as_float(data.get("mem")),
+    }
+    load = _as_float(data.get("load_1"))
+    cores = _as_float(data.get("cores"))
+    if load is not None and cores:
+        metrics["load"] = load / cores
+    net_in = _as_float(data.get("net_in"))
+    net_out = _as_float(data.get("net_out"))
+    if net_in is not None and net_out is not None:
+        metrics["net"] = net_in + net_out
+    return {name: value for name, value in metrics.items() if value is not None}
+
+
+class AdaptivePollInterval:
+    """Choose a host's poll interval from how quickly its metrics change.
+
+    A sample above an alert level or with a large change since the previous
+    sample drops the interval to the floor. Each calm sample after that
+    doubles it back towards the configured interval, and after
+    ``ADAPTIVE_STABLE_SAMPLES`` calm samples in a row it keeps doubling up
+    to the ceiling. :attr:`reason` names what set the current interval.
+    """
+
+    def __init__(self, interval: int) -> None:
+        """Initialize the tracker around the configured *interval*."""
+
+        self.base_interval = max(1, int(interval))
+        self.floor = min(ADAPTIVE_MIN_INTERVAL, self.base_interval)
+        self.ceiling = max(
+            self.base_interval,
+            min(self.base_interval * ADAPTIVE_CEILING_FACTOR, ADAPTIVE_MAX_INTERVAL),
+        )
+        self.interval = self.base_interval
+        self.reason = INTERVAL_REASON_CONFIGURED
+        self._previous: dict[str, float] = {}
+        self._calm_samples = 0
+
+    def update(self, data: Mapping[str, Any]) -> int:
+        """Record one successful sample and return the next poll interval."""
+
+        metrics = _volatility_metrics(data)
+        trigger = self._trigger(metrics)
+        self._previous = metrics
+        if trigger is not None:
+            self._calm_samples = 0
+            self.interval = self.floor
+            self.reason = trigger
+            return self.interval
+
+        self._calm_samples += 1
+        if self.interval < self.base_interval:
+            self.interval = min(self.base_interval, self.interval * 2)
+        elif self._calm_samples >= ADAPTIVE_STABLE_SAMPLES:
+            self.interval = min(self.ceiling, self.interval * 2)
+        if self.interval < self.base_interval:
+            self.reason = INTERVAL_REASON_SETTLING
+        elif self.interval > self.base_interval:
+            self.reason = INTERVAL_REASON_STABLE
+        else:
+            self.reason = INTERVAL_REASON_CONFIGURED
+        return self.interval
+
+    def _trigger(self, metrics: dict[str, float]) -> Optional[str]:
+        """Return why *metrics* need fast polling, or ``None`` when calm."""
+
+        for name, level in ADAPTIVE_ALERT_LEVELS.items():
+            value = metrics.get(name)
+            if value is not None and value >= level:
+                return f"{name}_high"
+        for name, threshold in ADAPTIVE_CHANGE_THRESHOLDS.items():
+            value = metrics.get(name)
+            previous = self._previous.get(name)
+            if value is None or previous is None:
+                continue
+            if name == "net":
+                # Throughput is bursty; only count doubling or halving.
+                threshold = max(threshold, max(value, previous) / 2)
+            if abs(value - previous) >= threshold:
+                return f"{name}_changed"
+        return None
+
+
+class SSHSessionLimiter:
+    """Cap concurrent SSH sessions and serve base polls before slow collectors.
+
+    Waiters are queued per priority; a released slot always goes to the oldest
+    base poll before any slow collector. A limiter with a *parent* also holds
+    a parent slot, so per-entry limits nest inside the global one.
+    """
+
+    def __init__(self, limit: int, parent: Optional[SSHSessionLimiter] = None) -> None:
+        """Initialize a limiter allowing *limit* concurrent sessions."""
+
+        self._limit = max(1, int(limit))
+        self._parent = parent
+        self._active = 0
+        self._waiters: dict[int, deque[asyncio.Future[None]]] = {
+            PRIORITY_BASE: deque(),
+            PRIORITY_SLOW: deque(),
+        }
+        self.last_wait_seconds = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Return the configured number of concurrent sessions."""
+
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        """Return the number of sessions currently holding a slot."""
+
+        return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of sessions waiting for a slot."""
+
+        return sum(
+            1 for queue in self._waiters.values() for future in queue if not future.done()
+        )
+
+    def set_limit(self, limit: int) -> None:
+        """Change the session limit and wake waiters that now fit."""
+
+        self._limit = max(1, int(limit))
+        self._wake_waiters()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_BASE) -> AsyncIterator[float]:
+        """Hold one session slot and yield the seconds spent waiting for it."""
+
+        started = time.monotonic()
+        async with contextlib.AsyncExitStack() as stack:
+            await self._acquire(priority)
+            stack.callback(self._release)
+            if self._parent is not None:
+                await stack.enter_async_context(self._parent.slot(priority))
+            waited = time.monotonic() - started
+            self.last_wait_seconds = waited
+            yield waited
+
+    async def _acquire(self, priority: int) -> None:
+        """Wait until a slot is free for *priority*."""
+
+        if self._active < self._limit and not self.queue_depth:
+            self._active += 1
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(priority, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation.
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Return a slot and hand it to the next waiter."""
+
+        self._active -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Grant free slots to waiters in priority order."""
+
+        while self._active < self._limit:
+            future = self._next_waiter()
+            if future is None:
+                return
+            self._active += 1
+            future.set_result(None)
+
+    def _next_waiter(self) -> Optional[asyncio.Future[None]]:
+        """Pop the oldest pending waiter of the most urgent priority."""
+
+        for priority in sorted(self._waiters):
+            queue = self._waiters[priority]
+            while queue:
+                future = queue.popleft()
+                if not future.done():
+                    return future
+        return None
+
+
+fleet_session_limiter = SSHSessionLimiter(DEFAULT_MAX_FLEET_SSH_SESSIONS)
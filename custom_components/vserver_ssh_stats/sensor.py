@@ -32,11 +32,35 @@ from .coordinator import (
     async_get_or_create_coordinators,
     async_get_or_create_custom_sensor_coordinators,
 )
-from .docker_entities import find_container
+from .docker_entities import CONTAINER_DATA_KEYS, find_container
 from .util import build_container_device_info, build_device_info, build_storage_device_info
 
 ACTION_STATUS_EVENT = f"{DOMAIN}_action_status"
 MAX_SENSOR_STATE_LENGTH = 255
+# Sensors that are aggregated from many coordinator keys and always update.
+AGGREGATE_SENSOR_KEYS = frozenset({"health_status", "health_score"})
+# Further coordinator keys read by sensors with extra state attributes.
+ATTRIBUTE_DATA_KEYS: dict[str, tuple[str, ...]] = {
+    "top_processes": ("top_process_details",),
+    "process_total": ("process_states", "process_users", "process_cgroups"),
+    "collection_time_ms": (
+        "collector_section_time_ms",
+        "collector_section_forks",
+        "collector_partial_sections",
+        "collector_skipped_sections",
+        "poll_interval",
+        "poll_interval_reason",
+        "collector_cache_age_seconds",
+        "collector_profile",
+        "collector_profile_stats",
+    ),
+    "containers": ("container_details",),
+    "docker_images_size_bytes": ("docker_image_sizes",),
+    "docker_volumes_size_bytes": ("docker_volume_sizes",),
+    "failed_systemd_units_list": ("failed_systemd_units_details",),
+    "software_raid_arrays": ("raid_arrays", "raid_detail_arrays"),
+    "fail2ban_banned_count": ("fail2ban_jails",),
+}
 
 
 def _sanitize(name: str) -> str:
@@ -50,206 +74,25 @@ class VServerSensorDescription(SensorEntityDescription):
     """Class describing VServer SSH Stats sensor."""
 
 
-def _diagnostic_sensor(**kwargs: Any) -> VServerSensorDescription:
-    """Create a diagnostic sensor description."""
-
-    return VServerSensorDescription(entity_category=EntityCategory.DIAGNOSTIC, **kwargs)
+def _sensor_data_keys(
+    key: str, container_key: str | None, storage_key: str | None
+) -> frozenset[str] | None:
+    """Return the coordinator keys a sensor reads, or ``None`` for all keys."""
 
-
-def _as_float(value: Any) -> float | None:
-    """Return *value* as float or None."""
-
-    try:
-        if value is None:
-            return None
-        return float(value)
-    except (TypeError, ValueError):
+    if key in AGGREGATE_SENSOR_KEYS:
         return None
+    if storage_key:
+        return frozenset({"storage_device_lookup"})
+    keys = {key, *ATTRIBUTE_DATA_KEYS.get(key, ())}
+    if container_key:
+        keys.update(CONTAINER_DATA_KEYS)
+    return frozenset(keys)
 
 
-def _health_level(score: int) -> str:
-    """Return a health state for a numeric score."""
-
-    if score <= 70:
-        return "critical"
-    if score <= 90:
-        return "warning"
-    return "ok"
-
-
-def _build_health(data: dict[str, Any], online: bool) -> dict[str, Any]:
-    """Build an aggregated health state from collected server metrics."""
-
-    if not online:
-        return {
-            "status": "offline",
-            "score": 0,
-            "reasons": ["Host is currently unreachable"],
-        }
-
-    score = 100
-    reasons: list[str] = []
-
-    def add_reason(message: str, penalty: int) -> None:
-        nonlocal score
-        reasons.append(message)
-        score = max(0, score - penalty)
-
-    cpu = _as_float(data.get("cpu"))
-    if cpu is not None:
-        if cpu >= 95:
-            add_reason(f"CPU usage is critical at {cpu:.0f}%", 30)
-        elif cpu >= 85:
-            add_reason(f"CPU usage is high at {cpu:.0f}%", 15)
-
-    mem = _as_float(data.get("mem"))
-    if mem is not None:
-        if mem >= 95:
-            add_reason(f"Memory usage is critical at {mem:.0f}%", 30)
-        elif mem >= 85:
-            add_reason(f"Memory usage is high at {mem:.0f}%", 15)
-
-    swap = _as_float(data.get("swap_usage"))
-    if swap is not None:
-        if swap >= 80:
-            add_reason(f"Swap usage is critical at {swap:.0f}%", 25)
-        elif swap >= 40:
-            add_reason(f"Swap usage is elevated at {swap:.0f}%", 10)
-
-    disk = _as_float(data.get("disk"))
-    if disk is not None:
-        if disk >= 95:
-            add_reason(f"Root disk usage is critical at {disk:.0f}%", 30)
-        elif disk >= 85:
-            add_reason(f"Root disk usage is high at {disk:.0f}%", 15)
-
-    for disk_stat in data.get("disk_stats", []):
-        if not isinstance(disk_stat, dict):
-            continue
-        if disk_stat.get("mount") == "/":
-            continue
-        total = _as_float(disk_stat.get("total"))
-        free = _as_float(disk_stat.get("free"))
-        if not total or free is None:
-            continue
-        used_percent = 100 - (free / total * 100)
-        label = disk_stat.get("label") or disk_stat.get("mount") or disk_stat.get("name")
-        if used_percent >= 95:
-            add_reason(f"Disk {label} is critical at {used_percent:.0f}%", 25)
-        elif used_percent >= 85:
-            add_reason(f"Disk {label} is high at {used_percent:.0f}%", 10)
-
-    cores = _as_float(data.get("cores"))
-    load_5 = _as_float(data.get("load_5"))
-    if cores and load_5 is not None:
-        load_ratio = load_5 / cores
-        if load_ratio >= 2:
-            add_reason(f"5-minute load is critical at {load_5:.2f} on {cores:.0f} cores", 25)
-        elif load_ratio >= 1:
-            add_reason(f"5-minute load is high at {load_5:.2f} on {cores:.0f} cores", 10)
-
-    pkg_count = _as_float(data.get("pkg_count"))
-    if pkg_count is not None:
-        if pkg_count >= 50:
-            add_reason(f"{pkg_count:.0f} package updates are pending", 10)
-        elif pkg_count >= 10:
-            add_reason(f"{pkg_count:.0f} package updates are pending", 5)
-
-    ssh_connect_time = _as_float(data.get("ssh_connect_time_ms"))
-    if ssh_connect_time is not None and ssh_connect_time >= 3000:
-        add_reason(f"SSH connect time is high at {ssh_connect_time:.0f} ms", 10)
-
-    collection_time = _as_float(data.get("collection_time_ms"))
-    if collection_time is not None and collection_time >= 10000:
-        add_reason(f"Collection time is high at {collection_time:.0f} ms", 10)
-
-    if data.get("reboot_required"):
-        add_reason("Reboot is required", 10)
-
-    if data.get("root_fs_readonly"):
-        add_reason("Root filesystem is mounted read-only", 40)
-
-    security_updates = _as_float(data.get("security_updates"))
-    if security_updates is not None:
-        if security_updates >= 10:
-            add_reason(f"{security_updates:.0f} security updates are pending", 15)
-        elif security_updates >= 1:
-            add_reason(f"{security_updates:.0f} security updates are pending", 8)
-
-    failed_units = _as_float(data.get("failed_systemd_units"))
-    if failed_units is not None and failed_units > 0:
-        penalty = min(30, 10 + int(failed_units) * 5)
-        add_reason(f"{failed_units:.0f} systemd units failed", penalty)
-
-    journal_errors = _as_float(data.get("journal_errors"))
-    if journal_errors is not None:
-        if journal_errors >= 20:
-            add_reason(f"{journal_errors:.0f} journal errors in the last 15 minutes", 15)
-        elif journal_errors >= 1:
-            add_reason(f"{journal_errors:.0f} journal errors in the last 15 minutes", 5)
-
-    failed_ssh_logins = _as_float(data.get("failed_ssh_logins_15m"))
-    if failed_ssh_logins is not None:
-        if failed_ssh_logins >= 100:
-            add_reason(
-                f"{failed_ssh_logins:.0f} failed SSH login attempts in the last 15 minutes",
-                15,
-            )
-        elif failed_ssh_logins >= 20:
-            add_reason(
-                f"{failed_ssh_logins:.0f} failed SSH login attempts in the last 15 minutes",
-                5,
-            )
+def _diagnostic_sensor(**kwargs: Any) -> VServerSensorDescription:
+    """Create a diagnostic sensor description."""
 
-    unhealthy_containers: list[str] = []
-    for container in data.get("container_stats", []):
-        if not isinstance(container, dict):
-            continue
-        health = str(container.get("health_state") or "").lower()
-        status = str(container.get("status") or "").lower()
-        name = str(container.get("name") or "").strip()
-        memory_limit_usage = _as_float(container.get("memory_limit_usage"))
-        exited_with_error = status.startswith("exited") and not status.startswith(
-            "exited (0)"
-        )
-        if health in {"unhealthy", "dead"} or exited_with_error:
-            unhealthy_containers.append(name or "unknown")
-        if memory_limit_usage is not None and memory_limit_usage >= 100:
-            add_reason(
-                f"Container {name or 'unknown'} reached its memory limit",
-                20,
-            )
-        elif memory_limit_usage is not None and memory_limit_usage >= 90:
-            add_reason(
-                f"Container {name or 'unknown'} is near its memory limit",
-                10,
-            )
-    for name in unhealthy_containers[:5]:
-        add_reason(f"Container {name} is not healthy", 15)
-
-    zombies = _as_float(data.get("process_zombies"))
-    if zombies is not None and zombies > 0:
-        add_reason(f"{zombies:.0f} zombie processes detected", min(15, 5 + int(zombies)))
-
-    if data.get("software_raid_degraded"):
-        add_reason("Software RAID is degraded", 35)
-    if data.get("smart_failure_detected"):
-        add_reason("A storage device reports SMART failure", 40)
-    elif data.get("storage_collection_error"):
-        add_reason("Storage health data is incomplete", 10)
-
-    conntrack_usage = _as_float(data.get("conntrack_usage"))
-    if conntrack_usage is not None:
-        if conntrack_usage >= 95:
-            add_reason(f"Conntrack usage is critical at {conntrack_usage:.0f}%", 25)
-        elif conntrack_usage >= 80:
-            add_reason(f"Conntrack usage is high at {conntrack_usage:.0f}%", 10)
-
-    return {
-        "status": _health_level(score),
-        "score": score,
-        "reasons": reasons,
-    }
+    return VServerSensorDescription(entity_category=EntityCategory.DIAGNOSTIC, **kwargs)
 
 
 @dataclass
@@ -631,6 +474,44 @@ SENSORS: tuple[VServerSensorDescription, ...] = (
         native_unit_of_measurement="ms",
         state_class=SensorStateClass.MEASUREMENT,
     ),
+    _diagnostic_sensor(
+        key="collector_payload_bytes",
+        name="Collector Payload Size",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    _diagnostic_sensor(
+        key="collector_parse_time_ms",
+        name="Collector Parse Time",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    _diagnostic_sensor(
+        key="slow_collector_payload_bytes",
+        name="Slow Collector Payload Size",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    _diagnostic_sensor(
+        key="slow_collector_transfer_bytes",
+        name="Slow Collector Transfer Size",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    _diagnostic_sensor(
+        key="ssh_queue_wait_ms",
+        name="SSH Queue Wait Time",
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    _diagnostic_sensor(
+        key="ssh_queue_depth",
+        name="SSH Queue Depth",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
     _diagnostic_sensor(key="collection_error", name="Collection Error"),
     _diagnostic_sensor(key="last_collection_failed", name="Last Collection Failed"),
     _diagnostic_sensor(
@@ -753,6 +634,7 @@ SENSORS: tuple[VServerSensorDescription, ...] = (
         key="storage_devices_collected",
         name="Storage Devices Collected",
     ),
+    _diagnostic_sensor(key="storage_devices_standby", name="Storage Devices in Standby"),
     _diagnostic_sensor(key="storage_device_errors", name="Storage Device Errors"),
     _diagnostic_sensor(
         key="storage_collection_time_ms",
@@ -796,7 +678,29 @@ class VServerSensor(CoordinatorEntity[VServerCoordinator], SensorEntity):
     """Representation of a VServer SSH Stats sensor."""
 
     _unrecorded_attributes = frozenset(
-        {"processes", "containers", "units", "arrays", "mdadm_details", "jails"}
+        {
+            "processes",
+            "containers",
+            "images",
+            "volumes",
+            "units",
+            "arrays",
+            "mdadm_details",
+            "jails",
+            "states",
+            "users",
+            "cgroups",
+            "section_time_ms",
+            "section_forks",
+            "partial_sections",
+            "skipped_sections",
+            "cache_age_seconds",
+            "metrics",
+            "poll_interval",
+            "poll_interval_reason",
+            "profile",
+            "profile_stats",
+        }
     )
     entity_description: VServerSensorDescription
 
@@ -813,7 +717,10 @@ class VServerSensor(CoordinatorEntity[VServerCoordinator], SensorEntity):
         storage_metric: str | None = None,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator,
+            context=_sensor_data_keys(description.key, container_key, storage_key),
+        )
         self.entity_description = description
         self._container_key = container_key
         self._container_metric = container_metric
@@ -831,17 +738,9 @@ class VServerSensor(CoordinatorEntity[VServerCoordinator], SensorEntity):
     def native_value(self) -> Any:
         """Return the value reported by the collector."""
         if self.entity_description.key == "health_status":
-            health = _build_health(
-                self.coordinator.data if isinstance(self.coordinator.data, dict) else {},
-                self.coordinator.last_update_success,
-            )
-            return health["status"]
+            return self.coordinator.health.level
         if self.entity_description.key == "health_score":
-            health = _build_health(
-                self.coordinator.data if isinstance(self.coordinator.data, dict) else {},
-                self.coordinator.last_update_success,
-            )
-            return health["score"]
+            return self.coordinator.health.score
         if not self.coordinator.data:
             return None
         if self._container_key and self._container_metric:
@@ -861,13 +760,11 @@ class VServerSensor(CoordinatorEntity[VServerCoordinator], SensorEntity):
         """Return additional context for complex sensor values."""
 
         if self.entity_description.key == "health_status":
-            health = _build_health(
-                self.coordinator.data if isinstance(self.coordinator.data, dict) else {},
-                self.coordinator.last_update_success,
-            )
+            health = self.coordinator.health
             return {
-                "score": health["score"],
-                "reasons": health["reasons"],
+                "score": health.score,
+                "reasons": list(health.reasons),
+                "metrics": health.metrics,
             }
         if not self.coordinator.data:
             return None
@@ -875,10 +772,38 @@ class VServerSensor(CoordinatorEntity[VServerCoordinator], SensorEntity):
             return {
                 "processes": self.coordinator.data.get("top_process_details", []),
             }
+        if self.entity_description.key == "process_total":
+            return {
+                "states": self.coordinator.data.get("process_states", {}),
+                "users": self.coordinator.data.get("process_users", {}),
+                "cgroups": self.coordinator.data.get("process_cgroups", {}),
+            }
+        if self.entity_description.key == "collection_time_ms":
+            return {
+                "section_time_ms": self.coordinator.data.get("collector_section_time_ms", {}),
+                "section_forks": self.coordinator.data.get("collector_section_forks", {}),
+                "partial_sections": self.coordinator.data.get("collector_partial_sections", []),
+                "skipped_sections": self.coordinator.data.get("collector_skipped_sections", []),
+                "poll_interval": self.coordinator.data.get("poll_interval"),
+                "poll_interval_reason": self.coordinator.data.get("poll_interval_reason"),
+                "cache_age_seconds": self.coordinator.data.get(
+                    "collector_cache_age_seconds", {}
+                ),
+                "profile": self.coordinator.data.get("collector_profile", {}),
+                "profile_stats": self.coordinator.data.get("collector_profile_stats", {}),
+            }
         if self.entity_description.key == "containers":
             return {
                 "containers": self.coordinator.data.get("container_details", []),
             }
+        if self.entity_description.key == "docker_images_size_bytes":
+            return {
+                "images": self.coordinator.data.get("docker_image_sizes", []),
+            }
+        if self.entity_description.key == "docker_volumes_size_bytes":
+            return {
+                "volumes": self.coordinator.data.get("docker_volume_sizes", []),
+            }
         if self.entity_description.key == "failed_systemd_units_list":
             return {
                 "units": self.coordinator.data.get("failed_systemd_units_details", []),
@@ -901,6 +826,8 @@ class VServerSensor(CoordinatorEntity[VServerCoordinator], SensorEntity):
                     "model": device.get("model"),
                     "serial": device.get("serial"),
                     "protocol": device.get("protocol"),
+                    "capacity_bytes": device.get("capacity_bytes"),
+                    "standby": device.get("standby"),
                 }
         return None
 
@@ -5,25 +5,48 @@ import asyncio
 import contextlib
 import json
 import logging
+import re
+import shlex
 import socket
+import threading
 import time
-from typing import Any, Dict, Optional
-
-import paramiko
-
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Iterable, Mapping, Optional, Sequence
+
+from .collector_output import (
+    MAX_COLLECTOR_OUTPUT,
+    CollectorOutputReader,
+    decode_json_document,
+    supported_output_encodings,
+)
 from .net_cache import (
+    ContainerCpuCache,
+    CpuStatsCache,
     EnergyStatsCache,
     NetStatsCache,
+    PowerStatsCache,
     ProcessPeakCache,
     RollingAverageCache,
+    SectionTimingCache,
 )
-from .remote_script import REMOTE_SCRIPT
-from .ssh_security import configure_pinned_host_keys
+from .remote_script import (
+    REMOTE_SCRIPT,
+    REMOTE_SCRIPT_SHA256,
+    STREAM_NEEDS_SCRIPT,
+    STREAM_SCRIPT_END,
+    cached_script_command,
+    install_script_command,
+    stream_script_command,
+)
+from .ssh_executor import LANE_POLL, LANE_STREAM, ssh_executor
+from .ssh_pool import ssh_pool
+from .ssh_transport import transport_for_host
 from .util import (
     DEFAULT_COMMAND_TIMEOUT,
     DEFAULT_CONNECT_TIMEOUT,
     normalize_mac_addresses,
     parse_monitored_ports,
+    remote_cache_ttls,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -31,12 +54,84 @@ _LOGGER = logging.getLogger(__name__)
 net_cache = NetStatsCache()
 disk_io_cache = NetStatsCache()
 energy_cache = EnergyStatsCache()
+cpu_stats_cache = CpuStatsCache()
+power_stats_cache = PowerStatsCache()
 process_peak_cache = ProcessPeakCache()
+container_cpu_cache = ContainerCpuCache()
 cpu_rolling_average_cache = RollingAverageCache(window_seconds=300.0)
 mem_rolling_average_cache = RollingAverageCache(window_seconds=300.0)
+collector_profile_cache = SectionTimingCache()
 
 DEFAULT_PORT_CHECK_TIMEOUT = 3
 MAX_CUSTOM_COMMAND_OUTPUT = 16 * 1024
+REMOTE_SCRIPT_CACHE_RETRY_SECONDS = 60 * 60
+# Largest images and volumes listed in the Docker disk usage attributes.
+DOCKER_DISK_BREAKDOWN_LIMIT = 20
+
+# Hosts that cannot keep an installed collector copy (read-only filesystem,
+# failed install, Windows) mapped to when stdin delivery was chosen.
+remote_script_stdin_hosts: dict[tuple[str, int], float] = {}
+
+# Hosts whose package, Docker and storage collector output is compressed.
+compressed_output_hosts: set[str] = set()
+
+
+def configure_output_compression(hosts: Iterable[str], enabled: bool) -> None:
+    """Enable or disable compressed slow collector output for *hosts*."""
+
+    for host in hosts:
+        if enabled:
+            compressed_output_hosts.add(host)
+        else:
+            compressed_output_hosts.discard(host)
+
+
+# Hosts whose collector reports per-function timings.
+profiled_hosts: set[str] = set()
+
+
+def configure_collector_profiling(hosts: Iterable[str], enabled: bool) -> None:
+    """Enable or disable remote collector profiling for *hosts*."""
+
+    for host in hosts:
+        if enabled:
+            profiled_hosts.add(host)
+        else:
+            profiled_hosts.discard(host)
+
+
+def forget_collector_profiles(hosts: Iterable[str]) -> None:
+    """Drop the collected function timings of *hosts*."""
+
+    collector_profile_cache.forget(hosts)
+
+
+# Section cache TTLs of hosts whose collector may reuse slow-changing results.
+remote_cache_hosts: dict[str, dict[str, int]] = {}
+
+
+def configure_remote_cache(
+    hosts: Iterable[str],
+    enabled: bool,
+    ttls: Mapping[str, int] | None = None,
+) -> None:
+    """Enable or disable the remote result cache for *hosts*.
+
+    *ttls* overrides the default per-section lifetimes of ``REMOTE_CACHE_TTLS``.
+    """
+
+    for host in hosts:
+        if enabled:
+            remote_cache_hosts[host] = remote_cache_ttls(dict(ttls or {}))
+        else:
+            remote_cache_hosts.pop(host, None)
+
+
+def _cache_ttl_env(cache_ttls: Mapping[str, int]) -> str:
+    """Return the collector environment assignment for section cache TTLs."""
+
+    ttls = ",".join(f"{section}={int(ttl)}" for section, ttl in cache_ttls.items())
+    return f"VSERVER_SSH_STATS_CACHE_TTL={ttls}"
 
 
 def _read_custom_command_channel(
@@ -96,44 +191,47 @@ def _run_ssh(
     connect_timeout: int,
     command_timeout: int,
     host_key_fingerprints: object,
-) -> tuple[str, Dict[str, float]]:
-    ssh = paramiko.SSHClient()
-    configure_pinned_host_keys(ssh, host_key_fingerprints)
+) -> tuple[Dict[str, Any], Dict[str, float]]:
     started = time.monotonic()
-    ssh.connect(
-        hostname=host,
-        port=port,
-        username=username,
-        password=password,
-        key_filename=key,
-        timeout=connect_timeout,
-        banner_timeout=connect_timeout,
-        auth_timeout=connect_timeout,
-    )
-    connected = time.monotonic()
-    try:
-        stdin, stdout, stderr = ssh.exec_command(cmd, timeout=command_timeout)
+    reader = CollectorOutputReader(MAX_COLLECTOR_OUTPUT)
+    with ssh_pool.exec_command(
+        host,
+        username,
+        password,
+        key,
+        port,
+        cmd,
+        connect_timeout,
+        command_timeout,
+        host_key_fingerprints,
+    ) as (stdin, stdout, stderr, connect_time_ms):
+        stdin_bytes = 0
         if stdin_data is not None:
-            stdin.write(stdin_data)
+            encoded_stdin = stdin_data.encode("utf-8")
+            stdin_bytes = len(encoded_stdin)
+            stdin.write(encoded_stdin)
             stdin.flush()
             stdin.channel.shutdown_write()
         try:
-            out = stdout.read().decode("utf-8", "ignore")
+            reader.read_from(stdout)
             err = stderr.read().decode("utf-8", "ignore")
             status = stdout.channel.recv_exit_status()
         except socket.timeout as err:
             raise TimeoutError(
                 f"Remote collector command timed out after {command_timeout} seconds"
             ) from err
-        if status != 0 and not out:
-            raise RuntimeError(err.strip() or f"Remote collector exited with status {status}")
-        finished = time.monotonic()
-        return out, {
-            "connect_time_ms": (connected - started) * 1000,
-            "collection_time_ms": (finished - started) * 1000,
-        }
-    finally:
-        ssh.close()
+    if status != 0 and not reader.received_bytes:
+        raise RuntimeError(err.strip() or f"Remote collector exited with status {status}")
+    finished = time.monotonic()
+    data = reader.finish()
+    return data, {
+        "connect_time_ms": connect_time_ms,
+        "collection_time_ms": (finished - started) * 1000,
+        "stdin_bytes": stdin_bytes,
+        "payload_bytes": reader.payload_bytes,
+        "transfer_bytes": reader.received_bytes,
+        "parse_time_ms": reader.parse_time_ms,
+    }
 
 
 def _run_custom_command(
@@ -149,22 +247,18 @@ def _run_custom_command(
 ) -> tuple[str, Dict[str, Any]]:
     """Run one configured command and return its stdout and timing data."""
 
-    ssh = paramiko.SSHClient()
-    configure_pinned_host_keys(ssh, host_key_fingerprints)
     started = time.monotonic()
-    ssh.connect(
-        hostname=host,
-        port=port,
-        username=username,
-        password=password,
-        key_filename=key,
-        timeout=connect_timeout,
-        banner_timeout=connect_timeout,
-        auth_timeout=connect_timeout,
-    )
-    connected = time.monotonic()
-    try:
-        _, stdout, _ = ssh.exec_command(command, timeout=command_timeout)
+    with ssh_pool.exec_command(
+        host,
+        username,
+        password,
+        key,
+        port,
+        command,
+        connect_timeout,
+        command_timeout,
+        host_key_fingerprints,
+    ) as (_, stdout, _, connect_time_ms):
         output, error_output, status, output_truncated = _read_custom_command_channel(
             stdout.channel,
             command_timeout,
@@ -176,12 +270,10 @@ def _run_custom_command(
             raise RuntimeError(detail or f"Custom command exited with status {status}")
         finished = time.monotonic()
         return output[:MAX_CUSTOM_COMMAND_OUTPUT], {
-            "connect_time_ms": (connected - started) * 1000,
+            "connect_time_ms": connect_time_ms,
             "collection_time_ms": (finished - started) * 1000,
             "output_truncated": output_truncated,
         }
-    finally:
-        ssh.close()
 
 
 async def async_run_custom_command(
@@ -197,18 +289,109 @@ async def async_run_custom_command(
 ) -> tuple[str, Dict[str, Any]]:
     """Run one configured custom sensor command outside the event loop."""
 
-    return await asyncio.to_thread(
-        _run_custom_command,
+    transport = transport_for_host(host)
+    if transport is None:
+        return await ssh_executor.run(
+            LANE_POLL,
+            _run_custom_command,
+            host,
+            username,
+            password,
+            key,
+            port,
+            command,
+            connect_timeout,
+            command_timeout,
+            host_key_fingerprints,
+        )
+
+    started = time.monotonic()
+    output, error_output, status, connect_time_ms, output_truncated = (
+        await transport.async_exec(
+            host,
+            username,
+            password,
+            key,
+            port,
+            command,
+            connect_timeout,
+            command_timeout,
+            host_key_fingerprints,
+            max_output=MAX_CUSTOM_COMMAND_OUTPUT,
+        )
+    )
+    if status != 0:
+        detail = error_output.strip() or output.strip()
+        raise RuntimeError(
+            detail[:MAX_CUSTOM_COMMAND_OUTPUT]
+            or f"Custom command exited with status {status}"
+        )
+    return output, {
+        "connect_time_ms": connect_time_ms,
+        "collection_time_ms": (time.monotonic() - started) * 1000,
+        "output_truncated": output_truncated,
+    }
+
+
+async def _async_run_ssh(
+    host: str,
+    username: str,
+    password: Optional[str],
+    key: Optional[str],
+    port: int,
+    cmd: str,
+    stdin_data: Optional[str],
+    connect_timeout: int,
+    command_timeout: int,
+    host_key_fingerprints: object,
+) -> tuple[Dict[str, Any], Dict[str, float]]:
+    """Run a collector command on the host's configured SSH transport."""
+
+    transport = transport_for_host(host)
+    if transport is None:
+        return await ssh_executor.run(
+            LANE_POLL,
+            _run_ssh,
+            host,
+            username,
+            password,
+            key,
+            port,
+            cmd,
+            stdin_data,
+            connect_timeout,
+            command_timeout,
+            host_key_fingerprints,
+        )
+
+    started = time.monotonic()
+    reader = CollectorOutputReader(MAX_COLLECTOR_OUTPUT)
+    encoded_stdin = stdin_data.encode("utf-8") if stdin_data is not None else None
+    _, err, status, connect_time_ms, _ = await transport.async_exec(
         host,
         username,
         password,
         key,
         port,
-        command,
+        cmd,
         connect_timeout,
         command_timeout,
         host_key_fingerprints,
+        stdin_data=encoded_stdin,
+        stdout_sink=reader.feed,
     )
+    if status != 0 and not reader.received_bytes:
+        raise RuntimeError(err.strip() or f"Remote collector exited with status {status}")
+    finished = time.monotonic()
+    data = reader.finish()
+    return data, {
+        "connect_time_ms": connect_time_ms,
+        "collection_time_ms": (finished - started) * 1000,
+        "stdin_bytes": len(encoded_stdin or b""),
+        "payload_bytes": reader.payload_bytes,
+        "transfer_bytes": reader.received_bytes,
+        "parse_time_ms": reader.parse_time_ms,
+    }
 
 
 def _sanitize(name: str) -> str:
@@ -263,6 +446,47 @@ def _safe_list(value: Any) -> list:
     return []
 
 
+def _safe_counts(value: Any) -> Dict[str, int]:
+    """Return a name to count mapping with non-numeric counts removed."""
+
+    if not isinstance(value, dict):
+        return {}
+    counts: Dict[str, int] = {}
+    for name, count in value.items():
+        number = _safe_int(count)
+        if number is not None:
+            counts[str(name)] = number
+    return counts
+
+
+def _collector_profile(value: Any) -> Dict[str, float]:
+    """Return function durations in ms from a remote ``collector_profile`` object."""
+
+    if not isinstance(value, dict):
+        return {}
+    durations: Dict[str, float] = {}
+    for name, span in value.items():
+        if not isinstance(span, dict):
+            continue
+        start = _safe_float(span.get("start_ms"))
+        end = _safe_float(span.get("end_ms"))
+        if start is not None and end is not None:
+            durations[str(name)] = round(max(0.0, end - start), 2)
+    return durations
+
+
+def _record_collector_profile(host: str, data: Dict[str, Any]) -> None:
+    """Add the function timings of a slow collector document to the host stats."""
+
+    sections = data.get("sections")
+    documents = sections.values() if isinstance(sections, dict) else [data]
+    for document in documents:
+        if isinstance(document, dict) and "collector_profile" in document:
+            collector_profile_cache.compute(
+                host, _collector_profile(document["collector_profile"])
+            )
+
+
 def _temperature_status(value: Any) -> Optional[str]:
     """Return a coarse temperature state independent of the raw temperature sensor."""
 
@@ -314,6 +538,47 @@ SLOW_RESULT_KEYS = {
     "docker_containers_size_bytes",
     "docker_volumes_size_bytes",
     "docker_build_cache_size_bytes",
+    "docker_image_sizes",
+    "docker_volume_sizes",
+}
+# Coordinator fields owned by the base collector sections of the medium and
+# slow tiers. Per-mount disk fields are matched by pattern.
+SECTION_RESULT_KEYS = {
+    "processes": {
+        "top_processes",
+        "top_process_details",
+        "process_total",
+        "process_running",
+        "process_zombies",
+        "process_states",
+        "process_users",
+        "process_cgroups",
+        "process_peak_since_boot",
+        "zombie_processes_detected",
+    },
+    "disk": {"disk", "disk_capacity_total", "disk_stats", "root_fs_readonly"},
+    "network": {"mac_address", "network_primary_mac", "mac_addresses", "primary_ip"},
+    "host": {
+        "software_raid_arrays",
+        "software_raid_degraded",
+        "software_raid_rebuild_active",
+        "software_raid_rebuild_progress",
+        "software_raid_rebuild_remaining_minutes",
+        "raid_arrays",
+        "reboot_required",
+        "last_boot",
+        "kernel_version",
+    },
+    "services": {"vnc", "web", "ssh"},
+    "systemd": {
+        "failed_systemd_units",
+        "failed_systemd_units_list",
+        "failed_systemd_units_details",
+    },
+    "journal": {"journal_errors"},
+    "ssh_logins": {"failed_ssh_logins_15m"},
+    "firewall": {"firewall_active", "firewall_backend", "firewall_rules_count"},
+    "fail2ban": {"fail2ban_active", "fail2ban_banned_count", "fail2ban_jails"},
 }
 
 
@@ -387,8 +652,28 @@ def _build_collection_commands(
     pkg_timeout: int | None = None,
     docker_timeout: int | None = None,
     storage_timeout: int | None = None,
+    cache_script: bool = True,
+    prev_uptime: int | None = None,
+    output_encodings: Sequence[str] = (),
+    profile: bool = False,
+    cache_ttls: Mapping[str, int] | None = None,
+    skip_sections: Sequence[str] = (),
+    docker_containers: Sequence[str] = (),
 ) -> list[CollectionCommand]:
-    """Return collection commands ordered by target OS preference."""
+    """Return collection commands ordered by target OS preference.
+
+    With *cache_script*, Linux hosts first run the collector installed under
+    its content hash and only upload it when that copy is missing. Streaming
+    the script over stdin remains the last Linux fallback. *prev_uptime* is
+    the uptime of the previous base sample; it lets the collector return raw
+    CPU counters instead of sleeping for a one second measurement.
+    *output_encodings* lists compressed output encodings the caller can
+    decode, best first; the collector uses the first one it has a tool for.
+    With *profile*, the collector adds per-function start and end times.
+    *cache_ttls* lets the collector reuse results of slow-changing sections.
+    *skip_sections* names base sections whose polling tier is not due.
+    *docker_containers* limits the Docker collector to these container IDs.
+    """
 
     normalized = (target_os or "auto").strip().lower()
     env_parts = [f"VSERVER_SSH_STATS_MODE={collector_mode}"]
@@ -398,11 +683,31 @@ def _build_collection_commands(
         env_parts.append(f"VSERVER_SSH_STATS_DOCKER_TIMEOUT={int(docker_timeout)}")
     if storage_timeout is not None:
         env_parts.append(f"VSERVER_SSH_STATS_STORAGE_TIMEOUT={int(storage_timeout)}")
+    if prev_uptime is not None:
+        env_parts.append(f"VSERVER_SSH_STATS_PREV_UPTIME={int(prev_uptime)}")
+    if output_encodings:
+        env_parts.append(f"VSERVER_SSH_STATS_COMPRESS={','.join(output_encodings)}")
+    if profile:
+        env_parts.append("VSERVER_SSH_STATS_PROFILE=1")
+    if cache_ttls:
+        env_parts.append(_cache_ttl_env(cache_ttls))
+    if skip_sections:
+        env_parts.append(f"VSERVER_SSH_STATS_SKIP={','.join(skip_sections)}")
+    if docker_containers:
+        env_parts.append(
+            f"VSERVER_SSH_STATS_DOCKER_CONTAINERS={shlex.quote(','.join(docker_containers))}"
+        )
     env = " ".join(env_parts)
     linux_commands: list[CollectionCommand] = [
         (f"{env} bash -s", REMOTE_SCRIPT),
         (f"{env} /bin/bash -s", REMOTE_SCRIPT),
     ]
+    if cache_script:
+        linux_commands = [
+            (cached_script_command(env), None),
+            (install_script_command(env), REMOTE_SCRIPT),
+            *linux_commands,
+        ]
     windows_command: CollectionCommand = (WINDOWS_REMOTE_SCRIPT, None)
     if collector_mode != "base":
         return [] if normalized == "windows" else linux_commands
@@ -414,34 +719,11 @@ def _build_collection_commands(
 def _parse_json_output(output: str) -> Dict[str, Any]:
     """Parse JSON output while tolerating surrounding text."""
 
-    stripped = output.strip()
-    if not stripped:
-        return {}
-
     try:
-        return json.loads(stripped)
-    except json.JSONDecodeError as err:
-        start = stripped.find("{")
-        end = stripped.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            candidate = stripped[start : end + 1]
-            try:
-                parsed = json.loads(candidate)
-            except json.JSONDecodeError:
-                _LOGGER.debug(
-                    "Failed to parse extracted JSON substring from SSH output: %s",
-                    candidate[:200],
-                )
-                raise err
-            _LOGGER.debug(
-                "Parsed JSON from SSH output after trimming prefix/suffix (prefix length %s, suffix length %s)",
-                start,
-                len(stripped) - end - 1,
-            )
-            return parsed
-
-        _LOGGER.debug("SSH output missing JSON object: %s", stripped[:200])
-        raise err
+        return decode_json_document(output)
+    except json.JSONDecodeError:
+        _LOGGER.debug("SSH output missing JSON object: %s", output.strip()[:200])
+        raise
 
 
 async def _async_collect_raw(
@@ -458,22 +740,40 @@ async def _async_collect_raw(
     docker_timeout: int | None = None,
     storage_timeout: int | None = None,
     host_key_fingerprints: object = None,
+    prev_uptime: int | None = None,
+    skip_sections: Sequence[str] = (),
+    docker_containers: Sequence[str] = (),
 ) -> tuple[Dict[str, Any] | None, Dict[str, float], Exception | None]:
     """Run one collector mode and return parsed remote JSON."""
 
     data: Dict[str, Any] | None = None
     timing: Dict[str, float] = {}
     last_error: Exception | None = None
+    cache_key = (host, port)
+    stdin_since = remote_script_stdin_hosts.get(cache_key)
+    cache_script = (
+        stdin_since is None
+        or time.monotonic() - stdin_since >= REMOTE_SCRIPT_CACHE_RETRY_SECONDS
+    )
+    output_encodings: tuple[str, ...] = ()
+    if collector_mode != "base" and host in compressed_output_hosts:
+        output_encodings = supported_output_encodings()
     for cmd, stdin_data in _build_collection_commands(
         target_os,
         collector_mode,
         pkg_timeout,
         docker_timeout,
         storage_timeout,
+        cache_script,
+        prev_uptime,
+        output_encodings,
+        host in profiled_hosts,
+        remote_cache_hosts.get(host),
+        skip_sections,
+        docker_containers,
     ):
         try:
-            out, timing = await asyncio.to_thread(
-                _run_ssh,
+            data, timing = await _async_run_ssh(
                 host,
                 username,
                 password,
@@ -485,8 +785,6 @@ async def _async_collect_raw(
                 command_timeout,
                 host_key_fingerprints,
             )
-            data = _parse_json_output(out)
-            break
         except Exception as err:
             last_error = err
             _LOGGER.debug(
@@ -495,13 +793,243 @@ async def _async_collect_raw(
                 host,
                 err,
             )
+            continue
+        if cache_script:
+            if REMOTE_SCRIPT_SHA256 in cmd and not _safe_int(data.get("root_fs_readonly")):
+                remote_script_stdin_hosts.pop(cache_key, None)
+            else:
+                remote_script_stdin_hosts[cache_key] = time.monotonic()
+        _LOGGER.debug(
+            "%s collector for %s sent %s stdin bytes, received %s bytes for %s "
+            "payload bytes parsed in %.1f ms",
+            collector_mode,
+            host,
+            timing.get("stdin_bytes", 0),
+            timing.get("transfer_bytes", 0),
+            timing.get("payload_bytes", 0),
+            timing.get("parse_time_ms", 0),
+        )
+        if collector_mode != "base":
+            _record_collector_profile(host, data)
+        break
     return data, timing, last_error
 
 
-def _process_docker_data(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Normalize Docker collector output into coordinator data fields."""
+def _docker_api_ports(ports: Any) -> str:
+    """Format Engine API port mappings like ``docker ps`` does."""
+
+    formatted: list[str] = []
+    for port in _safe_list(ports):
+        if not isinstance(port, dict) or _safe_int(port.get("PrivatePort")) is None:
+            continue
+        target = f"{port['PrivatePort']}/{port.get('Type') or 'tcp'}"
+        if _safe_int(port.get("PublicPort")) is not None:
+            target = f"{port.get('IP') or ''}:{port['PublicPort']}->{target}"
+        if target not in formatted:
+            formatted.append(target)
+    return ", ".join(formatted)
+
+
+def _docker_api_stats(stats: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return container counters from a one-shot Engine API stats document."""
+
+    cpu_stats = stats.get("cpu_stats") if isinstance(stats.get("cpu_stats"), dict) else {}
+    cpu_usage = cpu_stats.get("cpu_usage") if isinstance(cpu_stats.get("cpu_usage"), dict) else {}
+    memory = stats.get("memory_stats") if isinstance(stats.get("memory_stats"), dict) else {}
+    memory_detail = memory.get("stats") if isinstance(memory.get("stats"), dict) else {}
+    pids = stats.get("pids_stats") if isinstance(stats.get("pids_stats"), dict) else {}
+    throttling = (
+        cpu_stats.get("throttling_data")
+        if isinstance(cpu_stats.get("throttling_data"), dict)
+        else {}
+    )
+    total_usage = _safe_int(cpu_usage.get("total_usage"))
+    throttled_time = _safe_int(throttling.get("throttled_time"))
+    used = _safe_int(memory.get("usage"))
+    # Like docker stats, do not count reclaimable page cache as used memory.
+    inactive = _safe_int(
+        memory_detail.get("inactive_file", memory_detail.get("total_inactive_file"))
+    )
+    if used is not None and inactive is not None and inactive < used:
+        used -= inactive
+    limit = _safe_int(memory.get("limit"))
+    return {
+        "cpu_usage_usec": total_usage // 1000 if total_usage is not None else None,
+        "mem": round(used / limit * 100, 2) if used is not None and limit else None,
+        "memory_usage_bytes": used,
+        "pids": _safe_int(pids.get("current")),
+        "cpu_throttled_periods": _safe_int(throttling.get("throttled_periods")),
+        "cpu_throttled_usec": throttled_time // 1000 if throttled_time is not None else None,
+    }
+
+
+def _docker_api_data(api: Mapping[str, Any]) -> Dict[str, Any]:
+    """Convert Docker Engine API documents into Docker collector fields.
 
+    The remote collector returns the container list, the inspect and one-shot
+    stats documents, and the cgroup counters it read, as they are. The result
+    matches the output of the docker CLI collector.
+    """
+
+    inspected: Dict[str, Dict[str, Any]] = {}
+    stats: Dict[str, Dict[str, Any]] = {}
+    for document in _safe_list(api.get("documents")):
+        if not isinstance(document, dict):
+            continue
+        if isinstance(document.get("State"), dict) and document.get("Id"):
+            inspected[str(document["Id"])] = document
+        elif isinstance(document.get("cpu_stats"), dict) and document.get("id"):
+            stats[str(document["id"])] = _docker_api_stats(document)
+    cgroups = {
+        str(counters["id"]): counters
+        for counters in _safe_list(api.get("cgroups"))
+        if isinstance(counters, dict) and counters.get("id")
+    }
+
+    container_stats: list[Dict[str, Any]] = []
+    for container in _safe_list(api.get("containers")):
+        if not isinstance(container, dict) or not container.get("Id"):
+            continue
+        container_id = str(container["Id"])
+        names = _safe_list(container.get("Names"))
+        labels = container.get("Labels") if isinstance(container.get("Labels"), dict) else {}
+        details = inspected.get(container_id, {})
+        state = details.get("State") if isinstance(details.get("State"), dict) else {}
+        health = state.get("Health") if isinstance(state.get("Health"), dict) else {}
+        host_config = (
+            details.get("HostConfig") if isinstance(details.get("HostConfig"), dict) else {}
+        )
+        restart_policy = (
+            host_config.get("RestartPolicy")
+            if isinstance(host_config.get("RestartPolicy"), dict)
+            else {}
+        )
+        counters = cgroups.get(container_id) or stats.get(container_id) or {}
+        container_stats.append(
+            {
+                "id": container_id[:12],
+                "name": str(names[0]).lstrip("/") if names else "",
+                "cpu": None,
+                "cpu_usage_usec": counters.get("cpu_usage_usec"),
+                "mem": counters.get("mem"),
+                "memory_usage_bytes": counters.get("memory_usage_bytes"),
+                "memory_limit_bytes": host_config.get("Memory"),
+                "pids": counters.get("pids"),
+                "cpu_throttled_periods": counters.get("cpu_throttled_periods"),
+                "cpu_throttled_usec": counters.get("cpu_throttled_usec"),
+                "image": container.get("Image"),
+                "status": container.get("Status"),
+                "restart_count": details.get("RestartCount"),
+                "ports": _docker_api_ports(container.get("Ports")),
+                "health_state": (
+                    health.get("Status") or state.get("Status") or container.get("State")
+                ),
+                "running": state.get("Running"),
+                "restart_policy": restart_policy.get("Name"),
+                "compose_project": labels.get("com.docker.compose.project"),
+                "compose_service": labels.get("com.docker.compose.service"),
+                "swarm_service": labels.get("com.docker.swarm.service.name"),
+            }
+        )
+
+    return {"containers": "", "container_stats": container_stats}
+
+
+def _process_docker_disk_data(data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Normalize Docker disk usage collector output into coordinator data fields.
+
+    An Engine API ``/system/df`` document also yields the largest images and
+    volumes; the docker CLI only reports totals.
+    """
+
+    disk_usage = data.get("docker_df")
+    if not isinstance(disk_usage, dict):
+        return {
+            "docker_images_size_bytes": _safe_int(data.get("docker_images_size_bytes")),
+            "docker_containers_size_bytes": _safe_int(
+                data.get("docker_containers_size_bytes")
+            ),
+            "docker_volumes_size_bytes": _safe_int(data.get("docker_volumes_size_bytes")),
+            "docker_build_cache_size_bytes": _safe_int(
+                data.get("docker_build_cache_size_bytes")
+            ),
+            "docker_image_sizes": [],
+            "docker_volume_sizes": [],
+        }
+
+    def entries(key: str) -> list[Dict[str, Any]]:
+        return [entry for entry in _safe_list(disk_usage.get(key)) if isinstance(entry, dict)]
+
+    def total(values: Iterable[int | None]) -> int | None:
+        sizes = [value for value in values if value is not None]
+        # Docker reports -1 for sizes it has not computed.
+        return sum(value for value in sizes if value > 0) if sizes else None
+
+    images = [
+        {
+            "id": str(image.get("Id") or "").removeprefix("sha256:")[:12],
+            "tags": [
+                tag for tag in _safe_list(image.get("RepoTags")) if tag != "<none>:<none>"
+            ],
+            "size": _safe_int(image.get("Size")),
+            "shared_size": _safe_int(image.get("SharedSize")),
+            "containers": _safe_int(image.get("Containers")),
+        }
+        for image in entries("Images")
+    ]
+    volumes = [
+        {
+            "name": str(volume.get("Name") or ""),
+            "size": _safe_int((volume.get("UsageData") or {}).get("Size")),
+            "containers": _safe_int((volume.get("UsageData") or {}).get("RefCount")),
+        }
+        for volume in entries("Volumes")
+    ]
+
+    def largest(items: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+        items = sorted(items, key=lambda item: item["size"] or 0, reverse=True)
+        return items[:DOCKER_DISK_BREAKDOWN_LIMIT]
+
+    return {
+        "docker_images_size_bytes": _safe_int(disk_usage.get("LayersSize")),
+        "docker_containers_size_bytes": total(
+            _safe_int(container.get("SizeRw")) for container in entries("Containers")
+        ),
+        "docker_volumes_size_bytes": total(volume["size"] for volume in volumes),
+        "docker_build_cache_size_bytes": total(
+            _safe_int(cache.get("Size")) for cache in entries("BuildCache")
+        ),
+        "docker_image_sizes": largest(images),
+        "docker_volume_sizes": largest(volumes),
+    }
+
+
+def _process_docker_data(
+    data: Dict[str, Any], host: str | None = None, partial: bool = False
+) -> Dict[str, Any]:
+    """Normalize Docker collector output into coordinator data fields.
+
+    Containers read from cgroups report cumulative CPU time instead of a
+    percentage; with *host* given, their CPU usage is derived from the
+    previous sample of that host. *partial* marks a document that holds only
+    some containers. Engine API documents are converted first.
+    """
+
+    if isinstance(data.get("docker_api"), dict):
+        data = {**data, **_docker_api_data(data["docker_api"])}
     cont_stats = _safe_list(data.get("container_stats"))
+    cpu_usage_usec = {
+        str(container.get("id") or container.get("name")): usage
+        for container in cont_stats
+        if isinstance(container, dict)
+        and (usage := _safe_int(container.get("cpu_usage_usec"))) is not None
+    }
+    cgroup_cpu: Dict[str, float] = {}
+    if host is not None and cpu_usage_usec:
+        sample_uptime = _safe_float(data.get("docker_sample_uptime"))
+        if sample_uptime is None:
+            sample_uptime = _safe_float(data.get("sample_uptime"))
+        cgroup_cpu = container_cpu_cache.compute(host, cpu_usage_usec, sample_uptime, partial)
     containers_raw = data.get("containers", "")
     if isinstance(containers_raw, str) and "," in containers_raw:
         containers = ", ".join(
@@ -533,6 +1061,9 @@ def _process_docker_data(data: Dict[str, Any]) -> Dict[str, Any]:
             and memory_limit_bytes > 0
             else None
         )
+        cpu = _safe_float(container.get("cpu"))
+        if cpu is None:
+            cpu = cgroup_cpu.get(str(container.get("id") or name))
         running = _safe_bool(container.get("running"))
         if running is None:
             running = (
@@ -544,7 +1075,7 @@ def _process_docker_data(data: Dict[str, Any]) -> Dict[str, Any]:
             {
                 "id": str(container.get("id") or ""),
                 "name": name,
-                "cpu": _safe_float(container.get("cpu")),
+                "cpu": cpu,
                 "mem": _safe_float(container.get("mem")),
                 "memory_usage_bytes": memory_usage_bytes,
                 "memory_limit_bytes": (
@@ -579,6 +1110,17 @@ def _process_docker_data(data: Dict[str, Any]) -> Dict[str, Any]:
     if not containers and processed_containers:
         containers = ", ".join(container["name"] for container in processed_containers)
 
+    return {
+        "docker": _safe_int(data.get("docker")),
+        **_docker_container_summary(processed_containers, containers),
+    }
+
+
+def _docker_container_summary(
+    processed_containers: list[Dict[str, Any]], containers: Any
+) -> Dict[str, Any]:
+    """Return the coordinator fields derived from normalized containers."""
+
     docker_unhealthy_containers = 0
     docker_restart_count_total = 0
     for container in processed_containers:
@@ -594,7 +1136,6 @@ def _process_docker_data(data: Dict[str, Any]) -> Dict[str, Any]:
             docker_restart_count_total += restart_count
 
     result: Dict[str, Any] = {
-        "docker": _safe_int(data.get("docker")),
         "containers": containers,
         "container_details": processed_containers,
         "container_lookup": {
@@ -604,14 +1145,6 @@ def _process_docker_data(data: Dict[str, Any]) -> Dict[str, Any]:
         "docker_unhealthy_containers": docker_unhealthy_containers,
         "docker_restart_count_total": docker_restart_count_total,
         "container_stats": processed_containers,
-        "docker_images_size_bytes": _safe_int(data.get("docker_images_size_bytes")),
-        "docker_containers_size_bytes": _safe_int(
-            data.get("docker_containers_size_bytes")
-        ),
-        "docker_volumes_size_bytes": _safe_int(data.get("docker_volumes_size_bytes")),
-        "docker_build_cache_size_bytes": _safe_int(
-            data.get("docker_build_cache_size_bytes")
-        ),
     }
     for container in processed_containers:
         cname = _sanitize(container.get("name", ""))
@@ -641,6 +1174,52 @@ def _process_docker_data(data: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
+def merge_docker_containers(
+    data: Mapping[str, Any],
+    containers: Sequence[Dict[str, Any]],
+    container_ids: Iterable[str],
+) -> Dict[str, Any]:
+    """Return *data* with the containers of *container_ids* replaced.
+
+    *containers* holds the normalized state of those containers, e.g. from a
+    targeted Docker refresh; listed containers missing from it were removed.
+    Other containers and Docker disk usage keep their previous values.
+    """
+
+    ids = [container_id for container_id in container_ids if container_id]
+
+    def listed(container_id: str) -> bool:
+        return bool(container_id) and any(
+            wanted.startswith(container_id) or container_id.startswith(wanted)
+            for wanted in ids
+        )
+
+    updates = {
+        str(container.get("id") or ""): container
+        for container in containers
+        if isinstance(container, dict) and container.get("name")
+    }
+    merged_containers: list[Dict[str, Any]] = []
+    for container in _safe_list(data.get("container_stats")):
+        if not isinstance(container, dict):
+            continue
+        container_id = str(container.get("id") or "")
+        if not listed(container_id):
+            merged_containers.append(container)
+        elif container_id in updates:
+            merged_containers.append(updates.pop(container_id))
+    merged_containers.extend(updates.values())
+
+    merged = {key: value for key, value in data.items() if not key.startswith("container_")}
+    merged.update(
+        _docker_container_summary(
+            merged_containers,
+            ", ".join(container["name"] for container in merged_containers),
+        )
+    )
+    return merged
+
+
 def _process_storage_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize SMART/NVMe and mdadm output into coordinator data."""
 
@@ -669,6 +1248,8 @@ def _process_storage_data(data: Dict[str, Any]) -> Dict[str, Any]:
             "serial": serial,
             "protocol": str(device.get("protocol") or ""),
             "smart_status": status,
+            "standby": device.get("standby") is True,
+            "capacity_bytes": _safe_int(device.get("capacity_bytes")),
             "temperature": _safe_float(device.get("temperature")),
             "wear_percent": _safe_float(device.get("wear_percent")),
             "media_errors": _safe_int(device.get("media_errors")),
@@ -697,6 +1278,7 @@ def _process_storage_data(data: Dict[str, Any]) -> Dict[str, Any]:
         "storage_stats_partial": storage_stats_partial,
         "storage_devices_seen": storage_devices_seen,
         "storage_devices_collected": _safe_int(data.get("storage_devices_collected")),
+        "storage_devices_standby": _safe_int(data.get("storage_devices_standby")),
         "storage_device_errors": _safe_int(data.get("storage_device_errors")),
         "raid_detail_arrays": [
             detail
@@ -706,6 +1288,42 @@ def _process_storage_data(data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def merge_standby_storage_devices(
+    data: Dict[str, Any], previous_lookup: Mapping[str, Any] | None
+) -> Dict[str, Any]:
+    """Return storage *data* with the last known health of standby devices.
+
+    Devices in standby are not woken up to read SMART data, so their health
+    values are taken from *previous_lookup* of an earlier sample.
+    """
+
+    if not isinstance(previous_lookup, Mapping):
+        return data
+    devices: list[Dict[str, Any]] = []
+    for device in _safe_list(data.get("storage_devices")):
+        previous = previous_lookup.get(device.get("key"))
+        if device.get("standby") and isinstance(previous, dict):
+            device = {
+                **previous,
+                "name": device["name"],
+                "path": device["path"],
+                "standby": True,
+                "capacity_bytes": device.get("capacity_bytes")
+                or previous.get("capacity_bytes"),
+            }
+        devices.append(device)
+    failed_count = sum(device.get("smart_status") == "failed" for device in devices)
+    merged = {
+        **data,
+        "storage_devices": devices,
+        "storage_device_lookup": {device["key"]: device for device in devices},
+        "smart_failed_devices": failed_count,
+    }
+    if failed_count:
+        merged["smart_failure_detected"] = True
+    return merged
+
+
 def _has_usable_docker_metrics(result: Dict[str, Any]) -> bool:
     """Return whether running containers contain a credible stats sample."""
 
@@ -733,6 +1351,20 @@ def _drop_slow_result_keys(result: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _drop_skipped_section_keys(result: Dict[str, Any], skipped_sections: list[str]) -> None:
+    """Remove fields of base sections the collector skipped on this poll."""
+
+    skipped_keys: set[str] = set()
+    for section in skipped_sections:
+        skipped_keys.update(SECTION_RESULT_KEYS.get(section, ()))
+    skip_mounts = "disk" in skipped_sections
+    for key in list(result):
+        if key in skipped_keys or (
+            skip_mounts and key.startswith("disk_") and key.endswith(("_total", "_free"))
+        ):
+            del result[key]
+
+
 async def async_sample(
     host: str,
     username: str,
@@ -744,7 +1376,14 @@ async def async_sample(
     command_timeout: int = DEFAULT_COMMAND_TIMEOUT,
     monitored_ports: object = None,
     host_key_fingerprints: object = None,
+    skip_sections: Sequence[str] = (),
 ) -> Dict[str, Any]:
+    """Collect one base sample, leaving out the sections in *skip_sections*.
+
+    Fields of sections the collector reports as skipped are left out of the
+    result, so the coordinator keeps their previous values.
+    """
+
     port_check_task = asyncio.create_task(
         _async_check_monitored_ports(host, monitored_ports, connect_timeout)
     )
@@ -759,6 +1398,8 @@ async def async_sample(
         command_timeout,
         "base",
         host_key_fingerprints=host_key_fingerprints,
+        prev_uptime=cpu_stats_cache.last_uptime(host),
+        skip_sections=skip_sections,
     )
 
     if data is None:
@@ -767,9 +1408,45 @@ async def async_sample(
             "collection_error": str(last_error) if last_error else "No collector output",
         }
     port_checks = await port_check_task
+    return _process_base_data(host, data, timing, port_checks)
+
+
+def _process_base_data(
+    host: str,
+    data: Dict[str, Any],
+    timing: Dict[str, float],
+    port_checks: list[dict[str, Any]],
+) -> Dict[str, Any]:
+    """Turn one raw base collector sample into coordinator data."""
+
     now = time.time()
+    collector_profile = _collector_profile(data.get("collector_profile"))
+    collector_profile_stats = (
+        collector_profile_cache.compute(host, collector_profile)
+        if "collector_profile" in data
+        else {}
+    )
+    partial_sections = [str(section) for section in _safe_list(data.get("partial_sections"))]
+    skipped_sections = [str(section) for section in _safe_list(data.get("skipped_sections"))]
+    if partial_sections:
+        _LOGGER.debug(
+            "Collector sections %s on %s failed or timed out",
+            ", ".join(partial_sections),
+            host,
+        )
 
-    cpu_value = _safe_float(data.get("cpu"))
+    # Collectors that skipped the one second CPU sleep only report counters;
+    # derive the utilisation from the previous sample of this host.
+    cpu_jiffies = [_safe_int(value) for value in _safe_list(data.get("cpu_jiffies"))]
+    uptime_seconds = _safe_int(data.get("uptime"))
+    delta_cpu = cpu_stats_cache.compute(
+        host, cpu_jiffies if None not in cpu_jiffies else None, uptime_seconds
+    )
+    cpu_raw = data.get("cpu")
+    if cpu_raw is None:
+        cpu_raw = delta_cpu
+
+    cpu_value = _safe_float(cpu_raw)
     mem_value = _safe_float(data.get("mem"))
     cpu_avg_5m_raw = cpu_rolling_average_cache.compute(host, cpu_value, now)
     mem_avg_5m_raw = mem_rolling_average_cache.compute(host, mem_value, now)
@@ -810,18 +1487,23 @@ async def async_sample(
         round(swap_total_bytes / (1024 ** 3), 2) if swap_total_bytes is not None else None
     )
 
+    energy_uj = _safe_int(data.get("energy_uj"))
+    energy_range = _safe_int(data.get("energy_range_uj"))
+    delta_power = power_stats_cache.compute(
+        host, energy_uj, energy_range, _safe_float(data.get("sample_uptime"))
+    )
     power_value = _safe_float(data.get("power_w"))
+    if power_value is None:
+        power_value = delta_power
     if power_value is not None:
         power_value = round(power_value, 2)
 
-    energy_uj = _safe_int(data.get("energy_uj"))
-    energy_range = _safe_int(data.get("energy_range_uj"))
     energy_total_kwh_raw = energy_cache.compute(host, energy_uj, energy_range)
     energy_total_kwh = (
         round(energy_total_kwh_raw, 5) if energy_total_kwh_raw is not None else None
     )
 
-    docker_result = _process_docker_data(data)
+    docker_result = _process_docker_data(data, host)
 
     mac_addresses = normalize_mac_addresses(data.get("mac_addresses"))
     primary_mac = normalize_mac_addresses(data.get("mac_address"))
@@ -852,7 +1534,6 @@ async def async_sample(
         )
     top_process_summary = ", ".join(process["command"] for process in top_processes)
 
-    uptime_seconds = _safe_int(data.get("uptime"))
     process_total = _safe_int(data.get("process_total"))
     process_zombies = _safe_int(data.get("process_zombies"))
     process_peak = None
@@ -874,7 +1555,7 @@ async def async_sample(
     raid_rebuild_active = _safe_int(data.get("software_raid_rebuild_active"))
 
     result: Dict[str, Any] = {
-        "cpu": _safe_int(data.get("cpu")),
+        "cpu": _safe_int(cpu_raw),
         "cpu_avg_5m": cpu_avg_5m,
         "mem": _safe_int(data.get("mem")),
         "mem_avg_5m": mem_avg_5m,
@@ -901,6 +1582,9 @@ async def async_sample(
         "process_total": process_total,
         "process_running": _safe_int(data.get("process_running")),
         "process_zombies": process_zombies,
+        "process_states": _safe_counts(data.get("process_states")),
+        "process_users": _safe_counts(data.get("process_users")),
+        "process_cgroups": _safe_counts(data.get("process_cgroups")),
         "process_peak_since_boot": process_peak,
         "zombie_processes_detected": (
             process_zombies > 0 if process_zombies is not None else None
@@ -957,6 +1641,15 @@ async def async_sample(
         ],
         "ssh_connect_time_ms": round(timing.get("connect_time_ms", 0), 2),
         "collection_time_ms": round(timing.get("collection_time_ms", 0), 2),
+        "collector_payload_bytes": timing.get("payload_bytes"),
+        "collector_parse_time_ms": round(timing.get("parse_time_ms", 0), 2),
+        "collector_section_time_ms": _safe_counts(data.get("section_time_ms")),
+        "collector_section_forks": _safe_counts(data.get("section_forks")),
+        "collector_partial_sections": partial_sections,
+        "collector_skipped_sections": skipped_sections,
+        "collector_cache_age_seconds": _safe_counts(data.get("cache_age_seconds")),
+        "collector_profile": collector_profile,
+        "collector_profile_stats": collector_profile_stats,
         "collection_error": data.get("collection_error"),
         "last_collection_failed": bool(data.get("collection_error")),
     }
@@ -995,6 +1688,8 @@ async def async_sample(
         result[f"disk_{sanitized}_total"] = total_gib
         result[f"disk_{sanitized}_free"] = free_gib
     result["disk_stats"] = processed_disks
+    if skipped_sections:
+        _drop_skipped_section_keys(result, skipped_sections)
 
     result.update(docker_result)
 
@@ -1005,6 +1700,278 @@ async def async_sample(
     return _drop_slow_result_keys(result)
 
 
+class CollectorStream:
+    """Resident base collector that emits one JSON sample per interval."""
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: Optional[str],
+        key: Optional[str],
+        port: int,
+        connect_timeout: int,
+        command_timeout: int,
+        interval: int,
+        monitored_ports: object = None,
+        host_key_fingerprints: object = None,
+    ) -> None:
+        """Initialize a stream that is started by iterating ``async_samples``."""
+
+        self.host = host
+        self._username = username
+        self._password = password
+        self._key = key
+        self._port = port
+        self._connect_timeout = connect_timeout
+        self._command_timeout = command_timeout
+        self._interval = max(1, int(interval))
+        self._monitored_ports = monitored_ports
+        self._host_key_fingerprints = host_key_fingerprints
+        self._stdin: Any = None
+        self._channel: Any = None
+        self._write_lock = threading.Lock()
+
+    async def async_samples(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield processed base samples until the remote stream ends.
+
+        Raises ``EOFError`` when the channel closes and re-raises reader errors
+        so the caller can apply its failure backoff before restarting.
+        """
+
+        async for data, timing in self._async_documents():
+            port_checks = await _async_check_monitored_ports(
+                self.host,
+                self._monitored_ports,
+                self._connect_timeout,
+            )
+            yield _process_base_data(self.host, data, timing, port_checks)
+
+    async def _async_documents(
+        self,
+    ) -> AsyncIterator[tuple[Dict[str, Any], Dict[str, float]]]:
+        """Yield each JSON line of the channel with its timing."""
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+        reader = asyncio.ensure_future(
+            ssh_executor.run(LANE_STREAM, self._read_stream, loop, queue)
+        )
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "error":
+                    raise value
+                if kind == "eof":
+                    raise EOFError(f"Collector stream for {self.host} closed")
+                line, timing = value
+                try:
+                    data = _parse_json_output(line)
+                except json.JSONDecodeError:
+                    _LOGGER.debug("Ignoring non-JSON stream line from %s", self.host)
+                    continue
+                yield data, timing
+        finally:
+            try:
+                await ssh_executor.run(LANE_POLL, self.close)
+            except RuntimeError:
+                # The executor was shut down; closing a channel does not block.
+                self.close()
+            with contextlib.suppress(Exception):
+                await reader
+
+    async def async_request_sample(self) -> None:
+        """Ask the remote collector for an immediate extra sample."""
+
+        await ssh_executor.run(LANE_POLL, self._write_line, "sample")
+
+    def close(self) -> None:
+        """Close the stream channel; the reader thread then sees EOF."""
+
+        channel = self._channel
+        if channel is not None:
+            with contextlib.suppress(Exception):
+                channel.close()
+
+    def _write_line(self, line: str) -> None:
+        """Send one request line to the remote collector."""
+
+        with self._write_lock:
+            if self._stdin is None:
+                return
+            self._stdin.write(f"{line}\n".encode("utf-8"))
+            self._stdin.flush()
+
+    def _stream_env(self) -> str:
+        """Return the environment that selects the remote stream mode."""
+
+        env = f"VSERVER_SSH_STATS_MODE=stream VSERVER_SSH_STATS_STREAM_INTERVAL={self._interval}"
+        if self.host in profiled_hosts:
+            env += " VSERVER_SSH_STATS_PROFILE=1"
+        cache_ttls = remote_cache_hosts.get(self.host)
+        if cache_ttls:
+            env += f" {_cache_ttl_env(cache_ttls)}"
+        return env
+
+    def _read_stream(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue[tuple[str, Any]],
+    ) -> None:
+        """Read JSON lines from the remote collector in a worker thread."""
+
+        def emit(kind: str, value: Any = None) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, (kind, value))
+
+        env = self._stream_env()
+        try:
+            with ssh_pool.exec_command(
+                self.host,
+                self._username,
+                self._password,
+                self._key,
+                self._port,
+                stream_script_command(env),
+                self._connect_timeout,
+                self._interval + self._command_timeout,
+                self._host_key_fingerprints,
+            ) as (stdin, stdout, _, connect_time_ms):
+                self._stdin = stdin
+                self._channel = stdout.channel
+                timing: Dict[str, float] = {"connect_time_ms": connect_time_ms}
+                for raw_line in stdout:
+                    line = (
+                        raw_line.decode("utf-8", "ignore")
+                        if isinstance(raw_line, bytes)
+                        else raw_line
+                    ).strip()
+                    if line == STREAM_NEEDS_SCRIPT:
+                        self._write_line(f"{REMOTE_SCRIPT.rstrip()}\n{STREAM_SCRIPT_END}")
+                        continue
+                    if line:
+                        emit("line", (line, timing))
+                        timing = {"connect_time_ms": 0.0}
+        except Exception as err:
+            emit("error", err)
+            return
+        finally:
+            self._stdin = None
+            self._channel = None
+        emit("eof")
+
+
+DOCKER_EVENTS_HEARTBEAT_SECONDS = 30
+# Events with other IDs are ignored; the IDs end up in a remote command line.
+DOCKER_CONTAINER_ID_PATTERN = re.compile(r"[0-9a-f]{12,64}")
+
+
+def _docker_event(raw: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Normalize one ``docker events`` JSON document, or return None."""
+
+    actor = raw.get("Actor") if isinstance(raw.get("Actor"), dict) else {}
+    attributes = actor.get("Attributes") if isinstance(actor.get("Attributes"), dict) else {}
+    container_id = str(actor.get("ID") or raw.get("id") or "")
+    action = str(raw.get("Action") or raw.get("status") or "")
+    if (
+        str(raw.get("Type") or "container") != "container"
+        or not DOCKER_CONTAINER_ID_PATTERN.fullmatch(container_id)
+        or not action
+    ):
+        return None
+    # Health events read e.g. "health_status: unhealthy".
+    action, _, detail = action.partition(":")
+    return {
+        "id": container_id,
+        "name": str(attributes.get("name") or ""),
+        "action": action.strip(),
+        "health_state": detail.strip() or None,
+        "exit_code": _safe_int(attributes.get("exitCode")),
+        "time": _safe_int(raw.get("time")),
+    }
+
+
+class DockerEventStream(CollectorStream):
+    """Resident ``docker events`` channel for container state changes."""
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: Optional[str],
+        key: Optional[str],
+        port: int,
+        connect_timeout: int,
+        command_timeout: int,
+        since: int | None = None,
+        host_key_fingerprints: object = None,
+    ) -> None:
+        """Initialize a stream resuming after host time *since*, if given."""
+
+        super().__init__(
+            host,
+            username,
+            password,
+            key,
+            port,
+            connect_timeout,
+            command_timeout,
+            DOCKER_EVENTS_HEARTBEAT_SECONDS,
+            host_key_fingerprints=host_key_fingerprints,
+        )
+        self.since = since
+
+    async def async_events(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield normalized container events until the remote stream ends.
+
+        Heartbeats only advance :attr:`since`, the host time up to which
+        events were seen, so a restarted stream can replay what it missed.
+        """
+
+        async for data, _ in self._async_documents():
+            heartbeat = _safe_int(data.get("heartbeat"))
+            if heartbeat is not None:
+                self.since = heartbeat
+                continue
+            event = _docker_event(data)
+            if event is None:
+                continue
+            if event["time"] is not None:
+                self.since = max(self.since or 0, event["time"])
+            yield event
+
+    def _stream_env(self) -> str:
+        """Return the environment that selects the Docker event mode."""
+
+        env = (
+            "VSERVER_SSH_STATS_MODE=docker_events "
+            f"VSERVER_SSH_STATS_STREAM_INTERVAL={self._interval}"
+        )
+        if self.since is not None:
+            env += f" VSERVER_SSH_STATS_DOCKER_EVENTS_SINCE={int(self.since)}"
+        return env
+
+
+SLOW_COLLECTOR_MODES = {
+    "package": "packages",
+    "docker": "docker",
+    "docker_disk": "docker_disk",
+    "storage": "storage",
+}
+
+
+def _docker_outer_timeout(command_timeout: int) -> int:
+    """Return the channel timeout covering all Docker collector retries."""
+
+    quick_timeout = min(command_timeout, 30)
+    return command_timeout + (quick_timeout * 3) + 15
+
+
+def _storage_command_timeout(command_timeout: int) -> int:
+    """Return the timeout for each privileged SMART/NVMe/mdadm read."""
+
+    return min(max(command_timeout, 1), 20)
+
+
 async def async_sample_packages(
     host: str,
     username: str,
@@ -1031,6 +1998,27 @@ async def async_sample_packages(
         pkg_timeout=command_timeout,
         host_key_fingerprints=host_key_fingerprints,
     )
+    return {**_package_result(data, timing, last_error), **_transfer_result(timing)}
+
+
+def _transfer_result(timing: Dict[str, float]) -> Dict[str, Any]:
+    """Return decoded versus transferred byte counts of one slow round trip."""
+
+    if "payload_bytes" not in timing:
+        return {}
+    return {
+        "slow_collector_payload_bytes": timing["payload_bytes"],
+        "slow_collector_transfer_bytes": timing.get("transfer_bytes"),
+    }
+
+
+def _package_result(
+    data: Dict[str, Any] | None,
+    timing: Dict[str, float],
+    last_error: Exception | None,
+) -> Dict[str, Any]:
+    """Normalize one package collector document into coordinator data."""
+
     if data is None:
         return {
             "package_collection_error": (
@@ -1065,11 +2053,16 @@ async def async_sample_docker(
     connect_timeout: int = DEFAULT_CONNECT_TIMEOUT,
     command_timeout: int = DEFAULT_COMMAND_TIMEOUT,
     host_key_fingerprints: object = None,
+    containers: Sequence[str] = (),
 ) -> Dict[str, Any]:
-    """Collect Docker metrics with the slow collector mode."""
+    """Collect Docker metrics with the slow collector mode.
 
-    quick_timeout = min(command_timeout, 30)
-    outer_timeout = command_timeout + (quick_timeout * 3) + 15
+    With *containers*, only those container IDs are collected; see
+    :func:`merge_docker_containers`. Disk usage has its own collector, see
+    :func:`async_sample_docker_disk`.
+    """
+
+    outer_timeout = _docker_outer_timeout(command_timeout)
     data, timing, last_error = await _async_collect_raw(
         host,
         username,
@@ -1082,7 +2075,23 @@ async def async_sample_docker(
         "docker",
         docker_timeout=command_timeout,
         host_key_fingerprints=host_key_fingerprints,
+        docker_containers=containers,
     )
+    return {
+        **_docker_result(data, timing, last_error, host, bool(containers)),
+        **_transfer_result(timing),
+    }
+
+
+def _docker_result(
+    data: Dict[str, Any] | None,
+    timing: Dict[str, float],
+    last_error: Exception | None,
+    host: str | None = None,
+    partial: bool = False,
+) -> Dict[str, Any]:
+    """Normalize one Docker collector document into coordinator data."""
+
     if data is None:
         return {
             "docker_collection_error": (
@@ -1094,7 +2103,7 @@ async def async_sample_docker(
     if _safe_int(data.get("docker")) is None:
         return {"docker_collection_error": "Docker state was not reported"}
 
-    result = _process_docker_data(data)
+    result = _process_docker_data(data, host, partial)
     if not _has_usable_docker_metrics(result):
         return {
             "docker_collection_error": (
@@ -1111,6 +2120,57 @@ async def async_sample_docker(
     return result
 
 
+async def async_sample_docker_disk(
+    host: str,
+    username: str,
+    password: Optional[str],
+    key: Optional[str],
+    port: int,
+    target_os: Optional[str] = "auto",
+    connect_timeout: int = DEFAULT_CONNECT_TIMEOUT,
+    command_timeout: int = DEFAULT_COMMAND_TIMEOUT,
+    host_key_fingerprints: object = None,
+) -> Dict[str, Any]:
+    """Collect Docker image, container, volume and build cache disk usage."""
+
+    data, timing, last_error = await _async_collect_raw(
+        host,
+        username,
+        password,
+        key,
+        port,
+        target_os,
+        connect_timeout,
+        _docker_outer_timeout(command_timeout),
+        "docker_disk",
+        docker_timeout=command_timeout,
+        host_key_fingerprints=host_key_fingerprints,
+    )
+    return {**_docker_disk_result(data, timing, last_error), **_transfer_result(timing)}
+
+
+def _docker_disk_result(
+    data: Dict[str, Any] | None,
+    timing: Dict[str, float],
+    last_error: Exception | None,
+) -> Dict[str, Any]:
+    """Normalize one Docker disk usage document into coordinator data."""
+
+    if data is None:
+        return {
+            "docker_disk_collection_error": (
+                str(last_error) if last_error else "No Docker disk usage output"
+            )
+        }
+    if _safe_int(data.get("docker_disk_complete")) != 1:
+        return {"docker_disk_collection_error": "Docker disk usage collection did not complete"}
+
+    result = _process_docker_disk_data(data)
+    result["docker_disk_collection_error"] = None
+    result["docker_disk_collection_time_ms"] = round(timing.get("collection_time_ms", 0), 2)
+    return result
+
+
 async def async_sample_storage(
     host: str,
     username: str,
@@ -1124,7 +2184,7 @@ async def async_sample_storage(
 ) -> Dict[str, Any]:
     """Collect SMART, NVMe, and mdadm metrics with a slow collector mode."""
 
-    per_command_timeout = min(max(command_timeout, 1), 20)
+    per_command_timeout = _storage_command_timeout(command_timeout)
     data, timing, last_error = await _async_collect_raw(
         host,
         username,
@@ -1138,6 +2198,16 @@ async def async_sample_storage(
         storage_timeout=per_command_timeout,
         host_key_fingerprints=host_key_fingerprints,
     )
+    return {**_storage_result(data, timing, last_error), **_transfer_result(timing)}
+
+
+def _storage_result(
+    data: Dict[str, Any] | None,
+    timing: Dict[str, float],
+    last_error: Exception | None,
+) -> Dict[str, Any]:
+    """Normalize one storage collector document into coordinator data."""
+
     if data is None:
         return {
             "storage_collection_error": (
@@ -1165,3 +2235,80 @@ async def async_sample_storage(
         timing.get("collection_time_ms", 0), 2
     )
     return result
+
+
+async def async_sample_slow(
+    host: str,
+    username: str,
+    password: Optional[str],
+    key: Optional[str],
+    port: int,
+    collectors: list[str],
+    target_os: Optional[str] = "auto",
+    connect_timeout: int = DEFAULT_CONNECT_TIMEOUT,
+    command_timeout: int = DEFAULT_COMMAND_TIMEOUT,
+    host_key_fingerprints: object = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Collect several slow collectors in one SSH round trip.
+
+    The remote collector runs the requested sections in parallel and returns
+    one document with a section, completion flag and duration per mode. The
+    result maps each collector name to the data its own sampler would return.
+    """
+
+    modes = [SLOW_COLLECTOR_MODES[collector] for collector in collectors]
+    outer_timeout = command_timeout
+    if "docker" in modes or "docker_disk" in modes:
+        outer_timeout = _docker_outer_timeout(command_timeout)
+    data, timing, last_error = await _async_collect_raw(
+        host,
+        username,
+        password,
+        key,
+        port,
+        target_os,
+        connect_timeout,
+        outer_timeout,
+        ",".join(modes),
+        pkg_timeout=command_timeout,
+        docker_timeout=command_timeout,
+        storage_timeout=_storage_command_timeout(command_timeout),
+        host_key_fingerprints=host_key_fingerprints,
+    )
+    sections = data.get("sections") if isinstance(data, dict) else None
+    if not isinstance(sections, dict):
+        sections = {}
+        if last_error is None:
+            last_error = ValueError("No combined collector output")
+    completed = data.get("section_complete") if isinstance(data, dict) else None
+    section_times = data.get("section_time_ms") if isinstance(data, dict) else None
+    completed = completed if isinstance(completed, dict) else {}
+    section_times = section_times if isinstance(section_times, dict) else {}
+
+    result_builders = {
+        "package": _package_result,
+        "docker": partial(_docker_result, host=host),
+        "docker_disk": _docker_disk_result,
+        "storage": _storage_result,
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    for collector, mode in zip(collectors, modes):
+        section = sections.get(mode)
+        section_error = last_error
+        if not isinstance(section, dict) or _safe_int(completed.get(mode)) != 1:
+            section = None
+            section_error = section_error or ValueError(f"{mode} section did not complete")
+        section_timing = {
+            "collection_time_ms": _safe_float(section_times.get(mode)) or 0.0
+        }
+        results[collector] = {
+            **result_builders[collector](section, section_timing, section_error),
+            **_transfer_result(timing),
+        }
+    _LOGGER.debug(
+        "Combined %s collectors for %s finished in %.0f ms",
+        ",".join(modes),
+        host,
+        timing.get("collection_time_ms", 0),
+    )
+    return results
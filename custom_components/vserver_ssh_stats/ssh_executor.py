@@ -0,0 +1,156 @@
+"""Integration-owned thread pools for blocking SSH I/O."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+_T = TypeVar("_T")
+
+# Polls and custom sensors share the poll lane. Long service actions such as
+# package upgrades or reboots run in their own lane so they can never occupy
+# the threads that regular polling needs. Resident channels, i.e. collector
+# streams and Docker event streams, hold a worker for as long as they run and
+# get a lane of their own for the same reason.
+LANE_POLL = "poll"
+LANE_ACTION = "action"
+LANE_STREAM = "stream"
+LANES = (LANE_POLL, LANE_ACTION, LANE_STREAM)
+
+MIN_POLL_WORKERS = 4
+MAX_POLL_WORKERS = 64
+MIN_ACTION_WORKERS = 2
+MAX_ACTION_WORKERS = 16
+MIN_STREAM_WORKERS = 2
+MAX_STREAM_WORKERS = 256
+
+
+def lane_sizes(server_count: int) -> dict[str, int]:
+    """Return the worker count per lane for *server_count* configured servers.
+
+    Each server may run a base poll and a slow collector at the same time, so
+    the poll lane gets two workers per server. Actions get one per server.
+    Each server may keep a collector stream and a Docker event stream open,
+    so the stream lane gets two workers per server as well.
+    """
+
+    servers = max(0, int(server_count))
+    return {
+        LANE_POLL: min(MAX_POLL_WORKERS, max(MIN_POLL_WORKERS, servers * 2)),
+        LANE_ACTION: min(MAX_ACTION_WORKERS, max(MIN_ACTION_WORKERS, servers)),
+        LANE_STREAM: min(MAX_STREAM_WORKERS, max(MIN_STREAM_WORKERS, servers * 2)),
+    }
+
+
+class SSHExecutor:
+    """Run blocking SSH calls on dedicated, bounded thread pools."""
+
+    def __init__(self, server_count: int = 0) -> None:
+        """Initialize lanes sized for *server_count* servers."""
+
+        self._lock = threading.Lock()
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+        self._max_workers = lane_sizes(server_count)
+        self._queued = dict.fromkeys(LANES, 0)
+        self._running = dict.fromkeys(LANES, 0)
+        self._peak_queued = dict.fromkeys(LANES, 0)
+        self._shut_down = False
+
+    def configure(self, server_count: int) -> None:
+        """Resize the lanes for *server_count* servers.
+
+        A lane whose size changes gets a new pool; calls already submitted
+        to the old pool still finish there.
+        """
+
+        retired: list[ThreadPoolExecutor] = []
+        self.start()
+        with self._lock:
+            for lane, size in lane_sizes(server_count).items():
+                if self._max_workers.get(lane) == size:
+                    continue
+                self._max_workers[lane] = size
+                executor = self._executors.pop(lane, None)
+                if executor is not None:
+                    retired.append(executor)
+        for executor in retired:
+            executor.shutdown(wait=False)
+
+    def start(self) -> None:
+        """Accept calls again after :meth:`shutdown`, with the current lane sizes."""
+
+        with self._lock:
+            self._shut_down = False
+
+    def shutdown(self) -> None:
+        """Stop all lanes and cancel calls that did not start yet.
+
+        Later calls are refused until :meth:`configure` is called again.
+        """
+
+        with self._lock:
+            self._shut_down = True
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, lane: str, func: Callable[..., _T], *args: Any) -> _T:
+        """Run ``func(*args)`` on *lane* and return its result.
+
+        Raises ``RuntimeError`` after :meth:`shutdown`.
+        """
+
+        def call() -> _T:
+            with self._lock:
+                self._queued[lane] -= 1
+                self._running[lane] += 1
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running[lane] -= 1
+
+        with self._lock:
+            if self._shut_down:
+                raise RuntimeError("The SSH executor is shut down")
+            executor = self._executors.get(lane)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers[lane],
+                    thread_name_prefix=f"vserver_ssh_stats_{lane}",
+                )
+                self._executors[lane] = executor
+            self._queued[lane] += 1
+            self._peak_queued[lane] = max(self._peak_queued[lane], self._queued[lane])
+            try:
+                future = executor.submit(call)
+            except RuntimeError:
+                self._queued[lane] -= 1
+                raise
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            if future.cancel():
+                # Cancelled before a worker picked it up.
+                with self._lock:
+                    self._queued[lane] -= 1
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return worker, running and queue counts per lane for diagnostics."""
+
+        with self._lock:
+            return {
+                lane: {
+                    "max_workers": self._max_workers[lane],
+                    "running": self._running[lane],
+                    "queued": self._queued[lane],
+                    "peak_queued": self._peak_queued[lane],
+                    "saturated": self._running[lane] >= self._max_workers[lane],
+                }
+                for lane in LANES
+            }
+
+
+ssh_executor = SSHExecutor()
@@ -0,0 +1,299 @@
+"""Shared SSH transport pool for collectors, custom sensors and actions."""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import paramiko
+
+from .ssh_security import configure_pinned_host_keys
+from .util import DEFAULT_SSH_KEEPALIVE_INTERVAL, DEFAULT_SSH_POOL_IDLE_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+PoolKey = tuple[str, int, str, str, str, tuple[str, ...], bool]
+
+# Errors raised while opening a channel on a transport that went away between
+# polls. A reused connection failing this way is replaced once transparently.
+STALE_CONNECTION_ERRORS = (paramiko.SSHException, EOFError, OSError)
+
+
+class _PooledConnection:
+    """One authenticated SSH client shared by concurrent channels."""
+
+    __slots__ = ("client", "last_used", "in_use")
+
+    def __init__(self, client: Any) -> None:
+        """Track an authenticated client and its channel usage."""
+
+        self.client = client
+        self.last_used = time.monotonic()
+        self.in_use = 0
+
+    def is_active(self) -> bool:
+        """Return whether the underlying transport is still connected."""
+
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+
+def _fingerprint_key(value: object) -> tuple[str, ...]:
+    """Return a hashable, order-independent form of configured host-key pins."""
+
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sorted(str(item) for item in value))
+    if value:
+        return (str(value),)
+    return ()
+
+
+def pool_key(
+    host: str,
+    port: int,
+    username: str,
+    key: Optional[str],
+    password: Optional[str],
+    host_key_fingerprints: object,
+    compression: bool = False,
+) -> PoolKey:
+    """Return the pool key for one set of connection credentials.
+
+    The password is only kept as a digest so credential changes in the options
+    flow open a new connection instead of reusing the old authentication.
+    Compression is negotiated on connect, so toggling it needs a new
+    connection as well.
+    """
+
+    password_digest = (
+        hashlib.sha256(password.encode("utf-8")).hexdigest() if password else ""
+    )
+    return (
+        host,
+        int(port),
+        username,
+        key or "",
+        password_digest,
+        _fingerprint_key(host_key_fingerprints),
+        compression,
+    )
+
+
+class SSHConnectionPool:
+    """Keep authenticated SSH transports alive and run commands on new channels."""
+
+    def __init__(
+        self,
+        idle_ttl: float = DEFAULT_SSH_POOL_IDLE_TTL,
+        keepalive_interval: int = DEFAULT_SSH_KEEPALIVE_INTERVAL,
+        client_factory: Callable[[], Any] = paramiko.SSHClient,
+    ) -> None:
+        """Initialize an empty pool."""
+
+        self._idle_ttl = idle_ttl
+        self._keepalive_interval = keepalive_interval
+        self._client_factory = client_factory
+        self._connections: dict[PoolKey, _PooledConnection] = {}
+        self._connect_locks: dict[PoolKey, threading.Lock] = {}
+        self._compressed_hosts: set[str] = set()
+        self._lock = threading.Lock()
+
+    def set_compression(self, hosts: Iterable[str], enabled: bool) -> None:
+        """Enable or disable SSH transport compression for new connections to *hosts*."""
+
+        with self._lock:
+            for host in hosts:
+                if enabled:
+                    self._compressed_hosts.add(host)
+                else:
+                    self._compressed_hosts.discard(host)
+
+    def compression_enabled(self, host: str) -> bool:
+        """Return whether new connections to *host* request compression."""
+
+        return host in self._compressed_hosts
+
+    @contextlib.contextmanager
+    def exec_command(
+        self,
+        host: str,
+        username: str,
+        password: Optional[str],
+        key: Optional[str],
+        port: int,
+        command: str,
+        connect_timeout: int,
+        command_timeout: int,
+        host_key_fingerprints: object,
+    ) -> Iterator[tuple[Any, Any, Any, float]]:
+        """Yield ``(stdin, stdout, stderr, connect_time_ms)`` for *command*.
+
+        The command runs on a new channel of the pooled transport for these
+        credentials. A reused transport that fails to open a channel is
+        discarded and the command is retried once on a fresh connection.
+        """
+
+        compress = self.compression_enabled(host)
+        key_tuple = pool_key(
+            host, port, username, key, password, host_key_fingerprints, compress
+        )
+        connect_args = {
+            "hostname": host,
+            "port": port,
+            "username": username,
+            "password": password,
+            "key_filename": key,
+            "timeout": connect_timeout,
+            "banner_timeout": connect_timeout,
+            "auth_timeout": connect_timeout,
+            "compress": compress,
+        }
+        for attempt in range(2):
+            started = time.monotonic()
+            connection, reused = self._checkout(
+                key_tuple, connect_args, host_key_fingerprints
+            )
+            connect_time_ms = (time.monotonic() - started) * 1000
+            try:
+                stdin, stdout, stderr = connection.client.exec_command(
+                    command, timeout=command_timeout
+                )
+            except STALE_CONNECTION_ERRORS as err:
+                self._checkin(key_tuple, connection, discard=True)
+                if reused and attempt == 0:
+                    _LOGGER.debug("Reconnecting stale SSH transport to %s: %s", host, err)
+                    continue
+                raise
+            break
+
+        try:
+            yield stdin, stdout, stderr, connect_time_ms
+        finally:
+            with contextlib.suppress(Exception):
+                stdout.channel.close()
+            self._checkin(key_tuple, connection)
+
+    def close_hosts(self, hosts: set[str]) -> None:
+        """Close pooled connections for *hosts*, e.g. when an entry unloads."""
+
+        self._close_matching(lambda key_tuple: key_tuple[0] in hosts)
+
+    def close_all(self) -> None:
+        """Close every pooled connection."""
+
+        self._close_matching(lambda _key_tuple: True)
+
+    def _connect_lock(self, key_tuple: PoolKey) -> threading.Lock:
+        """Return the lock serializing connection setup for one pool key."""
+
+        with self._lock:
+            return self._connect_locks.setdefault(key_tuple, threading.Lock())
+
+    def _checkout(
+        self,
+        key_tuple: PoolKey,
+        connect_args: dict[str, Any],
+        host_key_fingerprints: object,
+    ) -> tuple[_PooledConnection, bool]:
+        """Return a usable connection for *key_tuple* and whether it was reused."""
+
+        self._evict_idle()
+        with self._connect_lock(key_tuple):
+            with self._lock:
+                connection = self._connections.get(key_tuple)
+            if connection is not None and self._is_usable(connection):
+                with self._lock:
+                    connection.in_use += 1
+                    connection.last_used = time.monotonic()
+                return connection, True
+            if connection is not None:
+                self._checkin(key_tuple, connection, discard=True, checked_out=False)
+
+            client = self._client_factory()
+            configure_pinned_host_keys(client, host_key_fingerprints)
+            try:
+                client.connect(**connect_args)
+            except BaseException:
+                client.close()
+                raise
+            transport = client.get_transport()
+            if transport is not None and self._keepalive_interval > 0:
+                transport.set_keepalive(self._keepalive_interval)
+            connection = _PooledConnection(client)
+            connection.in_use = 1
+            with self._lock:
+                self._connections[key_tuple] = connection
+            return connection, False
+
+    def _is_usable(self, connection: _PooledConnection) -> bool:
+        """Health-check a pooled connection before handing it out again."""
+
+        if not connection.is_active():
+            return False
+        if time.monotonic() - connection.last_used < self._keepalive_interval:
+            return True
+        try:
+            connection.client.get_transport().send_ignore()
+        except STALE_CONNECTION_ERRORS:
+            return False
+        return connection.is_active()
+
+    def _checkin(
+        self,
+        key_tuple: PoolKey,
+        connection: _PooledConnection,
+        *,
+        discard: bool = False,
+        checked_out: bool = True,
+    ) -> None:
+        """Release one channel user and close the connection once it is retired."""
+
+        with self._lock:
+            if checked_out:
+                connection.in_use -= 1
+            connection.last_used = time.monotonic()
+            pooled = self._connections.get(key_tuple) is connection
+            if pooled and (discard or not connection.is_active()):
+                del self._connections[key_tuple]
+                pooled = False
+            close = not pooled and connection.in_use <= 0
+        if close:
+            connection.client.close()
+
+    def _evict_idle(self) -> None:
+        """Close connections that have not carried a channel for the idle TTL."""
+
+        now = time.monotonic()
+        self._close_matching(
+            lambda key_tuple: (
+                self._connections[key_tuple].in_use <= 0
+                and now - self._connections[key_tuple].last_used >= self._idle_ttl
+            )
+        )
+
+    def _close_matching(self, predicate: Callable[[PoolKey], bool]) -> None:
+        """Remove matching connections and close those without active channels.
+
+        Connect locks without a pooled connection are dropped as well, so locks
+        of old credentials, host-key pins or compression settings do not
+        accumulate. Locks held by a connection in progress are kept.
+        """
+
+        retired: list[_PooledConnection] = []
+        with self._lock:
+            for key_tuple in [key for key in self._connections if predicate(key)]:
+                connection = self._connections.pop(key_tuple)
+                if connection.in_use <= 0:
+                    retired.append(connection)
+            for key_tuple, lock in list(self._connect_locks.items()):
+                if key_tuple not in self._connections and not lock.locked():
+                    del self._connect_locks[key_tuple]
+        for connection in retired:
+            with contextlib.suppress(Exception):
+                connection.client.close()
+
+
+ssh_pool = SSHConnectionPool()
@@ -0,0 +1,341 @@
+"""Optional asyncio-native SSH backend built on asyncssh.
+
+The Paramiko backend keeps one worker thread blocked per in-flight command.
+Hosts configured for the ``asyncssh`` transport instead multiplex all of
+their channels on the event loop. asyncssh is listed in the manifest; when
+it cannot be imported anyway, e.g. on a manual install, those hosts fall
+back to Paramiko with a warning.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import time
+from typing import Any, Callable, Iterable, Optional
+
+import paramiko
+
+from .ssh_pool import PoolKey, pool_key, ssh_pool
+from .ssh_security import PinnedHostKeyPolicy, SSHHostKeyError
+from .util import (
+    DEFAULT_SSH_KEEPALIVE_INTERVAL,
+    DEFAULT_SSH_POOL_IDLE_TTL,
+    SSH_TRANSPORT_ASYNCSSH,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Hosts of loaded config entries that selected the asyncssh transport.
+_asyncssh_hosts: set[str] = set()
+_missing_dependency_logged = False
+
+
+def configure_host_transport(hosts: Iterable[str], transport: str) -> None:
+    """Select *transport* for *hosts* of one config entry."""
+
+    for host in hosts:
+        if transport == SSH_TRANSPORT_ASYNCSSH:
+            _asyncssh_hosts.add(host)
+        else:
+            _asyncssh_hosts.discard(host)
+
+
+def forget_hosts(hosts: Iterable[str]) -> None:
+    """Drop transport selections for unloaded hosts."""
+
+    for host in hosts:
+        _asyncssh_hosts.discard(host)
+
+
+def _load_asyncssh() -> Any:
+    """Return the asyncssh module or ``None`` when it is not installed."""
+
+    global _missing_dependency_logged
+    try:
+        return importlib.import_module("asyncssh")
+    except ImportError:
+        if not _missing_dependency_logged:
+            _LOGGER.warning(
+                "The asyncssh SSH transport is selected but asyncssh is not "
+                "installed; using Paramiko instead"
+            )
+            _missing_dependency_logged = True
+        return None
+
+
+def transport_for_host(host: str) -> Optional[AsyncSSHTransport]:
+    """Return the asyncio transport for *host*, or ``None`` to use Paramiko."""
+
+    if host not in _asyncssh_hosts or _load_asyncssh() is None:
+        return None
+    return asyncssh_transport
+
+
+class _PublicKeyBlob:
+    """Expose an asyncssh public key in the shape the Paramiko policy expects."""
+
+    def __init__(self, key: Any) -> None:
+        """Keep the SSH wire encoding of the asyncssh *key*."""
+
+        self._data = key.public_data
+
+    def asbytes(self) -> bytes:
+        """Return the key blob that the fingerprint is computed from."""
+
+        return self._data
+
+
+async def _read_bounded(
+    stream: Any,
+    limit: Optional[int],
+    sink: Optional[Callable[[bytes], None]] = None,
+) -> tuple[bytes, bool]:
+    """Read *stream* to EOF, keeping at most *limit* bytes when set.
+
+    With a *sink*, chunks are handed over as they arrive instead of buffered.
+    """
+
+    data = bytearray()
+    truncated = False
+    while True:
+        chunk = await stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return bytes(data), truncated
+        if sink is not None:
+            sink(chunk)
+            continue
+        if limit is None:
+            data.extend(chunk)
+            continue
+        remaining = limit - len(data)
+        if remaining > 0:
+            data.extend(chunk[:remaining])
+        truncated |= len(chunk) > max(remaining, 0)
+
+
+class _AsyncConnection:
+    """One asyncssh connection shared by concurrent channels."""
+
+    __slots__ = ("connection", "last_used", "in_use")
+
+    def __init__(self, connection: Any) -> None:
+        """Track an authenticated connection and its channel usage."""
+
+        self.connection = connection
+        self.last_used = time.monotonic()
+        self.in_use = 0
+
+
+class AsyncSSHTransport:
+    """Run commands on pooled asyncssh connections without worker threads.
+
+    Connections are keyed like the Paramiko pool, verified against the same
+    pinned SHA-256 host-key fingerprints, and closed after the idle TTL.
+    Errors are raised as the exception types of the Paramiko backend so
+    callers handle both transports alike.
+    """
+
+    def __init__(self, idle_ttl: float = DEFAULT_SSH_POOL_IDLE_TTL) -> None:
+        """Initialize an empty connection cache."""
+
+        self._idle_ttl = idle_ttl
+        self._connections: dict[PoolKey, _AsyncConnection] = {}
+        self._locks: dict[PoolKey, asyncio.Lock] = {}
+
+    async def async_exec(
+        self,
+        host: str,
+        username: str,
+        password: Optional[str],
+        key: Optional[str],
+        port: int,
+        command: str,
+        connect_timeout: int,
+        command_timeout: int,
+        host_key_fingerprints: object,
+        stdin_data: Optional[bytes] = None,
+        max_output: Optional[int] = None,
+        stdout_sink: Optional[Callable[[bytes], None]] = None,
+    ) -> tuple[str, str, int, float, bool]:
+        """Run *command* and return stdout, stderr, exit status, connect ms, truncation.
+
+        When *stdout_sink* is given, stdout chunks are passed to it and the
+        returned stdout is empty.
+        """
+
+        asyncssh = _load_asyncssh()
+        key_tuple = pool_key(
+            host,
+            port,
+            username,
+            key,
+            password,
+            host_key_fingerprints,
+            ssh_pool.compression_enabled(host),
+        )
+        for attempt in range(2):
+            started = time.monotonic()
+            pooled, reused = await self._async_checkout(
+                asyncssh,
+                key_tuple,
+                host,
+                username,
+                password,
+                key,
+                port,
+                connect_timeout,
+                host_key_fingerprints,
+            )
+            connect_time_ms = (time.monotonic() - started) * 1000
+            try:
+                process = await pooled.connection.create_process(command, encoding=None)
+            except (asyncssh.Error, OSError) as err:
+                self._checkin(key_tuple, pooled, discard=True)
+                if reused and attempt == 0:
+                    _LOGGER.debug("Reconnecting stale asyncssh connection to %s: %s", host, err)
+                    continue
+                raise ConnectionError(str(err) or err.__class__.__name__) from err
+            break
+
+        try:
+            if stdin_data is not None:
+                process.stdin.write(stdin_data)
+            process.stdin.write_eof()
+            (stdout, truncated), (stderr, _) = await asyncio.wait_for(
+                asyncio.gather(
+                    _read_bounded(process.stdout, max_output, stdout_sink),
+                    _read_bounded(process.stderr, max_output),
+                ),
+                command_timeout,
+            )
+            await asyncio.wait_for(process.wait_closed(), command_timeout)
+        except asyncio.TimeoutError as err:
+            raise TimeoutError(
+                f"Remote command timed out after {command_timeout} seconds"
+            ) from err
+        finally:
+            process.close()
+            self._checkin(key_tuple, pooled)
+        status = process.exit_status if process.exit_status is not None else -1
+        return (
+            stdout.decode("utf-8", "replace"),
+            stderr.decode("utf-8", "replace"),
+            status,
+            connect_time_ms,
+            truncated,
+        )
+
+    async def async_close_hosts(self, hosts: set[str]) -> None:
+        """Remove cached connections for *hosts* and close those without channels.
+
+        Connections that still carry a channel are closed by ``_checkin`` once
+        their last channel finishes.
+        """
+
+        for key_tuple in [key for key in self._connections if key[0] in hosts]:
+            pooled = self._connections.pop(key_tuple)
+            if pooled.in_use <= 0:
+                pooled.connection.close()
+        self._prune_locks()
+
+    async def _async_checkout(
+        self,
+        asyncssh: Any,
+        key_tuple: PoolKey,
+        host: str,
+        username: str,
+        password: Optional[str],
+        key: Optional[str],
+        port: int,
+        connect_timeout: int,
+        host_key_fingerprints: object,
+    ) -> tuple[_AsyncConnection, bool]:
+        """Return a cached or new connection and whether it was reused."""
+
+        self._evict_idle()
+        lock = self._locks.setdefault(key_tuple, asyncio.Lock())
+        async with lock:
+            pooled = self._connections.get(key_tuple)
+            if pooled is not None:
+                pooled.in_use += 1
+                pooled.last_used = time.monotonic()
+                return pooled, True
+
+            policy = PinnedHostKeyPolicy(host_key_fingerprints)
+            compression: dict[str, Any] = {}
+            if ssh_pool.compression_enabled(host):
+                compression["compression_algs"] = ["zlib@openssh.com", "zlib", "none"]
+            rejected: list[SSHHostKeyError] = []
+
+            class _PinnedClient(asyncssh.SSHClient):
+                def validate_host_public_key(
+                    self, hostname: str, addr: str, key_port: int, host_key: Any
+                ) -> bool:
+                    try:
+                        policy.missing_host_key(None, hostname, _PublicKeyBlob(host_key))
+                    except SSHHostKeyError as err:
+                        rejected.append(err)
+                        return False
+                    return True
+
+            try:
+                connection, _client = await asyncssh.create_connection(
+                    _PinnedClient,
+                    host,
+                    port,
+                    username=username,
+                    password=password,
+                    client_keys=[key] if key else None,
+                    known_hosts=([], [], []),
+                    connect_timeout=connect_timeout,
+                    login_timeout=connect_timeout,
+                    keepalive_interval=DEFAULT_SSH_KEEPALIVE_INTERVAL,
+                    **compression,
+                )
+            except asyncssh.PermissionDenied as err:
+                raise paramiko.AuthenticationException(str(err)) from err
+            except asyncssh.Error as err:
+                if rejected:
+                    raise rejected[0] from err
+                raise ConnectionError(str(err) or err.__class__.__name__) from err
+            except asyncio.TimeoutError as err:
+                raise TimeoutError(f"Timed out connecting to {host}:{port}") from err
+            pooled = _AsyncConnection(connection)
+            pooled.in_use = 1
+            self._connections[key_tuple] = pooled
+            return pooled, False
+
+    def _checkin(
+        self, key_tuple: PoolKey, pooled: _AsyncConnection, *, discard: bool = False
+    ) -> None:
+        """Release one channel user and close the connection once it is retired."""
+
+        pooled.in_use -= 1
+        pooled.last_used = time.monotonic()
+        if discard and self._connections.get(key_tuple) is pooled:
+            del self._connections[key_tuple]
+        if self._connections.get(key_tuple) is not pooled and pooled.in_use <= 0:
+            pooled.connection.close()
+
+    def _evict_idle(self) -> None:
+        """Close connections that carried no channel for the idle TTL."""
+
+        now = time.monotonic()
+        for key_tuple, pooled in list(self._connections.items()):
+            if pooled.in_use <= 0 and now - pooled.last_used >= self._idle_ttl:
+                del self._connections[key_tuple]
+                pooled.connection.close()
+        self._prune_locks()
+
+    def _prune_locks(self) -> None:
+        """Drop connect locks without a cached connection that nobody holds."""
+
+        for key_tuple, lock in list(self._locks.items()):
+            if key_tuple not in self._connections and not lock.locked():
+                del self._locks[key_tuple]
+
+
+asyncssh_transport = AsyncSSHTransport()
@@ -13,6 +13,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from . import DOMAIN
 from .coordinator import VServerCoordinator, async_get_or_create_coordinators
 from .docker_entities import (
+    CONTAINER_DATA_KEYS,
     build_container_action_data,
     container_names_from_registry,
     container_names_from_stats,
@@ -48,7 +49,7 @@ class VServerContainerSwitch(CoordinatorEntity[VServerCoordinator], SwitchEntity
     ) -> None:
         """Initialize the container switch."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=CONTAINER_DATA_KEYS)
         self._container_name = container_name
         self._sanitized_name = sanitized_name
         self._connect_timeout = connect_timeout
@@ -14,10 +14,13 @@ except ImportError:  # pragma: no cover - compatibility with older Home Assistan
     CONNECTION_NETWORK_MAC = "mac"
 
 DEFAULT_INTERVAL = 30
+DEFAULT_MEDIUM_INTERVAL = 60
+DEFAULT_SLOW_INTERVAL = 10 * 60
 DEFAULT_CONNECT_TIMEOUT = 10
 DEFAULT_COMMAND_TIMEOUT = 45
 DEFAULT_PACKAGE_INTERVAL = 12 * 60 * 60
 DEFAULT_DOCKER_INTERVAL = 30 * 60
+DEFAULT_DOCKER_DISK_INTERVAL = 6 * 60 * 60
 DEFAULT_STORAGE_INTERVAL = 60 * 60
 DEFAULT_SLOW_COMMAND_TIMEOUT = 180
 DEFAULT_ACTION_COMMAND_TIMEOUT = 300
@@ -29,9 +32,94 @@ DEFAULT_CUSTOM_SENSOR_TIMEOUT = 30
 MIN_CUSTOM_SENSOR_INTERVAL = 5
 DEFAULT_BACKOFF_FAILURE_THRESHOLD = 3
 DEFAULT_BACKOFF_MAX_INTERVAL = 300
+DEFAULT_SSH_POOL_IDLE_TTL = 5 * 60
+DEFAULT_SSH_KEEPALIVE_INTERVAL = 30
+COLLECTION_MODE_POLL = "poll"
+COLLECTION_MODE_STREAM = "stream"
+COLLECTION_MODES = (COLLECTION_MODE_POLL, COLLECTION_MODE_STREAM)
+DEFAULT_COLLECTION_MODE = COLLECTION_MODE_POLL
+DEFAULT_MAX_SSH_SESSIONS = 4
+MAX_SSH_SESSIONS = 64
+DEFAULT_MAX_FLEET_SSH_SESSIONS = 16
+SSH_TRANSPORT_PARAMIKO = "paramiko"
+SSH_TRANSPORT_ASYNCSSH = "asyncssh"
+SSH_TRANSPORTS = (SSH_TRANSPORT_PARAMIKO, SSH_TRANSPORT_ASYNCSSH)
+DEFAULT_SSH_TRANSPORT = SSH_TRANSPORT_PARAMIKO
+# Default seconds the remote collector may reuse results of slow-changing
+# sections when the host result cache is enabled.
+REMOTE_CACHE_TTLS = {
+    "os": 60 * 60,
+    "mac": 60 * 60,
+    "boot": 10 * 60,
+    "firewall": 5 * 60,
+    "fail2ban": 2 * 60,
+    "systemd": 2 * 60,
+}
+# Base collector sections polled at the medium and slow tier intervals. All
+# other sections belong to the fast tier and run on every poll.
+METRIC_TIER_MEDIUM = "medium"
+METRIC_TIER_SLOW = "slow"
+METRIC_TIER_SECTIONS = {
+    METRIC_TIER_MEDIUM: ("processes", "disk", "network", "host"),
+    METRIC_TIER_SLOW: ("services", "systemd", "journal", "ssh_logins", "firewall", "fail2ban"),
+}
 
 MAC_PATTERN = re.compile(r"^[0-9a-f]{2}(:[0-9a-f]{2}){5}$")
 PORT_SPLIT_PATTERN = re.compile(r"[\s,;]+")
+REMOTE_CACHE_TTL_SPLIT_PATTERN = re.compile(r"[,;\n]+")
+
+
+def parse_remote_cache_ttls(value: object) -> dict[str, int]:
+    """Return per-section result cache TTL overrides from user input.
+
+    Text input holds ``section=seconds`` entries separated by commas or line
+    breaks, for example ``firewall=60``; ``0`` disables caching of a section.
+    Stored mappings are accepted as well. Unknown sections and negative or
+    non-numeric TTLs raise ``ValueError``.
+    """
+
+    if value in (None, ""):
+        return {}
+    if isinstance(value, str):
+        entries: list[tuple[str, object]] = []
+        for part in REMOTE_CACHE_TTL_SPLIT_PATTERN.split(value):
+            part = part.strip()
+            if not part:
+                continue
+            section, separator, seconds = part.partition("=")
+            if not separator:
+                raise ValueError("Invalid cache TTL")
+            entries.append((section, seconds))
+    elif isinstance(value, dict):
+        entries = list(value.items())
+    else:
+        raise ValueError("Invalid cache TTL")
+
+    ttls: dict[str, int] = {}
+    for section, seconds in entries:
+        section = str(section).strip().lower()
+        if section not in REMOTE_CACHE_TTLS or isinstance(seconds, bool):
+            raise ValueError("Invalid cache TTL")
+        try:
+            ttl = int(str(seconds).strip())
+        except ValueError as err:
+            raise ValueError("Invalid cache TTL") from err
+        if ttl < 0:
+            raise ValueError("Invalid cache TTL")
+        ttls[section] = ttl
+    return ttls
+
+
+def remote_cache_ttls(overrides: dict[str, int] | None) -> dict[str, int]:
+    """Return the effective result cache TTLs with *overrides* applied."""
+
+    return {**REMOTE_CACHE_TTLS, **(overrides or {})}
+
+
+def format_remote_cache_ttls(ttls: dict[str, int]) -> str:
+    """Return result cache TTLs formatted for text input."""
+
+    return "\n".join(f"{section}={seconds}" for section, seconds in ttls.items())
 
 
 def parse_monitored_ports(value: object) -> list[int]:
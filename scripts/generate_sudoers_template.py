@@ -46,7 +46,8 @@ REBOOT_RULES = ["/sbin/reboot"]
 DOCKER_RULES = ["/usr/bin/docker *"]
 
 STORAGE_HEALTH_RULES = [
-    "/usr/sbin/smartctl -a /dev/*",
+    "/usr/sbin/smartctl -n standby -a /dev/*",
+    "/usr/sbin/smartctl -n standby -H -A /dev/*",
     "/usr/sbin/nvme smart-log /dev/*",
     "/usr/sbin/mdadm --detail --export /dev/md*",
 ]
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""Local Paramiko SSH server answering collector commands for a simulated fleet.
+
+Every simulated host listens on its own loopback address (``127.0.x.y``, which
+Linux routes without extra configuration) on one shared port, so the
+integration keys connections, caches and limits per host exactly as for real
+servers. Commands are answered with canned collector documents instead of
+running ``remote_collector.sh``:
+
+* ``VSERVER_SSH_STATS_MODE=base`` returns a base sample with monotonically
+  growing CPU, network and disk counters.
+* ``docker`` and ``storage`` return documents with ``--containers`` containers
+  and ``--disks`` SMART devices, which makes them the large payloads.
+
+Hosts start without an installed collector, so the first poll of every host
+takes the same install-and-upload path as a fresh server. Each command waits
+``--latency-ms`` plus up to ``--jitter-ms`` before answering and fails with
+probability ``--failure-rate``. All of this is derived from ``--seed``, the
+host index and the command number, so runs are reproducible.
+
+Hosts are numbered from ``--first-host`` so consecutive runs in one process
+can use fresh addresses. The server prints one JSON line with the port, host
+addresses and host-key fingerprint once it listens, then serves until it is
+terminated.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import selectors
+import socket
+import threading
+import time
+from typing import Any
+
+import paramiko
+
+USERNAME = "bench"
+PASSWORD = "bench"
+MODE_PATTERN = re.compile(r"VSERVER_SSH_STATS_MODE=(\w+)")
+# Exit status of the cached collector command while it is not installed.
+SCRIPT_MISSING_STATUS = 86
+OUTPUT_CHUNK_SIZE = 32 * 1024
+GIB = 1024**3
+
+
+def host_address(index: int) -> str:
+    """Return the loopback address of simulated host *index*."""
+
+    return f"127.0.{index // 250}.{index % 250 + 2}"
+
+
+def _jiffies(index: int, count: int) -> list[int]:
+    """Return growing CPU counters so the collector derives a busy share."""
+
+    busy = 20 + index % 50
+    return [count * busy, 0, count * 10, count * (200 - busy), count * 2, 0, 1, 0]
+
+
+def base_document(index: int, count: int, rng: random.Random, disks: int) -> dict[str, Any]:
+    """Return a base collector sample of simulated host *index*."""
+
+    uptime = 86400 + count * 30
+    disk_stats = [
+        {
+            "mount": "/" if disk == 0 else f"/srv/data{disk}",
+            "name": f"sd{chr(97 + disk % 26)}1",
+            "total": 500 * GIB,
+            "free": int(500 * GIB * rng.uniform(0.05, 0.9)),
+        }
+        for disk in range(max(1, disks // 2))
+    ]
+    return {
+        "cpu": None,
+        "cpu_jiffies": _jiffies(index, count),
+        "sample_uptime": uptime,
+        "mem": round(rng.uniform(20, 95), 1),
+        "disk": round(rng.uniform(10, 90), 1),
+        "disk_capacity_total": 500 * GIB * len(disk_stats),
+        "disk_stats": disk_stats,
+        "uptime": uptime,
+        "temp": round(rng.uniform(35, 70), 1),
+        "rx": count * 50_000_000 + index,
+        "tx": count * 20_000_000 + index,
+        "ram": 16384,
+        "cores": 8,
+        "load_1": round(rng.uniform(0, 8), 2),
+        "load_5": round(rng.uniform(0, 6), 2),
+        "load_15": round(rng.uniform(0, 4), 2),
+        "cpu_freq": 2400,
+        "os": "Debian GNU/Linux 12 (bookworm)",
+        "mac_address": f"02:00:00:00:{index // 256:02x}:{index % 256:02x}",
+        "mac_addresses": [f"02:00:00:00:{index // 256:02x}:{index % 256:02x}"],
+        "top_processes": [
+            {"pid": 100 + pid, "command": f"worker-{pid}", "cpu": 5.0, "mem": 1.5}
+            for pid in range(5)
+        ],
+        "process_total": 240,
+        "process_running": 3,
+        "process_zombies": 0,
+        "process_states": {"S": 230, "R": 3, "I": 7},
+        "process_users": {"root": 180, "www-data": 60},
+        "process_cgroups": {"system.slice": 200, "user.slice": 40},
+        "tcp_established": rng.randint(10, 500),
+        "tcp_time_wait": rng.randint(0, 200),
+        "sockets_used": 700,
+        "tcp_sockets_in_use": 320,
+        "conntrack_count": 2000,
+        "conntrack_max": 262144,
+        "swap_usage": round(rng.uniform(0, 30), 1),
+        "swap_total": 2048,
+        "reboot_required": 0,
+        "security_updates": 0,
+        "last_boot": "2026-01-01 00:00:00",
+        "kernel_version": "6.1.0-26-amd64",
+        "primary_ip": f"10.0.{index // 250}.{index % 250 + 2}",
+        "failed_systemd_units": 0,
+        "failed_systemd_units_list": [],
+        "journal_errors": rng.randint(0, 5),
+        "root_fs_readonly": 0,
+        "failed_ssh_logins_15m": rng.randint(0, 30),
+        "firewall_active": 1,
+        "firewall_backend": "nftables",
+        "firewall_rules_count": 42,
+        "disk_read_bytes": count * 4_000_000,
+        "disk_write_bytes": count * 9_000_000,
+        "section_time_ms": {"system": 12, "processes": 30, "network": 8},
+        "section_forks": {"system": 4, "processes": 6, "network": 3},
+        "partial_sections": [],
+        "skipped_sections": [],
+        "cache_age_seconds": {},
+    }
+
+
+def docker_document(rng: random.Random, containers: int) -> dict[str, Any]:
+    """Return a Docker collector document with *containers* containers."""
+
+    stats = []
+    for number in range(containers):
+        limit = 2 * GIB
+        stats.append(
+            {
+                "id": hashlib.sha256(str(number).encode()).hexdigest()[:12],
+                "name": f"service-{number}",
+                "cpu": round(rng.uniform(0.1, 60), 2),
+                "mem": round(rng.uniform(0.1, 20), 2),
+                "memory_usage_bytes": int(limit * rng.uniform(0.05, 0.95)),
+                "memory_limit_bytes": limit,
+                "pids": rng.randint(1, 80),
+                "cpu_throttled_periods": rng.randint(0, 20),
+                "cpu_throttled_usec": rng.randint(0, 50_000),
+                "image": f"registry.example/service-{number}:1.{number % 7}",
+                "status": "Up 3 days (healthy)",
+                "restart_count": number % 3,
+                "ports": f"0.0.0.0:{8000 + number}->80/tcp",
+                "health_state": "healthy",
+                "running": True,
+                "restart_policy": "unless-stopped",
+                "compose_project": f"stack{number // 10}",
+                "compose_service": f"service-{number}",
+                "swarm_service": "",
+            }
+        )
+    return {
+        "docker": 1,
+        "containers": ",".join(container["name"] for container in stats),
+        "container_stats": stats,
+        "docker_stats_complete": 1,
+        "docker_stats_partial": 0,
+    }
+
+
+def storage_document(rng: random.Random, disks: int) -> dict[str, Any]:
+    """Return a storage collector document with *disks* SMART devices."""
+
+    devices = [
+        {
+            "name": f"nvme{number}n1" if number % 2 else f"sd{chr(97 + number % 26)}",
+            "path": f"/dev/nvme{number}n1" if number % 2 else f"/dev/sd{chr(97 + number % 26)}",
+            "model": "Simulated SSD 2TB",
+            "serial": f"SIM{number:08d}",
+            "protocol": "NVMe" if number % 2 else "ATA",
+            "smart_status": "passed",
+            "temperature": rng.randint(30, 55),
+            "wear_percent": rng.randint(0, 40),
+            "media_errors": 0,
+            "reallocated_sectors": 0,
+            "pending_sectors": 0,
+            "uncorrectable_sectors": 0,
+            "power_on_hours": rng.randint(100, 40_000),
+        }
+        for number in range(disks)
+    ]
+    return {
+        "storage_devices": devices,
+        "raid_details": [],
+        "storage_tools_available": 1,
+        "storage_stats_complete": 1,
+        "storage_stats_partial": 0,
+        "storage_devices_seen": disks,
+        "storage_devices_collected": disks,
+        "storage_devices_standby": 0,
+        "storage_device_errors": 0,
+    }
+
+
+class SimulatedFleet:
+    """Canned collector behaviour of every simulated host."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Initialize per-host command counters and install state."""
+
+        self._args = args
+        self._lock = threading.Lock()
+        self._commands: dict[int, int] = {}
+        self._installed: set[int] = set()
+
+    def serve(self, channel: paramiko.Channel, index: int, command: str) -> None:
+        """Answer one exec request on *channel* and close it."""
+
+        with self._lock:
+            count = self._commands.get(index, 0) + 1
+            self._commands[index] = count
+            installed = index in self._installed
+        rng = random.Random(f"{self._args.seed}:{index}:{count}")
+        try:
+            if "cat >" in command or command.rstrip().endswith("-s"):
+                while channel.recv(OUTPUT_CHUNK_SIZE):
+                    pass
+                if "cat >" in command:
+                    with self._lock:
+                        self._installed.add(index)
+                    installed = True
+            time.sleep((self._args.latency_ms + rng.uniform(0, self._args.jitter_ms)) / 1000)
+            if rng.random() < self._args.failure_rate:
+                channel.sendall_stderr(b"simulated collector failure\n")
+                channel.send_exit_status(1)
+                return
+            if not installed and "[ -s" in command:
+                channel.send_exit_status(SCRIPT_MISSING_STATUS)
+                return
+            match = MODE_PATTERN.search(command)
+            mode = match.group(1) if match else "base"
+            if mode == "docker":
+                document = docker_document(rng, self._args.containers)
+            elif mode == "storage":
+                document = storage_document(rng, self._args.disks)
+            else:
+                document = base_document(index, count, rng, self._args.disks)
+            output = json.dumps(document, separators=(",", ":")).encode() + b"\n"
+            for start in range(0, len(output), OUTPUT_CHUNK_SIZE):
+                channel.sendall(output[start : start + OUTPUT_CHUNK_SIZE])
+            channel.send_exit_status(0)
+        except (EOFError, OSError, paramiko.SSHException):
+            pass
+        finally:
+            channel.close()
+
+
+class _HostInterface(paramiko.ServerInterface):
+    """Password-authenticated SSH server side of one simulated host."""
+
+    def __init__(self, fleet: SimulatedFleet, index: int) -> None:
+        self._fleet = fleet
+        self._index = index
+
+    def get_allowed_auths(self, username: str) -> str:
+        return "password"
+
+    def check_auth_password(self, username: str, password: str) -> int:
+        if username == USERNAME and password == PASSWORD:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind: str, chanid: int) -> int:
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel: paramiko.Channel, command: bytes) -> bool:
+        threading.Thread(
+            target=self._fleet.serve,
+            args=(channel, self._index, command.decode("utf-8", "replace")),
+            daemon=True,
+        ).start()
+        return True
+
+
+def fingerprint(key: paramiko.PKey) -> str:
+    """Return the OpenSSH ``SHA256:`` fingerprint of *key*."""
+
+    digest = hashlib.sha256(key.asbytes()).digest()
+    return "SHA256:" + base64.b64encode(digest).decode("ascii").rstrip("=")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", type=int, required=True)
+    parser.add_argument("--first-host", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--containers", type=int, default=40)
+    parser.add_argument("--disks", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    host_key = paramiko.ECDSAKey.generate()
+    fleet = SimulatedFleet(args)
+    selector = selectors.DefaultSelector()
+    port = 0
+    addresses = []
+    for index in range(args.first_host, args.first_host + args.hosts):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((host_address(index), port))
+        listener.listen(64)
+        port = listener.getsockname()[1]
+        addresses.append(host_address(index))
+        selector.register(listener, selectors.EVENT_READ, index)
+
+    print(
+        json.dumps(
+            {
+                "port": port,
+                "hosts": addresses,
+                "username": USERNAME,
+                "password": PASSWORD,
+                "fingerprint": fingerprint(host_key),
+            }
+        ),
+        flush=True,
+    )
+    while True:
+        for selected, _events in selector.select():
+            connection, _address = selected.fileobj.accept()
+            transport = paramiko.Transport(connection)
+            transport.add_server_key(host_key)
+            # Negotiate on the transport thread so one slow client does not
+            # hold up the accept loop of every other host.
+            transport.start_server(
+                event=threading.Event(), server=_HostInterface(fleet, selected.data)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""Benchmark the collection pipeline against a simulated fleet of SSH hosts.
+
+For every fleet size, ``fake_ssh_server.py`` is started in a subprocess and
+each simulated host is polled the way its coordinator polls it:
+
+* ``async_sample`` every round, holding a base-priority slot of the entry's
+  SSH session limiter;
+* ``async_sample_docker`` followed by ``async_sample_storage`` every
+  ``--slow-every`` rounds, in the background with slow-priority slots.
+
+Hosts are grouped into config entries of ``--hosts-per-entry`` servers, each
+with its own session limiter below the fleet-wide one. ``--transport``
+selects the SSH backend the hosts use: the Paramiko pool on the SSH executor
+(the default) or the asyncssh transport on the event loop. The run reports
+the following, per poll kind where it applies:
+
+* throughput;
+* p50/p99 poll latency, including the wait for a session slot;
+* event-loop lag;
+* the peak thread count;
+* resident memory.
+
+The server answers from a seeded workload, so two runs with the same
+arguments exchange the same documents. Results are written as JSON;
+``--baseline`` prints the change against an earlier result file, for example
+one recorded on the previous commit.
+
+The benchmark needs Home Assistant and Paramiko installed, asyncssh for
+``--transport asyncssh``, and loopback addresses beyond ``127.0.0.1``, which
+Linux provides by default. Example::
+
+    python tests/benchmarks/fleet_benchmark.py --hosts 10 100 500 \\
+        --output fleet-new.json --baseline fleet-old.json
+
+To compare the transports, record one run per backend::
+
+    python tests/benchmarks/fleet_benchmark.py --hosts 100 500 --output paramiko.json
+    python tests/benchmarks/fleet_benchmark.py --hosts 100 500 --transport asyncssh \\
+        --output asyncssh.json --baseline paramiko.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[2]
+SERVER_PATH = Path(__file__).with_name("fake_ssh_server.py")
+PACKAGE = "custom_components.vserver_ssh_stats"
+LAG_PROBE_INTERVAL = 0.05
+RESULT_SCHEMA = 1
+POLL_KINDS = ("base", "docker", "storage")
+ERROR_KEYS = {
+    "base": "collection_error",
+    "docker": "docker_collection_error",
+    "storage": "storage_collection_error",
+}
+PAYLOAD_KEYS = {
+    "base": "collector_payload_bytes",
+    "docker": "slow_collector_payload_bytes",
+    "storage": "slow_collector_payload_bytes",
+}
+# Metrics printed by --baseline as (path in a run result, higher is better).
+COMPARED_METRICS = (
+    (("throughput_polls_per_second",), True),
+    (("polls", "base", "p50_ms"), False),
+    (("polls", "base", "p99_ms"), False),
+    (("event_loop_lag_ms", "p99"), False),
+    (("threads", "peak"), False),
+    (("memory_mib", "peak"), False),
+)
+
+
+def _percentile(values: list[float], percent: float) -> float | None:
+    """Return the nearest-rank *percent* percentile of *values*."""
+
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, round(percent / 100 * len(ordered)))
+    return round(ordered[rank - 1], 2)
+
+
+def _rss_mib() -> float:
+    """Return the resident set size of this process in MiB."""
+
+    try:
+        resident_pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        # ru_maxrss is the peak, in KiB on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _git_revision() -> dict[str, Any]:
+    """Return the current commit and whether the work tree has changes."""
+
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT, capture_output=True, text=True, check=False
+        ).stdout.strip()
+
+    return {"commit": git("rev-parse", "HEAD") or None, "dirty": bool(git("status", "--porcelain"))}
+
+
+def _start_server(args: argparse.Namespace, hosts: int, first_host: int) -> tuple[Any, dict]:
+    """Start the fake SSH server and return the process and its listen info."""
+
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(SERVER_PATH),
+            f"--hosts={hosts}",
+            f"--first-host={first_host}",
+            f"--latency-ms={args.latency_ms}",
+            f"--jitter-ms={args.jitter_ms}",
+            f"--failure-rate={args.failure_rate}",
+            f"--containers={args.containers}",
+            f"--disks={args.disks}",
+            f"--seed={args.seed}",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stdout is not None
+    line = process.stdout.readline()
+    if not line:
+        process.wait()
+        raise RuntimeError("Fake SSH server exited before listening")
+    return process, json.loads(line)
+
+
+class _LoopProbe:
+    """Sample event-loop lag, thread count and memory while a run is active."""
+
+    def __init__(self) -> None:
+        self.lag_ms: list[float] = []
+        self.threads_start = threading.active_count()
+        self.threads_peak = self.threads_start
+        self.memory_start = _rss_mib()
+        self.memory_peak = self.memory_start
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        assert self._task is not None
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LAG_PROBE_INTERVAL
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            self.lag_ms.append(max(0.0, (loop.time() - expected) * 1000))
+            self.threads_peak = max(self.threads_peak, threading.active_count())
+            self.memory_peak = max(self.memory_peak, _rss_mib())
+
+
+async def _run_fleet(
+    args: argparse.Namespace, hosts: int, server: dict[str, Any]
+) -> dict[str, Any]:
+    """Poll every simulated host for ``--rounds`` rounds and summarize."""
+
+    collector = importlib.import_module(f"{PACKAGE}.ssh_collector")
+    scheduler = importlib.import_module(f"{PACKAGE}.scheduler")
+    executor_module = importlib.import_module(f"{PACKAGE}.ssh_executor")
+    pool_module = importlib.import_module(f"{PACKAGE}.ssh_pool")
+    transport_module = importlib.import_module(f"{PACKAGE}.ssh_transport")
+    transport_module.configure_host_transport(server["hosts"], args.transport)
+    samplers = {
+        "base": collector.async_sample,
+        "docker": collector.async_sample_docker,
+        "storage": collector.async_sample_storage,
+    }
+    executor_module.ssh_executor.configure(hosts)
+    scheduler.fleet_session_limiter.set_limit(args.fleet_sessions)
+    limiters = [
+        scheduler.SSHSessionLimiter(args.max_sessions, parent=scheduler.fleet_session_limiter)
+        for _ in range(0, hosts, args.hosts_per_entry)
+    ]
+    latencies: dict[str, list[float]] = {kind: [] for kind in POLL_KINDS}
+    failures = dict.fromkeys(POLL_KINDS, 0)
+    waits: list[float] = []
+    payload_bytes = 0
+
+    async def poll(kind: str, host: str, limiter: Any) -> None:
+        nonlocal payload_bytes
+        priority = scheduler.PRIORITY_BASE if kind == "base" else scheduler.PRIORITY_SLOW
+        started = time.monotonic()
+        async with limiter.slot(priority) as wait_seconds:
+            result = await samplers[kind](
+                host,
+                server["username"],
+                server["password"],
+                None,
+                server["port"],
+                "debian",
+                args.connect_timeout,
+                args.command_timeout,
+                host_key_fingerprints=[server["fingerprint"]],
+            )
+        latencies[kind].append((time.monotonic() - started) * 1000)
+        waits.append(wait_seconds * 1000)
+        failures[kind] += bool(result.get(ERROR_KEYS[kind]))
+        payload_bytes += int(result.get(PAYLOAD_KEYS[kind]) or 0)
+
+    async def poll_slow(host: str, limiter: Any) -> None:
+        await poll("docker", host, limiter)
+        await poll("storage", host, limiter)
+
+    async def run_host(index: int, host: str) -> None:
+        limiter = limiters[index // args.hosts_per_entry]
+        offset = scheduler.phase_offset(host, args.interval) if args.interval else 0.0
+        started = time.monotonic()
+        slow_tasks = []
+        for round_number in range(args.rounds):
+            delay = started + offset + round_number * args.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if round_number % args.slow_every == 0:
+                slow_tasks.append(asyncio.create_task(poll_slow(host, limiter)))
+            await poll("base", host, limiter)
+        await asyncio.gather(*slow_tasks)
+
+    probe = _LoopProbe()
+    probe.start()
+    started = time.monotonic()
+    await asyncio.gather(*(run_host(index, host) for index, host in enumerate(server["hosts"])))
+    wall_seconds = time.monotonic() - started
+    await probe.stop()
+    memory_end = _rss_mib()
+    await asyncio.to_thread(pool_module.ssh_pool.close_hosts, set(server["hosts"]))
+    await transport_module.asyncssh_transport.async_close_hosts(set(server["hosts"]))
+    transport_module.forget_hosts(server["hosts"])
+
+    polls = sum(len(values) for values in latencies.values())
+    return {
+        "hosts": hosts,
+        "transport": args.transport,
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_polls_per_second": round(polls / wall_seconds, 2),
+        "payload_bytes": payload_bytes,
+        "polls": {
+            kind: {
+                "count": len(values),
+                "failures": failures[kind],
+                "p50_ms": _percentile(values, 50),
+                "p99_ms": _percentile(values, 99),
+                "max_ms": round(max(values), 2) if values else None,
+            }
+            for kind, values in latencies.items()
+        },
+        "session_wait_ms": {"p50": _percentile(waits, 50), "p99": _percentile(waits, 99)},
+        "event_loop_lag_ms": {
+            "p50": _percentile(probe.lag_ms, 50),
+            "p99": _percentile(probe.lag_ms, 99),
+            "max": round(max(probe.lag_ms, default=0.0), 2),
+        },
+        "threads": {"start": probe.threads_start, "peak": probe.threads_peak},
+        "memory_mib": {
+            "start": round(probe.memory_start, 1),
+            "peak": round(probe.memory_peak, 1),
+            "end": round(memory_end, 1),
+        },
+    }
+
+
+def _metric(run: dict[str, Any], path: tuple[str, ...]) -> float | None:
+    value: Any = run
+    for part in path:
+        value = value.get(part) if isinstance(value, dict) else None
+    return value if isinstance(value, (int, float)) else None
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[str]:
+    """Return one line per compared metric of fleet sizes in both results."""
+
+    previous_runs = {run["hosts"]: run for run in baseline.get("runs", [])}
+    lines = [
+        f"baseline {baseline.get('commit') or '?'} -> current {current.get('commit') or '?'}"
+    ]
+    for run in current.get("runs", []):
+        previous = previous_runs.get(run["hosts"])
+        if previous is None:
+            continue
+        for path, higher_is_better in COMPARED_METRICS:
+            old, new = _metric(previous, path), _metric(run, path)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            better = change > 0 if higher_is_better else change < 0
+            verdict = "better" if better and abs(change) >= 5 else ""
+            if not better and abs(change) >= 5:
+                verdict = "worse"
+            lines.append(
+                f"{run['hosts']:>5} hosts {'.'.join(path):<32} "
+                f"{old:>10} -> {new:>10} ({change:+.1f}%) {verdict}".rstrip()
+            )
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--rounds", type=int, default=6)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.0,
+        help="seconds between base polls of a host; 0 polls back to back",
+    )
+    parser.add_argument("--slow-every", type=int, default=3)
+    parser.add_argument(
+        "--transport", choices=("paramiko", "asyncssh"), default="paramiko"
+    )
+    parser.add_argument("--hosts-per-entry", type=int, default=10)
+    parser.add_argument("--max-sessions", type=int, default=4)
+    parser.add_argument("--fleet-sessions", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--containers", type=int, default=40)
+    parser.add_argument("--disks", type=int, default=8)
+    parser.add_argument("--connect-timeout", type=int, default=10)
+    parser.add_argument("--command-timeout", type=int, default=45)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("fleet-benchmark.json"))
+    parser.add_argument("--baseline", type=Path)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(ROOT))
+    settings = {
+        key: value for key, value in vars(args).items() if key not in {"output", "baseline"}
+    }
+    result: dict[str, Any] = {
+        "schema": RESULT_SCHEMA,
+        **_git_revision(),
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings,
+        "runs": [],
+    }
+    first_host = 0
+    for hosts in args.hosts:
+        # Every fleet size gets fresh addresses so per-host caches start empty.
+        process, server = _start_server(args, hosts, first_host)
+        first_host += hosts
+        try:
+            run = asyncio.run(_run_fleet(args, hosts, server))
+        finally:
+            process.terminate()
+            process.wait()
+        result["runs"].append(run)
+        base = run["polls"]["base"]
+        print(
+            f"{hosts:>5} hosts ({args.transport}) "
+            f"{run['throughput_polls_per_second']:>8.1f} polls/s "
+            f"base p50 {base['p50_ms']} ms p99 {base['p99_ms']} ms, "
+            f"loop lag p99 {run['event_loop_lag_ms']['p99']} ms, "
+            f"{run['threads']['peak']} threads, {run['memory_mib']['peak']} MiB"
+        )
+
+    args.output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"Wrote {args.output}")
+    if args.baseline:
+        print("\n".join(compare(json.loads(args.baseline.read_text()), result)))
+
+
+if __name__ == "__main__":
+    main()
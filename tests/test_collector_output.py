@@ -0,0 +1,117 @@
+"""Tests for bounded collector output reading."""
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+OUTPUT_PATH = ROOT / "custom_components" / "vserver_ssh_stats" / "collector_output.py"
+
+
+def _output_module() -> Any:
+    """Load the output reader without importing Home Assistant."""
+
+    spec = importlib.util.spec_from_file_location(
+        "vserver_ssh_stats_collector_output", OUTPUT_PATH
+    )
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class ChunkedStream(io.BytesIO):
+    """Blocking channel file returning at most a few bytes per read."""
+
+    def read(self, size: int | None = -1) -> bytes:
+        return super().read(5)
+
+
+def test_reader_skips_banner_noise_and_reports_sizes() -> None:
+    """MOTD lines before the document are dropped and not buffered."""
+
+    module = _output_module()
+    banner = b"Welcome to {prod}\nLast login: today\n"
+    document = json.dumps({"cpu": 7, "disks": [{"name": "sda"}]}).encode()
+    reader = module.CollectorOutputReader()
+
+    reader.read_from(ChunkedStream(banner + document + b"\nlogout\n"))
+
+    assert reader.finish() == {"cpu": 7, "disks": [{"name": "sda"}]}
+    assert reader.received_bytes == len(banner) + len(document) + len(b"\nlogout\n")
+    assert reader.skipped_bytes == banner.index(b"{")
+    assert reader.payload_bytes == reader.received_bytes - reader.skipped_bytes
+    assert reader.parse_time_ms >= 0
+
+
+def test_reader_enforces_the_payload_limit() -> None:
+    """Runaway output stops the read instead of growing the buffer."""
+
+    module = _output_module()
+    reader = module.CollectorOutputReader(max_bytes=16)
+    reader.feed(b"noise that does not count ")
+
+    with pytest.raises(module.CollectorOutputTooLarge):
+        reader.read_from(ChunkedStream(b'{"value": "' + b"x" * 32 + b'"}'))
+    assert reader.payload_bytes <= 16
+
+
+def test_reader_empty_and_noise_only_output() -> None:
+    """Empty output decodes to an empty document; plain text is an error."""
+
+    module = _output_module()
+    assert module.CollectorOutputReader().finish() == {}
+
+    reader = module.CollectorOutputReader()
+    reader.feed(b"bash: collector: command not found\n")
+    with pytest.raises(json.JSONDecodeError):
+        reader.finish()
+    with pytest.raises(json.JSONDecodeError):
+        module.decode_json_document("[1, 2]")
+
+
+def test_compressed_output_is_bounded_after_decompression() -> None:
+    """A small gzip stream cannot inflate past the payload limit."""
+
+    module = _output_module()
+    document = json.dumps({"pkg_list": "x" * 4096}).encode()
+    compressed = module.COMPRESSED_OUTPUT_MARKER + b"gzip\n" + gzip.compress(document)
+
+    reader = module.CollectorOutputReader()
+    reader.feed(b"motd\n" + compressed)
+    assert reader.finish() == {"pkg_list": "x" * 4096}
+    assert reader.payload_bytes == len(document)
+    assert reader.received_bytes < reader.payload_bytes
+
+    with pytest.raises(module.CollectorOutputTooLarge):
+        module.CollectorOutputReader(max_bytes=1024).feed(compressed)
+
+
+def test_zstandard_decoder_stops_a_decompression_bomb() -> None:
+    """The zstandard fallback returns at most one byte past the allowed output."""
+
+    zstandard = pytest.importorskip("zstandard")
+    module = _output_module()
+    bomb = zstandard.ZstdCompressor().compress(b"\0" * (64 * 1024 * 1024))
+    document = json.dumps({"pkg_list": "x" * 4096}).encode()
+
+    decode = module._zstandard_decoder()
+    assert len(decode(bomb, 1024)) == 1025
+    with pytest.raises(module.CollectorOutputTooLarge):
+        module.CollectorOutputReader(max_bytes=1024).feed(
+            module.COMPRESSED_OUTPUT_MARKER + b"zstd\n" + bomb
+        )
+
+    decode = module._zstandard_decoder()
+    compressed = zstandard.ZstdCompressor().compress(document)
+    output = b"".join(
+        decode(compressed[index : index + 7], len(document))
+        for index in range(0, len(compressed), 7)
+    )
+    assert output == document
@@ -0,0 +1,305 @@
+"""Tests for the streaming base collector reader."""
+from __future__ import annotations
+
+import ast
+import asyncio
+import contextlib
+import json
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Optional
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+INTEGRATION = ROOT / "custom_components" / "vserver_ssh_stats"
+
+
+class FakeStdin:
+    """Channel stdin stand-in recording request lines."""
+
+    def __init__(self) -> None:
+        self.written: list[bytes] = []
+
+    def write(self, data: bytes) -> None:
+        self.written.append(data)
+
+    def flush(self) -> None:
+        return None
+
+
+class FakePool:
+    """Pool stand-in returning scripted stdout lines on one channel."""
+
+    def __init__(self, lines: list[str]) -> None:
+        self.lines = lines
+        self.stdin = FakeStdin()
+        self.commands: list[str] = []
+
+    @contextlib.contextmanager
+    def exec_command(self, *args):
+        self.commands.append(args[5])
+        yield self.stdin, _LineFile(self.lines), None, 12.5
+
+
+class _LineFile:
+    """Iterable stdout with a Paramiko-like channel attribute."""
+
+    def __init__(self, lines: list[str]) -> None:
+        self._lines = lines
+        self.channel = SimpleNamespace(close=lambda: None)
+
+    def __iter__(self):
+        return iter(self._lines)
+
+
+class _ThreadExecutor:
+    """SSH executor stand-in running calls on the default executor."""
+
+    async def run(self, _lane: str, func, *args):
+        return await asyncio.to_thread(func, *args)
+
+
+def _stream_class(pool: FakePool, name: str = "CollectorStream"):
+    """Compile CollectorStream without Paramiko or Home Assistant."""
+
+    tree = ast.parse((INTEGRATION / "ssh_collector.py").read_text())
+    wanted = {
+        "CollectorStream",
+        "_safe_int",
+        "_docker_event",
+        "DOCKER_EVENTS_HEARTBEAT_SECONDS",
+        "DOCKER_CONTAINER_ID_PATTERN",
+    }
+    nodes = [
+        node
+        for node in tree.body
+        if (isinstance(node, (ast.ClassDef, ast.FunctionDef)) and node.name in wanted | {name})
+        or (
+            isinstance(node, ast.Assign)
+            and any(getattr(target, "id", None) in wanted for target in node.targets)
+        )
+    ]
+
+    async def no_port_checks(*_args: Any) -> list[dict[str, Any]]:
+        return []
+
+    namespace = {
+        "Any": Any,
+        "AsyncIterator": AsyncIterator,
+        "Dict": Dict,
+        "Optional": Optional,
+        "asyncio": asyncio,
+        "contextlib": contextlib,
+        "json": json,
+        "re": re,
+        "threading": threading,
+        "time": time,
+        "_LOGGER": logging.getLogger(__name__),
+        "ssh_pool": pool,
+        "ssh_executor": _ThreadExecutor(),
+        "LANE_POLL": "poll",
+        "LANE_STREAM": "stream",
+        "stream_script_command": lambda env: f"{env} stream",
+        "STREAM_NEEDS_SCRIPT": "need-script",
+        "STREAM_SCRIPT_END": "end-of-script",
+        "REMOTE_SCRIPT": "echo collector\n",
+        "profiled_hosts": set(),
+        "remote_cache_hosts": {},
+        "_parse_json_output": json.loads,
+        "_async_check_monitored_ports": no_port_checks,
+        "_process_base_data": lambda host, data, timing, ports: {
+            **data,
+            "host": host,
+            "ssh_connect_time_ms": timing.get("connect_time_ms"),
+        },
+    }
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), "<collector-stream>", "exec"), namespace)
+    return namespace[name]
+
+
+def test_stream_sends_script_on_request_and_yields_samples_until_eof() -> None:
+    """Samples are processed in order and EOF surfaces as a restartable error."""
+
+    pool = FakePool(["need-script\n", '{"cpu": 5}\n', "noise\n", '{"cpu": 7}\n'])
+    stream = _stream_class(pool)("server", "user", None, None, 22, 10, 45, 30)
+    samples: list[dict[str, Any]] = []
+
+    async def consume() -> None:
+        async for sample in stream.async_samples():
+            samples.append(sample)
+
+    with pytest.raises(EOFError):
+        asyncio.run(consume())
+
+    assert pool.commands == [
+        "VSERVER_SSH_STATS_MODE=stream VSERVER_SSH_STATS_STREAM_INTERVAL=30 stream"
+    ]
+    assert pool.stdin.written == [b"echo collector\nend-of-script\n"]
+    assert [sample["cpu"] for sample in samples] == [5, 7]
+    assert samples[0]["ssh_connect_time_ms"] == 12.5
+    assert samples[1]["ssh_connect_time_ms"] == 0.0
+
+
+def test_docker_event_stream_yields_events_and_resumes_after_last_seen_time() -> None:
+    """Heartbeats and events advance the resume time passed to the next channel."""
+
+    pool = FakePool(
+        [
+            '{"heartbeat": 1700000000}\n',
+            '{"Type": "container", "Action": "start", "time": 1700000005,'
+            ' "Actor": {"ID": "abc123def4567890", "Attributes": {"name": "web"}}}\n',
+            '{"Type": "container", "Action": "exec_start: sh", "Actor": {}}\n',
+            '{"heartbeat": 1700000030}\n',
+        ]
+    )
+    stream = _stream_class(pool, "DockerEventStream")(
+        "server", "user", None, None, 22, 10, 45, since=1699999990
+    )
+    events: list[dict[str, Any]] = []
+
+    async def consume() -> None:
+        async for event in stream.async_events():
+            events.append(event)
+
+    with pytest.raises(EOFError):
+        asyncio.run(consume())
+
+    assert pool.commands == [
+        "VSERVER_SSH_STATS_MODE=docker_events VSERVER_SSH_STATS_STREAM_INTERVAL=30 "
+        "VSERVER_SSH_STATS_DOCKER_EVENTS_SINCE=1699999990 stream"
+    ]
+    assert [(event["id"], event["action"], event["name"]) for event in events] == [
+        ("abc123def4567890", "start", "web")
+    ]
+    assert stream.since == 1700000030
+
+
+def test_streamed_samples_share_the_poll_success_and_error_handling() -> None:
+    """A failed streamed sample keeps the snapshot; a good one drives the interval."""
+
+    wanted = {
+        "_async_run_stream",
+        "_apply_base_sample",
+        "_merge_base_data",
+        "_record_success",
+        "_record_failure",
+        "_publish_poll_interval",
+        "_set_poll_interval",
+    }
+    tree = ast.parse((INTEGRATION / "coordinator.py").read_text())
+    coordinator = next(
+        node
+        for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == "VServerCoordinator"
+    )
+    methods = [
+        node
+        for node in coordinator.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name in wanted
+    ]
+    samples = [
+        {"cpu": 5, "mac_addresses": ["aa:bb"], "last_collection_failed": False},
+        {
+            "collection_error": "timeout",
+            "port_open_22": False,
+            "last_collection_failed": True,
+        },
+    ]
+
+    class FakeStream:
+        def __init__(self, *_args: Any) -> None:
+            pass
+
+        async def async_samples(self) -> AsyncIterator[dict[str, Any]]:
+            for sample in samples:
+                yield sample
+            raise EOFError
+
+    class StopStream(Exception):
+        pass
+
+    async def no_sleep(_seconds: float) -> None:
+        return None
+
+    namespace: dict[str, Any] = {
+        "Any": Any,
+        "CollectorStream": FakeStream,
+        "DEFAULT_BACKOFF_FAILURE_THRESHOLD": 3,
+        "DEFAULT_BACKOFF_MAX_INTERVAL": 900,
+        "INTERVAL_REASON_BACKOFF": "backoff",
+        "INTERVAL_REASON_CONFIGURED": "configured",
+        "_LOGGER": logging.getLogger(__name__),
+        "asyncio": SimpleNamespace(sleep=no_sleep),
+    }
+    exec(compile(ast.Module(body=methods, type_ignores=[]), "<coordinator>", "exec"), namespace)
+
+    class FakeAdaptive:
+        interval = 10
+        reason = "cpu_changed"
+
+        def __init__(self) -> None:
+            self.updates: list[dict[str, Any]] = []
+
+        def update(self, data: dict[str, Any]) -> int:
+            self.updates.append(data)
+            return self.interval
+
+    class FakeCoordinator:
+        server = {"host": "web1", "username": "root", "port": 22}
+        connect_timeout = 10
+        command_timeout = 45
+        base_interval = 30
+        current_interval = 30
+        interval_reason = "configured"
+        consecutive_failures = 0
+        _stream = None
+        _stream_task = object()
+
+        def __init__(self) -> None:
+            self.data = {"cpu": 1, "mem": 40, "port_open_22": True}
+            self._adaptive_interval = FakeAdaptive()
+            self.published: list[dict[str, Any]] = []
+            self.slow_scheduled: list[dict[str, Any]] = []
+            self.docker_events: list[dict[str, Any]] = []
+
+        def _schedule_slow_data(self, data: dict[str, Any]) -> None:
+            self.slow_scheduled.append(data)
+
+        def _start_docker_events(self, data: dict[str, Any]) -> None:
+            self.docker_events.append(data)
+
+        def async_set_updated_data(self, data: dict[str, Any]) -> None:
+            self.data = data
+            self.published.append(dict(data))
+
+        async def async_refresh(self) -> None:
+            raise StopStream
+
+    for name in wanted:
+        setattr(FakeCoordinator, name, namespace[name])
+    fake = FakeCoordinator()
+
+    with pytest.raises(StopStream):
+        asyncio.run(fake._async_run_stream())
+
+    good, failed = fake.published
+    assert (good["cpu"], good["poll_interval"], good["poll_interval_reason"]) == (
+        5,
+        10,
+        "cpu_changed",
+    )
+    assert fake.server["mac_addresses"] == ["aa:bb"]
+    assert len(fake._adaptive_interval.updates) == 1
+    assert len(fake.slow_scheduled) == len(fake.docker_events) == 1
+    assert failed["cpu"] == 5
+    assert failed["mem"] == 40
+    assert failed["port_open_22"] is False
+    assert failed["collection_error"] == "timeout"
+    assert failed["last_collection_failed"] is True
+    # The failed sample and the channel ending both count as failures.
+    assert fake.consecutive_failures == 2
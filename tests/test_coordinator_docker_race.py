@@ -3,15 +3,47 @@ from __future__ import annotations
 
 import ast
 import asyncio
+import contextlib
 import logging
 import re
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
 
 ROOT = Path(__file__).parents[1]
 COORDINATOR_PATH = (
     ROOT / "custom_components" / "vserver_ssh_stats" / "coordinator.py"
 )
+COLLECTOR_PATH = ROOT / "custom_components" / "vserver_ssh_stats" / "ssh_collector.py"
+
+
+def _container_merger() -> Any:
+    wanted = {
+        "_sanitize",
+        "_safe_int",
+        "_safe_float",
+        "_safe_list",
+        "_docker_container_summary",
+        "merge_docker_containers",
+    }
+    functions = [
+        node
+        for node in ast.parse(COLLECTOR_PATH.read_text()).body
+        if isinstance(node, ast.FunctionDef) and node.name in wanted
+    ]
+    namespace: dict[str, Any] = {
+        "Any": Any,
+        "Dict": Dict,
+        "Iterable": Iterable,
+        "Mapping": Mapping,
+        "Optional": Optional,
+        "Sequence": Sequence,
+    }
+    exec(
+        compile(ast.Module(body=functions, type_ignores=[]), "<collector-test>", "exec"),
+        namespace,
+    )
+    return namespace["merge_docker_containers"]
 
 
 def _coordinator_methods() -> dict[str, Any]:
@@ -26,6 +58,11 @@ def _coordinator_methods() -> dict[str, Any]:
         "_sanitize_container_name",
         "apply_docker_action_state",
         "_async_update_slow_data",
+        "apply_docker_event",
+        "_queue_container_refresh",
+        "_async_refresh_containers",
+        "_schedule_slow_data",
+        "_slow_data_due",
     }
     methods = [
         node
@@ -37,7 +74,12 @@ def _coordinator_methods() -> dict[str, Any]:
         "Any": Any,
         "_LOGGER": logging.getLogger(__name__),
         "async_sample_packages": None,
+        "asyncio": asyncio,
         "re": re,
+        "time": time,
+        "PRIORITY_SLOW": 1,
+        "DOCKER_EVENT_REFRESH_DELAY": 0,
+        "merge_docker_containers": _container_merger(),
     }
     exec(
         compile(ast.Module(body=methods, type_ignores=[]), "<coordinator-test>", "exec"),
@@ -46,6 +88,13 @@ def _coordinator_methods() -> dict[str, Any]:
     return namespace
 
 
+class _UnlimitedSessions:
+    """Session limiter stand-in that never waits."""
+
+    def slot(self, _priority: int):
+        return contextlib.nullcontext(0.0)
+
+
 def test_stop_action_discards_docker_sample_started_before_action() -> None:
     """A stale running snapshot must not switch a stopped container back on."""
 
@@ -74,6 +123,7 @@ def test_stop_action_discards_docker_sample_started_before_action() -> None:
         }
         connect_timeout = 10
         slow_command_timeout = 180
+        session_limiter = _UnlimitedSessions()
         _docker_state_revision = 0
         _slow_refresh_task = None
         data = {
@@ -127,6 +177,7 @@ def test_failed_docker_sample_preserves_last_valid_metrics() -> None:
         }
         connect_timeout = 10
         slow_command_timeout = 180
+        session_limiter = _UnlimitedSessions()
         _docker_state_revision = 0
         _slow_refresh_task = None
         data = {
@@ -152,3 +203,209 @@ def test_failed_docker_sample_preserves_last_valid_metrics() -> None:
         assert coordinator.data["docker_collection_error"].startswith("Docker returned")
 
     asyncio.run(run_scenario())
+
+
+def test_docker_events_patch_state_and_refresh_only_affected_containers() -> None:
+    """Events update containers at once; one targeted sample then replaces them."""
+
+    methods = _coordinator_methods()
+    sampled: list[list[str]] = []
+
+    async def sample_docker(*args: Any, containers: Any = (), **kwargs: Any) -> dict[str, Any]:
+        sampled.append(list(containers))
+        return {
+            "docker": 1,
+            "container_stats": [
+                {
+                    "id": "aaa",
+                    "name": "web",
+                    "running": False,
+                    "status": "Exited (137) 1 second ago",
+                    "health_state": "exited",
+                }
+            ],
+        }
+
+    methods["_async_refresh_containers"].__globals__["async_sample_docker"] = sample_docker
+
+    class FakeCoordinator:
+        server = {"host": "pi5docker", "username": "homeassistant", "port": 22}
+        connect_timeout = 10
+        slow_command_timeout = 180
+        session_limiter = _UnlimitedSessions()
+        name = "pi5docker"
+        _docker_state_revision = 0
+        _pending_container_refresh: set[str] = set()
+        _container_refresh_task = None
+        _queue_container_refresh = methods["_queue_container_refresh"]
+        _async_refresh_containers = methods["_async_refresh_containers"]
+
+        def __init__(self) -> None:
+            self.hass = self
+            self.updates = 0
+            self.data = {
+                "docker": 1,
+                "container_stats": [
+                    {"id": "aaa", "name": "web", "running": True, "status": "Up 2 hours"},
+                    {"id": "bbb", "name": "db", "running": True, "status": "Up 2 hours"},
+                    {"id": "ccc", "name": "old", "running": False, "status": "Created"},
+                ],
+            }
+
+        def async_create_background_task(self, coro: Any, _name: str) -> asyncio.Task[None]:
+            return asyncio.get_running_loop().create_task(coro)
+
+        async def async_wait_for_slow_refresh(self) -> None:
+            return None
+
+        def async_set_updated_data(self, data: dict[str, Any]) -> None:
+            self.data = data
+            self.updates += 1
+
+    async def run_scenario() -> None:
+        coordinator = FakeCoordinator()
+        apply_event = methods["apply_docker_event"]
+        apply_event(coordinator, {"id": "aaa" + "0" * 61, "action": "kill"})
+        apply_event(coordinator, {"id": "aaa" + "0" * 61, "action": "die", "exit_code": 137})
+        apply_event(coordinator, {"id": "ccc" + "0" * 61, "action": "destroy"})
+
+        assert coordinator.data["container_lookup"]["web"]["status"] == (
+            "Exited (137) Less than a second ago"
+        )
+        assert coordinator.data["container_lookup"]["web"]["health_state"] == "exited"
+        assert "old" not in coordinator.data["container_lookup"]
+        assert coordinator.data["containers"] == "web, db"
+        assert coordinator.updates == 2
+
+        await coordinator._container_refresh_task
+
+        assert sampled == [["aaa" + "0" * 61, "ccc" + "0" * 61]]
+        assert coordinator.data["container_lookup"]["web"]["status"] == (
+            "Exited (137) 1 second ago"
+        )
+        assert coordinator.data["container_lookup"]["db"]["running"] is True
+        assert "old" not in coordinator.data["container_lookup"]
+
+    asyncio.run(run_scenario())
+
+
+def test_container_action_discards_targeted_refresh_started_before_it() -> None:
+    """A container refresh must not undo the state of a later container action."""
+
+    methods = _coordinator_methods()
+    refresh_started = asyncio.Event()
+    release_refresh = asyncio.Event()
+
+    async def sample_docker(*args: Any, containers: Any = (), **kwargs: Any) -> dict[str, Any]:
+        refresh_started.set()
+        await release_refresh.wait()
+        return {
+            "docker": 1,
+            "container_stats": [
+                {"id": "aaa", "name": "web", "running": True, "status": "Up 1 second"}
+            ],
+        }
+
+    methods["_async_refresh_containers"].__globals__["async_sample_docker"] = sample_docker
+
+    class FakeCoordinator:
+        server = {"host": "pi5docker", "username": "homeassistant", "port": 22}
+        name = "pi5docker"
+        connect_timeout = 10
+        slow_command_timeout = 180
+        session_limiter = _UnlimitedSessions()
+        _docker_state_revision = 0
+        _pending_container_refresh: set[str] = set()
+        _container_refresh_task = None
+        _queue_container_refresh = methods["_queue_container_refresh"]
+        _async_refresh_containers = methods["_async_refresh_containers"]
+        _clear_docker_data = methods["_clear_docker_data"]
+        _sanitize_container_name = staticmethod(methods["_sanitize_container_name"])
+
+        def __init__(self) -> None:
+            self.hass = self
+            self.data = {
+                "docker": 1,
+                "container_stats": [
+                    {"id": "aaa", "name": "web", "running": True, "status": "Up 2 hours"}
+                ],
+            }
+
+        def async_create_background_task(self, coro: Any, _name: str) -> asyncio.Task[None]:
+            return asyncio.get_running_loop().create_task(coro)
+
+        async def async_wait_for_slow_refresh(self) -> None:
+            return None
+
+        def async_set_updated_data(self, data: dict[str, Any]) -> None:
+            self.data = data
+
+    async def run_scenario() -> None:
+        coordinator = FakeCoordinator()
+        coordinator._queue_container_refresh("aaa" + "0" * 61)
+        await refresh_started.wait()
+
+        methods["apply_docker_action_state"](coordinator, "web", "stop")
+        release_refresh.set()
+        await coordinator._container_refresh_task
+
+        assert coordinator.data["container_stats"][0]["running"] is False
+
+    asyncio.run(run_scenario())
+
+
+def test_docker_disk_usage_has_its_own_cadence_and_keeps_last_good_values() -> None:
+    """Disk usage runs on its own interval; a failed run keeps the previous sizes."""
+
+    methods = _coordinator_methods()
+    scheduled: list[list[str]] = []
+
+    async def sample_docker_disk(*args: Any, **kwargs: Any) -> dict[str, Any]:
+        return {"docker_disk_collection_error": "Docker disk usage collection did not complete"}
+
+    methods["_async_update_slow_data"].__globals__["async_sample_docker_disk"] = sample_docker_disk
+
+    class FakeCoordinator:
+        server = {"host": "pi5docker", "username": "homeassistant", "port": 22}
+        connect_timeout = 10
+        slow_command_timeout = 180
+        session_limiter = _UnlimitedSessions()
+        docker_interval = 1800
+        docker_disk_interval = 21600
+        package_interval = 0
+        storage_interval = 0
+        _docker_state_revision = 0
+        _slow_refresh_task = None
+        _last_docker_attempt = 0.0
+        _last_docker_disk_attempt = 0.0
+        _last_package_attempt = 0.0
+        _last_storage_attempt = 0.0
+        _slow_data_due = methods["_slow_data_due"]
+        _async_update_slow_data = methods["_async_update_slow_data"]
+        _clear_docker_data = methods["_clear_docker_data"]
+        data = {"docker": 1, "docker_volumes_size_bytes": 2048}
+
+        def __init__(self) -> None:
+            self.hass = self
+
+        def async_create_task(self, coro: Any) -> None:
+            scheduled.append(coro.cr_frame.f_locals["due_collectors"])
+            coro.close()
+
+        def async_set_updated_data(self, data: dict[str, Any]) -> None:
+            self.data = data
+
+    coordinator = FakeCoordinator()
+    methods["_schedule_slow_data"](coordinator, {"docker": 1})
+    coordinator._last_docker_attempt = time.monotonic() - 1800
+    methods["_schedule_slow_data"](coordinator, {"docker": 1})
+    assert scheduled == [["docker", "docker_disk"], ["docker"]]
+
+    # Hosts known to run no Docker skip the disk usage collector.
+    coordinator._last_docker_attempt = coordinator._last_docker_disk_attempt = 0.0
+    methods["_schedule_slow_data"](coordinator, {"docker": 0})
+    assert scheduled[-1] == ["docker"]
+
+    asyncio.run(methods["_async_update_slow_data"](coordinator, ["docker_disk"]))
+    assert coordinator.data["docker_volumes_size_bytes"] == 2048
+    assert coordinator.data["docker_disk_collection_error"].startswith("Docker disk usage")
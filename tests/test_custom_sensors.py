@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import ast
+import contextlib
 import json
 import re
 from pathlib import Path
@@ -55,6 +56,19 @@ def _channel_reader():
     return namespace["_read_custom_command_channel"], namespace
 
 
+class _FakePool:
+    """Pool stand-in that opens every command on one fake Paramiko client."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    @contextlib.contextmanager
+    def exec_command(self, *args):
+        command, _connect_timeout, command_timeout = args[5:8]
+        stdin, stdout, stderr = self.client.exec_command(command, timeout=command_timeout)
+        yield stdin, stdout, stderr, 0.0
+
+
 def _custom_command_runner(client):
     """Compile the custom command runner with a fake Paramiko client."""
 
@@ -71,8 +85,7 @@ def _custom_command_runner(client):
         "Dict": dict,
         "Optional": Any,
         "MAX_CUSTOM_COMMAND_OUTPUT": 16 * 1024,
-        "paramiko": SimpleNamespace(SSHClient=lambda: client),
-        "configure_pinned_host_keys": lambda _client, _fingerprints: None,
+        "ssh_pool": _FakePool(client),
         "time": SimpleNamespace(monotonic=lambda: 0.0, sleep=lambda _delay: None),
     }
     exec(compile(ast.Module(body=functions, type_ignores=[]), str(path), "exec"), namespace)
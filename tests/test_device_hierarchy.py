@@ -130,7 +130,6 @@ def test_container_sensors_read_canonical_container_metrics() -> None:
     )
     helpers = runpy.run_path(str(COMPONENT_PATH / "docker_entities.py"))
     namespace = {
-        "_build_health": lambda *_args: {"status": "ok", "score": 100},
         "find_container": helpers["find_container"],
     }
     exec(
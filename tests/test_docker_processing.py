@@ -2,15 +2,16 @@
 from __future__ import annotations
 
 import ast
+import re
 import runpy
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
 
 ROOT = Path(__file__).parents[1]
 INTEGRATION = ROOT / "custom_components" / "vserver_ssh_stats"
 
 
-def _docker_processor():
+def _docker_functions(namespace: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     source = (INTEGRATION / "ssh_collector.py").read_text()
     tree = ast.parse(source)
     wanted = {
@@ -20,18 +21,38 @@ def _docker_processor():
         "_safe_bool",
         "_safe_list",
         "_process_docker_data",
+        "_docker_api_ports",
+        "_docker_api_stats",
+        "_docker_api_data",
+        "_process_docker_disk_data",
+        "_docker_container_summary",
+        "_docker_event",
+        "merge_docker_containers",
     }
     functions = [
         node
         for node in tree.body
         if isinstance(node, ast.FunctionDef) and node.name in wanted
     ]
-    namespace = {"Any": Any, "Dict": Dict, "Optional": Optional}
+    namespace = {
+        "Any": Any,
+        "DOCKER_DISK_BREAKDOWN_LIMIT": 2,
+        "Dict": Dict,
+        "Iterable": Iterable,
+        "Mapping": Mapping,
+        "Optional": Optional,
+        "Sequence": Sequence,
+        **(namespace or {}),
+    }
     exec(
         compile(ast.Module(body=functions, type_ignores=[]), "<docker-processor>", "exec"),
         namespace,
     )
-    return namespace["_process_docker_data"]
+    return namespace
+
+
+def _docker_processor(namespace: Optional[Dict[str, Any]] = None):
+    return _docker_functions(namespace)["_process_docker_data"]
 
 
 def _docker_metric_validator():
@@ -89,6 +110,145 @@ def test_docker_state_and_health_normalization() -> None:
     assert result["container_lookup"]["stopped_ok"]["id"] == "2"
 
 
+def test_cgroup_cpu_time_becomes_usage_on_the_next_sample() -> None:
+    """Containers read from cgroups get CPU usage from the host's previous sample."""
+
+    net_cache = runpy.run_path(str(INTEGRATION / "net_cache.py"))
+    process = _docker_processor({"container_cpu_cache": net_cache["ContainerCpuCache"]()})
+
+    def sample(uptime: float, web_usec: int) -> Dict[str, Any]:
+        return {
+            "docker": 1,
+            "docker_sample_uptime": uptime,
+            "container_stats": [
+                {"id": "1", "name": "web", "running": True, "cpu_usage_usec": web_usec},
+                {"id": "2", "name": "legacy", "running": True, "cpu": 1.5},
+            ],
+        }
+
+    first = process(sample(100.0, 2_000_000), "host")
+    second = process(sample(104.0, 3_000_000), "host")
+
+    assert first["container_lookup"]["web"]["cpu"] is None
+    assert second["container_lookup"]["web"]["cpu"] == 25.0
+    assert second["container_lookup"]["legacy"]["cpu"] == 1.5
+    assert "cpu_usage_usec" not in second["container_lookup"]["web"]
+
+
+def test_engine_api_documents_match_cli_collector_fields() -> None:
+    """Engine API list, inspect, stats and df documents become normal containers."""
+
+    web = "a" * 64
+    db = "b" * 64
+    result = _docker_processor()(
+        {
+            "docker": 1,
+            "docker_stats_complete": 1,
+            "container_stats": [],
+            "docker_api": {
+                "containers": [
+                    {
+                        "Id": web,
+                        "Names": ["/web"],
+                        "Image": "nginx:1",
+                        "State": "running",
+                        "Status": "Up 2 hours (healthy)",
+                        "Ports": [
+                            {"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"},
+                            {"PrivatePort": 443, "Type": "tcp"},
+                        ],
+                        "Labels": {"com.docker.compose.project": "site"},
+                    },
+                    {"Id": db, "Names": ["/db"], "State": "running", "Status": "Up 1 hour"},
+                ],
+                "documents": [
+                    {
+                        "Id": web,
+                        "RestartCount": 2,
+                        "State": {
+                            "Running": True,
+                            "Status": "running",
+                            "Health": {"Status": "healthy"},
+                        },
+                        "HostConfig": {"Memory": 209715200, "RestartPolicy": {"Name": "always"}},
+                    },
+                    {"Id": db, "State": {"Running": True, "Status": "running"}},
+                    {
+                        "id": db,
+                        "cpu_stats": {"cpu_usage": {"total_usage": 3_000_000_000}},
+                        "memory_stats": {
+                            "usage": 150,
+                            "limit": 1000,
+                            "stats": {"inactive_file": 50},
+                        },
+                        "pids_stats": {"current": 4},
+                    },
+                ],
+                "cgroups": [
+                    {
+                        "id": web,
+                        "cpu_usage_usec": 5_000_000,
+                        "mem": 25.0,
+                        "memory_usage_bytes": 104857600,
+                    }
+                ],
+            },
+        }
+    )
+
+    web_container = result["container_lookup"]["web"]
+    assert result["containers"] == "web, db"
+    assert web_container["id"] == "a" * 12
+    assert web_container["ports"] == "0.0.0.0:8080->80/tcp, 443/tcp"
+    assert (web_container["health_state"], web_container["running"]) == ("healthy", True)
+    assert web_container["restart_count"] == 2
+    assert web_container["restart_policy"] == "always"
+    assert web_container["compose_project"] == "site"
+    assert web_container["memory_limit_usage"] == 50.0
+    assert result["container_lookup"]["db"]["mem"] == 10.0
+    assert result["container_lookup"]["db"]["pids"] == 4
+    assert "docker_images_size_bytes" not in result
+
+
+def test_docker_disk_usage_lists_the_largest_images_and_volumes() -> None:
+    """An Engine API df document yields totals and a size-ordered breakdown."""
+
+    process = _docker_functions()["_process_docker_disk_data"]
+    result = process(
+        {
+            "docker": 1,
+            "docker_disk_complete": 1,
+            "docker_df": {
+                "LayersSize": 4096,
+                "Images": [
+                    {"Id": "sha256:" + "1" * 64, "RepoTags": ["app:1"], "Size": 300},
+                    {"Id": "sha256:" + "2" * 64, "RepoTags": ["<none>:<none>"], "Size": 900},
+                    {"Id": "sha256:" + "3" * 64, "RepoTags": ["db:2"], "Size": 600},
+                ],
+                "Containers": [{"SizeRw": 10}, {"SizeRw": 5}],
+                "Volumes": [
+                    {"Name": "data", "UsageData": {"Size": 100, "RefCount": 1}},
+                    {"Name": "pending", "UsageData": {"Size": -1, "RefCount": 0}},
+                ],
+            },
+        }
+    )
+
+    assert result["docker_images_size_bytes"] == 4096
+    assert result["docker_containers_size_bytes"] == 15
+    assert result["docker_volumes_size_bytes"] == 100
+    assert result["docker_build_cache_size_bytes"] is None
+    assert [(image["id"], image["tags"]) for image in result["docker_image_sizes"]] == [
+        ("2" * 12, []),
+        ("3" * 12, ["db:2"]),
+    ]
+    assert result["docker_volume_sizes"][0] == {"name": "data", "size": 100, "containers": 1}
+
+    cli = process({"docker": 1, "docker_images_size_bytes": 1024, "docker_df": None})
+    assert cli["docker_images_size_bytes"] == 1024
+    assert cli["docker_image_sizes"] == []
+
+
 def test_container_lookup_helpers() -> None:
     """Ensure dynamic entities use stable sanitized lookup keys."""
 
@@ -122,14 +282,12 @@ def test_explicit_inspect_state_overrides_stale_status_text() -> None:
     assert result["container_lookup"]["grafana"]["running"] is False
 
 
-def test_container_limits_throttling_and_docker_disk_usage_are_normalized() -> None:
+def test_container_limits_and_throttling_are_normalized() -> None:
     """Preserve Docker resource limits and cumulative throttling counters."""
 
     result = _docker_processor()(
         {
             "docker": 1,
-            "docker_images_size_bytes": 1024,
-            "docker_volumes_size_bytes": 2048,
             "container_stats": [
                 {
                     "id": "1",
@@ -153,8 +311,6 @@ def test_container_limits_throttling_and_docker_disk_usage_are_normalized() -> N
     assert container["pids"] == 7
     assert container["cpu_throttled_periods"] == 9
     assert container["cpu_throttled_seconds"] == 1.5
-    assert result["docker_images_size_bytes"] == 1024
-    assert result["docker_volumes_size_bytes"] == 2048
     assert result["container_grafana_memory_limit_usage"] == 50.0
     assert result["container_grafana_memory_limit_reached"] is False
 
@@ -225,3 +381,78 @@ def test_all_zero_running_container_sample_is_rejected() -> None:
             ]
         }
     )
+
+
+def test_docker_events_are_normalized() -> None:
+    """Container events keep their ID, action, health state and exit code."""
+
+    docker_event = _docker_functions(
+        {"DOCKER_CONTAINER_ID_PATTERN": re.compile(r"[0-9a-f]{12,64}")}
+    )["_docker_event"]
+
+    assert docker_event(
+        {
+            "Type": "container",
+            "Action": "health_status: unhealthy",
+            "Actor": {"ID": "abc123def4567890", "Attributes": {"name": "web"}},
+            "time": 1700000000,
+        }
+    ) == {
+        "id": "abc123def4567890",
+        "name": "web",
+        "action": "health_status",
+        "health_state": "unhealthy",
+        "exit_code": None,
+        "time": 1700000000,
+    }
+    died = docker_event(
+        {
+            "Type": "container",
+            "Action": "die",
+            "Actor": {"ID": "abc123def4567890", "Attributes": {"exitCode": "1"}},
+        }
+    )
+    assert (died["action"], died["exit_code"]) == ("die", 1)
+    assert docker_event({"Type": "network", "Action": "connect", "Actor": {"ID": "n1"}}) is None
+    assert docker_event({"Type": "container", "Action": "start", "Actor": {}}) is None
+    for container_id in ("abc123", "ABC123DEF4567890", f"{'a' * 12};reboot"):
+        assert (
+            docker_event({"Type": "container", "Action": "start", "Actor": {"ID": container_id}})
+            is None
+        )
+
+
+def test_targeted_container_refresh_is_merged_by_id() -> None:
+    """Only listed containers are replaced, removed or added; the rest are kept."""
+
+    merge = _docker_functions()["merge_docker_containers"]
+    data = {
+        "docker": 1,
+        "docker_disk_usage": {"images": 3},
+        "container_web_cpu": 5.0,
+        "container_stats": [
+            {"id": "aaa", "name": "web", "running": True, "cpu": 5.0},
+            {"id": "bbb", "name": "db", "running": True, "cpu": 1.0},
+            {"id": "ccc", "name": "old", "running": False},
+        ],
+    }
+
+    merged = merge(
+        data,
+        [
+            {"id": "aaa", "name": "web", "running": False, "cpu": 0.0},
+            {"id": "ddd", "name": "new", "running": True},
+        ],
+        ["aaa000", "ccc000", "ddd000"],
+    )
+
+    assert [container["name"] for container in merged["container_stats"]] == [
+        "web",
+        "db",
+        "new",
+    ]
+    assert merged["containers"] == "web, db, new"
+    assert merged["container_lookup"]["web"]["running"] is False
+    assert merged["container_web_cpu"] == 0.0
+    assert "old" not in merged["container_lookup"]
+    assert merged["docker_disk_usage"] == {"images": 3}
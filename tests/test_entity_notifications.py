@@ -0,0 +1,202 @@
+"""Tests for notifying only entities whose coordinator keys changed."""
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).parents[1]
+INTEGRATION = ROOT / "custom_components" / "vserver_ssh_stats"
+
+
+def _load(path: Path, names: set[str], namespace: dict[str, Any]) -> dict[str, Any]:
+    """Compile top-level and class-level definitions *names* of *path*."""
+
+    nodes = []
+    for node in ast.parse(path.read_text()).body:
+        children = node.body if isinstance(node, ast.ClassDef) else [node]
+        for child in children:
+            if isinstance(child, ast.FunctionDef) and child.name in names:
+                nodes.append(child)
+            elif isinstance(child, (ast.Assign, ast.AnnAssign)):
+                targets = child.targets if isinstance(child, ast.Assign) else [child.target]
+                if any(isinstance(target, ast.Name) and target.id in names for target in targets):
+                    nodes.append(child)
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(path), "exec"), namespace)
+    return namespace
+
+
+def _coordinator() -> Any:
+    class BaseCoordinator:
+        """Stands in for DataUpdateCoordinator and records fallback updates."""
+
+        def async_update_listeners(self) -> None:
+            self.updates.append("base")
+
+    namespace = _load(
+        INTEGRATION / "coordinator.py",
+        {"_MISSING", "changed_keys"},
+        {"Any": Any, "BaseCoordinator": BaseCoordinator, "callback": lambda func: func},
+    )
+    # Compile the override inside a subclass so its super() call resolves.
+    source = (INTEGRATION / "coordinator.py").read_text()
+    override = next(
+        node
+        for node in ast.walk(ast.parse(source))
+        if isinstance(node, ast.FunctionDef) and node.name == "async_update_listeners"
+    )
+    listeners_class = ast.ClassDef(
+        name="ListenerCoordinator",
+        bases=[ast.Name(id="BaseCoordinator", ctx=ast.Load())],
+        keywords=[],
+        body=[override],
+        decorator_list=[],
+        type_params=[],
+    )
+    module = ast.fix_missing_locations(ast.Module(body=[listeners_class], type_ignores=[]))
+    exec(compile(module, "<coordinator>", "exec"), namespace)
+
+    class FakeCoordinator(namespace["ListenerCoordinator"]):
+        def __init__(self) -> None:
+            self.data: dict[str, Any] = {}
+            self.last_update_success = True
+            self._listeners: dict[Callable[[], None], tuple[Callable[[], None], Any]] = {}
+            self._notified_data = None
+            self._notified_success = True
+            self.notifications_sent = 0
+            self.notifications_skipped = 0
+            self.updates: list[str] = []
+
+        def listen(self, name: str, context: Any) -> None:
+            def update() -> None:
+                self.updates.append(name)
+
+            self._listeners[update] = (update, context)
+
+    return FakeCoordinator()
+
+
+def test_only_entities_bound_to_changed_keys_are_notified() -> None:
+    """Unchanged keys skip their entities; contextless entities always update."""
+
+    coordinator = _coordinator()
+    coordinator.listen("cpu", frozenset({"cpu"}))
+    coordinator.listen("containers", frozenset({"container_lookup", "container_stats"}))
+    coordinator.listen("health", None)
+
+    coordinator.data = {"cpu": 5, "container_stats": [{"name": "web", "running": True}]}
+    coordinator.async_update_listeners()
+    assert coordinator.updates == ["cpu", "containers", "health"]
+
+    coordinator.updates.clear()
+    coordinator.data = {"cpu": 7, "container_stats": [{"name": "web", "running": True}]}
+    coordinator.async_update_listeners()
+    assert coordinator.updates == ["cpu", "health"]
+
+    # A slow collector merge that only touches Docker data.
+    coordinator.updates.clear()
+    coordinator.data = {"cpu": 7, "container_stats": [{"name": "web", "running": False}]}
+    coordinator.async_update_listeners()
+    assert coordinator.updates == ["containers", "health"]
+    assert (coordinator.notifications_sent, coordinator.notifications_skipped) == (7, 2)
+
+    # Availability changes reach every entity even without data changes.
+    coordinator.updates.clear()
+    coordinator.last_update_success = False
+    coordinator.async_update_listeners()
+    assert coordinator.updates == ["cpu", "containers", "health"]
+
+
+def test_unexpected_listener_layout_falls_back_to_the_base_class() -> None:
+    """A changed private listener layout notifies everyone via the base class."""
+
+    coordinator = _coordinator()
+    coordinator.listen("cpu", frozenset({"cpu"}))
+    coordinator.data = {"cpu": 5}
+    coordinator.async_update_listeners()
+    assert coordinator.updates == ["cpu"]
+
+    coordinator.updates.clear()
+    coordinator._listeners = {
+        update: (update, context, "new field")
+        for update, context in coordinator._listeners.values()
+    }
+    coordinator.async_update_listeners()
+    assert coordinator.updates == ["base"]
+
+    coordinator.updates.clear()
+    del coordinator._listeners
+    coordinator.async_update_listeners()
+    assert coordinator.updates == ["base"]
+
+
+def test_sensor_contexts_cover_attribute_keys() -> None:
+    """Sensors listen to their own key plus every key their attributes read."""
+
+    namespace = _load(
+        INTEGRATION / "sensor.py",
+        {"AGGREGATE_SENSOR_KEYS", "ATTRIBUTE_DATA_KEYS", "_sensor_data_keys"},
+        {"Any": Any, "CONTAINER_DATA_KEYS": frozenset({"container_lookup", "container_stats"})},
+    )
+    data_keys = namespace["_sensor_data_keys"]
+
+    assert data_keys("health_score", None, None) is None
+    assert data_keys("cpu", None, None) == {"cpu"}
+    assert data_keys("process_total", None, None) == {
+        "process_total",
+        "process_states",
+        "process_users",
+        "process_cgroups",
+    }
+    assert "container_lookup" in data_keys("container_web_cpu", "web", None)
+    assert data_keys("storage_sda_temperature", None, "sda") == {"storage_device_lookup"}
+
+    # Every listed key is also read by extra_state_attributes.
+    source = (INTEGRATION / "sensor.py").read_text()
+    for keys in namespace["ATTRIBUTE_DATA_KEYS"].values():
+        assert all(source.count(f'"{key}"') >= 2 for key in keys)
+
+    # Every key extra_state_attributes reads is in the context of its sensor.
+    sensor_class = next(
+        node
+        for node in ast.parse(source).body
+        if isinstance(node, ast.ClassDef) and node.name == "VServerSensor"
+    )
+    attributes = next(
+        node
+        for node in sensor_class.body
+        if isinstance(node, ast.FunctionDef) and node.name == "extra_state_attributes"
+    )
+
+    def read_keys(nodes: list[ast.stmt]) -> set[str]:
+        return {
+            call.args[0].value
+            for node in nodes
+            for call in ast.walk(node)
+            if isinstance(call, ast.Call)
+            and isinstance(call.func, ast.Attribute)
+            and call.func.attr == "get"
+            and ast.unparse(call.func.value) == "self.coordinator.data"
+            and call.args
+            and isinstance(call.args[0], ast.Constant)
+        }
+
+    checked = 0
+    for branch in attributes.body:
+        if not isinstance(branch, ast.If):
+            continue
+        test = branch.test
+        if (
+            isinstance(test, ast.Compare)
+            and ast.unparse(test.left) == "self.entity_description.key"
+            and isinstance(test.comparators[0], ast.Constant)
+        ):
+            sensor_key = test.comparators[0].value
+            keys = read_keys(branch.body)
+            assert keys <= (data_keys(sensor_key, None, None) or set()), sensor_key
+            checked += len(keys)
+        elif ast.unparse(test) == "self._storage_key":
+            keys = read_keys(branch.body)
+            assert keys <= data_keys("storage_sda_temperature", None, "sda")
+            checked += len(keys)
+    assert checked >= 18
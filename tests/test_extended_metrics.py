@@ -3,16 +3,18 @@ from __future__ import annotations
 
 import ast
 import asyncio
+import logging
 import runpy
+from functools import partial
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 ROOT = Path(__file__).parents[1]
 INTEGRATION = ROOT / "custom_components" / "vserver_ssh_stats"
 
 
-def _storage_processor():
+def _storage_processor(name: str = "_process_storage_data"):
     """Load storage normalization helpers without Home Assistant imports."""
 
     tree = ast.parse((INTEGRATION / "ssh_collector.py").read_text())
@@ -22,18 +24,19 @@ def _storage_processor():
         "_safe_float",
         "_safe_list",
         "_process_storage_data",
+        "merge_standby_storage_devices",
     }
     functions = [
         node
         for node in tree.body
         if isinstance(node, ast.FunctionDef) and node.name in wanted
     ]
-    namespace = {"Any": Any, "Dict": Dict, "Optional": Optional}
+    namespace = {"Any": Any, "Dict": Dict, "Mapping": Mapping, "Optional": Optional}
     exec(
         compile(ast.Module(body=functions, type_ignores=[]), "<storage-processor>", "exec"),
         namespace,
     )
-    return namespace["_process_storage_data"]
+    return namespace[name]
 
 
 def test_storage_devices_and_smart_failure_are_normalized() -> None:
@@ -93,6 +96,40 @@ def test_unavailable_storage_health_does_not_report_false_safety() -> None:
     assert result["smart_failure_detected"] is None
 
 
+def test_standby_storage_devices_keep_their_last_known_health() -> None:
+    """A disk left in standby reports the values of the last active sample."""
+
+    process = _storage_processor()
+    merge = _storage_processor("merge_standby_storage_devices")
+    active = process(
+        {
+            "storage_devices": [
+                {"name": "sdb", "serial": "ZL2ABC", "smart_status": "failed", "temperature": 38},
+            ],
+        }
+    )
+    sample = process(
+        {
+            "storage_devices_standby": 1,
+            "storage_devices": [
+                {"name": "sdc", "serial": "ZL2ABC", "standby": True, "capacity_bytes": 4096},
+                {"name": "sda", "serial": "WD1", "smart_status": "passed"},
+            ],
+        }
+    )
+
+    assert sample["storage_device_lookup"]["zl2abc"]["temperature"] is None
+    result = merge(sample, active["storage_device_lookup"])
+
+    device = result["storage_device_lookup"]["zl2abc"]
+    assert (device["name"], device["standby"], device["capacity_bytes"]) == ("sdc", True, 4096)
+    assert (device["smart_status"], device["temperature"]) == ("failed", 38.0)
+    assert result["smart_failed_devices"] == 1
+    assert result["smart_failure_detected"] is True
+    assert result["storage_devices_standby"] == 1
+    assert merge(sample, None) is sample
+
+
 def test_process_peak_cache_resets_when_uptime_decreases() -> None:
     """The observed process peak belongs to one boot only."""
 
@@ -105,6 +142,64 @@ def test_process_peak_cache_resets_when_uptime_decreases() -> None:
     assert cache.compute("host", 40, 10) == 40
 
 
+def test_cpu_stats_cache_derives_usage_from_jiffy_deltas() -> None:
+    """CPU usage comes from counter deltas and resets after a reboot."""
+
+    module = runpy.run_path(str(INTEGRATION / "net_cache.py"))
+    cache = module["CpuStatsCache"]()
+
+    assert cache.compute("host", [100, 0, 100, 800, 0, 0, 0, 0], 1000) is None
+    assert cache.last_uptime("host") == 1000
+    assert cache.compute("host", [130, 0, 120, 840, 10, 0, 0, 0], 1030) == 50
+    assert cache.compute("host", [5, 0, 5, 10, 0, 0, 0, 0], 20) is None
+    assert cache.compute("host", None, 30) is None
+    assert cache.last_uptime("host") is None
+
+
+def test_power_stats_cache_derives_watts_and_handles_wraparound() -> None:
+    """Average power spans the time between samples, including counter wraps."""
+
+    module = runpy.run_path(str(INTEGRATION / "net_cache.py"))
+    cache = module["PowerStatsCache"]()
+
+    assert cache.compute("host", 1_000_000, 10_000_000, 100.0) is None
+    assert cache.compute("host", 31_000_000, 10_000_000, 130.0) == 1.0
+    assert cache.compute("host", 1_000_000, 40_000_000, 140.0) == 1.0
+    assert cache.compute("host", 2_000_000, None, 140.0) is None
+
+
+def test_container_cpu_cache_derives_usage_from_cgroup_cpu_time() -> None:
+    """Container CPU usage spans the samples; restarted containers start over."""
+
+    module = runpy.run_path(str(INTEGRATION / "net_cache.py"))
+    cache = module["ContainerCpuCache"]()
+
+    assert cache.compute("host", {"web": 1_000_000, "db": 5_000_000}, 100.0) == {}
+    assert cache.compute(
+        "host", {"web": 16_000_000, "db": 1_000_000, "new": 3_000}, 110.0
+    ) == {"web": 150.0}
+    assert cache.compute("host", {"web": 17_000_000}, 5.0) == {}
+    assert cache.compute("host", {"web": 17_500_000}, 15.0) == {"web": 5.0}
+    assert cache.compute("host", {"web": 18_000_000}, None) == {}
+    assert cache.compute("host", {"web": 19_000_000}, 25.0) == {}
+
+
+def test_container_cpu_cache_keeps_other_containers_across_partial_samples() -> None:
+    """A targeted refresh of some containers does not reset the others."""
+
+    module = runpy.run_path(str(INTEGRATION / "net_cache.py"))
+    cache = module["ContainerCpuCache"]()
+
+    assert cache.compute("host", {"web": 1_000_000, "db": 5_000_000}, 100.0) == {}
+    assert cache.compute("host", {"web": 6_000_000}, 105.0, partial=True) == {"web": 100.0}
+    assert cache.compute("host", {"web": 8_000_000, "db": 7_000_000}, 110.0) == {
+        "web": 40.0,
+        "db": 20.0,
+    }
+    assert cache.compute("host", {"web": 9_000_000}, 120.0) == {"web": 10.0}
+    assert cache.compute("host", {"db": 8_000_000}, 130.0, partial=True) == {}
+
+
 def test_rolling_average_cache_averages_within_the_trailing_window() -> None:
     """Old samples fall out of the window and missing values pass through as None."""
 
@@ -119,15 +214,40 @@ def test_rolling_average_cache_averages_within_the_trailing_window() -> None:
     assert cache.compute("other-host", None, 301.0) is None
 
 
+def test_section_timing_cache_reports_rolling_percentiles() -> None:
+    """Percentiles cover the last samples of each section of one host."""
+
+    module = runpy.run_path(str(INTEGRATION / "net_cache.py"))
+    cache = module["SectionTimingCache"](max_samples=20)
+
+    for duration in range(1, 31):
+        stats = cache.compute("host", {"read_cpu_stats": float(duration)})
+    stats = cache.compute("host", {"read_docker_stats": 400.0})
+
+    assert stats["read_cpu_stats"] == {"p50_ms": 20.0, "p95_ms": 29.0, "samples": 20}
+    assert stats["read_docker_stats"] == {"p50_ms": 400.0, "p95_ms": 400.0, "samples": 1}
+    assert cache.compute("other-host", {}) == {}
+
+    cache.forget(["host"])
+    assert cache.compute("host", {}) == {}
+
+
 def test_storage_collector_caps_commands_and_reports_partial_reads() -> None:
     """Bound individual privileged reads and preserve successful partial data."""
 
     tree = ast.parse((INTEGRATION / "ssh_collector.py").read_text())
-    function = next(
+    functions = [
         node
         for node in tree.body
-        if isinstance(node, ast.AsyncFunctionDef) and node.name == "async_sample_storage"
-    )
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        and node.name
+        in {
+            "async_sample_storage",
+            "_storage_result",
+            "_storage_command_timeout",
+            "_transfer_result",
+        }
+    ]
     captured: dict[str, Any] = {}
 
     async def fake_collect(*args, **kwargs):
@@ -158,7 +278,7 @@ def test_storage_collector_caps_commands_and_reports_partial_reads() -> None:
         "_process_storage_data": _storage_processor(),
     }
     exec(
-        compile(ast.Module(body=[function], type_ignores=[]), "<storage-sample>", "exec"),
+        compile(ast.Module(body=functions, type_ignores=[]), "<storage-sample>", "exec"),
         namespace,
     )
 
@@ -179,6 +299,95 @@ def test_storage_collector_caps_commands_and_reports_partial_reads() -> None:
     )
 
 
+def test_combined_slow_collectors_split_sections_per_collector() -> None:
+    """One round trip returns the same per-collector results as separate runs."""
+
+    tree = ast.parse((INTEGRATION / "ssh_collector.py").read_text())
+    wanted = {
+        "async_sample_slow",
+        "_package_result",
+        "_storage_result",
+        "_docker_result",
+        "_docker_disk_result",
+        "_storage_command_timeout",
+        "_docker_outer_timeout",
+        "_transfer_result",
+    }
+    nodes = [
+        node
+        for node in tree.body
+        if (
+            isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and node.name in wanted
+        )
+        or (
+            isinstance(node, ast.Assign)
+            and any(
+                isinstance(target, ast.Name) and target.id == "SLOW_COLLECTOR_MODES"
+                for target in node.targets
+            )
+        )
+    ]
+    captured: dict[str, Any] = {}
+
+    async def fake_collect(*args, **kwargs):
+        captured["mode"] = args[8]
+        captured["command_timeout"] = args[7]
+        return (
+            {
+                "sections": {
+                    "packages": {
+                        "pkg_count": 3,
+                        "pkg_list": "a,b,c",
+                        "security_updates": 1,
+                        "pkg_updates_complete": 1,
+                    },
+                    "storage": None,
+                },
+                "section_complete": {"packages": 1, "storage": 0},
+                "section_time_ms": {"packages": 40, "storage": 900},
+            },
+            {"collection_time_ms": 950.0},
+            None,
+        )
+
+    namespace = {
+        "Any": Any,
+        "Dict": Dict,
+        "Optional": Optional,
+        "DEFAULT_CONNECT_TIMEOUT": 10,
+        "DEFAULT_COMMAND_TIMEOUT": 45,
+        "_LOGGER": logging.getLogger(__name__),
+        "_async_collect_raw": fake_collect,
+        "partial": partial,
+        "_safe_int": lambda value: int(value) if value is not None else None,
+        "_safe_float": lambda value: float(value) if value is not None else None,
+        "_process_storage_data": _storage_processor(),
+    }
+    exec(
+        compile(ast.Module(body=nodes, type_ignores=[]), "<slow-sample>", "exec"),
+        namespace,
+    )
+
+    results = asyncio.run(
+        namespace["async_sample_slow"](
+            "host", "user", None, None, 22, ["package", "storage"], command_timeout=120
+        )
+    )
+
+    assert captured == {"mode": "packages,storage", "command_timeout": 120}
+    assert results["package"] == {
+        "package_collection_error": None,
+        "package_collection_time_ms": 40.0,
+        "pkg_count": 3,
+        "pkg_list": "a,b,c",
+        "security_updates": 1,
+    }
+    assert results["storage"] == {
+        "storage_collection_error": "storage section did not complete"
+    }
+
+
 def test_new_warning_binary_sensors_are_registered() -> None:
     """Expose all requested host-level warning conditions."""
 
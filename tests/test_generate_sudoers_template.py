@@ -41,7 +41,9 @@ def test_generates_rules_for_selected_features() -> None:
     )
     assert "vserver-monitor ALL=(root) NOPASSWD: /usr/bin/apt-get -y upgrade" in result.stdout
     assert "vserver-monitor ALL=(root) NOPASSWD: /sbin/reboot" in result.stdout
-    assert "vserver-monitor ALL=(root) NOPASSWD: /usr/sbin/smartctl -a /dev/*" in result.stdout
+    assert "vserver-monitor ALL=(root) NOPASSWD: /usr/sbin/smartctl -n standby -a /dev/*" in (
+        result.stdout
+    )
     assert "vserver-monitor ALL=(root) NOPASSWD: /usr/sbin/ufw status verbose" in result.stdout
     assert "vserver-monitor ALL=(root) NOPASSWD: /usr/bin/systemctl restart nginx" in result.stdout
     assert "dnf" not in result.stdout
@@ -0,0 +1,120 @@
+"""Tests for the memoized server health model."""
+from __future__ import annotations
+
+import ast
+import importlib.util
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+INTEGRATION = ROOT / "custom_components" / "vserver_ssh_stats"
+
+
+def _health_module() -> Any:
+    spec = importlib.util.spec_from_file_location(
+        "vserver_ssh_stats_health", INTEGRATION / "health.py"
+    )
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    # Dataclasses resolve their annotations through the registered module.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_health_reports_score_reasons_and_metrics() -> None:
+    """Penalties lower the score and name the metrics that caused them."""
+
+    health = _health_module()
+    data = {
+        "cpu": 97,
+        "mem": 50,
+        "disk_stats": [
+            {"mount": "/", "total": 100, "free": 1},
+            {"mount": "/data", "label": "data", "total": 100, "free": 12},
+        ],
+        "container_stats": [{"name": "web", "status": "Exited (1) 2 minutes ago"}],
+    }
+
+    result = health.evaluate_health(data, True)
+
+    assert result.score == 45
+    assert result.level == "critical"
+    assert result.reasons == (
+        "CPU usage is critical at 97%",
+        "Disk data is high at 88%",
+        "Container web is not healthy",
+    )
+    assert result.metrics == {
+        "cpu": 97.0,
+        "disk_stats:data": 88.0,
+        "container_stats:web": False,
+    }
+    assert health.evaluate_health(data, False).level == "offline"
+
+
+def test_per_server_thresholds_override_defaults() -> None:
+    """Configured levels replace the defaults of the listed metrics only."""
+
+    health = _health_module()
+    thresholds = health.parse_health_thresholds("cpu=98:99.5\nload=2:4")
+    data = {"cpu": 97, "mem": 96, "cores": 2, "load_5": 5}
+
+    result = health.evaluate_health(data, True, thresholds)
+
+    assert thresholds == {"cpu": (98.0, 99.5), "load": (2.0, 4.0)}
+    assert result.reasons == (
+        "Memory usage is critical at 96%",
+        "5-minute load is high at 5.00 on 2 cores",
+    )
+    assert health.parse_health_thresholds({"cpu": [98, 99.5]}) == {"cpu": (98.0, 99.5)}
+    assert health.format_health_thresholds(thresholds) == "cpu=98:99.5\nload=2:4"
+    for invalid in ("cpu=95", "cpu=95:90", "temperature=60:80", "cpu=high:98"):
+        with pytest.raises(ValueError):
+            health.parse_health_thresholds(invalid)
+
+
+def test_coordinator_evaluates_health_once_per_update() -> None:
+    """Both health sensors share one evaluation until listeners are updated again."""
+
+    evaluations: list[dict[str, Any]] = []
+
+    def evaluate(data: dict[str, Any], online: bool, thresholds: Any) -> Any:
+        evaluations.append(data)
+        return SimpleNamespace(score=100, level="ok")
+
+    tree = ast.parse((INTEGRATION / "coordinator.py").read_text())
+    coordinator_class = next(
+        node
+        for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == "VServerCoordinator"
+    )
+    health_property = next(
+        node
+        for node in coordinator_class.body
+        if isinstance(node, ast.FunctionDef) and node.name == "health"
+    )
+    namespace: dict[str, Any] = {"evaluate_health": evaluate}
+    exec(
+        compile(ast.Module(body=[health_property], type_ignores=[]), "<coordinator>", "exec"),
+        namespace,
+    )
+    coordinator = SimpleNamespace(
+        data={"cpu": 5},
+        last_update_success=True,
+        health_thresholds={},
+        _health=None,
+    )
+    health = namespace["health"].fget
+
+    assert health(coordinator).level == "ok"
+    assert health(coordinator).score == 100
+    assert len(evaluations) == 1
+
+    coordinator._health = None
+    health(coordinator)
+    assert len(evaluations) == 2
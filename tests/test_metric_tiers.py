@@ -0,0 +1,151 @@
+"""Tests for tiered polling of base collector sections."""
+from __future__ import annotations
+
+import ast
+import re
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict
+
+ROOT = Path(__file__).parents[1]
+INTEGRATION = ROOT / "custom_components" / "vserver_ssh_stats"
+
+
+def _load(path: Path, names: set[str], namespace: dict[str, Any]) -> dict[str, Any]:
+    """Compile the top-level functions and assignments *names* of *path*."""
+
+    nodes = []
+    for node in ast.parse(path.read_text()).body:
+        if isinstance(node, ast.ClassDef):
+            nodes.extend(
+                child
+                for child in node.body
+                if isinstance(child, ast.FunctionDef) and child.name in names
+            )
+        elif isinstance(node, ast.FunctionDef) and node.name in names:
+            nodes.append(node)
+        elif isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id in names for target in node.targets
+        ):
+            nodes.append(node)
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(path), "exec"), namespace)
+    return namespace
+
+
+def _tier_coordinator(medium: int, slow: int, interval: int = 30) -> SimpleNamespace:
+    """Return a stand-in coordinator with the tier scheduling methods."""
+
+    util = _load(
+        INTEGRATION / "util.py",
+        {"METRIC_TIER_SECTIONS"},
+        {"METRIC_TIER_MEDIUM": "medium", "METRIC_TIER_SLOW": "slow"},
+    )
+    methods = _load(
+        INTEGRATION / "coordinator.py",
+        {"_due_metric_tiers", "_skipped_sections"},
+        {"Any": Any, "METRIC_TIER_SECTIONS": util["METRIC_TIER_SECTIONS"]},
+    )
+    coordinator = SimpleNamespace(
+        current_interval=interval,
+        tier_intervals={"medium": medium, "slow": slow},
+        _last_tier_poll={"medium": 0.0, "slow": 0.0},
+    )
+    coordinator.due = lambda now: methods["_due_metric_tiers"](coordinator, now)
+    coordinator.skipped = methods["_skipped_sections"]
+    return coordinator
+
+
+def test_coordinator_requests_only_due_tiers() -> None:
+    """The first poll collects everything; later polls skip tiers that are not due."""
+
+    coordinator = _tier_coordinator(medium=60, slow=600)
+
+    assert coordinator.due(100.0) == ["medium", "slow"]
+    assert coordinator.skipped(["medium", "slow"]) == []
+    coordinator._last_tier_poll = {"medium": 100.0, "slow": 100.0}
+
+    assert coordinator.due(130.0) == []
+    assert coordinator.skipped([]) == [
+        "processes",
+        "disk",
+        "network",
+        "host",
+        "services",
+        "systemd",
+        "journal",
+        "ssh_logins",
+        "firewall",
+        "fail2ban",
+    ]
+    # Jitter of a poll arriving slightly early does not delay the tier a full poll.
+    assert coordinator.due(159.5) == ["medium"]
+    assert coordinator.skipped(["medium"])[0] == "services"
+    assert coordinator.due(700.0) == ["medium", "slow"]
+
+
+def test_tiers_at_or_below_the_poll_interval_run_every_poll() -> None:
+    """A tier interval shorter than the base interval never skips sections."""
+
+    coordinator = _tier_coordinator(medium=10, slow=30)
+    coordinator._last_tier_poll = {"medium": 100.0, "slow": 100.0}
+
+    assert coordinator.due(130.0) == ["medium", "slow"]
+
+
+def test_skipped_sections_only_drop_their_own_fields() -> None:
+    """Skipped sections keep previous values; fast fields are always replaced."""
+
+    namespace = _load(
+        INTEGRATION / "ssh_collector.py",
+        {"SECTION_RESULT_KEYS", "_drop_skipped_section_keys"},
+        {"Any": Any, "Dict": Dict},
+    )
+    result = {
+        "cpu": 5,
+        "disk": 40,
+        "disk_capacity_total": 100.0,
+        "disk_io_read": 1.5,
+        "disk_root_total": 100.0,
+        "disk_root_free": 60.0,
+        "disk_stats": [],
+        "process_total": 120,
+        "process_states": {"S": 120},
+        "firewall_active": False,
+        "fail2ban_jails": [],
+    }
+
+    namespace["_drop_skipped_section_keys"](result, ["disk", "processes", "fail2ban"])
+
+    assert result == {"cpu": 5, "disk_io_read": 1.5, "firewall_active": False}
+
+
+def test_remote_cache_ttls_are_parsed_from_section_entries() -> None:
+    """Host cache lifetimes accept per-section overrides and reject unknown sections."""
+
+    util = _load(
+        INTEGRATION / "util.py",
+        {
+            "REMOTE_CACHE_TTLS",
+            "REMOTE_CACHE_TTL_SPLIT_PATTERN",
+            "parse_remote_cache_ttls",
+            "remote_cache_ttls",
+            "format_remote_cache_ttls",
+        },
+        {"re": re},
+    )
+    parse = util["parse_remote_cache_ttls"]
+
+    assert parse("") == {}
+    assert parse("firewall = 60;\n Systemd=0,") == {"firewall": 60, "systemd": 0}
+    assert parse({"boot": "900"}) == {"boot": 900}
+    for value in ("firewall", "docker=60", "firewall=-1", "firewall=soon", {"os": True}):
+        try:
+            parse(value)
+        except ValueError:
+            continue
+        raise AssertionError(f"{value!r} was accepted")
+
+    ttls = util["remote_cache_ttls"](parse("firewall=60"))
+    assert ttls["firewall"] == 60
+    assert ttls["os"] == util["REMOTE_CACHE_TTLS"]["os"]
+    assert parse(util["format_remote_cache_ttls"](ttls)) == ttls
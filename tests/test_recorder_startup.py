@@ -65,6 +65,7 @@ def test_initial_refresh_waits_until_home_assistant_started() -> None:
             "DataUpdateCoordinator": object,
             "async_at_started": fake_async_at_started,
             "asyncio": asyncio,
+            "_initial_refresh_delay": lambda _coordinator: 0,
         },
     )
     refreshes: list[str] = []
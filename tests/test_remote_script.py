@@ -1,10 +1,20 @@
 """Tests for the embedded remote collector script."""
 from __future__ import annotations
 
+import importlib.util
 import json
 import os
+import pwd
+import socketserver
 import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
 from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pytest
 
 ROOT = Path(__file__).parents[1]
 REMOTE_SCRIPT_PATH = ROOT / "custom_components" / "vserver_ssh_stats" / "remote_collector.sh"
@@ -14,6 +24,17 @@ def _remote_script() -> str:
     return REMOTE_SCRIPT_PATH.read_text()
 
 
+def _remote_script_module() -> ModuleType:
+    """Load the script wrapper without importing Home Assistant."""
+
+    path = REMOTE_SCRIPT_PATH.with_name("remote_script.py")
+    spec = importlib.util.spec_from_file_location("vserver_ssh_stats_remote_script", path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 def _bash_function(name: str) -> str:
     """Extract one top-level shell function from the embedded payload."""
 
@@ -90,8 +111,25 @@ docker() {
     assert data["container_stats"][1]["cpu"] is None
     assert data["container_stats"][1]["running"] is False
     assert data["container_stats"][1]["status"].startswith("Exited (0)")
+    assert "docker_images_size_bytes" not in data
+
+    # Disk usage is a separate collector section.
+    result = subprocess.run(
+        ["bash"],
+        input=docker_stub + _remote_script(),
+        text=True,
+        capture_output=True,
+        check=False,
+        env=os.environ | {"VSERVER_SSH_STATS_MODE": "docker_disk"},
+    )
+
+    assert result.returncode == 0, result.stderr
+    data = json.loads(result.stdout)
+    assert (data["docker"], data["docker_disk_complete"]) == (1, 1)
     assert data["docker_images_size_bytes"] == 1610612736
     assert data["docker_volumes_size_bytes"] == 2147483648
+    assert data["docker_build_cache_size_bytes"] == 268435456
+    assert data["docker_df"] is None
 
 
 def test_base_collector_reports_process_socket_and_raid_fields() -> None:
@@ -128,6 +166,51 @@ def test_base_collector_reports_process_socket_and_raid_fields() -> None:
     assert data["firewall_active"] == 0
     assert data["firewall_backend"] == ""
     assert data["firewall_rules_count"] is None
+    assert {"cpu", "snapshot", "system", "processes", "firewall"}.issubset(
+        data["section_time_ms"]
+    )
+    assert data["section_forks"].keys() == data["section_time_ms"].keys()
+
+
+def test_base_collector_skips_cpu_sleep_when_previous_uptime_is_known(
+    tmp_path: Path,
+) -> None:
+    """Delta mode returns raw CPU counters instead of sleeping for a sample."""
+
+    sleep_log = tmp_path / "sleep.log"
+    fake_sleep = tmp_path / "sleep"
+    fake_sleep.write_text(f'#!/bin/sh\necho "$@" >> "{sleep_log}"\n')
+    fake_sleep.chmod(0o755)
+
+    def run(extra_env: dict[str, str]) -> dict:
+        result = subprocess.run(
+            ["bash"],
+            input=_remote_script(),
+            text=True,
+            capture_output=True,
+            check=False,
+            env=os.environ
+            | {"PATH": f"{tmp_path}:{os.environ['PATH']}", "VSERVER_SSH_STATS_MODE": "base"}
+            | extra_env,
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout)
+
+    measured = run({})
+    assert sleep_log.read_text() == "1\n"
+    assert isinstance(measured["cpu"], int)
+    assert len(measured["cpu_jiffies"]) == 8
+    assert measured["sample_uptime"] >= measured["uptime"]
+
+    delta = run({"VSERVER_SSH_STATS_PREV_UPTIME": str(measured["uptime"])})
+    assert sleep_log.read_text() == "1\n"
+    assert delta["cpu"] is None
+    assert delta["power_w"] is None
+    assert len(delta["cpu_jiffies"]) == 8
+
+    after_reboot = run({"VSERVER_SSH_STATS_PREV_UPTIME": str(measured["uptime"] + 10**6)})
+    assert sleep_log.read_text() == "1\n1\n"
+    assert isinstance(after_reboot["cpu"], int)
 
 
 def test_failed_ssh_login_collector_counts_recent_failures() -> None:
@@ -259,23 +342,298 @@ def test_fail2ban_collector_defaults_when_not_installed() -> None:
     assert data["fail2ban_jails"] == []
 
 
-def test_process_state_parser_handles_spaces_and_parentheses() -> None:
-    """Parse the state after the final command-name parenthesis in proc stat."""
+def _synthetic_proc(root: Path, count: int) -> None:
+    """Write a /proc tree with *count* processes, some with awkward names."""
+
+    for pid in range(1, count + 1):
+        process = root / str(pid)
+        process.mkdir(parents=True)
+        state = "Z" if pid % 50 == 0 else "R" if pid % 10 == 0 else "S"
+        comm = "worker ) with spaces" if pid % 7 == 0 else f"proc{pid}"
+        (process / "stat").write_text(f"{pid} ({comm}) {state} 1 {pid} {pid} 0\n")
+        uid = 0 if pid % 3 else 65534
+        (process / "status").write_text(
+            f"Name:\t{comm}\nState:\t{state}\nUid:\t{uid}\t{uid}\t{uid}\t{uid}\n"
+        )
+        cgroup = "/system.slice/docker-abc.scope" if pid % 2 else "/user.slice"
+        (process / "cgroup").write_text(f"0::{cgroup}\n")
+    (root / "self").mkdir()
+
+
+def test_process_scanner_counts_states_users_and_cgroups_in_one_pass(
+    tmp_path: Path,
+) -> None:
+    """Scanning 300 processes forks one awk and no per-process cat."""
+
+    proc_root = tmp_path / "proc"
+    _synthetic_proc(proc_root, 300)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fork_log = tmp_path / "forks.log"
+    for tool in ("awk", "cat"):
+        wrapper = bin_dir / tool
+        wrapper.write_text(
+            f'#!/bin/sh\necho {tool} >> "{fork_log}"\nPATH=/usr/bin:/bin exec {tool} "$@"\n'
+        )
+        wrapper.chmod(0o755)
+
+    result = subprocess.run(
+        ["bash"],
+        input=(
+            _bash_function("read_process_state")
+            + f"\nread_process_state '{proc_root}'\n"
+            + 'printf \'%s|%s|%s|%s|%s|%s\' "$process_total" "$process_running" '
+            + '"$process_zombies" "$process_states_json" "$process_users_json" '
+            + '"$process_cgroups_json"\n'
+        ),
+        text=True,
+        capture_output=True,
+        check=False,
+        env=os.environ | {"PATH": f"{bin_dir}:/usr/bin:/bin"},
+    )
+
+    assert result.returncode == 0, result.stderr
+    total, running, zombies, states, users, cgroups = result.stdout.split("|")
+    assert (int(total), int(running), int(zombies)) == (300, 24, 6)
+    assert json.loads(states) == {"S": 270, "R": 24, "Z": 6}
+    try:
+        nobody = pwd.getpwuid(65534).pw_name
+    except KeyError:
+        nobody = "65534"
+    assert json.loads(users) == {"root": 200, nobody: 100}
+    assert json.loads(cgroups) == {
+        "/system.slice/docker-abc.scope": 150,
+        "/user.slice": 150,
+    }
+    assert fork_log.read_text().split() == ["awk"]
+
+
+def _synthetic_snapshot_tree(root: Path) -> None:
+    """Write the /proc and /sys files read by the snapshot stage."""
+
+    net = root / "proc" / "net"
+    net.mkdir(parents=True)
+    (net / "dev").write_text(
+        "Inter-|   Receive |  Transmit\n"
+        " face |bytes packets|bytes packets\n"
+        "    lo:  5000 10 0 0 0 0 0 0  5000 10 0 0 0 0 0 0\n"
+        "  eth0:  1000 10 0 0 0 0 0 0  2000 20 0 0 0 0 0 0\n"
+        "enp0s31f6:300 3 0 0 0 0 0 0   400 4 0 0 0 0 0 0\n"
+    )
+    header = "  sl  local_address rem_address   st tx_queue rx_queue\n"
+    (net / "tcp").write_text(
+        header
+        + "   0: 0100007F:0016 00000000:0000 0A 0:0\n"
+        + "   1: 0100007F:0016 0100007F:9C40 01 0:0\n"
+        + "   2: 0100007F:0016 0100007F:9C41 06 0:0\n"
+    )
+    (net / "tcp6").write_text(header + "   0: 0:0016 0:9C42 01 0:0\n")
+    (net / "sockstat").write_text(
+        "sockets: used 42\nTCP: inuse 5 orphan 0 tw 1 alloc 7 mem 1\n"
+    )
+    (net / "sockstat6").write_text("TCP6: inuse 2\n")
+    netfilter = root / "proc" / "sys" / "net" / "netfilter"
+    netfilter.mkdir(parents=True)
+    (netfilter / "nf_conntrack_count").write_text("17\n")
+    (netfilter / "nf_conntrack_max").write_text("65536\n")
+    for device, sectors_read, sectors_written in (("sda", 10, 20), ("loop0", 99, 99)):
+        block = root / "sys" / "block" / device
+        block.mkdir(parents=True)
+        (block / "stat").write_text(
+            f"1 0 {sectors_read} 0 2 0 {sectors_written} 0 0 0 0\n"
+        )
+    thermal = root / "sys" / "class" / "thermal" / "thermal_zone0"
+    thermal.mkdir(parents=True)
+    (thermal / "temp").write_text("48500\n")
+
+
+def test_proc_snapshot_reads_all_counters_with_one_awk(tmp_path: Path) -> None:
+    """Network, socket, conntrack, disk I/O and temperature share one fork."""
+
+    _synthetic_snapshot_tree(tmp_path / "root")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fork_log = tmp_path / "forks.log"
+    for tool in ("awk", "cat", "basename", "dirname"):
+        wrapper = bin_dir / tool
+        wrapper.write_text(
+            f'#!/bin/sh\necho {tool} >> "{fork_log}"\nPATH=/usr/bin:/bin exec {tool} "$@"\n'
+        )
+        wrapper.chmod(0o755)
 
     result = subprocess.run(
         ["bash"],
         input=(
-            _bash_function("parse_process_state")
-            + "\nparse_process_state '123 (worker ) with spaces) Z 1 2 3'\n"
-            + "printf '%s' \"$parsed_process_state\"\n"
+            _bash_function("set_number_or_null")
+            + _bash_function("read_proc_snapshot")
+            + f"\nread_proc_snapshot '{tmp_path / 'root'}'\n"
+            + 'echo "$rx $tx $tcp_established $tcp_time_wait $sockets_used '
+            + "$tcp_sockets_in_use $conntrack_count $conntrack_max $disk_read_bytes "
+            + '$disk_write_bytes $temp_json ${cpu_freq:-none}"\n'
         ),
         text=True,
         capture_output=True,
         check=False,
+        env=os.environ | {"PATH": f"{bin_dir}:/usr/bin:/bin"},
     )
 
     assert result.returncode == 0, result.stderr
-    assert result.stdout == "Z"
+    assert result.stdout.split() == [
+        "1300",
+        "2400",
+        "2",
+        "1",
+        "42",
+        "7",
+        "17",
+        "65536",
+        str(10 * 512),
+        str(20 * 512),
+        "48.5",
+        "none",
+    ]
+    assert fork_log.read_text().split() == ["awk"]
+
+
+def test_profiling_flag_reports_function_start_and_end_times() -> None:
+    """Profiled runs add collector_profile; regular runs keep the old document."""
+
+    def run(mode: str, profile: str) -> dict:
+        result = subprocess.run(
+            ["bash"],
+            input=_remote_script(),
+            text=True,
+            capture_output=True,
+            check=False,
+            env=os.environ
+            | {
+                "VSERVER_SSH_STATS_MODE": mode,
+                "VSERVER_SSH_STATS_PREV_UPTIME": "1",
+                "VSERVER_SSH_STATS_PROFILE": profile,
+            },
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout)
+
+    base = run("base", "1")["collector_profile"]
+    assert {"read_cpu_stats", "read_proc_snapshot", "read_fail2ban_status"}.issubset(base)
+    assert all(0 <= span["start_ms"] <= span["end_ms"] for span in base.values())
+    # Background sections finish before the collector joins them.
+    join = base["join_background_sections"]
+    assert base["read_fail2ban_status"]["end_ms"] <= join["end_ms"]
+
+    storage = run("storage", "1")
+    assert set(storage["collector_profile"]) == {"read_storage_health"}
+    assert "collector_profile" not in run("storage", "0")
+
+
+@pytest.mark.parametrize("with_mktemp", [True, False])
+def test_hung_background_section_is_reported_partial(tmp_path: Path, with_mktemp: bool) -> None:
+    """A hanging fail2ban-client only loses the fail2ban section, with or without mktemp."""
+
+    fail2ban = tmp_path / "fail2ban-client"
+    fail2ban.write_text("#!/bin/sh\nexec sleep 30\n")
+    fail2ban.chmod(0o755)
+    if not with_mktemp:
+        (tmp_path / "mktemp").write_text("#!/bin/sh\nexit 1\n")
+        (tmp_path / "mktemp").chmod(0o755)
+
+    started = time.monotonic()
+    result = subprocess.run(
+        ["bash"],
+        input=_remote_script(),
+        text=True,
+        capture_output=True,
+        check=False,
+        env=os.environ
+        | {
+            "PATH": f"{tmp_path}:{os.environ['PATH']}",
+            "VSERVER_SSH_STATS_MODE": "base",
+            "VSERVER_SSH_STATS_PREV_UPTIME": "1",
+            "VSERVER_SSH_STATS_SECTION_TIMEOUT": "1",
+        },
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert time.monotonic() - started < 5
+    data = json.loads(result.stdout)
+    assert data["partial_sections"] == ["fail2ban"]
+    assert data["fail2ban_active"] is None
+    assert data["fail2ban_jails"] is None
+    assert data["firewall_active"] == 0
+    assert data["failed_systemd_units_list"] == []
+    assert data["ssh"] in {"yes", "no"}
+
+
+def test_result_cache_serves_sections_until_ttl_or_reboot(tmp_path: Path) -> None:
+    """Cached sections are reused within their TTL and dropped after a reboot."""
+
+    def run() -> dict:
+        result = subprocess.run(
+            ["bash"],
+            input=_remote_script(),
+            text=True,
+            capture_output=True,
+            check=False,
+            env=os.environ
+            | {
+                "VSERVER_SSH_STATS_MODE": "base",
+                "VSERVER_SSH_STATS_PREV_UPTIME": "1",
+                "VSERVER_SSH_STATS_CACHE_TTL": "os=3600,firewall=300",
+                "XDG_RUNTIME_DIR": str(tmp_path),
+            },
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout)
+
+    first = run()
+    assert first["cache_age_seconds"] == {"os": 0, "firewall": 0}
+    cache_dir = tmp_path / f"vserver_ssh_stats-{os.getuid()}"
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+
+    os_cache = cache_dir / "os.vars"
+    header, *_values = os_cache.read_text().splitlines()
+    uptime = int(header.removeprefix("cached_uptime="))
+    os_cache.write_text(f"cached_uptime={uptime}\nos=\"Cached OS\"\nos_json=\"Cached OS\"\n")
+    second = run()
+    assert second["os"] == "Cached OS"
+    assert set(second["cache_age_seconds"]) == {"os", "firewall"}
+    assert second["firewall_active"] == first["firewall_active"]
+
+    # A cache written at a higher uptime predates a reboot.
+    os_cache.write_text(f"cached_uptime={uptime + 10**6}\nos_json=\"Stale OS\"\n")
+    third = run()
+    assert third["os"] == first["os"]
+    assert third["cache_age_seconds"]["os"] == 0
+
+
+def test_skipped_sections_are_not_run_and_reported() -> None:
+    """Sections of tiers that are not due are left out of the sample."""
+
+    result = subprocess.run(
+        ["bash"],
+        input=_remote_script(),
+        text=True,
+        capture_output=True,
+        check=False,
+        env=os.environ
+        | {
+            "VSERVER_SSH_STATS_MODE": "base",
+            "VSERVER_SSH_STATS_PREV_UPTIME": "1",
+            "VSERVER_SSH_STATS_SKIP": "processes,disk,fail2ban",
+        },
+    )
+
+    assert result.returncode == 0, result.stderr
+    data = json.loads(result.stdout)
+    assert data["skipped_sections"] == ["fail2ban", "processes", "disk"]
+    assert {"processes", "disk", "fail2ban"}.isdisjoint(data["section_time_ms"])
+    assert data["top_processes"] is None
+    assert data["disk_stats"] is None
+    assert data["fail2ban_jails"] is None
+    assert data["partial_sections"] == []
+    assert data["rx"] is not None
+    assert data["firewall_active"] is not None
 
 
 def test_storage_collector_returns_a_stable_payload() -> None:
@@ -311,6 +669,203 @@ def test_storage_collector_returns_a_stable_payload() -> None:
     assert isinstance(data["raid_details"], list)
 
 
+def test_storage_probes_run_in_parallel_and_reuse_the_probe_cache(tmp_path: Path) -> None:
+    """Devices are probed concurrently; later runs skip discovery and identity reads."""
+
+    for device, files in {
+        "sda": {"size": "7814037168", "device/wwid": "naa.5000c500a1b2c3d4"},
+        "sdb": {"size": "7814037168", "device/serial": "ZL2ABC"},
+        "nvme0n1": {"size": "1953525168", "wwid": "eui.0025385b71b12345"},
+        "loop0": {"size": "8"},
+    }.items():
+        for name, content in files.items():
+            path = tmp_path / "root" / "sys" / "block" / device / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content + "\n")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "smartctl.log"
+    (bin_dir / "sudo").write_text('#!/bin/sh\nshift\nSUDO=1 exec "$@"\n')
+    (bin_dir / "smartctl").write_text(
+        f"""#!/bin/sh
+for last; do :; done
+device=$(basename "$last")
+echo "start $device ${{SUDO:-0}} $*" >> "{log}"
+sleep 0.3
+echo "end $device" >> "{log}"
+case "$device:${{SUDO:-0}}" in
+  sda:0) echo "Smartctl open device: /dev/sda failed: Permission denied" ;;
+  sda:1)
+    [ "$3" = -a ] && printf 'Device Model: WDC WD40EFRX\\nSerial Number: WD-WCC7K1\\n'
+    printf 'SMART overall-health self-assessment test result: PASSED\\n'
+    printf '194 Temperature_Celsius 0x0022 114 100 000 Old_age Always - 36\\n'
+    ;;
+  sdb:*) echo "Device is in STANDBY mode, exit(2)"; exit 2 ;;
+  nvme0n1:*)
+    [ "$3" = -a ] && printf 'Model Number: Samsung SSD 980\\nSerial Number: S64ANS0\\n'
+    printf 'Critical Warning: 0x00\\nTemperature: 41 Celsius\\nPercentage Used: 3%%\\n'
+    ;;
+esac
+"""
+    )
+    for stub in ("sudo", "smartctl"):
+        (bin_dir / stub).chmod(0o755)
+    script = _remote_script()
+    pattern = script.index("storage_output_pattern=")
+    functions = "".join(
+        _bash_function(name)
+        for name in (
+            "run_limited",
+            "json_escape",
+            "number_or_null",
+            "dump_variables",
+            "prepare_private_cache_dir",
+            "read_storage_device_output",
+            "probe_storage_device",
+            "add_storage_probe",
+            "read_storage_health",
+        )
+    )
+
+    def run() -> dict[str, Any]:
+        log.write_text("")
+        result = subprocess.run(
+            ["bash"],
+            input=(
+                "set -e\nstorage_timeout=5\nstorage_jobs=2\n"
+                + script[pattern : script.index("\n", pattern) + 1]
+                + functions
+                + f"read_storage_health '{tmp_path / 'root'}'\n"
+                + 'printf \'{"devices":%s,"collected":%s,"standby":%s,"errors":%s}\\n\' '
+                + '"$storage_devices_json" "$storage_devices_collected" '
+                + '"$storage_devices_standby" "$storage_device_errors"\n'
+            ),
+            text=True,
+            capture_output=True,
+            check=False,
+            env=os.environ
+            | {"PATH": f"{bin_dir}:/usr/bin:/bin", "XDG_RUNTIME_DIR": str(tmp_path)},
+        )
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout)
+
+    first = run()
+    first_log = log.read_text().splitlines()
+    second = run()
+    second_log = log.read_text().splitlines()
+
+    # Two probes overlap before the first one ends; the third waits for a slot.
+    assert [line.split()[0] for line in first_log[:2]] == ["start", "start"]
+    assert sum(line.startswith("start sda") for line in first_log) == 2
+    assert (first["collected"], first["standby"], first["errors"]) == (3, 1, 0)
+    devices = {device["name"]: device for device in first["devices"]}
+    assert devices["sda"]["serial"] == "WD-WCC7K1"
+    assert devices["sda"]["temperature"] == 36
+    assert devices["sda"]["capacity_bytes"] == 7814037168 * 512
+    assert devices["sdb"]["standby"] is True
+    assert devices["sdb"]["serial"] == "ZL2ABC"
+    assert devices["sdb"]["temperature"] is None
+    assert devices["nvme0n1"]["wear_percent"] == 3
+
+    # The remembered sudo choice and identity leave one health read per device.
+    assert sorted(line for line in second_log if line.startswith("start")) == [
+        "start nvme0n1 0 -n standby -H -A /dev/nvme0n1",
+        "start sda 1 -n standby -H -A /dev/sda",
+        "start sdb 0 -n standby -H -A /dev/sdb",
+    ]
+    assert second["devices"] == first["devices"]
+
+
+def test_storage_reads_fall_back_to_legacy_sudo_rule(tmp_path: Path) -> None:
+    """Hosts whose sudoers only allow "smartctl -a" keep reporting SMART health."""
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "smartctl.log"
+    (bin_dir / "sudo").write_text(
+        """#!/bin/sh
+shift
+if [ "$2" != -a ]; then
+  echo "Sorry, user monitor is not allowed to execute '$*' as root." >&2
+  exit 1
+fi
+exec "$@"
+"""
+    )
+    (bin_dir / "smartctl").write_text(
+        f"""#!/bin/sh
+echo "$*" >> "{log}"
+printf 'SMART overall-health self-assessment test result: PASSED\\n'
+"""
+    )
+    for stub in ("sudo", "smartctl"):
+        (bin_dir / stub).chmod(0o755)
+    script = _remote_script()
+    pattern = script.index("storage_output_pattern=")
+
+    result = subprocess.run(
+        ["bash"],
+        input=(
+            "set -e\nstorage_timeout=5\n"
+            + script[pattern : script.index("\n", pattern) + 1]
+            + _bash_function("run_limited")
+            + _bash_function("read_storage_device_output")
+            + "read_storage_device_output /dev/sda smartctl 1 1\n"
+            + 'printf \'%s\\n\' "$smart_command_status"\n'
+        ),
+        text=True,
+        capture_output=True,
+        check=False,
+        env=os.environ | {"PATH": f"{bin_dir}:/usr/bin:/bin"},
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "0\n"
+    assert log.read_text().splitlines() == ["-a /dev/sda"]
+
+
+def test_slow_collector_output_is_compressed_on_request() -> None:
+    """Requested gzip output is decoded by the reader; unknown encodings stay plain."""
+
+    spec = importlib.util.spec_from_file_location(
+        "vserver_ssh_stats_collector_output",
+        REMOTE_SCRIPT_PATH.with_name("collector_output.py"),
+    )
+    assert spec and spec.loader
+    output = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(output)
+
+    def run(encodings: str) -> bytes:
+        result = subprocess.run(
+            ["bash"],
+            input=_remote_script().encode(),
+            capture_output=True,
+            check=False,
+            env=os.environ
+            | {
+                "PATH": "/usr/bin:/bin",
+                "VSERVER_SSH_STATS_MODE": "storage",
+                "VSERVER_SSH_STATS_STORAGE_TIMEOUT": "1",
+                "VSERVER_SSH_STATS_COMPRESS": encodings,
+            },
+        )
+        assert result.returncode == 0, result.stderr
+        return result.stdout
+
+    compressed = run("brotli,gzip")
+    assert compressed.startswith(output.COMPRESSED_OUTPUT_MARKER + b"gzip\n")
+    reader = output.CollectorOutputReader()
+    for index in range(0, len(compressed), 3):
+        reader.feed(compressed[index : index + 3])
+    data = reader.finish()
+    assert reader.encoding == "gzip"
+    assert reader.received_bytes == len(compressed)
+    assert "storage_devices" in data
+
+    plain = run("brotli")
+    assert json.loads(plain) == data
+
+
 def test_docker_collector_does_not_turn_parse_errors_into_zero() -> None:
     """Map stats by container ID and preserve invalid percentages as null."""
 
@@ -357,6 +912,95 @@ docker() {
     assert data["container_stats"][1]["mem"] is None
 
 
+def _synthetic_cgroup_trees(root: Path) -> None:
+    """Write a cgroup v2 host and a cgroup v1 host with one container each."""
+
+    v2 = root / "v2"
+    (v2 / "proc" / "101").mkdir(parents=True)
+    (v2 / "proc" / "101" / "cgroup").write_text("0::/system.slice/docker-aaa.scope\n")
+    (v2 / "proc" / "102").mkdir(parents=True)
+    (v2 / "proc" / "102" / "cgroup").write_text("0::/system.slice/docker-gone.scope\n")
+    scope = v2 / "sys" / "fs" / "cgroup" / "system.slice" / "docker-aaa.scope"
+    scope.mkdir(parents=True)
+    (v2 / "sys" / "fs" / "cgroup" / "cgroup.controllers").write_text("cpu memory pids\n")
+    (scope / "cpu.stat").write_text(
+        "usage_usec 5000000\nnr_periods 9\nnr_throttled 3\nthrottled_usec 1500\n"
+    )
+    (scope / "memory.current").write_text("209715200\n")
+    (scope / "memory.max").write_text("max\n")
+    (scope / "memory.stat").write_text("anon 1\ninactive_file 104857600\n")
+    (scope / "pids.current").write_text("7\n")
+
+    v1 = root / "v1"
+    (v1 / "proc" / "201").mkdir(parents=True)
+    (v1 / "proc" / "201" / "cgroup").write_text(
+        "12:pids:/docker/bbb\n5:memory:/docker/bbb\n"
+        "3:cpu,cpuacct:/docker/bbb\n1:name=systemd:/docker/bbb\n"
+    )
+    cgroup = v1 / "sys" / "fs" / "cgroup"
+    for controller in ("cpu,cpuacct", "memory", "pids"):
+        (cgroup / controller / "docker" / "bbb").mkdir(parents=True)
+    (cgroup / "cpu,cpuacct" / "docker" / "bbb" / "cpu.stat").write_text(
+        "nr_periods 10\nnr_throttled 2\nthrottled_time 5000000\n"
+    )
+    (cgroup / "cpu,cpuacct" / "docker" / "bbb" / "cpuacct.usage").write_text("3000000000\n")
+    memory = cgroup / "memory" / "docker" / "bbb"
+    (memory / "memory.usage_in_bytes").write_text("52428800\n")
+    (memory / "memory.limit_in_bytes").write_text("9223372036854771712\n")
+    (memory / "memory.stat").write_text(
+        "cache 1\ninactive_file 0\ntotal_inactive_file 10485760\n"
+    )
+    (cgroup / "pids" / "docker" / "bbb" / "pids.current").write_text("4\n")
+
+    for host in (v1, v2):
+        (host / "proc" / "meminfo").write_text("MemTotal:        1048576 kB\n")
+        (host / "proc" / "uptime").write_text("1234.56 100.00\n")
+
+
+def test_container_cgroups_are_read_in_one_awk_pass(tmp_path: Path) -> None:
+    """CPU, memory and PID counters of all containers share one awk fork."""
+
+    _synthetic_cgroup_trees(tmp_path / "root")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fork_log = tmp_path / "forks.log"
+    for tool in ("awk", "cat"):
+        wrapper = bin_dir / tool
+        wrapper.write_text(
+            f'#!/bin/sh\necho {tool} >> "{fork_log}"\nPATH=/usr/bin:/bin exec {tool} "$@"\n'
+        )
+        wrapper.chmod(0o755)
+    inspect_lines = {
+        "v2": "aaafull|0|true|running|||||101|0\ngonefull|0|true|running|||||102|0\n"
+        "stoppedfull|0|false|exited|||||0|0",
+        "v1": "bbbfull|0|true|running|||||201|0",
+    }
+
+    lines = {}
+    for host, inspect in inspect_lines.items():
+        result = subprocess.run(
+            ["bash"],
+            input=(
+                _bash_function("read_container_cgroups")
+                + f"\ninspect_lines='{inspect}'\n"
+                + f"read_container_cgroups '{tmp_path / 'root' / host}'\n"
+                + 'printf \'%s\\n%s\\n\' "$docker_sample_uptime" "$container_cgroup_lines"\n'
+            ),
+            text=True,
+            capture_output=True,
+            check=False,
+            env=os.environ | {"PATH": f"{bin_dir}:/usr/bin:/bin"},
+        )
+        assert result.returncode == 0, result.stderr
+        uptime, *lines[host] = result.stdout.splitlines()
+        assert uptime == "1234.56"
+
+    # Reclaimable page cache is not counted and "max" limits use MemTotal.
+    assert lines["v2"] == ["aaafull|5000000|9.77|104857600|7|3|1500"]
+    assert lines["v1"] == ["bbbfull|3000000|3.91|41943040|4|2|5000"]
+    assert fork_log.read_text().split() == ["awk", "awk"]
+
+
 def test_docker_collector_retries_an_all_zero_stats_sample(tmp_path: Path) -> None:
     """Retry once when Docker reports zero CPU and memory for every container."""
 
@@ -441,3 +1085,216 @@ docker() {
     data = json.loads(result.stdout)
     assert data["container_stats"][0]["cpu"] == 3.25
     assert data["container_stats"][0]["mem"] == 7.5
+
+
+def test_docker_collector_reads_the_engine_api_socket(tmp_path: Path) -> None:
+    """With a usable socket the CLI is not started and API documents are returned."""
+
+    web = "a" * 64
+    old = "b" * 64
+    responses = {
+        "/containers/json": [
+            {"Id": web, "Names": ["/web"], "State": "running", "Status": "Up 2 hours"},
+            {"Id": old, "Names": ["/old"], "State": "exited", "Status": "Exited (0) 1 day ago"},
+        ],
+        f"/containers/{web}/json": {"Id": web, "State": {"Running": True, "Pid": 0}},
+        f"/containers/{old}/json": {"Id": old, "State": {"Running": False, "Pid": 0}},
+        f"/containers/{web}/stats": {"id": web, "cpu_stats": {"cpu_usage": {"total_usage": 5}}},
+    }
+    requests: list[str] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            requests.append(self.path)
+            body = json.dumps(responses[self.path.split("?")[0]], separators=(",", ":")).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_args: object) -> None:
+            return None
+
+    socket_path = tmp_path / "docker.sock"
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        result = subprocess.run(
+            ["bash"],
+            input="docker() { echo cli >&2; return 1; }\n" + _remote_script(),
+            text=True,
+            capture_output=True,
+            check=False,
+            env=os.environ
+            | {"VSERVER_SSH_STATS_MODE": "docker", "DOCKER_HOST": f"unix://{socket_path}"},
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result.returncode == 0, result.stderr
+    assert "cli" not in result.stderr
+    data = json.loads(result.stdout)
+    assert (data["docker"], data["docker_stats_complete"], data["docker_stats_partial"]) == (
+        1,
+        1,
+        0,
+    )
+    api = data["docker_api"]
+    assert [container["Id"] for container in api["containers"]] == [web, old]
+    assert [document.get("Id") or document.get("id") for document in api["documents"]] == [
+        web,
+        old,
+        web,
+    ]
+    assert "cpu_stats" in api["documents"][2]
+    assert requests[0].startswith("/containers/json?all=1")
+    assert f"/containers/{web}/stats?stream=false&one-shot=true" in requests
+
+
+def test_docker_events_mode_relays_filtered_events_after_a_heartbeat() -> None:
+    """The event channel starts with a heartbeat and resumes from the given time."""
+
+    docker_stub = r'''
+timeout() { shift; "$@"; }
+docker() {
+  case "$1" in
+    info) return 0 ;;
+    events)
+      printf '{"args":"%s"}\n' "$*"
+      printf '%s\n' '{"Type":"container","Action":"die","Actor":{"ID":"abc"}}'
+      ;;
+    *) return 24 ;;
+  esac
+}
+'''
+    result = subprocess.run(
+        ["bash"],
+        input=docker_stub + _remote_script(),
+        text=True,
+        capture_output=True,
+        check=False,
+        env=os.environ
+        | {
+            "VSERVER_SSH_STATS_MODE": "docker_events",
+            "VSERVER_SSH_STATS_DOCKER_EVENTS_SINCE": "1700000000",
+        },
+    )
+
+    assert result.returncode == 0, result.stderr
+    heartbeat, arguments, event = [json.loads(line) for line in result.stdout.splitlines()]
+    assert heartbeat["heartbeat"] >= 1700000000
+    assert event["Action"] == "die"
+    assert "--filter type=container" in arguments["args"]
+    assert "--filter event=health_status" in arguments["args"]
+    assert "--since 1700000000" in arguments["args"]
+
+
+def test_combined_collector_modes_return_one_document_per_section() -> None:
+    """Comma separated modes run in one invocation with per-section status."""
+
+    result = subprocess.run(
+        ["bash"],
+        input=_remote_script(),
+        text=True,
+        capture_output=True,
+        check=False,
+        env=os.environ | {"VSERVER_SSH_STATS_MODE": "packages,storage,unknown"},
+    )
+
+    assert result.returncode == 0, result.stderr
+    data = json.loads(result.stdout)
+    assert set(data["sections"]) == {"packages", "storage"}
+    assert data["section_complete"] == {"packages": 1, "storage": 1}
+    assert data["sections"]["packages"]["pkg_updates_complete"] == 1
+    assert data["sections"]["storage"]["storage_stats_complete"] == 1
+    assert all(isinstance(value, int) for value in data["section_time_ms"].values())
+
+
+def test_cached_collector_is_installed_once_and_run_by_hash(tmp_path: Path) -> None:
+    """The first poll uploads the script; later polls run the cached copy."""
+
+    module = _remote_script_module()
+    env = {**os.environ, "HOME": str(tmp_path)}
+    env.pop("XDG_CACHE_HOME", None)
+    cache_dir = tmp_path / ".cache" / "vserver_ssh_stats"
+    payload = 'printf "mode=%s\\n" "$VSERVER_SSH_STATS_MODE"\n'
+
+    def run(command: str, stdin: str = "") -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            ["sh", "-c", command],
+            input=stdin,
+            text=True,
+            capture_output=True,
+            check=False,
+            env=env,
+        )
+
+    prefix = "VSERVER_SSH_STATS_MODE=docker"
+    missing = run(module.cached_script_command(prefix))
+    assert missing.returncode == module.REMOTE_SCRIPT_MISSING_STATUS
+
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "collector-outdated.sh").write_text("exit 1\n")
+    installed = run(module.install_script_command(prefix), payload)
+    assert installed.returncode == 0, installed.stderr
+    assert installed.stdout == "mode=docker\n"
+    assert [path.name for path in cache_dir.iterdir()] == [
+        f"collector-{module.REMOTE_SCRIPT_SHA256}.sh"
+    ]
+
+    cached = run(module.cached_script_command(prefix))
+    assert cached.returncode == 0, cached.stderr
+    assert cached.stdout == "mode=docker\n"
+
+
+def test_collector_install_reports_read_only_cache_dir(tmp_path: Path) -> None:
+    """An unwritable cache leaves stdin streaming as the fallback."""
+
+    module = _remote_script_module()
+    blocked = tmp_path / "cache"
+    blocked.write_text("not a directory\n")
+    env = {**os.environ, "HOME": str(tmp_path), "XDG_CACHE_HOME": str(blocked)}
+
+    result = subprocess.run(
+        ["sh", "-c", module.install_script_command("VSERVER_SSH_STATS_MODE=base")],
+        input="echo should-not-run\n",
+        text=True,
+        capture_output=True,
+        check=False,
+        env=env,
+    )
+
+    assert result.returncode == module.REMOTE_SCRIPT_INSTALL_FAILED_STATUS
+    assert result.stdout == ""
+
+
+def test_stream_collector_bootstraps_and_answers_sample_requests(tmp_path: Path) -> None:
+    """The resident collector asks for the script, samples on request and exits on EOF."""
+
+    module = _remote_script_module()
+    env = os.environ | {"HOME": str(tmp_path)}
+    env.pop("XDG_CACHE_HOME", None)
+    command = module.stream_script_command(
+        "VSERVER_SSH_STATS_MODE=stream VSERVER_SSH_STATS_STREAM_INTERVAL=600"
+    )
+
+    result = subprocess.run(
+        ["sh", "-c", command],
+        input=f"{_remote_script().rstrip()}\n{module.STREAM_SCRIPT_END}\nsample\n",
+        text=True,
+        capture_output=True,
+        check=False,
+        env=env,
+        timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.splitlines()
+    assert lines[0] == module.STREAM_NEEDS_SCRIPT
+    samples = [json.loads(line) for line in lines[1:]]
+    assert len(samples) == 2
+    assert all("cpu" in sample and "uptime" in sample for sample in samples)
@@ -0,0 +1,147 @@
+"""Tests for the fleet SSH session limiter and poll phase offsets."""
+from __future__ import annotations
+
+import ast
+import asyncio
+import contextlib
+import hashlib
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Mapping, Optional
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+SCHEDULER_PATH = ROOT / "custom_components" / "vserver_ssh_stats" / "scheduler.py"
+
+
+def _scheduler_module() -> dict[str, Any]:
+    """Compile the scheduler without importing Home Assistant."""
+
+    tree = ast.parse(SCHEDULER_PATH.read_text())
+    tree.body = [
+        node
+        for node in tree.body
+        if not isinstance(node, (ast.Import, ast.ImportFrom))
+        or (isinstance(node, ast.ImportFrom) and node.module == "__future__")
+    ]
+    namespace: dict[str, Any] = {
+        "Any": Any,
+        "AsyncIterator": AsyncIterator,
+        "Mapping": Mapping,
+        "Optional": Optional,
+        "asyncio": asyncio,
+        "contextlib": contextlib,
+        "deque": deque,
+        "hashlib": hashlib,
+        "time": time,
+        "DEFAULT_MAX_FLEET_SSH_SESSIONS": 16,
+    }
+    exec(compile(tree, str(SCHEDULER_PATH), "exec"), namespace)
+    return namespace
+
+
+def test_phase_offsets_are_stable_and_inside_the_interval() -> None:
+    """Hosts keep their offset across restarts and are spread out."""
+
+    phase_offset = _scheduler_module()["phase_offset"]
+    offsets = [phase_offset(f"host-{index}", 30) for index in range(50)]
+
+    assert offsets == [phase_offset(f"host-{index}", 30) for index in range(50)]
+    assert all(0 <= offset < 30 for offset in offsets)
+    assert len({round(offset) for offset in offsets}) > 10
+    assert phase_offset("host", 0) == 0.0
+
+
+def test_limiter_caps_sessions_and_serves_base_polls_first() -> None:
+    """Queued base polls get a released slot before earlier slow collectors."""
+
+    module = _scheduler_module()
+    fleet = module["SSHSessionLimiter"](2)
+    limiter = module["SSHSessionLimiter"](1, parent=fleet)
+    base, slow = module["PRIORITY_BASE"], module["PRIORITY_SLOW"]
+    order: list[str] = []
+
+    async def session(name: str, priority: int, release: asyncio.Event) -> None:
+        async with limiter.slot(priority):
+            order.append(name)
+            await release.wait()
+
+    async def scenario() -> None:
+        first_release = asyncio.Event()
+        done = asyncio.Event()
+        done.set()
+        first = asyncio.create_task(session("first", base, first_release))
+        await asyncio.sleep(0)
+        slow_task = asyncio.create_task(session("slow", slow, done))
+        base_task = asyncio.create_task(session("base", base, done))
+        await asyncio.sleep(0)
+
+        assert limiter.active == 1
+        assert fleet.active == 1
+        assert limiter.queue_depth == 2
+
+        first_release.set()
+        await asyncio.gather(first, slow_task, base_task)
+        assert limiter.active == 0
+        assert fleet.active == 0
+        assert limiter.queue_depth == 0
+
+    asyncio.run(scenario())
+    assert order == ["first", "base", "slow"]
+
+
+def test_cancelled_waiter_does_not_leak_a_slot() -> None:
+    """A poll cancelled while queued leaves the limiter usable."""
+
+    limiter = _scheduler_module()["SSHSessionLimiter"](1)
+
+    async def scenario() -> None:
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await holder
+
+        async with limiter.slot() as waited:
+            assert waited < 1
+        assert limiter.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_adaptive_interval_tightens_on_volatility_and_relaxes_when_stable() -> None:
+    """Incidents poll at the floor; calm hosts back off to the ceiling."""
+
+    adaptive = _scheduler_module()["AdaptivePollInterval"](30)
+    calm = {"cpu": 10, "mem": 40, "load_1": 0.2, "cores": 2, "net_in": 1000, "net_out": 500}
+
+    assert (adaptive.update(calm), adaptive.reason) == (30, "configured")
+    assert (adaptive.update(calm | {"cpu": 55}), adaptive.reason) == (10, "cpu_changed")
+    assert (adaptive.update(calm | {"cpu": 95}), adaptive.reason) == (10, "cpu_high")
+    assert (adaptive.update(calm), adaptive.reason) == (10, "cpu_changed")
+    assert (adaptive.update(calm), adaptive.reason) == (20, "settling")
+    assert (adaptive.update(calm), adaptive.reason) == (30, "configured")
+    # Network throughput only counts when it doubles or halves above 1 MiB/s.
+    assert adaptive.update(calm | {"net_in": 900_000}) == 30
+    assert (adaptive.update(calm | {"net_in": 5_000_000}), adaptive.reason) == (
+        10,
+        "net_changed",
+    )
+
+    intervals = [adaptive.update(calm) for _ in range(10)]
+    assert intervals[-1] == adaptive.ceiling == 120
+    assert adaptive.reason == "stable"
+    assert adaptive.update(calm | {"load_1": 4}) == adaptive.floor
+    assert adaptive.reason == "load_high"
@@ -0,0 +1,183 @@
+"""Tests for the integration-owned SSH thread pools."""
+from __future__ import annotations
+
+import ast
+import asyncio
+import importlib.util
+import logging
+import threading
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Any
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+EXECUTOR_PATH = ROOT / "custom_components" / "vserver_ssh_stats" / "ssh_executor.py"
+INIT_PATH = EXECUTOR_PATH.with_name("__init__.py")
+
+
+def _executor_module() -> ModuleType:
+    """Load the executor module without importing Home Assistant."""
+
+    spec = importlib.util.spec_from_file_location(
+        "vserver_ssh_stats_ssh_executor", EXECUTOR_PATH
+    )
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_lane_sizes_scale_with_servers_and_stay_bounded() -> None:
+    """Small setups keep a minimum pool and large fleets are capped."""
+
+    module = _executor_module()
+
+    assert module.lane_sizes(0) == {"poll": 4, "action": 2, "stream": 2}
+    assert module.lane_sizes(10) == {"poll": 20, "action": 10, "stream": 20}
+    assert module.lane_sizes(500) == {"poll": 64, "action": 16, "stream": 256}
+
+
+def test_hung_actions_do_not_block_the_poll_lane() -> None:
+    """A saturated action lane is reported while polls still run."""
+
+    module = _executor_module()
+    executor = module.SSHExecutor(0)
+    release = threading.Event()
+
+    async def scenario() -> None:
+        actions = [
+            asyncio.create_task(executor.run(module.LANE_ACTION, release.wait, 5))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.1)
+
+        assert await executor.run(module.LANE_POLL, str.upper, "polled") == "POLLED"
+        stats = executor.stats()
+        assert stats["action"]["running"] == 2
+        assert stats["action"]["queued"] == 1
+        assert stats["action"]["saturated"] is True
+        assert stats["poll"]["saturated"] is False
+
+        release.set()
+        await asyncio.gather(*actions)
+        assert executor.stats()["action"]["running"] == 0
+        assert executor.stats()["action"]["peak_queued"] >= 1
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+
+def test_shutdown_cancels_queued_calls() -> None:
+    """Unloading the last entry stops the pools and drops waiting calls."""
+
+    module = _executor_module()
+    executor = module.SSHExecutor(0)
+    release = threading.Event()
+
+    async def scenario() -> None:
+        running = [
+            asyncio.create_task(executor.run(module.LANE_ACTION, release.wait, 5))
+            for _ in range(2)
+        ]
+        queued = asyncio.create_task(executor.run(module.LANE_ACTION, release.wait, 5))
+        await asyncio.sleep(0.1)
+
+        executor.shutdown()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        release.set()
+        await asyncio.gather(*running)
+        assert executor.stats()["action"]["queued"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_shutdown_refuses_new_calls_until_reconfigured() -> None:
+    """Calls after the last entry unloaded must not start new pools."""
+
+    module = _executor_module()
+    executor = module.SSHExecutor(0)
+    executor.shutdown()
+
+    with pytest.raises(RuntimeError, match="shut down"):
+        asyncio.run(executor.run(module.LANE_POLL, int, "1"))
+    assert executor._executors == {}
+
+    executor.configure(1)
+    try:
+        assert asyncio.run(executor.run(module.LANE_POLL, int, "1")) == 1
+    finally:
+        executor.shutdown()
+
+
+def test_unload_stops_streams_before_the_executor_shuts_down() -> None:
+    """Stream cleanup must not revive the thread pools of an unloaded entry."""
+
+    events: list[str] = []
+    tree = ast.parse(INIT_PATH.read_text())
+    functions = [
+        node
+        for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        and node.name in {"async_unload_entry", "_configure_ssh_executor"}
+    ]
+
+    class FakeCoordinator:
+        async def async_stop_stream(self) -> None:
+            events.append("stop_stream")
+
+    class FakeExecutor:
+        def shutdown(self) -> None:
+            events.append("shutdown")
+
+        async def run(self, _lane: str, func: Any, *args: Any) -> Any:
+            events.append("run")
+            return func(*args)
+
+    async def unload_platforms(_entry: Any, _platforms: Any) -> bool:
+        return True
+
+    async def close_async_hosts(_hosts: Any) -> None:
+        events.append("close_asyncssh")
+
+    def ignore(*_args: Any) -> None:
+        return None
+
+    namespace: dict[str, Any] = {
+        "Any": Any,
+        "ConfigEntry": Any,
+        "HomeAssistant": Any,
+        "DOMAIN": "vserver_ssh_stats",
+        "PLATFORMS": [],
+        "LANE_ACTION": "action",
+        "_LOGGER": logging.getLogger(__name__),
+        "ssh_executor": FakeExecutor(),
+        "ssh_pool": SimpleNamespace(
+            set_compression=ignore, close_hosts=lambda _hosts: events.append("close_pool")
+        ),
+        "asyncssh_transport": SimpleNamespace(async_close_hosts=close_async_hosts),
+        "forget_hosts": ignore,
+        "configure_output_compression": ignore,
+        "configure_collector_profiling": ignore,
+        "forget_collector_profiles": ignore,
+        "configure_remote_cache": ignore,
+    }
+    exec(compile(ast.Module(body=functions, type_ignores=[]), str(INIT_PATH), "exec"), namespace)
+    hass = SimpleNamespace(
+        config_entries=SimpleNamespace(async_unload_platforms=unload_platforms),
+        data={
+            "vserver_ssh_stats": {
+                "entry": {
+                    "servers": [{"host": "vps.example"}],
+                    "coordinators": [FakeCoordinator()],
+                }
+            }
+        },
+    )
+
+    assert asyncio.run(namespace["async_unload_entry"](hass, SimpleNamespace(entry_id="entry")))
+    assert events == ["stop_stream", "run", "close_pool", "close_asyncssh", "shutdown"]
@@ -0,0 +1,232 @@
+"""Tests for the shared SSH connection pool."""
+from __future__ import annotations
+
+import ast
+import contextlib
+import hashlib
+import logging
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator, Optional
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+POOL_PATH = ROOT / "custom_components" / "vserver_ssh_stats" / "ssh_pool.py"
+
+
+class FakeSSHException(Exception):
+    """Stand-in for paramiko.SSHException."""
+
+
+class FakeTransport:
+    """Minimal Paramiko transport with an adjustable connection state."""
+
+    def __init__(self) -> None:
+        self.active = True
+        self.keepalive: int | None = None
+        self.ignored = 0
+
+    def is_active(self) -> bool:
+        return self.active
+
+    def set_keepalive(self, interval: int) -> None:
+        self.keepalive = interval
+
+    def send_ignore(self) -> None:
+        self.ignored += 1
+        if not self.active:
+            raise EOFError
+
+
+class FakeClient:
+    """Paramiko SSHClient stand-in recording connections and channels."""
+
+    def __init__(self) -> None:
+        self.transport = FakeTransport()
+        self.connected = 0
+        self.closed = False
+        self.commands: list[str] = []
+        self.fail_next_exec = False
+
+    def connect(self, **kwargs: Any) -> None:
+        self.connected += 1
+        self.connect_kwargs = kwargs
+
+    def get_transport(self) -> FakeTransport:
+        return self.transport
+
+    def exec_command(self, command: str, timeout: int):
+        if self.fail_next_exec:
+            self.fail_next_exec = False
+            raise FakeSSHException("SSH session not active")
+        self.commands.append(command)
+        channel = SimpleNamespace(closed=False)
+        channel.close = lambda: setattr(channel, "closed", True)
+        return None, SimpleNamespace(channel=channel), None
+
+    def close(self) -> None:
+        self.closed = True
+        self.transport.active = False
+
+
+def _pool_module() -> dict[str, Any]:
+    """Compile the pool without importing Paramiko or Home Assistant."""
+
+    tree = ast.parse(POOL_PATH.read_text())
+    tree.body = [
+        node
+        for node in tree.body
+        if not isinstance(node, (ast.Import, ast.ImportFrom))
+        or (isinstance(node, ast.ImportFrom) and node.module == "__future__")
+    ]
+    namespace: dict[str, Any] = {
+        "Any": Any,
+        "Callable": Callable,
+        "Iterator": Iterator,
+        "Optional": Optional,
+        "contextlib": contextlib,
+        "hashlib": hashlib,
+        "logging": logging,
+        "threading": threading,
+        "time": time,
+        "paramiko": SimpleNamespace(SSHException=FakeSSHException, SSHClient=FakeClient),
+        "configure_pinned_host_keys": lambda _client, _fingerprints: None,
+        "DEFAULT_SSH_KEEPALIVE_INTERVAL": 30,
+        "DEFAULT_SSH_POOL_IDLE_TTL": 300,
+    }
+    exec(compile(tree, str(POOL_PATH), "exec"), namespace)
+    return namespace
+
+
+def _make_pool(**kwargs: Any) -> tuple[Any, list[FakeClient]]:
+    clients: list[FakeClient] = []
+
+    def factory() -> FakeClient:
+        clients.append(FakeClient())
+        return clients[-1]
+
+    pool = _pool_module()["SSHConnectionPool"](client_factory=factory, **kwargs)
+    return pool, clients
+
+
+def _run(pool: Any, command: str = "true", host: str = "server", password: str = "pw"):
+    with pool.exec_command(
+        host, "user", password, None, 22, command, 10, 30, ["SHA256:test"]
+    ) as (_stdin, stdout, _stderr, connect_time_ms):
+        channel = stdout.channel
+    return channel, connect_time_ms
+
+
+def test_pool_reuses_authenticated_transport_for_new_channels() -> None:
+    """Consecutive collectors share one login and each channel is closed."""
+
+    pool, clients = _make_pool()
+
+    first_channel, _ = _run(pool, "collector")
+    second_channel, connect_time_ms = _run(pool, "docker")
+
+    assert len(clients) == 1
+    assert clients[0].connected == 1
+    assert clients[0].commands == ["collector", "docker"]
+    assert clients[0].transport.keepalive == 30
+    assert first_channel.closed and second_channel.closed
+    assert connect_time_ms < 50
+
+
+def test_pool_requests_compression_only_for_configured_hosts() -> None:
+    """Transport compression is a per-host opt-in applied on connect."""
+
+    pool, clients = _make_pool()
+    pool.set_compression(["wan"], True)
+
+    _run(pool, host="wan")
+    _run(pool, host="lan")
+
+    assert clients[0].connect_kwargs["compress"] is True
+    assert clients[1].connect_kwargs["compress"] is False
+
+    # Toggling compression opens a new transport instead of reusing the old one.
+    pool.set_compression(["wan"], False)
+    _run(pool, host="wan")
+    assert len(clients) == 3
+    assert clients[2].connect_kwargs["compress"] is False
+
+    pool.close_hosts({"wan"})
+    assert all(key[0] != "wan" for key in pool._connect_locks)
+
+
+def test_pool_separates_credentials_and_hosts() -> None:
+    """Changing the password or host never reuses another login."""
+
+    pool, clients = _make_pool()
+
+    _run(pool, host="one", password="old")
+    _run(pool, host="one", password="new")
+    _run(pool, host="two", password="new")
+
+    assert len(clients) == 3
+
+
+def test_pool_reconnects_once_when_reused_transport_is_stale() -> None:
+    """A transport that died between polls is replaced transparently."""
+
+    pool, clients = _make_pool()
+    _run(pool)
+    clients[0].fail_next_exec = True
+
+    _run(pool, "retry")
+
+    assert len(clients) == 2
+    assert clients[0].closed is True
+    assert clients[1].commands == ["retry"]
+
+
+def test_pool_does_not_retry_fresh_connection_failures() -> None:
+    """Errors on a brand-new connection are surfaced to the collector."""
+
+    pool, clients = _make_pool()
+
+    def factory() -> FakeClient:
+        client = FakeClient()
+        client.fail_next_exec = True
+        clients.append(client)
+        return client
+
+    pool._client_factory = factory
+    with pytest.raises(FakeSSHException):
+        _run(pool)
+    assert len(clients) == 1
+    assert clients[0].closed is True
+
+
+def test_pool_health_checks_and_evicts_idle_connections() -> None:
+    """Dead idle transports fail the keepalive probe and expired ones are closed."""
+
+    pool, clients = _make_pool(keepalive_interval=0)
+    _run(pool)
+    clients[0].transport.active = False
+    _run(pool)
+    assert len(clients) == 2
+    assert clients[0].closed is True
+
+    idle_pool, idle_clients = _make_pool(idle_ttl=0)
+    _run(idle_pool)
+    _run(idle_pool)
+    assert len(idle_clients) == 2
+    assert idle_clients[0].closed is True
+
+
+def test_pool_close_hosts_only_closes_matching_connections() -> None:
+    """Unloading one entry leaves other hosts connected."""
+
+    pool, clients = _make_pool()
+    _run(pool, host="one")
+    _run(pool, host="two")
+
+    pool.close_hosts({"one"})
+
+    assert clients[0].closed is True
+    assert clients[1].closed is False
@@ -0,0 +1,316 @@
+"""Tests for the optional asyncssh transport backend."""
+from __future__ import annotations
+
+import ast
+import asyncio
+import base64
+import hashlib
+import importlib.util
+import logging
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterable, Optional
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+PACKAGE = ROOT / "custom_components" / "vserver_ssh_stats"
+TRANSPORT_PATH = PACKAGE / "ssh_transport.py"
+HOST_KEY = b"fake-ed25519-host-key"
+HOST_KEY_FINGERPRINT = "SHA256:" + base64.b64encode(
+    hashlib.sha256(HOST_KEY).digest()
+).decode("ascii").rstrip("=")
+
+
+class FakeAuthenticationException(Exception):
+    """Stand-in for paramiko.AuthenticationException."""
+
+
+class FakeStream:
+    """asyncssh reader returning canned output in small chunks."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    async def read(self, size: int) -> bytes:
+        chunk, self._data = self._data[:7], self._data[7:]
+        return chunk
+
+
+class FakeProcess:
+    """asyncssh process echoing stdin after a fixed prefix."""
+
+    def __init__(self, command: str) -> None:
+        self.command = command
+        self.stdin_data = b""
+        self.stdin = SimpleNamespace(write=self._write, write_eof=self._write_eof)
+        self.stdout = FakeStream(b"")
+        self.stderr = FakeStream(b"")
+        self.exit_status: Optional[int] = None
+        self.closed = False
+
+    def _write(self, data: bytes) -> None:
+        self.stdin_data += data
+
+    def _write_eof(self) -> None:
+        if self.command == "fail":
+            self.stderr = FakeStream(b"boom")
+            self.exit_status = 3
+            return
+        self.stdout = FakeStream(self.command.encode() + b":" + self.stdin_data)
+        self.exit_status = 0
+
+    async def wait_closed(self) -> None:
+        return None
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeConnection:
+    """asyncssh connection counting opened channels."""
+
+    def __init__(self) -> None:
+        self.processes: list[FakeProcess] = []
+        self.closed = False
+
+    async def create_process(self, command: str, encoding: Any = None) -> FakeProcess:
+        assert encoding is None
+        process = FakeProcess(command)
+        self.processes.append(process)
+        return process
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _fake_asyncssh() -> SimpleNamespace:
+    """Return a minimal asyncssh module that validates host keys like the real one."""
+
+    class Error(Exception):
+        pass
+
+    class PermissionDenied(Error):
+        pass
+
+    class SSHClient:
+        pass
+
+    module = SimpleNamespace(
+        Error=Error,
+        PermissionDenied=PermissionDenied,
+        SSHClient=SSHClient,
+        connections=[],
+    )
+
+    async def create_connection(client_factory: Any, host: str, port: int, **kwargs: Any):
+        assert kwargs["known_hosts"] == ([], [], [])
+        client = client_factory()
+        host_key = SimpleNamespace(public_data=HOST_KEY)
+        if not client.validate_host_public_key(host, host, port, host_key):
+            raise Error("Host key is not trusted")
+        connection = FakeConnection()
+        connection.options = kwargs
+        module.connections.append(connection)
+        return connection, client
+
+    module.create_connection = create_connection
+    return module
+
+
+def _transport_module(asyncssh: Any, compressed_hosts: Iterable[str] = ()) -> dict[str, Any]:
+    """Compile the transport with a fake asyncssh and without Paramiko."""
+
+    spec = importlib.util.spec_from_file_location(
+        "vserver_ssh_stats_ssh_security", PACKAGE / "ssh_security.py"
+    )
+    assert spec is not None and spec.loader is not None
+    security = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(security)
+
+    def import_module(name: str) -> Any:
+        if asyncssh is None:
+            raise ImportError(name)
+        return asyncssh
+
+    tree = ast.parse(TRANSPORT_PATH.read_text())
+    tree.body = [
+        node
+        for node in tree.body
+        if not isinstance(node, (ast.Import, ast.ImportFrom))
+        or (isinstance(node, ast.ImportFrom) and node.module == "__future__")
+    ]
+    namespace: dict[str, Any] = {
+        "Any": Any,
+        "Callable": Callable,
+        "Iterable": Iterable,
+        "Optional": Optional,
+        "asyncio": asyncio,
+        "importlib": SimpleNamespace(import_module=import_module),
+        "logging": logging,
+        "time": time,
+        "paramiko": SimpleNamespace(AuthenticationException=FakeAuthenticationException),
+        "PoolKey": tuple,
+        "pool_key": lambda *args: args[:4],
+        "ssh_pool": SimpleNamespace(compression_enabled=set(compressed_hosts).__contains__),
+        "PinnedHostKeyPolicy": security.PinnedHostKeyPolicy,
+        "SSHHostKeyError": security.SSHHostKeyError,
+        "DEFAULT_SSH_KEEPALIVE_INTERVAL": 30,
+        "DEFAULT_SSH_POOL_IDLE_TTL": 300,
+        "SSH_TRANSPORT_ASYNCSSH": "asyncssh",
+    }
+    exec(compile(tree, str(TRANSPORT_PATH), "exec"), namespace)
+    return namespace
+
+
+def _exec(transport: Any, command: str, **kwargs: Any):
+    return transport.async_exec(
+        "vps.example",
+        "root",
+        "secret",
+        None,
+        22,
+        command,
+        5,
+        5,
+        [HOST_KEY_FINGERPRINT],
+        **kwargs,
+    )
+
+
+def test_commands_share_one_verified_connection() -> None:
+    """Concurrent commands multiplex channels over one pinned connection."""
+
+    asyncssh = _fake_asyncssh()
+    transport = _transport_module(asyncssh)["AsyncSSHTransport"]()
+
+    async def scenario() -> list[tuple[str, str, int, float, bool]]:
+        return await asyncio.gather(
+            _exec(transport, "collect", stdin_data=b"script"),
+            _exec(transport, "uptime"),
+            _exec(transport, "fail"),
+        )
+
+    collect, uptime, fail = asyncio.run(scenario())
+
+    assert collect[:3] == ("collect:script", "", 0)
+    assert uptime[:3] == ("uptime:", "", 0)
+    assert fail[:3] == ("", "boom", 3)
+    assert len(asyncssh.connections) == 1
+    assert all(process.closed for process in asyncssh.connections[0].processes)
+    assert "compression_algs" not in asyncssh.connections[0].options
+
+
+def test_compression_is_requested_for_configured_hosts() -> None:
+    """SSH compression follows the pool setting and still allows uncompressed peers."""
+
+    asyncssh = _fake_asyncssh()
+    transport = _transport_module(asyncssh, ["vps.example"])["AsyncSSHTransport"]()
+
+    asyncio.run(_exec(transport, "uptime"))
+
+    assert asyncssh.connections[0].options["compression_algs"][-1] == "none"
+
+
+def test_output_is_bounded_when_requested() -> None:
+    """Custom sensor output stops growing at the configured limit."""
+
+    transport = _transport_module(_fake_asyncssh())["AsyncSSHTransport"]()
+
+    stdout, _stderr, status, _connect_ms, truncated = asyncio.run(
+        _exec(transport, "x" * 40, max_output=10)
+    )
+
+    assert status == 0
+    assert stdout == "x" * 10
+    assert truncated is True
+
+    chunks: list[bytes] = []
+    stdout, _stderr, status, _connect_ms, truncated = asyncio.run(
+        _exec(transport, "y" * 40, stdout_sink=chunks.append)
+    )
+
+    assert (stdout, status, truncated) == ("", 0, False)
+    assert b"".join(chunks) == b"y" * 40 + b":"
+    assert len(chunks) > 1
+
+
+def test_closing_hosts_keeps_busy_connections_until_their_channels_finish(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Unloading a host retires a busy connection instead of cutting its channel."""
+
+    asyncssh = _fake_asyncssh()
+    transport = _transport_module(asyncssh)["AsyncSSHTransport"]()
+
+    async def scenario() -> None:
+        release = asyncio.Event()
+
+        class SlowProcess(FakeProcess):
+            async def wait_closed(self) -> None:
+                await release.wait()
+
+        async def create_process(
+            self: FakeConnection, command: str, encoding: Any = None
+        ) -> FakeProcess:
+            process = SlowProcess(command)
+            self.processes.append(process)
+            return process
+
+        monkeypatch.setattr(FakeConnection, "create_process", create_process)
+        command = asyncio.create_task(_exec(transport, "uptime"))
+        while not asyncssh.connections or not asyncssh.connections[0].processes:
+            await asyncio.sleep(0)
+
+        await transport.async_close_hosts({"vps.example"})
+        assert asyncssh.connections[0].closed is False
+        assert transport._connections == {}
+
+        release.set()
+        assert (await command)[:3] == ("uptime:", "", 0)
+        assert asyncssh.connections[0].closed is True
+        assert transport._locks == {}
+
+    asyncio.run(scenario())
+
+
+def test_unpinned_host_key_is_rejected() -> None:
+    """A host key outside the pinned fingerprints fails like the Paramiko policy."""
+
+    asyncssh = _fake_asyncssh()
+    module = _transport_module(asyncssh)
+    transport = module["AsyncSSHTransport"]()
+
+    async def scenario() -> None:
+        await transport.async_exec(
+            "vps.example",
+            "root",
+            "secret",
+            None,
+            22,
+            "uptime",
+            5,
+            5,
+            ["SHA256:" + "A" * 43],
+        )
+
+    with pytest.raises(module["SSHHostKeyError"], match="host key mismatch"):
+        asyncio.run(scenario())
+    assert asyncssh.connections == []
+
+
+def test_hosts_fall_back_to_paramiko_without_asyncssh() -> None:
+    """Only configured hosts use asyncssh, and only when it is installed."""
+
+    module = _transport_module(_fake_asyncssh())
+    module["configure_host_transport"](["a", "b"], "asyncssh")
+    module["configure_host_transport"](["b"], "paramiko")
+    assert module["transport_for_host"]("a") is module["asyncssh_transport"]
+    assert module["transport_for_host"]("b") is None
+    module["forget_hosts"](["a"])
+    assert module["transport_for_host"]("a") is None
+
+    missing = _transport_module(None)
+    missing["configure_host_transport"](["a"], "asyncssh")
+    assert missing["transport_for_host"]("a") is None